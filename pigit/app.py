@@ -41,6 +41,7 @@ from pigit.termui import (
     ToastPosition,
     set_theme,
 )
+from pigit.termui import syntax_pool
 from pigit.termui.cli_output import Console
 from pigit.termui.containers import Column, SplitPane, TabView
 from pigit.termui.tty_io import terminal_size
@@ -60,27 +61,37 @@ from .app_log_graph_preview import LogGraphPreview
 from .app_stash import StashPanel
 from .app_status import StatusPanel
 from .app_theme import THEME
+from .const import ACTIVITY_CACHE_DIR, COMMIT_STORE_PATH
+from .git.commit_store import CommitStore
 from .git.managed_repos import ManagedRepos
+from .git.model import BranchStatus
 from .observe import (
+    AdaptiveCadence,
     ChangeBatch,
     ChangeKind,
+    InotifyBackend,
+    ObservationBackend,
     ObserveContext,
     RefreshCoordinator,
     RepoObserver,
     StatMtimeBackend,
     WatchRoot,
+    inotify_available,
     should_defer_repo_refresh,
 )
 from .observe.denylist import rel_path_is_denied
 from .observe.digest import hash_porcelain
+from .observe.git_index import IndexDirtyProbe
 from .viewmodels.status import StatusViewModel
 from .viewmodels.branch import BranchViewModel
 from .viewmodels.commit import CommitViewModel
 from .session_history import SessionHistory
 from .config_data import AppConfig
 
-# FS mtime poll cadence for StatMtimeBackend.
-_OBSERVE_POLL_INTERVAL_S = 1.0
+# Observe poll cadence (StatMtime; idle wake-up for inotify): fast right after
+# a keypress or a detected change, backing off to the idle interval.
+_OBSERVE_POLL_FAST_S = 0.25
+_OBSERVE_POLL_IDLE_S = 4.0
 # UI queue drain / debounce flush retry cadence.
 _OBSERVE_DRAIN_INTERVAL_S = 0.15
 
@@ -131,10 +142,12 @@ class PigitApplication(Application):
         self._observer: RepoObserver | None = None
         self._coordinator: RefreshCoordinator | None = None
         self._observe_ctx: ObserveContext | None = None
-        self._observe_poll_id: int | None = None
         self._observe_drain_id: int | None = None
+        self._observe_probe: IndexDirtyProbe | None = None
         self._observe_status_unsub: Callable[[], None] | None = None
         self._header_reload_token: object | None = None
+        # Commit metadata shared across sessions (opened on first use)
+        self._commit_store = CommitStore(COMMIT_STORE_PATH)
         # ViewModels (assigned in build_root, same lifetime as panels)
         self._status_vm: StatusViewModel
         self._commit_vm: CommitViewModel
@@ -170,8 +183,13 @@ class PigitApplication(Application):
         footer.set_global_help([(";", "Palette"), ("I", "Inspector"), ("Q", "Quit")])
 
         self._status_vm = StatusViewModel(self._git, history=self._session_history)
+        self._status_vm.branch.subscribe(self._on_status_branch)
         self._branch_vm = BranchViewModel(self._git, history=self._session_history)
-        self._commit_vm = CommitViewModel(self._git)
+        self._commit_vm = CommitViewModel(
+            self._git,
+            activity_cache_dir=ACTIVITY_CACHE_DIR,
+            store=self._commit_store,
+        )
 
         # Side previews are created at app level but only inserted into the
         # layout on large screens: Status/Stash use diff preview, Branch uses
@@ -216,7 +234,13 @@ class PigitApplication(Application):
             id="commit",
             report_default=self._config.commit_report_default,
         )
-        self._diff_panel = DiffViewer(id="diff", word_diff=self._config.word_diff)
+        self._diff_panel = DiffViewer(
+            id="diff",
+            word_diff=self._config.word_diff,
+            max_lines=self._config.diff_max_lines,
+            syntax_cache_size=self._config.syntax_cache_size,
+            store=self._commit_store,
+        )
         self._tab_view = TabView(
             children=[
                 self._status_stack,
@@ -338,12 +362,23 @@ class PigitApplication(Application):
         if self._tab_view.active is not None:
             self._on_tab_switch(self._tab_view.active)
 
+    def before_key(self, key: str) -> None:
+        """Keypresses keep repo observation at its fast poll cadence."""
+        if self._observer is not None:
+            self._observer.note_activity()
+
     def on_exit(self) -> None:
         """Stop repo observation timers and backend before root destroy."""
         self._stop_repo_observe()
+        self._git.close()
+        self._commit_store.close()
+        syntax_pool.shutdown()
 
     def _start_repo_observe(self) -> None:
-        """Start StatMtime observation of git metadata (and Status worktree)."""
+        """Start observation of git metadata (and Status worktree).
+
+        Uses inotify on Linux, stat polling elsewhere.
+        """
         try:
             git_dir = self._git.get_git_dir()
             common_dir = self._git.get_git_common_dir()
@@ -358,7 +393,16 @@ class PigitApplication(Application):
             git_dir=git_dir,
             common_dir=common_dir,
         )
-        backend = StatMtimeBackend(worktree_digest=self._observe_worktree_digest)
+        if repo_root:
+            self._observe_probe = IndexDirtyProbe(
+                repo_root, git_dir, confirm=self._observe_porcelain_digest
+            )
+        backend: ObservationBackend
+        if inotify_available():
+            # Falls back to StatMtime itself when the watch limit is reached.
+            backend = InotifyBackend(worktree_digest=self._observe_worktree_digest)
+        else:
+            backend = StatMtimeBackend(worktree_digest=self._observe_worktree_digest)
         observer = RepoObserver(backend=backend)
         self._observer = observer
         self._coordinator = RefreshCoordinator(
@@ -367,23 +411,39 @@ class PigitApplication(Application):
             on_batch=self._on_observe_batch,
             ctx_provider=self._observe_context,
         )
+        if self._loop is not None:
+            # Polls (and the worktree digest's git status) run off the UI
+            # thread; roots below are handed to the worker, not applied here.
+            observer.start_worker(
+                AdaptiveCadence(_OBSERVE_POLL_FAST_S, _OBSERVE_POLL_IDLE_S)
+            )
         self._resync_observe_roots(reset=True)
         if self._observe_status_unsub is None:
             self._observe_status_unsub = self._status_vm.items.subscribe(
                 self._on_status_items_for_observe
             )
         if self._loop is not None:
-            self._observe_poll_id = self._loop.add_interval(
-                _OBSERVE_POLL_INTERVAL_S,
-                observer.poll_into_queue,
-            )
             self._observe_drain_id = self._loop.add_interval(
                 _OBSERVE_DRAIN_INTERVAL_S,
                 self._coordinator.drain,
             )
 
     def _observe_worktree_digest(self) -> str | None:
-        """Return a porcelain digest while Status worktree observe is active."""
+        """Return a worktree digest while Status worktree observe is active.
+
+        A stat sweep against ``.git/index`` runs first; ``git status`` only
+        runs when the sweep suspects a change.
+        """
+        probe = self._observe_probe
+        if probe is None:
+            return self._observe_porcelain_digest()
+        try:
+            return probe()
+        except Exception:
+            logging.debug("Worktree index probe failed", exc_info=True)
+            return self._observe_porcelain_digest()
+
+    def _observe_porcelain_digest(self) -> str | None:
         try:
             return hash_porcelain(self._git.status_porcelain())
         except Exception:
@@ -428,21 +488,19 @@ class PigitApplication(Application):
             self._observer.update_roots(roots)
 
     def _stop_repo_observe(self) -> None:
-        """Remove observe intervals and stop the backend."""
+        """Remove the drain interval and stop the observe worker/backend."""
         if self._observe_status_unsub is not None:
             self._observe_status_unsub()
             self._observe_status_unsub = None
-        if self._loop is not None:
-            if self._observe_poll_id is not None:
-                self._loop.remove_interval(self._observe_poll_id)
-                self._observe_poll_id = None
-            if self._observe_drain_id is not None:
-                self._loop.remove_interval(self._observe_drain_id)
-                self._observe_drain_id = None
+        if self._loop is not None and self._observe_drain_id is not None:
+            self._loop.remove_interval(self._observe_drain_id)
+            self._observe_drain_id = None
         if self._observer is not None:
+            # Does not join the worker; an in-flight digest finishes on its own.
             self._observer.stop()
             self._observer = None
         self._coordinator = None
+        self._observe_probe = None
 
     def _observe_context(self) -> ObserveContext:
         """Return the current ObserveContext (must be started)."""
@@ -459,15 +517,19 @@ class PigitApplication(Application):
     def _on_observe_batch(self, batch: ChangeBatch) -> None:
         """Apply a debounced ChangeBatch to header and the active panel."""
         kinds = batch.kinds
-        if ChangeKind.HEAD in kinds or ChangeKind.REFS in kinds:
+        active = resolve_presentation_leaf(self._tab_view.active)
+        status_reload = isinstance(active, StatusPanel) and (
+            ChangeKind.INDEX in kinds or ChangeKind.WORKTREE_META in kinds
+        )
+        if (ChangeKind.HEAD in kinds or ChangeKind.REFS in kinds) and not status_reload:
+            # A status reload carries the branch headers (see _on_status_branch).
             self._schedule_reload_header()
 
-        active = resolve_presentation_leaf(self._tab_view.active)
         if active is None:
             return
 
         if isinstance(active, StatusPanel):
-            if ChangeKind.INDEX in kinds or ChangeKind.WORKTREE_META in kinds:
+            if status_reload:
                 self._refresh_list_panel(active)
             if ChangeKind.PREVIEW_FILE in kinds:
                 if (
@@ -499,6 +561,16 @@ class PigitApplication(Application):
             if ChangeKind.STASH in kinds or ChangeKind.REFS in kinds:
                 self._refresh_list_panel(active)
 
+    def _on_status_branch(self, branch: BranchStatus | None) -> None:
+        """Apply the branch headers read by the last status load to the header."""
+        if branch is None or branch.detached:
+            # Detached label (tag / short SHA) needs the get_head fallback.
+            self._schedule_reload_header()
+            return
+        self._header_state.branch = branch.head
+        self._header_state.ahead = branch.ahead
+        self._header_state.behind = branch.behind
+
     def _schedule_reload_header(self) -> None:
         """Async-load branch + ahead/behind into HeaderState with stale-guard."""
         token = object()
@@ -692,6 +764,17 @@ class PigitApplication(Application):
         show_sheet(panel, title="Recent")
         panel.activate()
 
+    @bind_action("git_trace", "T", desc="Show recent git subprocess timings", tip="Trace")
+    def open_git_trace(self) -> None:
+        """Open the executor trace buffer as a top-edge sheet."""
+        from pigit.ext.exec_trace import get_exec_trace
+
+        from .app_git_trace import GitTraceSheet
+
+        sheet = GitTraceSheet(get_exec_trace())
+        show_sheet(sheet, edge="top", max_fraction=0.5)
+        sheet.activate()
+
     def toggle_side_preview(self) -> None:
         """Toggle the side preview that belongs to the focused panel."""
         cols, _ = terminal_size()
@@ -28,6 +28,7 @@ from pigit.termui import (
     show_sheet,
     show_toast,
 )
+from pigit.termui.primitives import TextIndex
 from pigit.termui.widgets import ItemList
 from pigit.termui.wcwidth_table import wcswidth
 
@@ -126,12 +127,14 @@ class CommitPanel(ItemList):
             on_selection_changed=on_selection_changed,
             lazy_load=True,
             id=id,
-            on_search_changed=lambda: self._apply_filter(),
+            on_search_changed=lambda: self._on_query_changed(),
         )
         self._vm = vm
         self.commits: list[Commit] = []
         self._all_commits: list[Commit] = []
         self._source_map: list[int] = []
+        # Filter index over ``_all_commits``; rebuilt lazily when they change.
+        self._filter_index: TextIndex | None = None
         self._report_enabled = report_default
         self._report_h = 0
         self._contrib_graph = ContributionGraph()
@@ -205,13 +208,15 @@ class CommitPanel(ItemList):
         if not self.commits:
             return
         source_idx = self._source_index(self.curr_no)
-        content = self._vm.load_diff(source_idx)
+        stream = self._vm.open_diff(source_idx)
+        if stream is None:
+            return
         self.emit(
             EVT_GOTO,
             target="diff",
             source=self,
             key=self.commits[self.curr_no].sha,
-            content=content,
+            stream=stream,
             repo_path=self._vm.repo_path,
             diff_type=DiffType.COMMIT,
         )
@@ -284,11 +289,24 @@ class CommitPanel(ItemList):
             )
         self._update_report_layout()
 
-    @bind_action("search", "/", desc="Filter commit list by message or SHA")
+    @bind_action("search", "/", desc="Filter commits (Enter: search history)")
     def search(self) -> None:
         """Activate the commit-list search filter."""
         self.enter_search()
 
+    def _on_query_changed(self) -> None:
+        """Filter the loaded list while typing; search all history on Enter.
+
+        A submitted query runs :meth:`ICommitViewModel.search` in the
+        background; editing or clearing the query stops it and lists the log.
+        """
+        query = self.search_query
+        if self.search_active or not query.strip():
+            self._vm.clear_search()
+        else:
+            self._vm.search(query)
+        self._apply_filter()
+
     def _source_index(self, item_idx: int) -> int:
         """Map a visible item index to the source index in ``_all_commits``."""
         if item_idx < len(self._source_map):
@@ -343,56 +361,115 @@ class CommitPanel(ItemList):
             self._vm_unsubs.append(
                 bind_signals(self, self._vm.items, callback=self._on_items_changed)
             )
+            self._vm_unsubs.append(
+                bind_signals(
+                    self, self._vm.activity, callback=self._on_activity_changed
+                )
+            )
+            self._vm_unsubs.append(
+                bind_signals(
+                    self,
+                    self._vm.search_running,
+                    callback=self._on_search_running_changed,
+                )
+            )
 
     def _on_items_changed(self) -> None:
         if not self.is_activated():
             return
         commits = self._vm.items.value
+        # A page slid the window: keep the selected commit (and its screen row).
+        keep = self._current_commit() if self._vm.window_shift else None
         self._all_commits = list(commits)
+        self._filter_index = None
+        self._rel_time_cache.clear()
+        self._abs_time_cache.clear()
         # Clear decoration / body caches BEFORE rebuild so row templates
         # re-parse ``extra_info`` (e.g. HEAD moved off a former tip).
         self._bodies = None
         self._body_lines_cache.clear()
         self._refs_cache.clear()
-        self._apply_filter()
-        self._contrib_graph.set_commits(commits)
+        self._apply_filter(keep_sha=keep.sha if keep is not None else None)
+        if self._vm.activity.value is None:
+            # Until the year-long aggregation lands, chart the loaded window.
+            self._contrib_graph.set_commits(commits)
+
+    def _on_search_running_changed(self) -> None:
+        # A search that ends with no hits leaves ``items`` unchanged: swap the
+        # "Searching history…" placeholder here.
+        if self.is_activated() and not self._all_commits:
+            self._apply_filter()
+            self._request_render()
+
+    def _on_activity_changed(self) -> None:
+        activity = self._vm.activity.value
+        if activity is None:
+            self._contrib_graph.set_commits(self._all_commits)
+        else:
+            self._contrib_graph.set_counts(
+                activity.day_counts, activity.author_day_counts
+            )
+        self._request_render()
 
-    def _apply_filter(self) -> None:
-        """Filter commits by query and rebuild display state."""
-        query = self.search_query.lower()
+    def _notify_change(self) -> None:
+        super()._notify_change()
+        if self.commits:
+            # Page the log in the background as the cursor nears either end.
+            self._vm.ensure_window(self._source_index(self.curr_no))
+
+    def _select_sha(self, sha: str, screen_row: int) -> None:
+        """Select ``sha`` if listed, showing it ``screen_row`` rows from the top."""
+        for idx, commit in enumerate(self.commits):
+            if commit.sha == sha:
+                break
+        else:
+            return
+        self.curr_no = idx
+        self._r_start = max(0, self.cursor_row() - screen_row)
+        self._scroll_into_view()
+
+    def _apply_filter(self, keep_sha: str | None = None) -> None:
+        """Filter commits by query and rebuild display state.
+
+        Args:
+            keep_sha: Commit to keep selected across the rebuild, if listed.
+        """
+        # Server-side search results are already the matches.
+        query = "" if self._vm.search_query else self.search_query.lower()
         if not query:
             self.commits = list(self._all_commits)
             self._source_map = list(range(len(self._all_commits)))
         else:
-            filtered: list[Commit] = []
-            mapping: list[int] = []
-            for i, c in enumerate(self._all_commits):
-                if (
-                    query in c.msg.lower()
-                    or query in c.author.lower()
-                    or query in c.sha.lower()
-                ):
-                    filtered.append(c)
-                    mapping.append(i)
-            self.commits = filtered
-            self._source_map = mapping
+            if self._filter_index is None:
+                # NUL never occurs in a query, so matches cannot span fields.
+                self._filter_index = TextIndex(
+                    [f"{c.msg}\0{c.author}\0{c.sha}" for c in self._all_commits]
+                )
+            self._source_map = self._filter_index.search(query)
+            self.commits = [self._all_commits[i] for i in self._source_map]
         if not self.commits:
-            self.set_content(["No matching commits."])
+            empty = "Searching history…" if self._vm.searching else "No matching commits."
+            self.set_content([empty])
             self._max_meta_w = 0
             self._row_cache_focused.clear()
             self._row_cache_unfocused.clear()
             self._notify_change()
             return
-        self._rel_time_cache.clear()
-        self._abs_time_cache.clear()
+        # Kept across keystrokes; reset when the commits change.
         for commit in self.commits:
-            self._rel_time_cache[commit.sha] = relative_time(commit.unix_timestamp)
-            self._abs_time_cache[commit.sha] = self._format_abs_time(
-                commit.unix_timestamp
-            )
+            if commit.sha not in self._rel_time_cache:
+                self._rel_time_cache[commit.sha] = relative_time(
+                    commit.unix_timestamp
+                )
+                self._abs_time_cache[commit.sha] = self._format_abs_time(
+                    commit.unix_timestamp
+                )
         if self._expanded:
             self._ensure_bodies()
+        screen_row = self.cursor_row() - self._r_start
         self._rebuild_rows()
+        if keep_sha is not None:
+            self._select_sha(keep_sha, screen_row)
         self._build_row_cache()
         self._notify_change()
 
@@ -814,9 +891,10 @@ class CommitPanel(ItemList):
         are skipped (they belong to the commit row only). ``commit`` may be
         ``None`` in this mode.
         """
+        lanes_after = row.lanes_after
         if sub:
             segments: list[Segment] = []
-            for i, sha in enumerate(row.lanes_after):
+            for i, sha in enumerate(lanes_after):
                 if sha is None:
                     segments.append(
                         Segment("  ", fg=THEME.fg_dim, style_flags=cursor_flags)
@@ -829,17 +907,22 @@ class CommitPanel(ItemList):
                 )
             return segments
 
-        total_lanes = max(len(row.lanes_before), len(row.lanes_after))
+        lanes_before = row.lanes_before
+        total_lanes = max(len(lanes_before), len(lanes_after))
         segments = []
         assert commit is not None
         for i in range(total_lanes):
-            ch, fg = self._lane_glyph(row, i, commit, focused=focused)
+            ch, fg = self._lane_glyph(
+                row, lanes_before, lanes_after, i, commit, focused=focused
+            )
             segments.append(Segment(ch + " ", fg=fg, style_flags=cursor_flags))
         return segments
 
     def _lane_glyph(
         self,
         row: GraphRow,
+        lanes_before: list[str | None],
+        lanes_after: list[str | None],
         i: int,
         commit: Commit,
         *,
@@ -859,8 +942,8 @@ class CommitPanel(ItemList):
         if i in row.opened_lanes:
             return self.GRAPH_OPEN, lane_fg
 
-        before_active = i < len(row.lanes_before) and row.lanes_before[i] is not None
-        after_active = i < len(row.lanes_after) and row.lanes_after[i] is not None
+        before_active = i < len(lanes_before) and lanes_before[i] is not None
+        after_active = i < len(lanes_after) and lanes_after[i] is not None
         if before_active or after_active:
             return self.GRAPH_VERTICAL, lane_fg
 
@@ -1,24 +1,37 @@
 """
 Module: pigit/app_commit_graph.py
-Description: Pure algorithm for inline merge-graph layout per commit row.
+Description: Incremental inline merge-graph layout per commit row.
 Author: Zev
 Date: 2026-05-04
 """
 
 from __future__ import annotations
 
+from bisect import bisect_left, insort
 from typing import TYPE_CHECKING
-from collections.abc import Sequence
+from collections.abc import Collection, Sequence
 
-from .app_types import GraphRow
+from .app_types import GraphRow, GraphSegment
 
 if TYPE_CHECKING:
     from pigit.git.model import Commit
 
 
+# Rows per lane snapshot; rows in between replay at most this many deltas.
+CHECKPOINT_ROWS = 64
+
+
 def compute_graph_rows(commits: Sequence[Commit]) -> list[GraphRow]:
     """Compute graph layout for ``commits`` (newest-first, as ``git log`` emits).
 
+    One-shot form of :meth:`GraphLayout.extend`.
+    """
+    return GraphLayout().extend(commits)
+
+
+class GraphLayout:
+    """Lane layout that grows a page at a time as ``git log`` streams in.
+
     For each commit:
 
     1. Find lanes whose expected SHA matches the commit (``incoming``).
@@ -27,68 +40,108 @@ def compute_graph_rows(commits: Sequence[Commit]) -> list[GraphRow]:
     3. For each additional parent (merge), open a new lane to the right of
        ``commit_lane``.
     4. Trim trailing ``None`` slots so column count tracks the active set.
-    """
-    lanes: list[str | None] = []
-    rows: list[GraphRow] = []
-
-    for commit in commits:
-        sha = commit.sha
-        parents = list(commit.parents)
 
-        lanes_before = list(lanes)
+    A SHA → lanes index and a sorted free-slot list keep each step
+    proportional to the lanes it touches, not to the lane count. Rows store
+    lane writes as deltas against a :class:`GraphSegment` checkpoint.
+    """
 
-        incoming = [i for i, s in enumerate(lanes) if s == sha]
+    def __init__(self) -> None:
+        self._lanes: list[str | None] = []
+        # Expected SHA -> lanes waiting for it, ascending.
+        self._waiting: dict[str, list[int]] = {}
+        # ``None`` slots below ``len(_lanes)``, ascending.
+        self._free: list[int] = []
+        self._segment: GraphSegment | None = None
+
+    def copy(self) -> GraphLayout:
+        """Return an independent layout at the same position (rows not shared)."""
+        other = GraphLayout()
+        other._lanes = list(self._lanes)
+        other._waiting = {sha: list(lanes) for sha, lanes in self._waiting.items()}
+        other._free = list(self._free)
+        return other
+
+    @property
+    def lanes(self) -> list[str | None]:
+        """Current lanes (after the last row)."""
+        return list(self._lanes)
+
+    def extend(self, commits: Sequence[Commit]) -> list[GraphRow]:
+        """Lay out ``commits`` after the rows already produced; return their rows."""
+        rows: list[GraphRow] = []
+        for commit in commits:
+            rows.append(self._add(commit.sha, commit.parents))
+        return rows
+
+    def _add(self, sha: str, parents: Sequence[str]) -> GraphRow:
+        segment = self._segment
+        if segment is None or len(segment.deltas) >= CHECKPOINT_ROWS:
+            segment = self._segment = GraphSegment(tuple(self._lanes))
+        writes: list[tuple[int, str | None]] = []
+
+        incoming = self._waiting.pop(sha, None)
         if incoming:
-            commit_lane = min(incoming)
-            closed_lanes = sorted(set(incoming) - {commit_lane})
+            commit_lane = incoming[0]
+            closed_lanes = incoming[1:]
         else:
-            commit_lane = _alloc_lane(lanes, prefer_after=0)
+            commit_lane = self._alloc(0, ())
             closed_lanes = []
 
-        lanes[commit_lane] = parents[0] if parents else None
-        excluded: set[int] = set()
+        self._set(commit_lane, parents[0] if parents else None, writes)
         for i in closed_lanes:
-            lanes[i] = None
-            excluded.add(i)
+            self._set(i, None, writes)
 
         opened_lanes: list[int] = []
+        excluded = set(closed_lanes)
         for parent_sha in parents[1:]:
-            slot = _alloc_lane(
-                lanes,
-                prefer_after=commit_lane + 1,
-                exclude=excluded,
-            )
-            lanes[slot] = parent_sha
+            slot = self._alloc(commit_lane + 1, excluded)
+            self._set(slot, parent_sha, writes)
             opened_lanes.append(slot)
             excluded.add(slot)
 
+        lanes = self._lanes
         while lanes and lanes[-1] is None:
             lanes.pop()
-
-        rows.append(
-            GraphRow(
-                lanes_before=lanes_before,
-                commit_lane=commit_lane,
-                closed_lanes=closed_lanes,
-                opened_lanes=opened_lanes,
-                lanes_after=list(lanes),
-            )
+        free = self._free
+        while free and free[-1] >= len(lanes):
+            free.pop()
+
+        segment.deltas.append((tuple(writes), len(lanes)))
+        return GraphRow(
+            commit_lane=commit_lane,
+            closed_lanes=closed_lanes,
+            opened_lanes=opened_lanes,
+            segment=segment,
+            offset=len(segment.deltas) - 1,
         )
 
-    return rows
-
-
-def _alloc_lane(
-    lanes: list[str | None],
-    *,
-    prefer_after: int = 0,
-    exclude: set[int] | None = None,
-) -> int:
-    """First ``None`` slot at index ``>= prefer_after`` and not in ``exclude``;
-    append a new lane otherwise."""
-    excl = exclude or set()
-    for i in range(prefer_after, len(lanes)):
-        if lanes[i] is None and i not in excl:
-            return i
-    lanes.append(None)
-    return len(lanes) - 1
+    def _set(
+        self, lane: int, sha: str | None, writes: list[tuple[int, str | None]]
+    ) -> None:
+        """Point ``lane`` at ``sha`` and keep the index and free list in step."""
+        old = self._lanes[lane]
+        if old is not None:
+            waiting = self._waiting.get(old)
+            if waiting is not None and lane in waiting:
+                waiting.remove(lane)
+                if not waiting:
+                    del self._waiting[old]
+        self._lanes[lane] = sha
+        if sha is None:
+            insort(self._free, lane)
+        else:
+            insort(self._waiting.setdefault(sha, []), lane)
+        writes.append((lane, sha))
+
+    def _alloc(self, prefer_after: int, exclude: Collection[int]) -> int:
+        """First ``None`` slot at index ``>= prefer_after`` and not in ``exclude``;
+        append a new lane otherwise. The slot leaves the free list."""
+        free = self._free
+        k = bisect_left(free, prefer_after)
+        while k < len(free):
+            if free[k] not in exclude:
+                return free.pop(k)
+            k += 1
+        self._lanes.append(None)
+        return len(self._lanes) - 1
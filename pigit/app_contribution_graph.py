@@ -120,11 +120,20 @@ class ContributionGraph(Component):
             d = dt.date()
             counts[d] += 1
             author_counts[c.author][d] += 1
-        self._day_counts = dict(counts)
-        self._author_day_counts = {
-            author: dict(dates) for author, dates in author_counts.items()
-        }
-        self._max_count = max(counts.values()) if counts else 0
+        self.set_counts(
+            dict(counts),
+            {author: dict(dates) for author, dates in author_counts.items()},
+        )
+
+    def set_counts(
+        self,
+        day_counts: dict[datetime.date, int],
+        author_day_counts: dict[str, dict[datetime.date, int]],
+    ) -> None:
+        """Show pre-aggregated daily and per-author counts (e.g. a full year)."""
+        self._day_counts = day_counts
+        self._author_day_counts = author_day_counts
+        self._max_count = max(day_counts.values()) if day_counts else 0
         self._recompute_derived_data()
 
     def _recompute_derived_data(self) -> None:
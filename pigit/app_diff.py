@@ -9,13 +9,15 @@ from __future__ import annotations
 
 import bisect
 import dataclasses
-import difflib
 import enum
 import logging
 import os
 import re
 import subprocess
 import tempfile
+from collections.abc import Iterator
+from functools import partial
+from typing import TYPE_CHECKING
 
 from pigit.termui import (
     EventType,
@@ -29,9 +31,11 @@ from pigit.termui import (
     show_badge,
     show_toast,
 )
+from pigit.termui import syntax_pool
 from pigit.termui.syntax import SyntaxTokenizer
 from pigit.termui.primitives import (
     format_line_number,
+    match_tokens,
     merge_ranges,
     plain,
     tokenize_with_positions,
@@ -41,10 +45,18 @@ from pigit.termui.wcwidth_table import truncate_by_width, wcswidth
 
 from .app_theme import THEME
 
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    from .git.api import DiffStream, GitApi
+    from .git.commit_store import CommitStore
+
 _logger = logging.getLogger(__name__)
 
 _HUNK_HEADER_RE = re.compile(r"@@ -(\d+)(?:,\d+)? \+(\d+)(?:,\d+)? @@")
 _DIFF_GIT_RE = re.compile(r"^diff --git a/(.+) b/(.+)$")
+# Lines never highlighted in a diff (see DiffViewer._line_lang).
+_FILE_HEADER_PREFIXES = ("diff --git", "--- ", "+++ ")
 
 
 @dataclasses.dataclass
@@ -81,6 +93,26 @@ class _Hunk:
 _RenderToken = tuple[str, tuple[int, int, int], int, tuple[int, int, int] | None]
 _RenderLine = list[_RenderToken]
 
+# A hunk sent to the syntax pool: its lines, ``(offset, lang)`` change points
+# and whether word-diff is on.
+_PoolHunk = tuple[list[str], list[tuple[int, str]], bool]
+
+
+@dataclasses.dataclass(eq=False)
+class _PoolJob:
+    """Hunks highlighted by one syntax pool call, as ``(index, start, end)``."""
+
+    future: Future[list[list[_RenderLine]]]
+    hunks: list[tuple[int, int, int]]
+    # Set on the UI thread when the result arrives (see _on_pool_job_done).
+    rendered: list[list[_RenderLine]] | None = None
+
+
+def _render_hunks_in_worker(hunks: list[_PoolHunk]) -> list[list[_RenderLine]]:
+    """Render whole hunks in a syntax pool worker (see DiffViewer._pool_tokenize)."""
+    tokenizer = syntax_pool.worker_tokenizer()
+    return [DiffViewer._render_hunk(*hunk, tokenizer) for hunk in hunks]
+
 
 class DiffViewer(LineTextBrowser):
     """Diff viewer with TrueColor background rendering, line numbers, and heatmap column."""
@@ -100,6 +132,23 @@ class DiffViewer(LineTextBrowser):
     DENSITY_LONG = 60
     BORDER_ROWS = 2
     BORDER_COLS = 2
+    # Lines prepared past the visible window so short scrolls hit the cache.
+    TOKENIZE_LOOKAHEAD = 64
+    # Streamed diffs: lines per background read, and lines read per load
+    # (``L`` loads the next part).
+    STREAM_BATCH = 2000
+    MAX_LINES = 20000
+    # Diffs of at least POOL_MIN_LINES lines are also highlighted ahead in
+    # the syntax process pool, whole hunks of about POOL_CHUNK_LINES lines
+    # per job; smaller ones are only prepared in-thread as they are drawn.
+    POOL_MIN_LINES = 5000
+    POOL_CHUNK_LINES = 2000
+    # Word-diff segments per hunk body, shared by every viewer so re-opening
+    # a file (or opening one shown in the preview) skips the token diff.
+    _WORD_DIFF_CACHE_MAX = 256
+    _word_diff_cache: dict[
+        tuple[int, int], list[tuple[int, list[tuple[str, str | None, int]]]]
+    ] = {}
 
     @staticmethod
     def _is_file_header(line: str) -> bool:
@@ -123,23 +172,37 @@ class DiffViewer(LineTextBrowser):
         size: tuple[int, int] | None = None,
         id: str | None = None,
         word_diff: bool = False,
+        max_lines: int = MAX_LINES,
+        syntax_cache_size: int = SyntaxTokenizer.CACHE_SIZE,
+        store: CommitStore | None = None,
     ) -> None:
         super().__init__(x, y, size, [], id=id)
         # LineTextBrowser sets _max_line to full height; adjust for border rows
         if self._size[1] >= 3:
             self._max_line = self._size[1] - 2
-        self._heatmap: list[str] = []
-        self._heatmap_colors: list[tuple[int, int, int]] = []
-        self._line_numbers: list[str] = []
+        # Per-line metadata, filled lazily like ``_render_tokens``.
+        self._heatmap: list[str | None] = []
+        self._heatmap_colors: list[tuple[int, int, int] | None] = []
+        self._line_numbers: list[str | None] = []
         self.come_from: Component | None = None
         self.i_cache_key = ""
         self.i_cache: dict[str, int] = {}
-        self._tokenizer = SyntaxTokenizer()
-        self._line_langs: list[str] = []
+        self._tokenizer = SyntaxTokenizer(syntax_cache_size)
+        # Language change points: ``_langs[k]`` applies from ``_lang_starts[k]``.
+        self._lang_starts: list[int] = []
+        self._langs: list[str] = []
         self._multiline_mask: list[str | None] = []
+        # Hunks (``-1``: the whole plain file) whose mask entries are computed.
+        self._mask_ready: set[int] = set()
+        # Per hunk (``-1``: lines before the first one): next line to number,
+        # old line no, new line no.
+        self._line_no_cursor: dict[int, tuple[int, int, int]] = {}
         # _render_tokens holds (text, fg_color, display_width, word_diff_bg_or_None)
-        self._render_tokens: list[_RenderLine] = []
+        # per line; ``None`` until the line is first drawn (see _prepare_lines).
+        self._render_tokens: list[_RenderLine | None] = []
         self._hunk_starts: list[int] = []
+        # ``diff --git`` line of the file being scanned (see _scan_hunks).
+        self._file_header_start = 0
         self._hunk_mode = False
         self._hunk_index = 0
         self._hunks: list[_Hunk] = []
@@ -147,12 +210,25 @@ class DiffViewer(LineTextBrowser):
         self._diff_type = DiffType.UNSTAGED
         self._alert_dialog = AlertDialog(on_result=lambda _: None)
         self._patch_task: AsyncTask[tuple[int, str, str, str, str]] = AsyncTask()
-        self._tokenize_task: AsyncTask[list[_RenderLine]] = AsyncTask()
-        self._tokenize_gen: int = 0
+
+        # Streamed diff state (see load_stream)
+        self._max_lines = max(1, max_lines)
+        self._stream: DiffStream | None = None
+        self._stream_task: AsyncTask[tuple[DiffStream, list[str], bool]] = (
+            AsyncTask()
+        )
+        self._stream_reading = False
+
+        # Syntax pool jobs not yet merged, oldest first (see _pool_tokenize).
+        self._pool_jobs: list[_PoolJob] = []
+        self._pool_next_hunk = 0
+        self._pool_task: AsyncTask[list[list[_RenderLine]]] = AsyncTask()
 
         # Word-diff state
         self._word_diff = word_diff
         self._word_diff_segments: list[list[tuple[str, str | None, int]]] = []
+        # Hunks whose word-diff segments are computed.
+        self._word_diff_ready: set[int] = set()
 
         # File history state
         self._file_history_mode = False
@@ -160,10 +236,15 @@ class DiffViewer(LineTextBrowser):
         self._file_history_commits: list[tuple[str, str]] = []
         self._file_history_index: int = 0
         self._file_history_cache: dict[str, list[str]] = {}
+        # One GitApi per history session so p/n reuse its cat-file process.
+        self._file_history_git: GitApi | None = None
+        # Keeps ``git log --follow`` walks across sessions (see _file_history).
+        self._store = store
         self._saved_diff_state: _DiffStateSnapshot | None = None
         # Horizontal scroll state
         self._col_offset: int = 0
         self._max_col_offset: int = 0
+        self._max_text_w = 0
         self._cached_path_i = -1
         self._cached_path_hunks_id = -1
         self._cached_path: str | None = None
@@ -202,38 +283,34 @@ class DiffViewer(LineTextBrowser):
 
     def _set_plain_content(self, lines: list[str]) -> None:
         """Set plain file content (no diff parsing) for File History mode."""
-        self._content = []
-        for line in lines:
-            cleaned = plain(line).replace("\r", "")
-            if "\t" in cleaned:
-                cleaned = cleaned.expandtabs(self.TAB_WIDTH)
-            self._content.append(cleaned)
-
-        # Plain 1-based sequential line numbers
-        self._line_numbers = [
-            format_line_number(i + 1, self.LINE_NO_STR_WIDTH)
-            for i in range(len(self._content))
-        ]
+        self._content = self._clean_lines(lines)
+        self._reset_line_cache()
 
         # Detect language from file path
         lang = "generic"
         if self._file_history_path:
             lang = self._tokenizer.detect_language(self._file_history_path)
-        self._line_langs = [lang] * len(self._content)
-
-        # No heatmap for plain files
-        self._heatmap = [" "] * len(self._content)
-        self._heatmap_colors = [THEME.fg_dim] * len(self._content)
-
-        self._multiline_mask = self._tokenizer.compute_multiline_mask(
-            self._content, self._line_langs, strip_diff_prefix=False
-        )
-        self._render_tokens = self._pre_tokenize_plain()
+        self._lang_starts = [0]
+        self._langs = [lang]
         self._hunks = []
         self._hunk_starts = []
         self._i = 0
+        self._max_text_w = self._widest_text(self._content)
         self._compute_max_col_offset()
 
+    def _reset_line_cache(self) -> None:
+        """Drop per-line metadata and tokens; size the caches to ``_content``."""
+        self._cancel_pool_jobs()
+        n = len(self._content)
+        self._heatmap = [None] * n
+        self._heatmap_colors = [None] * n
+        self._line_numbers = [None] * n
+        self._multiline_mask = [None] * n
+        self._render_tokens = [None] * n
+        self._mask_ready = set()
+        self._word_diff_ready = set()
+        self._line_no_cursor = {}
+
     def _compute_max_col_offset(self, content_w: int | None = None) -> None:
         """Compute how far right the user can horizontally scroll.
 
@@ -245,53 +322,63 @@ class DiffViewer(LineTextBrowser):
             self._max_col_offset = 0
             self._col_offset = 0
             return
-        # Widest line after stripping the diff prefix (+/ -/ ).
-        max_text_w = max(
-            (wcswidth(line) - 1 if line and line[0] in "+- " else wcswidth(line))
-            for line in self._content
-        )
         if content_w is None:
             w = self._size[0] if self._size else 80
             content_w = max(0, w - self.BORDER_COLS)
         main_w = self._main_width(content_w)
-        self._max_col_offset = max(0, max_text_w - main_w)
+        self._max_col_offset = max(0, self._max_text_w - main_w)
         self._col_offset = min(self._col_offset, self._max_col_offset)
 
-    def _pre_tokenize_plain(
-        self,
-    ) -> list[_RenderLine]:
-        """Pre-tokenize plain file content (no diff prefixes)."""
-        result: list[_RenderLine] = []
-        for i, line in enumerate(self._content):
-            lang = self._line_langs[i] if i < len(self._line_langs) else "generic"
-            ml_type = self._multiline_mask[i] if i < len(self._multiline_mask) else None
-            if lang == "plain":
-                tokens = [(line, "plain")]
-            elif ml_type is not None:
-                tokens = [(line, ml_type)]
-            elif lang == "md":
-                tokens = self._tokenizer.tokenize_markdown(line)
-            else:
-                tokens = self._tokenizer.tokenize(line, lang)
-            result.append(
-                [
-                    (
-                        text,
-                        (
-                            THEME.fg_primary
-                            if ttype == "plain"
-                            else self._tokenizer.resolve_color(ttype, lang)
-                        ),
-                        wcswidth(text),
-                        None,
-                    )
-                    for text, ttype in tokens
-                ]
+    @staticmethod
+    def _widest_text(lines: list[str]) -> int:
+        """Widest of ``lines`` after stripping the diff prefix (+/ -/ )."""
+        return max(
+            (
+                (wcswidth(line) - 1 if line and line[0] in "+- " else wcswidth(line))
+                for line in lines
+            ),
+            default=0,
+        )
+
+    @staticmethod
+    def _render_plain_line(
+        line: str, lang: str, ml_type: str | None, tokenizer: SyntaxTokenizer
+    ) -> _RenderLine:
+        """Tokenize one line of plain file content (no diff prefix)."""
+        if lang == "plain":
+            tokens = [(line, "plain")]
+        elif ml_type is not None:
+            tokens = [(line, ml_type)]
+        elif lang == "md":
+            tokens = tokenizer.tokenize_markdown(line)
+        else:
+            tokens = tokenizer.tokenize(line, lang)
+        return [
+            (
+                text,
+                (
+                    THEME.fg_primary
+                    if ttype == "plain"
+                    else tokenizer.resolve_color(ttype, lang)
+                ),
+                wcswidth(text),
+                None,
             )
-        return result
+            for text, ttype in tokens
+        ]
+
+    def _clean_lines(self, lines: list[str]) -> list[str]:
+        """Strip styles and ``\r``, expand tabs (see :meth:`set_content`)."""
+        cleaned_lines: list[str] = []
+        for line in lines:
+            cleaned = plain(line).replace("\r", "")
+            if "\t" in cleaned:
+                cleaned = cleaned.expandtabs(self.TAB_WIDTH)
+            cleaned_lines.append(cleaned)
+        return cleaned_lines
 
     def set_content(self, diff_lines: list[str]) -> None:
-        """Set diff content and pre-compute heatmap and line numbers.
+        """Set diff content; per-line work is deferred until lines are drawn.
 
         Tab characters are expanded to spaces (tabstop=8) because terminals
         render tabs as variable-width whitespace, while our width calculations
@@ -302,113 +389,254 @@ class DiffViewer(LineTextBrowser):
         ``\\r`` to reset the cursor to the start of the line, corrupting
         the rendered output.
 
-        Syntax highlighting is computed asynchronously to avoid freezing the
-        TUI on large diffs.  Lines render with plain text until tokenization
-        finishes.
+        Only whole-diff structure is computed here: hunk boundaries, file
+        languages and the horizontal scroll bound. Heatmap, line numbers,
+        the multi-line mask and syntax tokens are computed by
+        :meth:`_prepare_lines` for the visible window (plus a lookahead) and
+        cached per line, so opening a huge diff costs about one screen.
 
         When word-diff mode is active, intra-line changes are computed locally
         from the normal unified diff (old ``-`` line vs new ``+`` line) and
         stored as per-line segments used during tokenization. This leaves
         ``_content`` as a valid patch, so hunk stage/discard keep working.
+        Like the mask, they are computed per hunk when it is first drawn.
+
+        Stops a diff being streamed by :meth:`load_stream`.
         """
+        self._stop_stream()
+        self._file_history_mode = False
+        self._file_history_cache.clear()
         self._content = []
-        self._heatmap = []
-        self._heatmap_colors = []
-        self._line_numbers = []
-        self._line_langs = []
-        self._multiline_mask = []
-        self._render_tokens = []
+        self._reset_line_cache()
+        self._lang_starts = []
+        self._langs = []
         self._hunks = []
         self._hunk_starts = []
-        self._file_history_mode = False
-        self._file_history_cache.clear()
-        for line in diff_lines:
-            cleaned = plain(line).replace("\r", "")
-            if "\t" in cleaned:
-                cleaned = cleaned.expandtabs(self.TAB_WIDTH)
-            self._content.append(cleaned)
-
-        self._compute_heatmap()
-        self._compute_line_numbers()
-        self._line_langs = self._detect_line_languages()
-        self._multiline_mask = self._tokenizer.compute_multiline_mask(
-            self._content, self._line_langs
-        )
-        self._hunks = self._parse_hunks()
-        self._hunk_starts = [h.start for h in self._hunks]
+        self._file_header_start = 0
+        self._word_diff_segments = []
+        self._max_text_w = 0
         self._i = 0
+        self.append_content(diff_lines)
+
+    def append_content(self, diff_lines: list[str]) -> None:
+        """Append lines to the diff, extending its structure incrementally.
+
+        Lines already on screen keep their cached metadata and tokens, except
+        in the last hunk when the new lines continue it: its multi-line mask
+        is recomputed and, in word-diff mode, its lines are re-paired.
+        """
+        start = len(self._content)
+        new_lines = self._clean_lines(diff_lines)
+        self._content.extend(new_lines)
+        pad = [None] * len(new_lines)
+        self._heatmap.extend(pad)
+        self._heatmap_colors.extend(pad)
+        self._line_numbers.extend(pad)
+        self._multiline_mask.extend(pad)
+        self._render_tokens.extend(pad)
+
+        self._scan_languages(start)
+        first_new = self._scan_hunks(start)
+        self._max_text_w = max(self._max_text_w, self._widest_text(new_lines))
         self._compute_max_col_offset()
+        self._cached_path_i = -1
 
-        # Compute word-diff segments on the normal unified diff.
+        reopened = first_new > 0 and self._hunks[first_new - 1].end > start
+        if reopened:
+            self._mask_ready.discard(first_new - 1)
+            # The pool highlights the hunk again with its new lines.
+            self._pool_next_hunk = min(self._pool_next_hunk, first_new - 1)
         if self._word_diff:
-            self._compute_word_diff_segments()
-
-        # Async: syntax highlighting (slow for large files).
-        self._tokenize_task.cancel()
-        self._tokenize_gen += 1
-        current_gen = self._tokenize_gen
-        content = list(self._content)
-        line_langs = list(self._line_langs)
-        multiline_mask = list(self._multiline_mask)
-        word_diff_segments = list(self._word_diff_segments)
-        tokenizer = self._tokenizer
-
-        def _work() -> list[_RenderLine]:
-            return DiffViewer._pre_tokenize_with(
-                content, line_langs, multiline_mask, tokenizer, word_diff_segments
-            )
-
-        def _callback(
-            tokens: list[_RenderLine],
-        ) -> None:
-            if not self.is_activated() or current_gen != self._tokenize_gen:
-                return
-            self._render_tokens = tokens
-            request_render()
+            self._word_diff_segments.extend([] for _ in new_lines)
+            if reopened:
+                self._word_diff_ready.discard(first_new - 1)
+                hunk = self._hunks[first_new - 1]
+                # New lines may pair with earlier ones: retokenize the hunk.
+                self._render_tokens[hunk.start : start] = [None] * (
+                    start - hunk.start
+                )
+        self._pool_tokenize()
+
+    def _pool_tokenize(self) -> None:
+        """Highlight the hunks of a large diff ahead in the syntax pool.
+
+        Regex tokenizing is CPU-bound Python, so doing the whole diff on a
+        thread would hold the GIL against key handling. Hunks not sent yet go
+        to worker processes in chunks; each result comes back through the
+        future's done callback (no thread waits on it) and
+        :meth:`_on_pool_job_done` merges them in job order into
+        ``_render_tokens``, skipping lines drawn in the meantime. Without a
+        process pool, lines stay prepared as drawn.
+        """
+        if self._file_history_mode or len(self._content) < self.POOL_MIN_LINES:
+            return
+        hunks = self._hunks
+        while self._pool_next_hunk < len(hunks):
+            batch: list[tuple[int, int, int]] = []
+            size = 0
+            h = self._pool_next_hunk
+            while h < len(hunks) and size < self.POOL_CHUNK_LINES:
+                hunk = hunks[h]
+                batch.append((h, hunk.start, hunk.end))
+                size += hunk.end - hunk.start
+                h += 1
+            payload: list[_PoolHunk] = [
+                (self._content[start:end], self._lang_runs(start, end), self._word_diff)
+                for _, start, end in batch
+            ]
+            future = syntax_pool.submit(_render_hunks_in_worker, payload)
+            if future is None:
+                break
+            job = _PoolJob(future, batch)
+            self._pool_jobs.append(job)
+            self._pool_next_hunk = h
+            self._pool_task.watch(future, partial(self._on_pool_job_done, job))
 
-        self._tokenize_task.start(_work, _callback)
+    def _on_pool_job_done(
+        self, job: _PoolJob, rendered: list[list[_RenderLine]]
+    ) -> None:
+        """Merge every finished job at the head of ``_pool_jobs``, in order."""
+        if job not in self._pool_jobs:
+            return  # Cancelled with its diff.
+        job.rendered = rendered
+        jobs = self._pool_jobs
+        while jobs:
+            head = jobs[0]
+            if head.rendered is None:
+                future = head.future
+                if not future.done() or (
+                    not future.cancelled() and future.exception() is None
+                ):
+                    break  # Its result is still on the way.
+                jobs.pop(0)  # Failed: its lines are prepared as drawn.
+                continue
+            jobs.pop(0)
+            self._apply_pool_job(head)
+
+    def _apply_pool_job(self, job: _PoolJob) -> None:
+        rendered = job.rendered or []
+        hunks = self._hunks
+        tokens = self._render_tokens
+        for (h, start, end), lines in zip(job.hunks, rendered):
+            if h >= len(hunks) or hunks[h].start != start or hunks[h].end != end:
+                continue  # The hunk grew since; it was sent again.
+            for idx, line_tokens in enumerate(lines, start):
+                if tokens[idx] is None:
+                    tokens[idx] = line_tokens
+
+    def _cancel_pool_jobs(self) -> None:
+        self._pool_task.cancel()
+        for job in self._pool_jobs:
+            job.future.cancel()
+        self._pool_jobs = []
+        self._pool_next_hunk = 0
+
+    def _lang_runs(self, start: int, end: int) -> list[tuple[int, str]]:
+        """``(offset, lang)`` change points of lines ``[start, end)``.
+
+        Lines before the first ``diff --git`` (all of them in a combined
+        ``diff --cc``) are ``"plain"``, as in :meth:`_line_lang`.
+        """
+        first = bisect.bisect_right(self._lang_starts, start) - 1
+        runs: list[tuple[int, str]] = []
+        if first < 0:
+            runs.append((0, "plain"))
+            first = 0
+        last = bisect.bisect_left(self._lang_starts, end)
+        runs += [
+            (max(self._lang_starts[k] - start, 0), self._langs[k])
+            for k in range(first, last)
+        ]
+        return runs
+
+    @classmethod
+    def _render_hunk(
+        cls,
+        lines: list[str],
+        lang_runs: list[tuple[int, str]],
+        word_diff: bool,
+        tokenizer: SyntaxTokenizer,
+    ) -> list[_RenderLine]:
+        """Render one whole hunk the way :meth:`_prepare_diff_lines` does."""
+        langs: list[str] = []
+        for k, (offset, lang) in enumerate(lang_runs):
+            stop = lang_runs[k + 1][0] if k + 1 < len(lang_runs) else len(lines)
+            langs.extend([lang] * (stop - offset))
+        langs = [
+            "plain" if line.startswith(_FILE_HEADER_PREFIXES) else lang
+            for line, lang in zip(lines, langs)
+        ]
+        mask = tokenizer.compute_multiline_mask(lines, langs)
+        segments: list[list[tuple[str, str | None, int]] | None] = [None] * len(lines)
+        if word_diff:
+            for offset, line_segments in cls._hunk_word_diff(tuple(lines[1:])):
+                segments[offset + 1] = line_segments or None
+        return [
+            cls._render_diff_line(line, langs[i], mask[i], tokenizer, segments[i])
+            for i, line in enumerate(lines)
+        ]
 
-    def _compute_word_diff_segments(self) -> None:
-        """Compute per-line word-diff segments from a normal unified diff.
+    def _word_diff_hunk(self, hunk_idx: int) -> None:
+        """Fill ``_word_diff_segments`` for one hunk.
 
-        For each pair of adjacent ``-`` / ``+`` lines inside a hunk, we use
-        ``difflib.SequenceMatcher`` to find the changed character/word ranges.
-        Deletions are highlighted on the ``-`` line, additions on the ``+`` line.
-        This keeps ``_content`` as a valid patch and does not require git's
-        ``--word-diff`` flag.
+        Results are looked up in :attr:`_word_diff_cache` by the hash of the
+        hunk body first, so a hunk seen before costs one hash.
+        """
+        if hunk_idx in self._word_diff_ready:
+            return
+        self._word_diff_ready.add(hunk_idx)
+        hunk = self._hunks[hunk_idx]
+        # The first line of a hunk is the @@ header; content starts after it.
+        body = tuple(self._content[hunk.start + 1 : hunk.end])
+        key = (len(body), hash(body))
+        cache = self._word_diff_cache
+        entries = cache.pop(key, None)
+        if entries is None:
+            entries = self._hunk_word_diff(body)
+            while len(cache) >= self._WORD_DIFF_CACHE_MAX:
+                del cache[next(iter(cache))]
+        cache[key] = entries
+
+        segments = self._word_diff_segments
+        segments[hunk.start : hunk.end] = [[] for _ in range(hunk.end - hunk.start)]
+        base = hunk.start + 1
+        for offset, line_segments in entries:
+            segments[base + offset] = line_segments
+
+    @classmethod
+    def _hunk_word_diff(
+        cls, body: tuple[str, ...]
+    ) -> list[tuple[int, list[tuple[str, str | None, int]]]]:
+        """Pair ``-``/``+`` lines of a hunk body and compute their word segments.
+
+        The n-th ``-`` line pairs with the n-th ``+`` line; deletions are
+        highlighted on the ``-`` line, additions on the ``+`` line. This keeps
+        ``_content`` as a valid patch and does not require git's
+        ``--word-diff`` flag. Returns ``(offset in body, segments)`` pairs.
         """
-        self._word_diff_segments = [[] for _ in self._content]
-        for hunk in self._hunks:
-            self._process_hunk_word_diff(hunk, self._word_diff_segments)
-
-    def _process_hunk_word_diff(
-        self,
-        hunk: _Hunk,
-        segments: list[list[tuple[str, str | None, int]]],
-    ) -> None:
-        """Pair ``-``/``+`` lines inside a hunk and compute their word segments."""
         minus_idxs: list[int] = []
         plus_idxs: list[int] = []
-        # The first line of a hunk is the @@ header; content starts after it.
-        for idx in range(hunk.start + 1, hunk.end):
-            line = self._content[idx]
+        for idx, line in enumerate(body):
             if line.startswith("-") and not line.startswith("--- "):
                 minus_idxs.append(idx)
             elif line.startswith("+") and not line.startswith("+++ "):
                 plus_idxs.append(idx)
 
-        paired = min(len(minus_idxs), len(plus_idxs))
-        for i in range(paired):
-            old_idx = minus_idxs[i]
-            new_idx = plus_idxs[i]
-            old_code = self._content[old_idx][1:]
-            new_code = self._content[new_idx][1:]
-            del_ranges, add_ranges = self._word_diff_ranges(old_code, new_code)
-            segments[old_idx] = self._ranges_to_segments(old_code, del_ranges, "del")
-            segments[new_idx] = self._ranges_to_segments(new_code, add_ranges, "add")
+        entries: list[tuple[int, list[tuple[str, str | None, int]]]] = []
+        for old_idx, new_idx in zip(minus_idxs, plus_idxs):
+            old_code = body[old_idx][1:]
+            new_code = body[new_idx][1:]
+            del_ranges, add_ranges = cls._word_diff_ranges(old_code, new_code)
+            entries.append(
+                (old_idx, cls._ranges_to_segments(old_code, del_ranges, "del"))
+            )
+            entries.append(
+                (new_idx, cls._ranges_to_segments(new_code, add_ranges, "add"))
+            )
 
         # Unpaired lines (pure additions or deletions) already get their
         # background from _draw_diff_line; no word-diff highlight needed.
+        return entries
 
     @staticmethod
     def _word_diff_ranges(
@@ -417,30 +645,27 @@ class DiffViewer(LineTextBrowser):
         """Return changed (start, end) ranges in ``old`` and ``new``.
 
         Uses word-level comparison: both strings are split into word tokens
-        (whitespace-separated), then ``SequenceMatcher`` finds matching token
+        (whitespace-separated), then :func:`match_tokens` finds matching token
         blocks.  Token-level changes are mapped back to character ranges.
         """
         old_tokens, old_positions = tokenize_with_positions(old)
         new_tokens, new_positions = tokenize_with_positions(new)
 
-        matcher = difflib.SequenceMatcher(None, old_tokens, new_tokens, autojunk=False)
-        matches = matcher.get_matching_blocks()
-
         del_ranges: list[tuple[int, int]] = []
         add_ranges: list[tuple[int, int]] = []
         old_tok = 0
         new_tok = 0
-        for m in matches:
-            if old_tok < m.a:
+        for a, b, size in match_tokens(old_tokens, new_tokens):
+            if old_tok < a:
                 start = old_positions[old_tok][0]
-                end = old_positions[m.a - 1][1]
+                end = old_positions[a - 1][1]
                 del_ranges.append((start, end))
-            if new_tok < m.b:
+            if new_tok < b:
                 start = new_positions[new_tok][0]
-                end = new_positions[m.b - 1][1]
+                end = new_positions[b - 1][1]
                 add_ranges.append((start, end))
-            old_tok = m.a + m.size
-            new_tok = m.b + m.size
+            old_tok = a + size
+            new_tok = b + size
 
         # Merge adjacent ranges to minimise segment count.
         del_ranges = merge_ranges(del_ranges)
@@ -471,45 +696,31 @@ class DiffViewer(LineTextBrowser):
         """Set the optional label drawn on the viewer's own box border."""
         self._box_title = title
 
-    def _parse_hunks(self) -> list[_Hunk]:
-        """Parse hunk boundaries from diff content in a single pass."""
-        hunks: list[_Hunk] = []
-        current_start: int | None = None
-        file_header_start = 0
-        old_start = new_start = old_count = new_count = 0
+    def _scan_hunks(self, start: int) -> int:
+        """Extend ``_hunks`` over the lines from ``start`` on.
 
-        for i, line in enumerate(self._content):
+        A hunk still open at the previous end of content (``end == start``)
+        grows to take in the new lines. Returns the index of the first hunk
+        added by this call.
+        """
+        hunks = self._hunks
+        first_new = len(hunks)
+        current = hunks[-1] if hunks and hunks[-1].end == start else None
+        file_header_start = self._file_header_start
+        content = self._content
+
+        for i in range(start, len(content)):
+            line = content[i]
             if line.startswith("diff --git"):
-                if current_start is not None:
-                    hunks.append(
-                        _Hunk(
-                            start=current_start,
-                            end=i,
-                            old_start=old_start,
-                            old_count=old_count,
-                            new_start=new_start,
-                            new_count=new_count,
-                            file_header_start=file_header_start,
-                        )
-                    )
-                    current_start = None
+                if current is not None:
+                    current.end = i
+                    current = None
                 file_header_start = i
                 continue
 
             if line.startswith("@@"):
-                if current_start is not None:
-                    hunks.append(
-                        _Hunk(
-                            start=current_start,
-                            end=i,
-                            old_start=old_start,
-                            old_count=old_count,
-                            new_start=new_start,
-                            new_count=new_count,
-                            file_header_start=file_header_start,
-                        )
-                    )
-                current_start = i
+                if current is not None:
+                    current.end = i
                 m = _HUNK_HEADER_RE.match(line)
                 if m:
                     old_start = int(m.group(1))
@@ -517,22 +728,25 @@ class DiffViewer(LineTextBrowser):
                     old_count = self._parse_count(line, is_old=True)
                     new_count = self._parse_count(line, is_old=False)
                 else:
+                    _logger.warning("Unexpected @@ line format: %r", line)
                     old_start = new_start = 0
                     old_count = new_count = 1
-
-        if current_start is not None:
-            hunks.append(
-                _Hunk(
-                    start=current_start,
-                    end=len(self._content),
+                current = _Hunk(
+                    start=i,
+                    end=i + 1,
                     old_start=old_start,
                     old_count=old_count,
                     new_start=new_start,
                     new_count=new_count,
                     file_header_start=file_header_start,
                 )
-            )
-        return hunks
+                hunks.append(current)
+                self._hunk_starts.append(i)
+
+        if current is not None:
+            current.end = len(content)
+        self._file_header_start = file_header_start
+        return first_new
 
     @staticmethod
     def _parse_count(header_line: str, *, is_old: bool) -> int:
@@ -547,148 +761,212 @@ class DiffViewer(LineTextBrowser):
         count_str = m.group(2)
         return int(count_str) if count_str is not None else 1
 
-    def _detect_line_languages(self) -> list[str]:
-        """Scan file headers to determine per-line language.
+    def _scan_languages(self, start: int) -> None:
+        """Extend the language change points over the lines from ``start`` on.
 
-        Lines before the first ``diff --git`` (commit meta-info) and diff
-        file headers (``---`` / ``+++``) are marked as ``"plain"`` to skip
-        syntax highlighting. Only actual code lines use language-specific
-        tokenization.
+        The language switches at every ``diff --git`` line (from its ``b/``
+        path) and again at its ``+++`` line. See :meth:`_line_lang` for the
+        lines that are never highlighted.
         """
-        result: list[str] = []
-        current_lang = "generic"
-        saw_diff = False
-        for line in self._content:
+        starts = self._lang_starts
+        langs = self._langs
+        content = self._content
+        for i in range(start, len(content)):
+            line = content[i]
             if line.startswith("diff --git"):
-                saw_diff = True
                 parts = line.split()
                 if len(parts) >= 4 and parts[3].startswith("b/"):
-                    current_lang = self._tokenizer.detect_language(parts[3][2:])
-                result.append("plain")
-            elif not saw_diff:
-                result.append("plain")
-            elif line.startswith("--- ") or line.startswith("+++ "):
-                if line.startswith("+++ "):
-                    filename = line[4:]
-                    if filename.startswith("b/"):
-                        filename = filename[2:]
-                    current_lang = self._tokenizer.detect_language(filename)
-                result.append("plain")
+                    lang = self._tokenizer.detect_language(parts[3][2:])
+                else:
+                    lang = langs[-1] if langs else "generic"
+            elif starts and line.startswith("+++ "):
+                filename = line[4:]
+                if filename.startswith("b/"):
+                    filename = filename[2:]
+                lang = self._tokenizer.detect_language(filename)
             else:
-                result.append(current_lang)
-        return result
-
-    @staticmethod
-    def _pre_tokenize_with(
-        content: list[str],
-        line_langs: list[str],
-        multiline_mask: list[str | None],
-        tokenizer: SyntaxTokenizer,
-        word_diff_segments: list[list[tuple[str, str | None, int]]] | None = None,
-    ) -> list[_RenderLine]:
-        """Pre-tokenize all lines with a state snapshot (thread-safe)."""
-        result: list[_RenderLine] = []
-        for i, line in enumerate(content):
-            lang = line_langs[i] if i < len(line_langs) else "generic"
-            if line.startswith("@@"):
-                tokens = tokenizer.tokenize_diff_hunk(line)
-                result.append(
-                    [
-                        (
-                            text,
-                            (
-                                THEME.fg_primary
-                                if ttype == "plain"
-                                else tokenizer.resolve_color(ttype, lang)
-                            ),
-                            wcswidth(text),
-                            None,
-                        )
-                        for text, ttype in tokens
-                    ]
-                )
                 continue
-            if line.startswith("\\"):
-                result.append([])
+            starts.append(i)
+            langs.append(lang)
+
+    def _line_lang(self, idx: int) -> str:
+        """Return the highlight language of line ``idx``.
+
+        Lines before the first ``diff --git`` (commit meta-info) and diff
+        file headers (``diff --git`` / ``---`` / ``+++``) are ``"plain"`` to
+        skip syntax highlighting.
+        """
+        pos = bisect.bisect_right(self._lang_starts, idx) - 1
+        if pos < 0:
+            return "plain"
+        if not self._file_history_mode and self._content[idx].startswith(
+            _FILE_HEADER_PREFIXES
+        ):
+            return "plain"
+        return self._langs[pos]
+
+    def _prepare_lines(self, start: int, end: int) -> None:
+        """Compute metadata and render tokens for lines ``[start, end)``.
+
+        ``TOKENIZE_LOOKAHEAD`` lines past ``end`` are prepared too. Results
+        stay cached per line until the content changes.
+        """
+        end = min(end + self.TOKENIZE_LOOKAHEAD, len(self._content))
+        # Tokens may come first from the syntax pool, other metadata never.
+        todo = [
+            idx
+            for idx in range(max(start, 0), end)
+            if self._heatmap[idx] is None or self._render_tokens[idx] is None
+        ]
+        if not todo:
+            return
+        if self._file_history_mode:
+            self._prepare_plain_lines(todo)
+        else:
+            self._prepare_diff_lines(todo)
+
+    def _prepare_diff_lines(self, todo: list[int]) -> None:
+        # Numbering and the multi-line mask are sequential from each ``@@``.
+        stop = todo[-1] + 1
+        first = bisect.bisect_right(self._hunk_starts, todo[0]) - 1
+        untokenized = any(self._render_tokens[idx] is None for idx in todo)
+        for h in range(first, bisect.bisect_left(self._hunk_starts, stop)):
+            self._number_hunk_lines(h, stop)
+            if untokenized and h >= 0 and self._hunks[h].end > todo[0]:
+                self._mask_hunk(h)
+                if self._word_diff:
+                    self._word_diff_hunk(h)
+        segments = self._word_diff_segments
+        for idx in todo:
+            line = self._content[idx]
+            self._heatmap[idx], self._heatmap_colors[idx] = self._heatmap_entry(line)
+            if self._render_tokens[idx] is not None:
                 continue
+            self._render_tokens[idx] = self._render_diff_line(
+                line,
+                self._line_lang(idx),
+                self._multiline_mask[idx],
+                self._tokenizer,
+                segments[idx] if idx < len(segments) and segments[idx] else None,
+            )
 
-            if line.startswith("--- ") or line.startswith("+++ "):
-                code = line
-            elif line and line[0] in "+- ":
-                code = line[1:]
-            else:
-                code = line
-            ml_type = multiline_mask[i] if i < len(multiline_mask) else None
-
-            segments = (
-                word_diff_segments[i]
-                if word_diff_segments
-                and i < len(word_diff_segments)
-                and word_diff_segments[i]
-                else None
+    def _prepare_plain_lines(self, todo: list[int]) -> None:
+        lang = self._langs[0] if self._langs else "generic"
+        if -1 not in self._mask_ready:
+            self._mask_ready.add(-1)
+            self._multiline_mask = self._tokenizer.compute_multiline_mask(
+                self._content, [lang] * len(self._content), strip_diff_prefix=False
+            )
+        for idx in todo:
+            # No heatmap for plain files
+            self._heatmap[idx] = " "
+            self._heatmap_colors[idx] = THEME.fg_dim
+            self._line_numbers[idx] = format_line_number(
+                idx + 1, self.LINE_NO_STR_WIDTH
+            )
+            self._render_tokens[idx] = self._render_plain_line(
+                self._content[idx], lang, self._multiline_mask[idx], self._tokenizer
             )
-            if segments is not None:
-                line_result: _RenderLine = []
-                for seg_text, seg_kind, _ in segments:
-                    if lang == "plain":
-                        seg_tokens = [(seg_text, "plain")]
-                    elif ml_type is not None:
-                        seg_tokens = [(seg_text, ml_type)]
-                    elif lang == "md":
-                        seg_tokens = tokenizer.tokenize_markdown(seg_text)
-                    else:
-                        seg_tokens = tokenizer.tokenize(seg_text, lang)
-                    seg_bg = None
-                    if seg_kind == "add":
-                        seg_bg = THEME.bg_word_diff_add
-                    elif seg_kind == "del":
-                        seg_bg = THEME.bg_word_diff_del
-                    for text, ttype in seg_tokens:
-                        fg = (
-                            THEME.fg_primary
-                            if ttype == "plain"
-                            else tokenizer.resolve_color(ttype, lang)
-                        )
-                        line_result.append((text, fg, wcswidth(text), seg_bg))
-                result.append(line_result)
-                continue
 
-            if lang == "plain":
-                tokens = [(code, "plain")]
-            elif ml_type is not None:
-                tokens = [(code, ml_type)]
-            elif lang == "md":
-                tokens = tokenizer.tokenize_markdown(code)
-            else:
-                tokens = tokenizer.tokenize(code, lang)
-            result.append(
-                [
+    def _mask_hunk(self, hunk_idx: int) -> None:
+        """Fill ``_multiline_mask`` for one hunk (the mask resets at ``@@``)."""
+        if hunk_idx in self._mask_ready:
+            return
+        self._mask_ready.add(hunk_idx)
+        hunk = self._hunks[hunk_idx]
+        first = max(bisect.bisect_right(self._lang_starts, hunk.start) - 1, 0)
+        last = bisect.bisect_left(self._lang_starts, hunk.end)
+        if not any(
+            self._tokenizer.has_multiline_context(lang)
+            for lang in self._langs[first:last]
+        ):
+            return  # e.g. JSON / YAML: nothing spans lines.
+        self._multiline_mask[hunk.start : hunk.end] = (
+            self._tokenizer.compute_multiline_mask(
+                self._content[hunk.start : hunk.end],
+                [self._line_lang(i) for i in range(hunk.start, hunk.end)],
+            )
+        )
+
+    @staticmethod
+    def _render_diff_line(
+        line: str,
+        lang: str,
+        ml_type: str | None,
+        tokenizer: SyntaxTokenizer,
+        segments: list[tuple[str, str | None, int]] | None = None,
+    ) -> _RenderLine:
+        """Tokenize one diff line (thread-safe)."""
+        if line.startswith("@@"):
+            return [
+                (
+                    text,
                     (
-                        text,
-                        (
-                            THEME.fg_primary
-                            if ttype == "plain"
-                            else tokenizer.resolve_color(ttype, lang)
-                        ),
-                        wcswidth(text),
-                        None,
+                        THEME.fg_primary
+                        if ttype == "plain"
+                        else tokenizer.resolve_color(ttype, lang)
+                    ),
+                    wcswidth(text),
+                    None,
+                )
+                for text, ttype in tokenizer.tokenize_diff_hunk(line)
+            ]
+        if line.startswith("\\"):
+            return []
+
+        if line.startswith("--- ") or line.startswith("+++ "):
+            code = line
+        elif line and line[0] in "+- ":
+            code = line[1:]
+        else:
+            code = line
+
+        if segments is not None:
+            line_result: _RenderLine = []
+            for seg_text, seg_kind, _ in segments:
+                if lang == "plain":
+                    seg_tokens = [(seg_text, "plain")]
+                elif ml_type is not None:
+                    seg_tokens = [(seg_text, ml_type)]
+                elif lang == "md":
+                    seg_tokens = tokenizer.tokenize_markdown(seg_text)
+                else:
+                    seg_tokens = tokenizer.tokenize(seg_text, lang)
+                seg_bg = None
+                if seg_kind == "add":
+                    seg_bg = THEME.bg_word_diff_add
+                elif seg_kind == "del":
+                    seg_bg = THEME.bg_word_diff_del
+                for text, ttype in seg_tokens:
+                    fg = (
+                        THEME.fg_primary
+                        if ttype == "plain"
+                        else tokenizer.resolve_color(ttype, lang)
                     )
-                    for text, ttype in tokens
-                ]
+                    line_result.append((text, fg, wcswidth(text), seg_bg))
+            return line_result
+
+        if lang == "plain":
+            tokens = [(code, "plain")]
+        elif ml_type is not None:
+            tokens = [(code, ml_type)]
+        elif lang == "md":
+            tokens = tokenizer.tokenize_markdown(code)
+        else:
+            tokens = tokenizer.tokenize(code, lang)
+        return [
+            (
+                text,
+                (
+                    THEME.fg_primary
+                    if ttype == "plain"
+                    else tokenizer.resolve_color(ttype, lang)
+                ),
+                wcswidth(text),
+                None,
             )
-        return result
-
-    def _pre_tokenize(
-        self,
-    ) -> list[_RenderLine]:
-        """Pre-tokenize all lines using current component state."""
-        return self._pre_tokenize_with(
-            self._content,
-            self._line_langs,
-            self._multiline_mask,
-            self._tokenizer,
-            self._word_diff_segments,
-        )
+            for text, ttype in tokens
+        ]
 
     def get_help_title(self) -> str:
         return "Diff"
@@ -712,14 +990,87 @@ class DiffViewer(LineTextBrowser):
             # Reset hunk mode on new diff
             self._hunk_mode = False
             self._hunk_index = 0
+            stream = data.get("stream")
             content = data.get("content", "")
-            match content:
-                case list():
-                    self.set_content(content)
-                case str():
-                    self.set_content(content.splitlines())
+            if stream is not None:
+                self.load_stream(stream)
+            else:
+                match content:
+                    case list():
+                        self.set_content(content)
+                    case str():
+                        self.set_content(content.splitlines())
             self._i = self.i_cache.get(self.i_cache_key, 0)
 
+    def load_stream(self, stream: DiffStream) -> None:
+        """Show a diff read from ``stream`` in the background.
+
+        The first batch is drawn as soon as it arrives and later batches are
+        appended (see :meth:`append_content`). Reading pauses after
+        ``max_lines`` lines; ``L`` reads the next ``max_lines``.
+        """
+        self.set_content([])
+        self._stream = stream
+        self._read_stream(self._max_lines)
+
+    def _read_stream(self, count: int) -> None:
+        stream = self._stream
+        if stream is None or self._stream_reading:
+            return
+        self._stream_reading = True
+        self._stream_task.start_stream(
+            partial(self._stream_batches, stream, count), self._apply_stream_batch
+        )
+
+    def _stream_batches(
+        self, stream: DiffStream, count: int
+    ) -> Iterator[tuple[DiffStream, list[str], bool]]:
+        """Yield ``(stream, lines, done)`` for up to ``count`` lines (worker thread)."""
+        while True:
+            lines = stream.read_lines(min(self.STREAM_BATCH, count))
+            count -= len(lines)
+            done = count <= 0 or stream.exhausted
+            yield stream, lines, done
+            if done:
+                return
+
+    def _apply_stream_batch(self, batch: tuple[DiffStream, list[str], bool]) -> None:
+        stream, lines, done = batch
+        if stream is not self._stream:
+            return
+        if lines:
+            self.append_content(lines)
+        if done:
+            self._stream_reading = False
+            if stream.exhausted:
+                self._stream = None
+                # A remembered position may lie past a diff that shrank.
+                self._i = min(self._i, max(len(self._content) - 1, 0))
+        request_render()
+
+    def _stop_stream(self) -> None:
+        """Stop reading a streamed diff; lines already shown stay."""
+        self._stream_task.cancel()
+        self._stream_reading = False
+        stream, self._stream = self._stream, None
+        if stream is not None:
+            stream.close()
+
+    @property
+    def _stream_paused(self) -> bool:
+        """True while a streamed diff waits at its line limit for ``L``."""
+        return self._stream is not None and not self._stream_reading
+
+    @bind_action(
+        "load_more",
+        "L",
+        desc="Load the next part of a long diff",
+        tip="Load more",
+        tip_when=lambda self: self._stream_paused,
+    )
+    def _load_more(self) -> None:
+        self._read_stream(self._max_lines)
+
     @bind_action("down", "j", desc="Navigate diff lines down", tip="Navigate")
     def _on_j(self) -> None:
         if self._hunk_mode:
@@ -887,6 +1238,7 @@ class DiffViewer(LineTextBrowser):
 
     def _enter_file_history(self, path: str) -> None:
         """Save diff state and switch to File History view."""
+        self._stop_stream()
         # Save BEFORE set_content overwrites everything
         self._saved_diff_state = _DiffStateSnapshot(
             content=list(self._content),
@@ -900,7 +1252,8 @@ class DiffViewer(LineTextBrowser):
         from .git.api import GitApi
 
         git = GitApi(path=self._repo_path)
-        self._file_history_commits = git.get_file_history(path, self._repo_path)
+        self._file_history_git = git
+        self._file_history_commits = self._file_history(git, path)
 
         current_sha = self.i_cache_key
         self._file_history_index = 0
@@ -912,6 +1265,28 @@ class DiffViewer(LineTextBrowser):
         self._file_history_mode = True
         self._load_file_history_at_current_index()
 
+    def _file_history(self, git: GitApi, path: str) -> list[tuple[str, str]]:
+        """Return the commits that touched *path*, from the store when known.
+
+        The ``--follow`` walk only depends on the tip it starts from, so it is
+        stored per HEAD sha; a hit costs one ``rev-parse`` instead of a walk
+        over the whole history.
+        """
+        if self._store is None:
+            return git.get_file_history(path, self._repo_path)
+        from .git.api import GitError
+
+        try:
+            tip = git.resolve_head_sha(self._repo_path)
+        except GitError:
+            return git.get_file_history(path, self._repo_path)
+        history = self._store.load_file_history(self._repo_path, tip, path)
+        if history is None:
+            history = git.get_file_history(path, self._repo_path)
+            if history:  # Empty is also what a failed walk returns.
+                self._store.save_file_history(self._repo_path, tip, path, history)
+        return history
+
     def _load_file_history_at_current_index(self) -> None:
         if not self._file_history_commits:
             self._set_plain_content(["No history for this file"])
@@ -921,9 +1296,11 @@ class DiffViewer(LineTextBrowser):
         if sha in self._file_history_cache:
             content = self._file_history_cache[sha]
         else:
-            from .git.api import GitApi
+            git = self._file_history_git
+            if git is None:
+                from .git.api import GitApi
 
-            git = GitApi(path=self._repo_path)
+                git = self._file_history_git = GitApi(path=self._repo_path)
             raw = git.get_file_at_commit(sha, self._file_history_path, self._repo_path)
             if raw is None:
                 content = ["File deleted in this commit"]
@@ -948,6 +1325,7 @@ class DiffViewer(LineTextBrowser):
             return
         self._file_history_mode = False
         self._file_history_cache.clear()
+        self._close_file_history_git()
         snap = self._saved_diff_state
         if snap is not None:
             self.set_content(snap.content)
@@ -956,6 +1334,12 @@ class DiffViewer(LineTextBrowser):
             self.come_from = snap.come_from
         self._saved_diff_state = None
 
+    def _close_file_history_git(self) -> None:
+        """Stop the history session's ``cat-file`` process (recreated on demand)."""
+        if self._file_history_git is not None:
+            self._file_history_git.close()
+            self._file_history_git = None
+
     # ── Horizontal scroll ──
 
     def _next_hunk_nav(self) -> None:
@@ -979,6 +1363,14 @@ class DiffViewer(LineTextBrowser):
                 kind=FeedbackKind.WARNING,
             )
             return
+        if self._stream is not None and self._hunk_index >= len(self._hunks) - 1:
+            # The last hunk may stop mid-way until the stream is read out.
+            show_toast(
+                "Hunk not fully loaded (L: load more)",
+                duration=1.5,
+                kind=FeedbackKind.WARNING,
+            )
+            return
         patch = self._extract_hunk_patch(self._hunk_index)
         if needs_confirm:
 
@@ -1018,9 +1410,11 @@ class DiffViewer(LineTextBrowser):
         return ["git", "apply", "-R", patch_path], "Hunk discarded"
 
     def deactivate(self) -> None:
-        """Cancel pending patch task and clear stuck badge."""
+        """Cancel pending work, stop git helpers and clear stuck badge."""
         self._patch_task.cancel()
-        self._tokenize_task.cancel()
+        self._stop_stream()
+        self._cancel_pool_jobs()
+        self._close_file_history_git()
         show_badge("", duration=0)
         super().deactivate()
 
@@ -1081,15 +1475,6 @@ class DiffViewer(LineTextBrowser):
 
         self._patch_task.start(_work, _callback)
 
-    def _compute_heatmap(self) -> None:
-        """Compute density symbol and color for each line."""
-        self._heatmap = []
-        self._heatmap_colors = []
-        for line in self._content:
-            sym, color = self._heatmap_entry(line)
-            self._heatmap.append(sym)
-            self._heatmap_colors.append(color)
-
     def _heatmap_entry(self, line: str) -> tuple[str, tuple[int, int, int]]:
         """Return (density_symbol, color) for a single diff line."""
         if self._is_file_header(line):
@@ -1119,43 +1504,53 @@ class DiffViewer(LineTextBrowser):
             return 2
         return 3
 
-    def _compute_line_numbers(self) -> None:
-        """Compute line numbers for each diff line by parsing @@ headers."""
-        self._line_numbers = []
-        old_line = 0
-        new_line = 0
-        for line in self._content:
-            if line.startswith("@@"):
-                m = _HUNK_HEADER_RE.search(line)
-                if m:
-                    old_line = int(m.group(1))
-                    new_line = int(m.group(2))
-                else:
-                    _logger.warning("Unexpected @@ line format: %r", line)
-                    old_line = 0
-                    new_line = 0
-                self._line_numbers.append("")
-            elif self._is_file_header(line):
-                self._line_numbers.append("")
-            elif self._is_add_line(line):
-                self._line_numbers.append(
-                    format_line_number(new_line, self.LINE_NO_STR_WIDTH)
-                )
+    def _number_hunk_lines(self, hunk_idx: int, stop: int) -> None:
+        """Fill ``_line_numbers`` from hunk ``hunk_idx`` up to line ``stop``.
+
+        Counting runs from the hunk's ``@@`` line up to the next ``@@``;
+        ``hunk_idx == -1`` covers the lines before the first hunk, counted
+        from zero. Numbering resumes where the previous call stopped.
+        """
+        starts = self._hunk_starts
+        if hunk_idx < 0:
+            default = (0, 0, 0)
+        else:
+            hunk = self._hunks[hunk_idx]
+            default = (hunk.start, hunk.old_start, hunk.new_start)
+        idx, old_line, new_line = self._line_no_cursor.get(hunk_idx, default)
+        if hunk_idx + 1 < len(starts):
+            end = starts[hunk_idx + 1]
+        else:
+            end = len(self._content)
+        stop = min(stop, end)
+        if idx >= stop:
+            return
+        numbers = self._line_numbers
+        width = self.LINE_NO_STR_WIDTH
+        content = self._content
+        # Same classification as _is_add_line / _is_del_line / _is_file_header,
+        # inlined: this loop may walk a whole lockfile-sized hunk.
+        for i in range(idx, stop):
+            line = content[i]
+            head = line[:1]
+            if head == "+" and not line.startswith("+++"):
+                numbers[i] = format_line_number(new_line, width)
                 new_line += 1
-            elif self._is_del_line(line):
-                self._line_numbers.append(
-                    format_line_number(old_line, self.LINE_NO_STR_WIDTH)
-                )
+            elif head == "-" and not line.startswith("---"):
+                numbers[i] = format_line_number(old_line, width)
                 old_line += 1
-            elif line.startswith("\\"):
-                self._line_numbers.append("")
+            elif (
+                head in ("@", "\\")
+                and line.startswith(("@@", "\\"))
+                or line.startswith(("--- ", "+++ "))
+            ):
+                numbers[i] = ""
             else:
                 # Context line
-                self._line_numbers.append(
-                    format_line_number(new_line, self.LINE_NO_STR_WIDTH)
-                )
+                numbers[i] = format_line_number(new_line, width)
                 old_line += 1
                 new_line += 1
+        self._line_no_cursor[hunk_idx] = (stop, old_line, new_line)
 
     def resize(self, size: tuple[int, int]) -> None:
         # Reserve BORDER_ROWS for top/bottom borders
@@ -1218,10 +1613,11 @@ class DiffViewer(LineTextBrowser):
         if line.startswith("\\"):
             surface.draw_text_rgb(row, text_start_col, line, fg=THEME.fg_dim, bg=bg)
         else:
-            if idx < len(self._render_tokens):
-                tokens = self._render_tokens[idx]
-            else:
-                # Fallback plain text while async tokenization is in flight.
+            tokens = (
+                self._render_tokens[idx] if idx < len(self._render_tokens) else None
+            )
+            if tokens is None:
+                # Plain text for a line that was not prepared.
                 if line and line[0] in "+- ":
                     code = line[1:]
                 else:
@@ -1240,6 +1636,8 @@ class DiffViewer(LineTextBrowser):
 
         sym = self._heatmap[idx]
         color = self._heatmap_colors[idx]
+        if sym is None or color is None:
+            sym, color = self._heatmap_entry(line)
         surface.draw_text_rgb(row, heatmap_x, sym, fg=color, bg=bg)
 
     def _draw_tokens(
@@ -1336,6 +1734,7 @@ class DiffViewer(LineTextBrowser):
         content_w = w - self.BORDER_COLS
         main_w = content_w - self.LINE_NO_WIDTH - 1
         end = min(self._i + content_h, len(self._content))
+        self._prepare_lines(self._i, end)
 
         for idx in range(self._i, end):
             row = idx - self._i + 1  # +1 for top border
@@ -1345,7 +1744,7 @@ class DiffViewer(LineTextBrowser):
                 surface.draw_text_rgb(row, 1, line_no, fg=THEME.fg_dim)
 
             text_start = 1 + self.LINE_NO_WIDTH + 1
-            tokens = self._render_tokens[idx] if idx < len(self._render_tokens) else []
+            tokens = self._render_tokens[idx] or []
             self._draw_tokens(
                 surface,
                 row,
@@ -1369,6 +1768,7 @@ class DiffViewer(LineTextBrowser):
 
         main_w = self._main_width(w)
         end = min(self._i + h, len(self._content))
+        self._prepare_lines(self._i, end)
 
         for idx in range(self._i, end):
             row = idx - self._i
@@ -1378,7 +1778,7 @@ class DiffViewer(LineTextBrowser):
                 surface.draw_text_rgb(row, 0, line_no, fg=THEME.fg_dim)
 
             text_start = self.LINE_NO_WIDTH + 1
-            tokens = self._render_tokens[idx] if idx < len(self._render_tokens) else []
+            tokens = self._render_tokens[idx] or []
             self._draw_tokens(
                 surface,
                 row,
@@ -1412,6 +1812,7 @@ class DiffViewer(LineTextBrowser):
         content_w = w - self.BORDER_COLS
         main_w = self._main_width(content_w)
         end = min(self._i + content_h, len(self._content))
+        self._prepare_lines(self._i, end)
 
         for idx in range(self._i, end):
             row = idx - self._i + 1
@@ -1450,6 +1851,7 @@ class DiffViewer(LineTextBrowser):
                 surface.draw_text_rgb(h - 1, 1, path_trim, fg=THEME.fg_muted)
 
         # Horizontal scroll indicator
+        right = w - 2
         if self._max_col_offset > 0:
             pct = (
                 0
@@ -1460,6 +1862,17 @@ class DiffViewer(LineTextBrowser):
             ind_x = w - len(indicator) - 2
             if ind_x > 4:
                 surface.draw_text_rgb(h - 1, ind_x, indicator, fg=THEME.fg_dim)
+                right = ind_x
+
+        if self._stream is not None:
+            stream_badge = (
+                f" {len(self._content)} lines · L: load more "
+                if self._stream_paused
+                else f" {len(self._content)} lines… "
+            )
+            stream_x = right - wcswidth(stream_badge)
+            if stream_x > 4:
+                surface.draw_text_rgb(h - 1, stream_x, stream_badge, fg=THEME.fg_muted)
 
         if self._hunk_mode:
             badge = " HUNK "
@@ -1482,6 +1895,7 @@ class DiffViewer(LineTextBrowser):
 
         main_w = self._main_width(w)
         end = min(self._i + h, len(self._content))
+        self._prepare_lines(self._i, end)
 
         for idx in range(self._i, end):
             row = idx - self._i
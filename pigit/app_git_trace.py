@@ -0,0 +1,125 @@
+"""
+Module: pigit/app_git_trace.py
+Description: Sheet listing the git subprocesses recorded by the executor trace.
+Author: Zev
+Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+from pigit.ext.exec_trace import ExecRecord, ExecTrace, TraceTotal, format_argv
+from pigit.termui import (
+    bind_action,
+    Component,
+    dismiss_sheet,
+    palette,
+    Segment,
+    Surface,
+)
+from pigit.termui.widgets import LineTextBrowser, Sheet
+
+from .app_theme import THEME
+
+# Slowest (caller, command) pairs shown above the per-run list.
+_TOP_TOTALS = 8
+
+
+def _ms(seconds: float | None) -> str:
+    return "    live" if seconds is None else f"{seconds * 1000:>6.1f}ms"
+
+
+def _size(n: int) -> str:
+    if n < 1024:
+        return f"{n}B"
+    if n < 1024 * 1024:
+        return f"{n / 1024:.1f}K"
+    return f"{n / (1024 * 1024):.1f}M"
+
+
+class GitTraceSheet(Component):
+    """Read-only view of the executor trace: slowest callers, then newest runs."""
+
+    keymap_namespace = "git_trace"
+
+    def __init__(self, trace: ExecTrace, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._rows = self.format(trace.totals(), trace.records())
+        self._browser = LineTextBrowser(content=self._rows, bg=None)
+        self._browser.parent = self
+
+    @property
+    def focus_child(self) -> Component | None:
+        return self._browser
+
+    def preferred_sheet_height(self, term_h: int) -> int:
+        """Fit the rows plus the facing-edge rule (up to half terminal)."""
+        return Sheet.clamp_height(self._rows, term_h, border=1)
+
+    @staticmethod
+    def format(
+        totals: list[TraceTotal], records: list[ExecRecord]
+    ) -> list[list[Segment]]:
+        """Title, the slowest totals, then one row per buffered run (newest first)."""
+        count = sum(t.count for t in totals)
+        wall = sum(t.wall for t in totals)
+        rows = [
+            [
+                Segment(
+                    "Git trace",
+                    fg=THEME.fg_panel_title,
+                    style_flags=palette.STYLE_BOLD,
+                ),
+                Segment(" · ", fg=THEME.fg_muted),
+                Segment(f"{count} processes", fg=THEME.fg_info),
+                Segment(" · ", fg=THEME.fg_muted),
+                Segment(f"{wall:.3f}s", fg=THEME.fg_primary),
+            ]
+        ]
+        for t in totals[:_TOP_TOTALS]:
+            rows.append(
+                [
+                    Segment(f"{t.count:>5}× ", fg=THEME.fg_dim),
+                    Segment(_ms(t.wall), fg=THEME.fg_warning),
+                    Segment(f"  {t.caller}", fg=THEME.fg_primary),
+                    Segment(f"  {t.command}", fg=THEME.fg_muted),
+                ]
+            )
+        if records:
+            rows.append([Segment("")])
+        for rec in reversed(records):
+            ok = rec.code in (0, None)
+            rows.append(
+                [
+                    Segment(_ms(rec.wall), fg=THEME.fg_warning),
+                    Segment(
+                        f" {'-' if rec.code is None else rec.code:>3}",
+                        fg=THEME.fg_success if ok else THEME.fg_danger,
+                    ),
+                    Segment(
+                        f" {_size(rec.out_bytes):>6}/{_size(rec.err_bytes):<5}",
+                        fg=THEME.fg_dim,
+                    ),
+                    Segment(f" {rec.caller}", fg=THEME.fg_primary),
+                    Segment(f"  {format_argv(rec.argv)}", fg=THEME.fg_muted),
+                ]
+            )
+        return rows
+
+    def resize(self, size: tuple[int, int]) -> None:
+        super().resize(size)
+        self._browser.resize(size)
+
+    def _render_surface(self, surface: Surface) -> None:
+        self._browser._render_surface(surface)
+
+    @bind_action("next", "j", "down", desc="Scroll down")
+    def scroll_down(self) -> None:
+        self._browser.scroll_down(1)
+
+    @bind_action("previous", "k", "up", desc="Scroll up")
+    def scroll_up(self) -> None:
+        self._browser.scroll_up(1)
+
+    @bind_action("close", "esc", "T", desc="Close")
+    def close(self) -> None:
+        dismiss_sheet()
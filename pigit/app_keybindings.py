@@ -16,6 +16,7 @@ from .app import PigitApplication
 from .app_branch import BranchPanel
 from .app_commit import CommitPanel
 from .app_diff import DiffViewer
+from .app_git_trace import GitTraceSheet
 from .app_inspector import InspectorSheet
 from .app_log_ref import LogRefSheet
 from .app_rebase import RebasePanel
@@ -36,6 +37,7 @@ _KEYMAP_CLASSES: tuple[type, ...] = (
     RecentActionsPanel,
     LogRefSheet,
     InspectorSheet,
+    GitTraceSheet,
 )
 
 _KEY_SYNTAX_HINT = (
@@ -32,6 +32,7 @@ from pigit.termui import (
     show_sheet,
     show_toast,
 )
+from pigit.termui.primitives import TextIndex
 from pigit.termui.widgets import AlertDialog, InputLine, ItemList
 
 from .app_diff import DiffType, DiffViewer
@@ -302,6 +303,8 @@ class StatusPanel(ItemList):
         self.files: list[File] = []
         self._all_files: list[File] = []
         self._source_map: list[int] = []
+        # Filter index over ``_all_files``; rebuilt lazily when they change.
+        self._filter_index: TextIndex | None = None
         self._alert_dialog = AlertDialog(
             inner_width=alert_inner_width,
             on_result=lambda _: None,
@@ -355,6 +358,7 @@ class StatusPanel(ItemList):
         if not self.is_activated():
             return
         self._all_files = list(files)
+        self._filter_index = None
         self._apply_filter()
 
     def _apply_filter(self) -> None:
@@ -364,14 +368,10 @@ class StatusPanel(ItemList):
             self.files = list(self._all_files)
             self._source_map = list(range(len(self._all_files)))
         else:
-            filtered: list[File] = []
-            mapping: list[int] = []
-            for i, f in enumerate(self._all_files):
-                if query in f.name.lower():
-                    filtered.append(f)
-                    mapping.append(i)
-            self.files = filtered
-            self._source_map = mapping
+            if self._filter_index is None:
+                self._filter_index = TextIndex([f.name for f in self._all_files])
+            self._source_map = self._filter_index.search(query)
+            self.files = [self._all_files[i] for i in self._source_map]
         if not self.files:
             self._tree_rows = []
             self.set_content([])
@@ -463,7 +463,9 @@ class StatusPanel(ItemList):
         if hit is None:
             return
         f, source_idx = hit
-        diff = self._vm.load_diff(source_idx)
+        stream = self._vm.open_diff(source_idx)
+        if stream is None:
+            return
         diff_type = (
             DiffType.STAGED
             if (f.has_staged_change and not f.has_unstaged_change)
@@ -474,7 +476,7 @@ class StatusPanel(ItemList):
             target="diff",
             source=self,
             key=f.name,
-            content=diff,
+            stream=stream,
             repo_path=self._vm.repo_path,
             diff_type=diff_type,
         )
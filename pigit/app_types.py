@@ -73,7 +73,33 @@ class InspectorHost(Protocol):
         ...
 
 
-@dataclass
+class GraphSegment:
+    """Lane state for a run of consecutive graph rows, stored as deltas.
+
+    ``base`` is the full lane list before the first row; each row then records
+    only the lanes it wrote and the lane count left after trailing ``None``
+    slots were trimmed. A row's lanes are replayed from ``base`` on demand.
+    """
+
+    __slots__ = ("base", "deltas")
+
+    def __init__(self, base: tuple[str | None, ...]) -> None:
+        self.base = base
+        self.deltas: list[tuple[tuple[tuple[int, str | None], ...], int]] = []
+
+    def lanes_after(self, offset: int) -> list[str | None]:
+        """Return the lanes after row ``offset`` of this segment."""
+        lanes = list(self.base)
+        for writes, width in self.deltas[: offset + 1]:
+            for lane, sha in writes:
+                if lane >= len(lanes):
+                    lanes.extend([None] * (lane + 1 - len(lanes)))
+                lanes[lane] = sha
+            del lanes[width:]
+        return lanes
+
+
+@dataclass(eq=False, slots=True)
 class GraphRow:
     """Lane layout for one commit row.
 
@@ -82,10 +108,23 @@ class GraphRow:
 
     `closed_lanes` / `opened_lanes` are always > `commit_lane` by construction,
     so the renderer can use a single direction of curve glyphs.
+
+    `lanes_before` / `lanes_after` are rebuilt from the row's
+    :class:`GraphSegment` on each access; read them once per row.
     """
 
-    lanes_before: list[str | None]
     commit_lane: int
     closed_lanes: list[int]
     opened_lanes: list[int]
-    lanes_after: list[str | None]
+    segment: GraphSegment
+    offset: int
+
+    @property
+    def lanes_before(self) -> list[str | None]:
+        if self.offset == 0:
+            return list(self.segment.base)
+        return self.segment.lanes_after(self.offset - 1)
+
+    @property
+    def lanes_after(self) -> list[str | None]:
+        return self.segment.lanes_after(self.offset)
@@ -108,6 +108,12 @@ class Config(metaclass=Singleton):
         # (bool) Enable word-diff by default in the diff viewer.
         word_diff = {app_word_diff}
 
+        # (int) Lines of a diff read at a time; L in the diff viewer loads more.
+        diff_max_lines = {app_diff_max_lines}
+
+        # (int) Highlighted lines kept per diff viewer; 0 disables the cache.
+        syntax_cache_size = {app_syntax_cache_size}
+
         # (str) Status panel default view. Supported: [flat, tree]
         status_view = "{app_status_view}"
 
@@ -288,6 +294,28 @@ class Config(metaclass=Singleton):
                     self._status_view_candidate
                 )
             )
+        diff_max_lines = app_raw.get("diff_max_lines", 20000)
+        if (
+            not isinstance(diff_max_lines, int)
+            or isinstance(diff_max_lines, bool)
+            or diff_max_lines <= 0
+        ):
+            diff_max_lines = 20000
+            self._warnings.append(
+                'Config key "app.diff_max_lines" should be a positive integer, '
+                "using 20000."
+            )
+        syntax_cache_size = app_raw.get("syntax_cache_size", 512)
+        if (
+            not isinstance(syntax_cache_size, int)
+            or isinstance(syntax_cache_size, bool)
+            or syntax_cache_size < 0
+        ):
+            syntax_cache_size = 512
+            self._warnings.append(
+                'Config key "app.syntax_cache_size" should be a non-negative '
+                "integer, using 512."
+            )
         kb_raw = app_raw.get("keybindings", {})
         if not isinstance(kb_raw, dict):
             kb_raw = {}
@@ -303,6 +331,8 @@ class Config(metaclass=Singleton):
             repo_observe=app_raw.get("repo_observe", True),
             observe_worktree=app_raw.get("observe_worktree", True),
             word_diff=app_raw.get("word_diff", True),
+            diff_max_lines=diff_max_lines,
+            syntax_cache_size=syntax_cache_size,
             status_view=status_view,
             diff_preview_default=app_raw.get("diff_preview_default", True),
             log_graph_default=app_raw.get("log_graph_default", True),
@@ -378,6 +408,8 @@ class Config(metaclass=Singleton):
                         app_repo_observe=str(data.app.repo_observe).lower(),
                         app_observe_worktree=str(data.app.observe_worktree).lower(),
                         app_word_diff=str(data.app.word_diff).lower(),
+                        app_diff_max_lines=data.app.diff_max_lines,
+                        app_syntax_cache_size=data.app.syntax_cache_size,
                         app_status_view=data.app.status_view,
                         app_diff_preview_default=str(
                             data.app.diff_preview_default
@@ -49,6 +49,8 @@ class AppConfig:
     repo_observe: bool = True
     observe_worktree: bool = True
     word_diff: bool = True
+    diff_max_lines: int = 20000
+    syntax_cache_size: int = 512
     status_view: Literal["flat", "tree"] = "tree"
     diff_preview_default: bool = True
     log_graph_default: bool = True
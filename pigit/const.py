@@ -49,6 +49,12 @@ REPOS_PATH: str = f"{PIGIT_HOME}/repos.json"
 # Command MRU history file
 CMD_MRU_PATH: str = f"{PIGIT_HOME}/cmd_mru.json"
 
+# Per-repo commit activity (contribution graph) cache
+ACTIVITY_CACHE_DIR: str = f"{PIGIT_HOME}/activity"
+
+# Cross-session commit metadata store (sqlite)
+COMMIT_STORE_PATH: str = f"{PIGIT_HOME}/commits.sqlite"
+
 # Flag of first running
 IS_FIRST_RUN: bool = not os.path.isdir(PIGIT_HOME)
 if IS_FIRST_RUN:
@@ -1,7 +1,9 @@
 # The PIGIT terminal tool entry file.
 from __future__ import annotations
 
+import atexit
 import os
+import sys
 from typing import TYPE_CHECKING
 
 from .config import Config
@@ -45,6 +47,15 @@ ctx = _bootstrap()
 console = get_console()
 
 
+def _install_git_trace_dump() -> None:
+    """Print the per-caller subprocess summary to stderr when pigit exits."""
+    from .ext.exec_trace import get_exec_trace
+
+    atexit.register(
+        lambda: print(get_exec_trace().format_summary(), file=sys.stderr)
+    )
+
+
 def _color_index(count: int) -> str:
     """Return a color name based on code quantity (thousands)."""
     level_color = (
@@ -85,6 +96,12 @@ def _color_index(count: int) -> str:
     action="store_true",
     help="Show some information about the current git repository.",
 )
+@argument(
+    "--trace-git",
+    action="store_true",
+    dest="trace_git",
+    help="Print a timing summary of every git subprocess on exit.",
+)
 @argument(
     "-c --count",
     nargs="?",
@@ -129,6 +146,9 @@ def _color_index(count: int) -> str:
     " (requires --create-config)",
 )
 def pigit(args: Namespace, _) -> None:
+    if args.trace_git:
+        _install_git_trace_dump()
+
     if args.init:
         from .init import run_shell_init
 
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import shlex
+import sys
+import threading
+from collections import deque
+from dataclasses import dataclass
+from types import FrameType
+from typing import Any
+
+# Records kept for the TUI sheet; totals are unbounded (one per caller/command).
+DEFAULT_CAPACITY = 512
+
+# Frames skipped when attributing a spawn to its caller.
+_PLUMBING_MODULES = ("pigit.ext.", "asyncio", "contextlib", "subprocess", "threading")
+
+
+@dataclass(slots=True)
+class ExecRecord:
+    """One subprocess started by :class:`~pigit.ext.executor.Executor`."""
+
+    # Command argv (string commands are recorded as a single element).
+    argv: tuple[str, ...]
+    # Working directory passed to Popen, if any.
+    cwd: str | None
+    # Wall-clock start (epoch seconds).
+    start: float
+    # Elapsed seconds; ``None`` for detached or long-lived processes.
+    wall: float | None
+    # Bytes read from stdout / stderr (0 when not captured).
+    out_bytes: int
+    err_bytes: int
+    # Exit code; ``None`` when the process was not waited for.
+    code: int | None
+    # Outermost GitApi method (``GitApi.load_status``) or first non-executor frame.
+    caller: str
+
+    @property
+    def command(self) -> str:
+        """Short label: program plus subcommand (``git status``)."""
+        words = self.argv[0].split() if len(self.argv) == 1 else self.argv
+        return " ".join(words[:2])
+
+
+@dataclass(slots=True)
+class TraceTotal:
+    """Aggregate of every run for one ``(caller, command)`` pair."""
+
+    caller: str
+    command: str
+    count: int = 0
+    wall: float = 0.0
+    max_wall: float = 0.0
+
+
+def _caller_name(frame: FrameType | None) -> str:
+    """Name the code that asked for a spawn.
+
+    The outermost consecutive ``pigit.git.api`` frame wins (the facade method),
+    otherwise the first frame outside executor/asyncio plumbing.
+    """
+    api: FrameType | None = None
+    outside: FrameType | None = None
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("pigit.git.api"):
+            api = frame
+        elif api is not None:
+            break
+        elif outside is None and not module.startswith(_PLUMBING_MODULES):
+            outside = frame
+        frame = frame.f_back
+    picked = api or outside
+    return picked.f_code.co_qualname if picked is not None else "?"
+
+
+class ExecTrace:
+    """Thread-safe ring buffer of :class:`ExecRecord` plus per-caller totals."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        self._records: deque[ExecRecord] = deque(maxlen=capacity)
+        self._totals: dict[tuple[str, str], TraceTotal] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        cmd: Any,
+        *,
+        cwd: Any,
+        start: float,
+        wall: float | None,
+        out_bytes: int = 0,
+        err_bytes: int = 0,
+        code: int | None = None,
+    ) -> ExecRecord:
+        """Append one run; the caller is resolved from the current stack."""
+        argv = (cmd,) if isinstance(cmd, str) else tuple(str(x) for x in cmd)
+        rec = ExecRecord(
+            argv=argv,
+            cwd=None if cwd is None else str(cwd),
+            start=start,
+            wall=wall,
+            out_bytes=out_bytes,
+            err_bytes=err_bytes,
+            code=code,
+            caller=_caller_name(sys._getframe(1)),
+        )
+        key = (rec.caller, rec.command)
+        with self._lock:
+            self._records.append(rec)
+            total = self._totals.get(key)
+            if total is None:
+                total = self._totals[key] = TraceTotal(*key)
+            total.count += 1
+            if wall is not None:
+                total.wall += wall
+                total.max_wall = max(total.max_wall, wall)
+        return rec
+
+    def records(self) -> list[ExecRecord]:
+        """Buffered records, oldest first."""
+        with self._lock:
+            return list(self._records)
+
+    def totals(self) -> list[TraceTotal]:
+        """Totals sorted by cumulative wall time, slowest first."""
+        with self._lock:
+            totals = [
+                TraceTotal(t.caller, t.command, t.count, t.wall, t.max_wall)
+                for t in self._totals.values()
+            ]
+        totals.sort(key=lambda t: (-t.wall, -t.count, t.caller))
+        return totals
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+            self._totals.clear()
+
+    def format_summary(self) -> str:
+        """Plain-text table of :meth:`totals` for ``--trace-git``."""
+        totals = self.totals()
+        count = sum(t.count for t in totals)
+        wall = sum(t.wall for t in totals)
+        lines = [f"git trace: {count} processes, {wall:.3f}s wall"]
+        if totals:
+            lines.append(f"{'calls':>6} {'total':>9} {'max':>9}  caller / command")
+        for t in totals:
+            lines.append(
+                f"{t.count:>6} {t.wall:>8.3f}s {t.max_wall:>8.3f}s  "
+                f"{t.caller}  {t.command}"
+            )
+        return "\n".join(lines)
+
+
+def format_argv(argv: tuple[str, ...]) -> str:
+    """Render a record's argv as a shell-quoted line."""
+    return argv[0] if len(argv) == 1 else shlex.join(argv)
+
+
+_trace = ExecTrace()
+
+
+def get_exec_trace() -> ExecTrace:
+    """Process-wide trace shared by every :class:`~pigit.ext.executor.Executor`."""
+    return _trace
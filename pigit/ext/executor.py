@@ -3,13 +3,18 @@ from __future__ import annotations
 import asyncio
 import contextlib
 import dataclasses
+import functools
 import logging
 import os
 import shlex
+import shutil
 import sys
-from subprocess import Popen, PIPE
+import time
+from subprocess import DEVNULL, Popen, PIPE
 from typing import Any, Final, cast
-from collections.abc import Iterator
+from collections.abc import Collection, Iterator
+
+from .exec_trace import ExecTrace, get_exec_trace
 
 # Type defined
 ExecResult = tuple[int | None, str | bytes | None, str | bytes | None]
@@ -53,6 +58,23 @@ def _split_cmd_argv(cmd: str) -> list[str]:
         return cmd.split()
 
 
+@functools.lru_cache(maxsize=32)
+def _resolve_program(name: str, search_path: str | None) -> str | None:
+    """Return the absolute path of ``name`` on ``search_path`` (cached).
+
+    Args:
+        name (str): ``argv[0]``; returned as-is when it has a directory part.
+        search_path (Optional[str]): ``PATH`` value used for the lookup.
+
+    Returns:
+        Optional[str]: Absolute executable path, or ``None`` when not found.
+    """
+    if os.path.dirname(name):
+        return name
+    found = shutil.which(name, path=search_path)
+    return os.path.abspath(found) if found else None
+
+
 @dataclasses.dataclass
 class ExecState:
     """State ctx of ~Executor."""
@@ -65,8 +87,11 @@ class ExecState:
 
 
 class Executor:
-    def __init__(self, log: logging.Logger | None = None) -> None:
+    def __init__(
+        self, log: logging.Logger | None = None, trace: ExecTrace | None = None
+    ) -> None:
         self.log = log
+        self.trace = trace if trace is not None else get_exec_trace()
 
     def _log_warning(self, msg: object, *args: object) -> None:
         """Emit a diagnostic line when a logger was configured.
@@ -156,6 +181,30 @@ class Executor:
         if err:
             print(err)
 
+    def _argv_fast_path(self, cmd: str | list | tuple, kws: dict[str, Any]) -> None:
+        """Prepare shell-free spawn kwargs for an argv command, in place.
+
+        ``argv[0]`` is resolved once to an absolute ``executable`` and, without a
+        ``cwd``, inherited fds are kept (ours are close-on-exec) so CPython can use
+        ``posix_spawn``. ``posix_spawn`` cannot change directory, so calls with a
+        ``cwd`` use CPython's vfork path instead; both skip ``/bin/sh``.
+
+        Args:
+            cmd (Union[str, list, tuple]): The command; strings are left untouched.
+            kws (dict[str, Any]): Popen kwargs for this call.
+        """
+        if isinstance(cmd, str) or not cmd or kws.get("shell"):
+            return
+        kws["shell"] = False
+        if "executable" not in kws:
+            env = kws.get("env")
+            search_path = (os.environ if env is None else env).get("PATH")
+            exe = _resolve_program(os.fspath(cmd[0]), search_path)
+            if exe:
+                kws["executable"] = exe
+        if kws.get("cwd") is None:
+            kws.setdefault("close_fds", False)
+
     def __call__(self, cmd: str | list | tuple, *, flags: int = 0, **kws) -> tuple:
         return self.exec(cmd, flags=flags, **kws)
 
@@ -175,13 +224,16 @@ class Executor:
         """
         es = self.generate_popen_state(flags, kws)
 
+        self._argv_fast_path(cmd, kws)
         if "shell" not in kws:
             kws["shell"] = isinstance(cmd, str)
 
         kws["args"] = cmd
 
+        start, t0 = time.time(), time.perf_counter()
         if not es.waiting:
             Popen(**kws)
+            self.trace.record(cmd, cwd=kws.get("cwd"), start=start, wall=None)
             return (None, None, None)
         else:
             try:
@@ -193,6 +245,15 @@ class Executor:
                 self._log_warning(f"Failed to run: {cmd}, {e}")
                 return None, None, None
             else:
+                self.trace.record(
+                    cmd,
+                    cwd=kws.get("cwd"),
+                    start=start,
+                    wall=time.perf_counter() - t0,
+                    out_bytes=len(_out or b""),
+                    err_bytes=len(_err or b""),
+                    code=_code,
+                )
                 if es.wait_enter:
                     self._press_enter()
 
@@ -210,32 +271,40 @@ class Executor:
         cmd: str | list | tuple,
         *,
         flags: int = 0,
+        ok_codes: Collection[int] = (0,),
         **kws: Any,
     ) -> Iterator[str]:
         """Yield decoded stdout lines as they arrive (no trailing newline).
 
         Forces :data:`REDIRECT`, :data:`WAITING`, and :data:`DECODE`. Stderr is read
-        after stdout EOF to avoid pipe back-pressure; non-zero exit is logged.
+        after stdout EOF to avoid pipe back-pressure; an exit code outside
+        ``ok_codes`` is logged.
 
         Args:
             cmd: Same as :meth:`exec`.
             flags: Extra flag bits merged into the stream run (rarely needed).
+            ok_codes: Exit codes that mean success (e.g. ``(0, 1)`` for
+                ``git diff --no-index``, which exits 1 when the files differ).
             **kws: Passed to :class:`~subprocess.Popen` (``cwd``, ``shell``, …).
 
         Yields:
             str: One logical line per stdout read.
         """
         kws = dict(kws)
+        self._argv_fast_path(cmd, kws)
         if "shell" not in kws:
             kws["shell"] = isinstance(cmd, str)
         kws["args"] = cmd
         stream_flags = REDIRECT | WAITING | DECODE | flags
         es = self.generate_popen_state(stream_flags, kws)
+        start, t0 = time.time(), time.perf_counter()
+        out_bytes = 0
         try:
             with Popen(**kws) as proc:
                 if proc.stdout is None:
                     return
                 for raw in proc.stdout:
+                    out_bytes += len(raw)
                     decoded = self._try_decode(raw, es)
                     if isinstance(decoded, str):
                         yield decoded.rstrip("\r\n")
@@ -251,7 +320,16 @@ class Executor:
                             yield str(chunk).rstrip("\r\n")
                 err_raw = proc.stderr.read() if proc.stderr is not None else None
             code = proc.returncode
-            if code not in (0, None):
+            self.trace.record(
+                cmd,
+                cwd=kws.get("cwd"),
+                start=start,
+                wall=time.perf_counter() - t0,
+                out_bytes=out_bytes,
+                err_bytes=len(err_raw or b""),
+                code=code,
+            )
+            if code is not None and code not in ok_codes:
                 self._log_warning(f"exec_stream exited {code}: {cmd!r}")
             if err_raw:
                 err_text = self._try_decode(err_raw, es)
@@ -260,6 +338,33 @@ class Executor:
         except Exception as e:
             self._log_warning(f"Failed to exec_stream: {cmd!r}\n{e}")
 
+    def spawn_pipe(self, cmd: str | list | tuple, **kws: Any) -> Popen | None:
+        """Start a long-lived process with binary stdin/stdout pipes.
+
+        Used for request/response helpers such as ``git cat-file --batch`` that
+        stay alive across many calls. Stderr is discarded.
+
+        Args:
+            cmd: Same as :meth:`exec`.
+            **kws: Passed to :class:`~subprocess.Popen` (``cwd``, ``env``, …).
+
+        Returns:
+            The running process, or ``None`` when it could not be started.
+        """
+        kws = dict(kws)
+        self._argv_fast_path(cmd, kws)
+        if "shell" not in kws:
+            kws["shell"] = isinstance(cmd, str)
+        kws.update(args=cmd, stdin=PIPE, stdout=PIPE, stderr=DEVNULL)
+        start = time.time()
+        try:
+            proc = Popen(**kws)
+        except Exception as e:
+            self._log_warning(f"Failed to spawn: {cmd!r}, {e}")
+            return None
+        self.trace.record(cmd, cwd=kws.get("cwd"), start=start, wall=None)
+        return proc
+
     def _asyncio_spawn_kw(self, cur_kws: dict[str, Any]) -> dict[str, Any]:
         """Build kwargs for :func:`asyncio.create_subprocess_exec` / shell helpers.
 
@@ -269,7 +374,7 @@ class Executor:
         Returns:
             dict[str, Any]: Allowed keys only, with ``start_new_session=True`` if unset.
         """
-        allowed = ("stdin", "stdout", "stderr", "cwd", "env", "executable")
+        allowed = ("stdin", "stdout", "stderr", "cwd", "env", "executable", "close_fds")
         sk = {k: cur_kws[k] for k in allowed if k in cur_kws}
         sk.setdefault("start_new_session", True)
         return sk
@@ -296,6 +401,7 @@ class Executor:
         """
         use_shell = cur_kws["shell"] if "shell" in cur_kws else isinstance(cmd, str)
         sk = self._asyncio_spawn_kw(cur_kws)
+        start, t0 = time.time(), time.perf_counter()
 
         try:
             if use_shell and isinstance(cmd, str):
@@ -311,16 +417,29 @@ class Executor:
                 if not argv:
                     self._log_warning("Empty argv for subprocess_exec")
                     return (1, "", "") if es.reply else (None, None, None)
+                cur_kws = dict(cur_kws)
+                self._argv_fast_path(argv, cur_kws)
+                sk = self._asyncio_spawn_kw(cur_kws)
                 proc = await asyncio.create_subprocess_exec(argv[0], *argv[1:], **sk)
         except Exception as e:
             self._log_warning(f"Failed to run: {cmd}, {e}")
             return None, None, None
 
         if not es.waiting:
+            self.trace.record(cmd, cwd=sk.get("cwd"), start=start, wall=None)
             return None, None, None
 
         _out, _err = await proc.communicate()
         _code = proc.returncode
+        self.trace.record(
+            cmd,
+            cwd=sk.get("cwd"),
+            start=start,
+            wall=time.perf_counter() - t0,
+            out_bytes=len(_out or b""),
+            err_bytes=len(_err or b""),
+            code=_code,
+        )
 
         _out = self._try_decode(_out, es)
         _err = self._try_decode(_err, es)
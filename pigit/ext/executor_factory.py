@@ -8,9 +8,11 @@ Tests may :meth:`ExecutorFactory.set_strategy` with a :class:`MockExecutor` or c
 from __future__ import annotations
 
 import copy
+import shlex
 from abc import ABC, abstractmethod
 from typing import Any
-from collections.abc import Iterator
+from collections.abc import Collection, Iterator
+from subprocess import Popen
 
 from typing import cast
 
@@ -35,7 +37,9 @@ class ExecutorStrategy(ABC):
         **kws: Any,
     ) -> list[ExecResult]: ...
 
-    def exec_stream(self, cmd: CmdT, **kws: Any) -> Iterator[str]:
+    def exec_stream(
+        self, cmd: CmdT, *, ok_codes: Collection[int] = (0,), **kws: Any
+    ) -> Iterator[str]:
         """Fallback: buffer full stdout via :meth:`exec` (tests and non-streaming strategies)."""
         _, err, out = self.exec(cmd, flags=REPLY | DECODE, **kws)
         if err:
@@ -44,15 +48,21 @@ class ExecutorStrategy(ABC):
             return
         yield from cast(str, out).splitlines()
 
+    def spawn_pipe(self, cmd: CmdT, **kws: Any) -> Popen | None:
+        """Fallback: no long-lived processes; callers use one-shot :meth:`exec`."""
+        return None
+
 
 class LocalExecutor(Executor, ExecutorStrategy):
     """Default: real subprocess behavior, identical to :class:`Executor`."""
 
 
 def _cmd_key(cmd: CmdT) -> str:
+    # Argv commands key as their shell-quoted line, so ``["git", "add", "a b"]``
+    # matches ``"git add 'a b'"``.
     if isinstance(cmd, str):
         return cmd
-    return " ".join(str(x) for x in cmd)
+    return shlex.join(str(x) for x in cmd)
 
 
 class MockExecutor(ExecutorStrategy):
@@ -0,0 +1,181 @@
+"""
+Module: pigit/git/activity.py
+Description: Year-long per-day / per-author commit counts, cached per ref tip.
+Author: Zev
+Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import json
+import logging
+import os
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .api import GitError
+
+if TYPE_CHECKING:
+    from .api import GitApi
+
+_logger = logging.getLogger(__name__)
+
+# ``git log --since`` bound of the aggregation pass.
+ACTIVITY_SINCE = "1.year"
+# Days kept in the counts; the heatmap shows at most 53 weeks.
+ACTIVITY_DAYS = 371
+# Tips remembered per repo (one per recently viewed branch, roughly).
+MAX_CACHED_TIPS = 8
+_CACHE_VERSION = 1
+
+
+@dataclass
+class CommitActivity:
+    """Commit counts per day and per author for the log reachable from ``tip``.
+
+    Days are local dates of the author timestamp (as the heatmap shows them).
+    """
+
+    tip: str
+    author_day_counts: dict[str, dict[datetime.date, int]] = field(
+        default_factory=dict
+    )
+
+    @property
+    def day_counts(self) -> dict[datetime.date, int]:
+        counts: dict[datetime.date, int] = defaultdict(int)
+        for dates in self.author_day_counts.values():
+            for day, count in dates.items():
+                counts[day] += count
+        return dict(counts)
+
+    def add(self, timestamp: int, author: str) -> None:
+        day = datetime.datetime.fromtimestamp(timestamp).date()
+        dates = self.author_day_counts.setdefault(author, {})
+        dates[day] = dates.get(day, 0) + 1
+
+    def prune(self, first_day: datetime.date) -> None:
+        """Drop counts for days before ``first_day`` (and authors left empty)."""
+        for author, counts in list(self.author_day_counts.items()):
+            dates = {d: n for d, n in counts.items() if d >= first_day}
+            if dates:
+                self.author_day_counts[author] = dates
+            else:
+                del self.author_day_counts[author]
+
+    def rebased(self, tip: str) -> CommitActivity:
+        """Return a copy of these counts to be extended up to ``tip``."""
+        return CommitActivity(
+            tip, {a: dict(dates) for a, dates in self.author_day_counts.items()}
+        )
+
+    def to_json(self) -> dict:
+        return {
+            "tip": self.tip,
+            "authors": {
+                author: {d.isoformat(): n for d, n in dates.items()}
+                for author, dates in self.author_day_counts.items()
+            },
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> CommitActivity:
+        authors = data.get("authors", {})
+        return cls(
+            str(data["tip"]),
+            {
+                str(author): {
+                    datetime.date.fromisoformat(d): int(n) for d, n in dates.items()
+                }
+                for author, dates in authors.items()
+            },
+        )
+
+
+def activity_cache_path(cache_dir: str | Path, repo_path: str) -> Path:
+    """Return the cache file for ``repo_path`` inside ``cache_dir``."""
+    key = hashlib.sha1(os.path.realpath(repo_path).encode("utf-8")).hexdigest()
+    return Path(cache_dir) / f"{key}.json"
+
+
+def load_cached_activity(path: str | Path) -> list[CommitActivity]:
+    """Load cached activity entries, most recently used first."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != _CACHE_VERSION:
+            return []
+        return [CommitActivity.from_json(entry) for entry in data["tips"]]
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return []
+
+
+def save_cached_activity(entries: list[CommitActivity], path: str | Path) -> None:
+    """Write ``entries`` to ``path`` (atomically; errors are logged, not raised)."""
+    path = Path(path)
+    data = {
+        "version": _CACHE_VERSION,
+        "tips": [entry.to_json() for entry in entries[:MAX_CACHED_TIPS]],
+    }
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    except OSError:
+        _logger.debug("Cannot write activity cache %s", path, exc_info=True)
+
+
+def load_activity(
+    git: GitApi,
+    tip: str,
+    cache_path: str | Path | None = None,
+    today: datetime.date | None = None,
+) -> CommitActivity:
+    """Return the last year of commit activity reachable from ``tip``.
+
+    Reuses a cached entry for ``tip`` as is. Otherwise the newest cached tip
+    that is an ancestor of ``tip`` is extended with only the commits between
+    the two; with no usable entry the whole year is read. The result is
+    written back to ``cache_path`` (when given) as the most recent entry.
+
+    Args:
+        git: Repo to read from.
+        tip: Full SHA of the ref tip.
+        cache_path: Cache file (see :func:`activity_cache_path`); ``None``
+            reads the log without caching.
+        today: Reference date for pruning; defaults to today.
+    """
+    entries = load_cached_activity(cache_path) if cache_path is not None else []
+    activity = next((e for e in entries if e.tip == tip), None)
+    if activity is None:
+        base = _find_ancestor_entry(git, entries, tip)
+        activity = base.rebased(tip) if base is not None else CommitActivity(tip)
+        for timestamp, author in git.iter_activity(
+            tip, since=ACTIVITY_SINCE, exclude=base.tip if base is not None else ""
+        ):
+            activity.add(timestamp, author)
+
+    today = today or datetime.date.today()
+    activity.prune(today - datetime.timedelta(days=ACTIVITY_DAYS))
+    if cache_path is not None:
+        others = [e for e in entries if e.tip != tip]
+        save_cached_activity([activity, *others], cache_path)
+    return activity
+
+
+def _find_ancestor_entry(
+    git: GitApi, entries: list[CommitActivity], tip: str
+) -> CommitActivity | None:
+    for entry in entries:
+        try:
+            if git.is_ancestor(entry.tip, tip):
+                return entry
+        except GitError:
+            continue  # The cached tip no longer exists (gc'd / rewritten).
+    return None
@@ -15,16 +15,30 @@ from pigit.ext.executor_factory import ExecutorFactory, ExecutorStrategy
 from ._errors import GitError, RepoError
 from ._core import _CoreOps
 from ._branch import _BranchOps
-from ._commit import _CommitOps, _DEFAULT_LOG_FORMAT, LOG_GRAPH_LIMIT
+from ._commit import (
+    CommitLog,
+    CommitSearch,
+    _CommitOps,
+    _DEFAULT_LOG_FORMAT,
+    LOG_GRAPH_LIMIT,
+)
 from ._status import _StatusOps
 from ._stash import _StashOps
-from ._diff import _DiffOps
+from ._diff import DiffStream, _DiffOps
 from ._worktree import _WorktreeOps
 from ._merge import _MergeOps
 from ._fileio import _FileioOps
 from ._display import _DisplayOps
+from ._objects import _ObjectOps
 
-__all__ = ("GitApi", "GitError", "RepoError")
+__all__ = (
+    "CommitLog",
+    "CommitSearch",
+    "DiffStream",
+    "GitApi",
+    "GitError",
+    "RepoError",
+)
 
 
 class GitApi:
@@ -43,24 +57,32 @@ class GitApi:
         self.log = log or logging.getLogger(__name__)
         self.path = path
         self._core = _CoreOps(self)
+        self._objects = _ObjectOps(self)
         self._branch = _BranchOps(self)
-        self._commit = _CommitOps(self, self._core)
+        self._commit = _CommitOps(self, self._core, self._objects)
         self._status = _StatusOps(self, self._core)
-        self._stash = _StashOps(self)
-        self._diff = _DiffOps(self)
+        self._stash = _StashOps(self, self._objects)
+        self._diff = _DiffOps(self, self._objects)
         self._worktree = _WorktreeOps(self, self._core)
         self._merge = _MergeOps(self, self._core)
-        self._fileio = _FileioOps(self)
+        self._fileio = _FileioOps(self, self._objects)
         self._display = _DisplayOps(self, self._core, self._branch)
 
     def bind_path(self, path: str) -> "GitApi":
         """Return a new GitApi instance pinned to the given path."""
         return GitApi(executor=self.executor, path=path, log=self.log)
 
+    def close(self) -> None:
+        """Stop long-lived helper processes (``git cat-file``) owned by this instance."""
+        self._objects.close()
+
     # ── _core ──
     def confirm_repo(self, given_path=None, exclude_submodule=False):
         return self._core.confirm_repo(given_path, exclude_submodule)
 
+    def repo_layout(self, path=None):
+        return self._core.repo_layout(path)
+
     def get_config(self, path=None):
         return self._core.get_config(path)
 
@@ -89,7 +111,7 @@ class GitApi:
         return self._core.get_git_common_dir(path)
 
     def get_head_tracking(self, path=None):
-        return self._core.get_head_tracking(path)
+        return self._status.get_head_tracking(path)
 
     def verify_commitish(self, ref, path=None):
         return self._core.verify_commitish(ref, path)
@@ -153,8 +175,21 @@ class GitApi:
             branch_name, limit, filter_path, path, max_commits
         )
 
-    def get_commit_bodies(self, branch_name, max_commits=300, path=None):
-        return self._commit.get_commit_bodies(branch_name, max_commits, path)
+    def iter_activity(self, branch_name, since="1.year", exclude="", path=None):
+        return self._commit.iter_activity(branch_name, since, exclude, path)
+
+    def search_commits(self, branch_name, query, path=None):
+        return self._commit.search_commits(branch_name, query, path)
+
+    def open_commit_log(
+        self, branch_name, start=0, pushed_from=None, filter_path="", path=None
+    ):
+        return self._commit.open_commit_log(
+            branch_name, start, pushed_from, filter_path, path
+        )
+
+    def get_commit_bodies(self, branch_name, max_commits=300, path=None, shas=None):
+        return self._commit.get_commit_bodies(branch_name, max_commits, path, shas)
 
     def list_commits_in_range(self, base, path=None):
         return self._commit.list_commits_in_range(base, path)
@@ -162,6 +197,9 @@ class GitApi:
     def load_commit_info(self, commit_sha="", file_name="", plain=False, path=None):
         return self._commit.load_commit_info(commit_sha, file_name, plain, path)
 
+    def stream_commit_info(self, commit_sha="", file_name="", plain=False, path=None):
+        return self._commit.stream_commit_info(commit_sha, file_name, plain, path)
+
     def get_commit_stats(self, commit_sha, path=None):
         return self._commit.get_commit_stats(commit_sha, path)
 
@@ -169,6 +207,12 @@ class GitApi:
     def load_status(self, path=None, use_cache=True):
         return self._status.load_status(path, use_cache)
 
+    def load_status_with_branch(self, path=None, use_cache=True):
+        return self._status.load_status_with_branch(path, use_cache)
+
+    def branch_status(self, path=None):
+        return self._status.branch_status(path)
+
     def status_porcelain(self, path=None):
         return self._status.status_porcelain(path)
 
@@ -216,6 +260,11 @@ class GitApi:
     def load_file_diff(self, file, tracked=True, cached=False, plain=False, path=None):
         return self._diff.load_file_diff(file, tracked, cached, plain, path)
 
+    def stream_file_diff(
+        self, file, tracked=True, cached=False, plain=False, path=None
+    ):
+        return self._diff.stream_file_diff(file, tracked, cached, plain, path)
+
     def get_file_history(self, path, repo_path=None):
         return self._diff.get_file_history(path, repo_path)
 
@@ -7,7 +7,6 @@ Date: 2026-08-13
 
 from __future__ import annotations
 
-import shlex
 import time
 from typing import cast
 
@@ -34,11 +33,13 @@ class _BranchOps(_OpsBase):
         """Get repo all branch."""
         path = path or self.path
 
-        include_all = "--all" if include_remote else ""
         color = "never" if plain else "always"
+        command = ["git", "branch", f"--color={color}"]
+        if include_remote:
+            command.insert(2, "--all")
 
         _, _, res = self.executor.exec(
-            f"git branch {include_all} --color={color}",
+            command,
             flags=REPLY | DECODE,
             cwd=path,
         )
@@ -56,16 +57,18 @@ class _BranchOps(_OpsBase):
         path = path or self.path
         branches: list[Branch] = []
 
+        command = ["git", "branch"]
         if scope == "remote":
-            flag = "-r"
+            command.append("-r")
         elif scope == "all":
-            flag = "-a"
-        else:
-            flag = ""
+            command.append("-a")
+        command += [
+            "--sort=-committerdate",
+            "--format=%(HEAD)|%(refname:short)|%(refname)|%(upstream:short)|%(upstream:track)",
+        ]
 
         _, _, resp = self.executor.exec(
-            f"git branch {flag} --sort=-committerdate "
-            '--format="%(HEAD)|%(refname:short)|%(refname)|%(upstream:short)|%(upstream:track)" ',
+            command,
             flags=REPLY | DECODE,
             cwd=path,
         )
@@ -115,7 +118,7 @@ class _BranchOps(_OpsBase):
     def checkout_branch(self, branch_name: str, path: str | None = None) -> None:
         path = path or self.path
         code, err, out = self.executor.exec(
-            f"git checkout {shlex.quote(branch_name)}",
+            ["git", "checkout", branch_name],
             cwd=path,
             flags=WAITING | REPLY | DECODE,
         )
@@ -130,7 +133,7 @@ class _BranchOps(_OpsBase):
     ) -> None:
         path = path or self.path
         code, err, out = self.executor.exec(
-            f"git branch -m {shlex.quote(old_name)} {shlex.quote(new_name)}",
+            ["git", "branch", "-m", old_name, new_name],
             cwd=path,
             flags=WAITING | REPLY | DECODE,
         )
@@ -145,7 +148,7 @@ class _BranchOps(_OpsBase):
         """Create a new branch from HEAD and switch to it."""
         path = path or self.path
         code, err, out = self.executor.exec(
-            f"git checkout -b {shlex.quote(branch_name)}",
+            ["git", "checkout", "-b", branch_name],
             cwd=path,
             flags=WAITING | REPLY | DECODE,
         )
@@ -162,7 +165,7 @@ class _BranchOps(_OpsBase):
         path = path or self.path
         flag = "-D" if force else "-d"
         code, err, out = self.executor.exec(
-            f"git branch {flag} {shlex.quote(branch_name)}",
+            ["git", "branch", flag, branch_name],
             cwd=path,
             flags=WAITING | REPLY | DECODE,
         )
@@ -175,7 +178,7 @@ class _BranchOps(_OpsBase):
         """Create a branch at a specific commit."""
         path = path or self.path
         code, err, _ = self.executor.exec(
-            f"git branch {shlex.quote(branch_name)} {shlex.quote(sha)}",
+            ["git", "branch", branch_name, sha],
             cwd=path,
             flags=WAITING | REPLY | DECODE,
         )
@@ -186,7 +189,7 @@ class _BranchOps(_OpsBase):
         """Get the SHA of a branch. Returns None if the branch does not exist."""
         path = path or self.path
         code, _err, out = self.executor.exec(
-            f"git rev-parse --verify {shlex.quote(branch_name)}",
+            ["git", "rev-parse", "--verify", branch_name],
             cwd=path,
             flags=REPLY | DECODE,
         )
@@ -200,15 +203,16 @@ class _BranchOps(_OpsBase):
         """Return branch creation date as YYYY-MM-DD (best-effort via reflog)."""
         path = path or self.path
         _, _, resp = self.executor.exec(
-            f"git reflog show {shlex.quote(branch_name)} --format=%at | tail -1",
+            ["git", "reflog", "show", branch_name, "--format=%at"],
             flags=REPLY | DECODE,
             cwd=path,
-            shell=True,
         )
-        if not resp:
+        # Oldest reflog entry is last.
+        lines = cast(str, resp or "").split()
+        if not lines:
             return "?"
         try:
-            ts = int(resp.strip())
+            ts = int(lines[-1])
             return time.strftime("%Y-%m-%d", time.localtime(ts))
         except ValueError:
             return "?"
@@ -229,7 +233,7 @@ class _BranchOps(_OpsBase):
         """
         path = path or self.path
         _code, _err, out = self.executor.exec(
-            f"git log {shlex.quote(branch_name)} -1 --pretty=format:%s%x00%aN",
+            ["git", "log", branch_name, "-1", "--pretty=format:%s%x00%aN"],
             flags=REPLY | DECODE,
             cwd=path,
         )
@@ -8,15 +8,18 @@ Date: 2026-08-13
 from __future__ import annotations
 
 import shlex
-from collections.abc import Iterator
+import threading
+from subprocess import Popen
+from collections.abc import Iterator, Sequence
 from typing import cast
 
 from pigit.ext.executor import REPLY, DECODE
 
 from ..model import Commit
 from ._base import _OpsBase
+from ._diff import DiffStream
 from ._errors import GitError
-from ._util import _RE_COMMIT_TAG, parse_numstat
+from ._util import _RE_COMMIT_TAG, parse_numstat, split_commit_object
 
 # Default pretty format for git log output (shared with the facade).
 _DEFAULT_LOG_FORMAT = (
@@ -25,15 +28,16 @@ _DEFAULT_LOG_FORMAT = (
 
 # Native `git log --decorate --graph` preview: bounded, no `--all`.
 LOG_GRAPH_LIMIT = 80
-_LOG_GRAPH_ARGS = "--decorate --graph --color=always"
+_LOG_GRAPH_ARGS = ["--decorate", "--graph", "--color=always"]
 
 
 class _CommitOps(_OpsBase):
     """Commit listing, log, and metadata."""
 
-    def __init__(self, api, core) -> None:
+    def __init__(self, api, core, objects) -> None:
         super().__init__(api)
         self._core = core
+        self._objects = objects
 
     def load_log(
         self,
@@ -45,11 +49,17 @@ class _CommitOps(_OpsBase):
     ) -> str:
         path = path or self.path
 
-        branch_part = shlex.quote(branch_name) if branch_name else ""
-        limit_part = f"-{limit}" if limit else ""
-        filter_part = f"--follow -- {shlex.quote(filter_path)}" if filter_path else ""
+        # ``arg_str`` keeps its shell-style quoting for callers; split it here.
+        command = ["git", "log"]
+        if branch_name:
+            command.append(branch_name)
+        command += shlex.split(arg_str)
+        if limit:
+            command.append(f"-{limit}")
+        if filter_path:
+            command += ["--follow", "--", filter_path]
         _, _, resp = self.executor.exec(
-            f"git log {branch_part} {arg_str} {limit_part} {filter_part}",
+            command,
             flags=REPLY | DECODE,
             cwd=path,
         )
@@ -80,7 +90,7 @@ class _CommitOps(_OpsBase):
 
         path = path or self.path
         code, err, resp = self.executor.exec(
-            f"git log {_LOG_GRAPH_ARGS} -n {limit} {shlex.quote(branch_name)}",
+            ["git", "log", *_LOG_GRAPH_ARGS, "-n", str(limit), branch_name],
             flags=REPLY | DECODE,
             cwd=path,
         )
@@ -110,50 +120,85 @@ class _CommitOps(_OpsBase):
         first_pushed_commit = self._core.get_first_pushed_commit(path, branch_name)
         passed_first_pushed_commit = not first_pushed_commit
 
-        branch_part = shlex.quote(branch_name) if branch_name else ""
-        limit_part = f"-n {max_commits}" if limit else ""
-        filter_part = f"--follow -- {shlex.quote(filter_path)}" if filter_path else ""
-        command = (
-            f"git log {branch_part} --oneline "
-            f'--pretty=format:"%H|%at|%aN|%d|%P|%s" '
-            f"{limit_part} --abbrev=20 --date=unix {filter_part}"
-        ).strip()
-
+        command = _log_command(
+            branch_name, max_commits if limit else None, filter_path=filter_path
+        )
         for line in self.executor.exec_stream(command, cwd=path):
-            if not line.strip():
+            commit = _parse_log_line(line)
+            if commit is None:
                 continue
-            split_ = line.split("|")
-            if len(split_) < 6:
+            if commit.sha == first_pushed_commit:
+                passed_first_pushed_commit = True
+            commit.status = "pushed" if passed_first_pushed_commit else "unpushed"
+            yield commit
+
+    def iter_activity(
+        self,
+        branch_name: str,
+        since: str = "1.year",
+        exclude: str = "",
+        path: str | None = None,
+    ) -> Iterator[tuple[int, str]]:
+        """Yield ``(author_timestamp, author)`` per commit, streaming ``git log``.
+
+        Args:
+            branch_name: Ref (or SHA) to walk from.
+            since: ``git log --since`` value bounding the walk.
+            exclude: Optional commit whose ancestors are skipped
+                (``branch_name ^exclude``), for incremental updates.
+            path: Repo root; defaults to :attr:`path`.
+        """
+        path = path or self.path
+        command = ["git", "log", branch_name]
+        if exclude:
+            command.append(f"^{exclude}")
+        command += [f"--since={since}", "--format=%at%x09%aN", "--"]
+        for line in self.executor.exec_stream(command, cwd=path):
+            stamp, sep, author = line.partition("\t")
+            if not sep or not stamp.isdigit():
                 continue
+            yield int(stamp), author
 
-            sha = split_[0]
-            unix_timestamp = int(split_[1])
-            author = split_[2]
-            extra_info = (split_[3]).strip()
-            parent_str = split_[4].strip()
-            message = "|".join(split_[5:])
+    def open_commit_log(
+        self,
+        branch_name: str,
+        start: int = 0,
+        pushed_from: int | None = None,
+        filter_path: str = "",
+        path: str | None = None,
+    ) -> CommitLog:
+        """Return a resumable :class:`CommitLog` positioned at ``start``.
 
-            parents = parent_str.split() if parent_str else []
+        Args:
+            branch_name: Branch ref to log.
+            start: Commits already loaded by the caller (first page to read).
+            pushed_from: Log offset of the first pushed commit when the caller
+                has already seen it; ``None`` lets the log find it.
+            filter_path: Optional path filter (``--follow``).
+            path: Repo root; defaults to :attr:`path`.
+        """
+        return CommitLog(
+            self,
+            branch_name,
+            start=start,
+            pushed_from=pushed_from,
+            filter_path=filter_path,
+            path=path or self.path,
+        )
 
-            tag = []
-            if extra_info:
-                if match := _RE_COMMIT_TAG.search(extra_info):
-                    tag.append(match[1])
+    def search_commits(
+        self, branch_name: str, query: str, path: str | None = None
+    ) -> CommitSearch:
+        """Return a :class:`CommitSearch` over ``branch_name``'s whole history.
 
-            if sha == first_pushed_commit:
-                passed_first_pushed_commit = True
-            status = {True: "unpushed", False: "pushed"}[not passed_first_pushed_commit]
-
-            yield Commit(
-                sha=sha,
-                msg=message,
-                author=author,
-                unix_timestamp=unix_timestamp,
-                status=status,
-                extra_info=extra_info,
-                tag=tag,
-                parents=parents,
-            )
+        Args:
+            branch_name: Ref whose history is searched.
+            query: ``author:<text>`` matches authors, ``-S<text>`` /
+                ``-G<regex>`` match added or removed code; any other text
+                matches commit messages (case-insensitive substring).
+            path: Repo root; defaults to :attr:`path`.
+        """
+        return CommitSearch(self, branch_name, query, path=path or self.path)
 
     def load_commits(
         self,
@@ -182,10 +227,14 @@ class _CommitOps(_OpsBase):
         preserves ``--reverse`` order.
         """
         path = path or self.path
-        cmd = (
-            f'git log --reverse --topo-order --pretty=format:"%H|%P|%s" '
-            f"{shlex.quote(base)}..HEAD"
-        )
+        cmd = [
+            "git",
+            "log",
+            "--reverse",
+            "--topo-order",
+            "--pretty=format:%H|%P|%s",
+            f"{base}..HEAD",
+        ]
         code, err, resp = self.executor.exec(cmd, flags=REPLY | DECODE, cwd=path)
         if code != 0:
             raise GitError(err or f"git log failed for {base}")
@@ -219,6 +268,7 @@ class _CommitOps(_OpsBase):
         branch_name: str,
         max_commits: int = 300,
         path: str | None = None,
+        shas: Sequence[str] | None = None,
     ) -> dict[str, str]:
         """Return a ``{sha: full body}`` map for ``branch_name``.
 
@@ -227,13 +277,27 @@ class _CommitOps(_OpsBase):
         full message must read it instead of ``%s``. Records are framed with
         ASCII RS (``\\x1e``) and SHA/body split with US (``\\x1f``) so multi-line
         bodies survive shell parsing without ambiguity.
+
+        When the caller already holds the commit list, ``shas`` reads those
+        commit objects through the persistent ``git cat-file`` pair instead of
+        walking ``branch_name`` again.
         """
         path = path or self.path
-        branch_part = shlex.quote(branch_name) if branch_name else ""
-        cmd = (f"git log {branch_part} --format=%H%x1f%B%x1e -n {max_commits}").strip()
+        bodies: dict[str, str] = {}
+        if shas is not None:
+            objs = self._objects.read_many(shas, path)
+            if objs is not None:
+                for sha, obj in zip(shas, objs):
+                    if obj is None or obj[0] != "commit" or obj[2] is None:
+                        continue
+                    _headers, message = split_commit_object(obj[2])
+                    bodies[sha] = message.strip("\n")
+                return bodies
+        cmd = ["git", "log", "--format=%H%x1f%B%x1e", "-n", str(max_commits)]
+        if branch_name:
+            cmd.insert(2, branch_name)
         _, _, resp = self.executor.exec(cmd, flags=REPLY | DECODE, cwd=path)
 
-        bodies: dict[str, str] = {}
         if resp is None:
             return bodies
         resp_str = cast(str, resp)
@@ -258,23 +322,26 @@ class _CommitOps(_OpsBase):
                 file_name: file name(include full path).
                 plain: whether has color.
         """
-        path = path or self.path
-        color_str = "never" if plain else "always"
-
-        if file_name:
-            cmd = f"git show --color={color_str} {shlex.quote(commit_sha)} -- {shlex.quote(file_name)}"
-        else:
-            cmd = f"git show --color={color_str} {shlex.quote(commit_sha)}"
-
         _, _, resp = self.executor.exec(
-            cmd,
+            _show_command(commit_sha, file_name, plain),
             flags=REPLY | DECODE,
-            cwd=path,
+            cwd=path or self.path,
         )
         if resp is None:
             return ""
         return cast(str, resp).rstrip()
 
+    def stream_commit_info(
+        self,
+        commit_sha: str = "",
+        file_name: str = "",
+        plain: bool = False,
+        path: str | None = None,
+    ) -> DiffStream:
+        """Like :meth:`load_commit_info`, but return a :class:`DiffStream`."""
+        command = _show_command(commit_sha, file_name, plain)
+        return DiffStream(self, command, path=path or self.path)
+
     def get_commit_stats(
         self, commit_sha: str, path: str | None = None
     ) -> tuple[list[tuple[str, int, int]], int, int]:
@@ -286,10 +353,263 @@ class _CommitOps(_OpsBase):
         """
         path = path or self.path
         _, _, resp = self.executor.exec(
-            f"git show --numstat --format= {shlex.quote(commit_sha)}",
+            ["git", "show", "--numstat", "--format=", commit_sha],
             flags=REPLY | DECODE,
             cwd=path,
         )
         if not resp:
             return [], 0, 0
         return parse_numstat(cast(str, resp))
+
+
+class CommitLog:
+    """Page through a long ``git log`` without re-walking history per page.
+
+    Forward pages come from one ``git log --skip=<start>`` process that stays
+    open between reads (the pipe back-pressures it while idle). Earlier
+    ranges, e.g. pages a viewer dropped to bound memory, are re-read with
+    ``--skip``/``-n``. Reads are serialized; :meth:`close` may come from
+    another thread and takes effect once an in-flight read returns.
+    """
+
+    def __init__(
+        self,
+        ops: _CommitOps,
+        branch_name: str,
+        *,
+        start: int,
+        pushed_from: int | None,
+        filter_path: str,
+        path: str | None,
+    ) -> None:
+        self._ops = ops
+        self._branch_name = branch_name
+        self._filter_path = filter_path
+        self._path = path
+        self._offset = start
+        self._pushed_from = pushed_from
+        self._first_pushed: str | None = None
+        self._stream: Iterator[str] | None = None
+        self._exhausted = False
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @property
+    def offset(self) -> int:
+        """Log position of the next forward read."""
+        return self._offset
+
+    @property
+    def exhausted(self) -> bool:
+        """True once the forward stream reached the end of history."""
+        return self._exhausted or self._closed
+
+    def read_page(self, count: int) -> list[Commit]:
+        """Read up to ``count`` commits after :attr:`offset` from the stream."""
+        with self._lock:
+            if self.exhausted:
+                return []
+            if self._stream is None:
+                self._stream = self._ops.executor.exec_stream(
+                    _log_command(
+                        self._branch_name,
+                        None,
+                        filter_path=self._filter_path,
+                        skip=self._offset,
+                    ),
+                    cwd=self._path,
+                )
+            page: list[Commit] = []
+            while len(page) < count:
+                line = next(self._stream, None)
+                if line is None:
+                    self._exhausted = True
+                    self._close_stream()
+                    break
+                commit = _parse_log_line(line)
+                if commit is None:
+                    continue
+                commit.status = self._status_at(self._offset, commit.sha)
+                self._offset += 1
+                page.append(commit)
+            if self._closed:
+                self._close_stream()
+            return page
+
+    def read_range(self, start: int, count: int) -> list[Commit]:
+        """Re-read ``count`` commits at log offset ``start`` (``--skip``)."""
+        if count <= 0:
+            return []
+        command = _log_command(
+            self._branch_name, count, filter_path=self._filter_path, skip=start
+        )
+        page: list[Commit] = []
+        with self._lock:
+            for line in self._ops.executor.exec_stream(command, cwd=self._path):
+                commit = _parse_log_line(line)
+                if commit is None:
+                    continue
+                commit.status = self._status_at(start + len(page), commit.sha)
+                page.append(commit)
+        return page
+
+    def close(self) -> None:
+        """Stop the forward stream (terminates its ``git log``)."""
+        self._closed = True
+        if self._lock.acquire(blocking=False):
+            try:
+                self._close_stream()
+            finally:
+                self._lock.release()
+
+    def _close_stream(self) -> None:
+        stream, self._stream = self._stream, None
+        close = getattr(stream, "close", None)
+        if callable(close):
+            close()
+
+    def _status_at(self, offset: int, sha: str) -> str:
+        """``pushed`` from the first commit shared with the upstream onwards."""
+        if self._pushed_from is None:
+            if self._first_pushed is None:
+                self._first_pushed = self._ops._core.get_first_pushed_commit(
+                    self._path, self._branch_name
+                )
+                if not self._first_pushed:
+                    self._pushed_from = 0
+            if sha == self._first_pushed:
+                self._pushed_from = offset
+        if self._pushed_from is not None and offset >= self._pushed_from:
+            return "pushed"
+        return "unpushed"
+
+
+class CommitSearch:
+    """A ``git log`` search streamed one match at a time.
+
+    Iterating runs the search; :meth:`close` may come from another thread and
+    terminates ``git log`` right away, even while it is still walking history
+    between matches. Matches carry no pushed/unpushed ``status``.
+    """
+
+    def __init__(
+        self, ops: _CommitOps, branch_name: str, query: str, *, path: str | None
+    ) -> None:
+        self._ops = ops
+        self._path = path
+        self._args = _search_args(query)
+        self._command = _log_command(branch_name, None, search=self._args)
+        self._proc: Popen | None = None
+        self._closed = False
+
+    def __iter__(self) -> Iterator[Commit]:
+        if not self._args or self._closed:
+            return
+        executor = self._ops.executor
+        proc = executor.spawn_pipe(self._command, cwd=self._path)
+        if proc is None:
+            lines: Iterator[str] = executor.exec_stream(self._command, cwd=self._path)
+        else:
+            self._proc = proc
+            if proc.stdin is not None:
+                proc.stdin.close()
+            if self._closed:
+                proc.terminate()
+            lines = (
+                raw.decode("utf-8", errors="replace").rstrip("\r\n")
+                for raw in proc.stdout or ()
+            )
+        try:
+            for line in lines:
+                if self._closed:
+                    break
+                commit = _parse_log_line(line)
+                if commit is not None:
+                    yield commit
+        finally:
+            if proc is not None:
+                self._stop(proc)
+
+    def close(self) -> None:
+        """Stop the search (terminates its ``git log``)."""
+        self._closed = True
+        proc = self._proc
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
+
+    @staticmethod
+    def _stop(proc: Popen) -> None:
+        if proc.poll() is None:
+            proc.terminate()
+        if proc.stdout is not None:
+            proc.stdout.close()
+        proc.wait()
+
+
+def _show_command(commit_sha: str, file_name: str, plain: bool) -> list[str]:
+    command = ["git", "show", f"--color={'never' if plain else 'always'}", commit_sha]
+    if file_name:
+        command += ["--", file_name]
+    return command
+
+
+def _log_command(
+    branch_name: str,
+    max_commits: int | None,
+    *,
+    filter_path: str = "",
+    skip: int = 0,
+    search: Sequence[str] = (),
+) -> list[str]:
+    """Build the ``git log`` argv parsed by :func:`_parse_log_line`."""
+    command = ["git", "log"]
+    if branch_name:
+        command.append(branch_name)
+    command += ["--oneline", "--pretty=format:%H|%at|%aN|%d|%P|%s", *search]
+    if skip:
+        command.append(f"--skip={skip}")
+    if max_commits is not None:
+        command += ["-n", str(max_commits)]
+    command += ["--abbrev=20", "--date=unix"]
+    if filter_path:
+        command += ["--follow", "--", filter_path]
+    return command
+
+
+def _search_args(query: str) -> list[str]:
+    """Map a :meth:`_CommitOps.search_commits` query to ``git log`` options."""
+    query = query.strip()
+    if query.startswith("author:"):
+        text = query.removeprefix("author:").strip()
+        return ["-i", "-F", f"--author={text}"] if text else []
+    if query[:2] in ("-S", "-G"):
+        text = query[2:].strip()
+        return [query[:2] + text] if text else []
+    return ["-i", "-F", f"--grep={query}"] if query else []
+
+
+def _parse_log_line(line: str) -> Commit | None:
+    """Parse one :func:`_log_command` line; ``status`` is left for the caller."""
+    if not line.strip():
+        return None
+    split_ = line.split("|")
+    if len(split_) < 6:
+        return None
+
+    extra_info = split_[3].strip()
+    parent_str = split_[4].strip()
+    tag = []
+    if extra_info:
+        if match := _RE_COMMIT_TAG.search(extra_info):
+            tag.append(match[1])
+
+    return Commit(
+        sha=split_[0],
+        msg="|".join(split_[5:]),
+        author=split_[2],
+        unix_timestamp=int(split_[1]),
+        status="",
+        extra_info=extra_info,
+        tag=tag,
+        parents=parent_str.split() if parent_str else [],
+    )
@@ -7,23 +7,113 @@ Date: 2026-08-13
 
 from __future__ import annotations
 
+import os
 import re
-import shlex
 from pathlib import Path
 from typing import cast
 
 from pigit.ext.executor import WAITING, REPLY, DECODE
 
+from ..model import RepoLayout
 from ._base import _OpsBase
 from ._errors import GitError
 from ._util import _RE_CONFIG_NEWLINE
 
+# One spawn answers every layout question; ``--show-toplevel`` goes last because
+# it is the only one that fails in a bare repo or inside the git dir.
+_LAYOUT_CMD = [
+    "git",
+    "rev-parse",
+    "--git-dir",
+    "--git-common-dir",
+    "--is-bare-repository",
+    "--is-inside-work-tree",
+    "--show-toplevel",
+]
+
 
 class _CoreOps(_OpsBase):
     """Repo discovery, config, and head primitives used across the git API."""
 
     def __init__(self, api) -> None:
         super().__init__(api)
+        # {resolved query path: (stat signature, layout)}; see ``repo_layout``.
+        self._layout_cache: dict[str, tuple[tuple, RepoLayout]] = {}
+
+    @staticmethod
+    def _layout_signature(layout: RepoLayout) -> tuple:
+        """Stat the ``.git`` entry and ``HEAD``; a change means re-resolve."""
+
+        def st(p: str) -> tuple[int, int] | None:
+            try:
+                s = os.stat(p)
+                return (s.st_mtime_ns, s.st_ino)
+            except OSError:
+                return None
+
+        entry = (
+            os.path.join(layout.toplevel, ".git")
+            if layout.toplevel
+            else layout.git_dir
+        )
+        return (st(entry), st(os.path.join(layout.git_dir, "HEAD")))
+
+    def _load_layout(self, path: str) -> tuple[RepoLayout | None, str]:
+        """Run the single ``rev-parse`` for ``path``; return ``(layout, stderr)``."""
+        code, err, out = self.executor.exec(
+            _LAYOUT_CMD,
+            flags=REPLY | DECODE,
+            cwd=path,
+        )
+        # ``--show-toplevel`` fails last (bare repo / inside .git) after the
+        # other answers were printed, so a short reply is still usable.
+        lines = cast(str, out or "").splitlines()
+        if code is None or len(lines) < 4:
+            return None, cast(str, err or "")
+
+        def absolute(raw: str) -> str:
+            return str((Path(path) / raw.strip()).resolve())
+
+        toplevel = ""
+        if code == 0 and len(lines) >= 5 and lines[4].strip():
+            toplevel = str(Path(lines[4].strip()).resolve())
+        layout = RepoLayout(
+            toplevel=toplevel,
+            git_dir=absolute(lines[0]),
+            common_dir=absolute(lines[1]),
+            is_bare=lines[2].strip() == "true",
+            is_inside_work_tree=lines[3].strip() == "true",
+        )
+        return layout, ""
+
+    def _repo_layout(self, path: str | None) -> tuple[RepoLayout | None, str]:
+        path = path if path is not None else self.path
+        if path is None or path == "":
+            path = "."
+        path = str(Path(path).resolve())
+
+        cached = self._layout_cache.get(path)
+        if cached is not None:
+            sig, layout = cached
+            if self._layout_signature(layout) == sig:
+                return layout, ""
+        if not Path(path).is_dir():
+            return None, ""
+
+        layout, err = self._load_layout(path)
+        if layout is None:
+            self._layout_cache.pop(path, None)
+        else:
+            self._layout_cache[path] = (self._layout_signature(layout), layout)
+        return layout, err
+
+    def repo_layout(self, path: str | None = None) -> RepoLayout | None:
+        """Return the :class:`RepoLayout` for ``path``, or ``None`` outside a repo.
+
+        Resolved by one ``git rev-parse`` and cached per path; the entry is
+        reused until the ``.git`` entry or ``HEAD`` changes on disk.
+        """
+        return self._repo_layout(path)[0]
 
     def confirm_repo(
         self, given_path: str | None = None, exclude_submodule: bool = False
@@ -32,49 +122,18 @@ class _CoreOps(_OpsBase):
         Get the current git repository path. If not, the path is empty.
         Get the local git config path. If not, the path is empty.
 
-        Uses ``git rev-parse --show-toplevel`` so the work tree root is absolute
-        even when ``given_path`` is a subdirectory (e.g. TUI started under ``pkg/``).
+        Uses ``git rev-parse --show-toplevel`` (via :meth:`repo_layout`) so the
+        work tree root is absolute even when ``given_path`` is a subdirectory
+        (e.g. TUI started under ``pkg/``).
 
         Args:
             exclude_submodule: Reserved for API compatibility; unused.
         """
         _ = exclude_submodule
-        path = given_path if given_path is not None else self.path
-        if path is None or path == "":
-            path = "."
-        path = str(Path(path).resolve())
-
-        repo_path: str = ""
-        git_conf_path: str = ""
-
-        if not Path(path).is_dir():
-            return repo_path, git_conf_path
-
-        code, _err, top_out = self.executor.exec(
-            "git rev-parse --show-toplevel",
-            flags=REPLY | DECODE,
-            cwd=path,
-        )
-        if code is None or code != 0 or not top_out or not str(top_out).strip():
-            return "", ""
-
-        repo_path = str(Path(str(top_out).strip()).resolve())
-
-        code2, _err2, gd_out = self.executor.exec(
-            "git rev-parse --git-dir",
-            flags=REPLY | DECODE,
-            cwd=path,
-        )
-        if code2 is None or code2 != 0 or not gd_out or not str(gd_out).strip():
+        layout = self.repo_layout(given_path)
+        if layout is None or not layout.toplevel:
             return "", ""
-
-        git_dir_raw = str(gd_out).strip()
-        if Path(git_dir_raw).is_absolute():
-            git_conf_path = str(Path(git_dir_raw).resolve())
-        else:
-            git_conf_path = str((Path(repo_path) / git_dir_raw).resolve())
-
-        return repo_path, git_conf_path
+        return layout.toplevel, layout.git_dir
 
     def get_config(self, path: str | None = None) -> dict[str, dict[str, str]]:
         """Try to read git config and parse, return a config dict.
@@ -125,7 +184,7 @@ class _CoreOps(_OpsBase):
         """
         path = path or self.path
         code, _err, out = self.executor.exec(
-            f"git config {shlex.quote(key)}",
+            ["git", "config", key],
             cwd=path,
             flags=REPLY | DECODE,
         )
@@ -137,11 +196,18 @@ class _CoreOps(_OpsBase):
         """Get current repo head. Return a branch name or a commit sha string."""
         path = path or self.path
 
-        _, _, head = self.executor.exec(
-            "git symbolic-ref -q --short HEAD || git describe --tags --exact-match",
+        # A branch name first; a detached HEAD falls back to an exact tag.
+        code, _, head = self.executor.exec(
+            ["git", "symbolic-ref", "-q", "--short", "HEAD"],
             flags=REPLY | DECODE,
             cwd=path,
         )
+        if code != 0:
+            _, _, head = self.executor.exec(
+                ["git", "describe", "--tags", "--exact-match"],
+                flags=REPLY | DECODE,
+                cwd=path,
+            )
         if head is not None:
             head = cast(str, head).rstrip()
         return head
@@ -157,10 +223,7 @@ class _CoreOps(_OpsBase):
             else:
                 return ""
 
-        command = "git merge-base {} {}@{{u}}".format(
-            shlex.quote(branch_name),
-            shlex.quote(branch_name),
-        )
+        command = ["git", "merge-base", branch_name, f"{branch_name}@{{u}}"]
         _, _, commit_msg = self.executor.exec(command, flags=REPLY | DECODE, cwd=path)
         if commit_msg is None:
             return ""
@@ -172,7 +235,7 @@ class _CoreOps(_OpsBase):
         # Get remote name, exit when error.
         path = path or self.path
         _, _, res = self.executor.exec(
-            "git remote show", flags=REPLY | DECODE, cwd=path
+            ["git", "remote", "show"], flags=REPLY | DECODE, cwd=path
         )
 
         return cast(str, res).strip().splitlines() if res else []
@@ -191,7 +254,7 @@ class _CoreOps(_OpsBase):
 
         # Get remote url, exit when error.
         _, err, remote_url = self.executor.exec(
-            f"git ls-remote --get-url {shlex.quote(remote_name)}",
+            ["git", "ls-remote", "--get-url", remote_name],
             flags=REPLY | DECODE,
             cwd=path,
         )
@@ -217,39 +280,21 @@ class _CoreOps(_OpsBase):
             cur = parent
 
     def get_git_dir(self, path: str | None = None) -> str:
-        """Return the git directory path via ``git rev-parse --git-dir``."""
-        path = path or self.path
-        code, err, out = self.executor.exec(
-            "git rev-parse --git-dir",
-            flags=REPLY | DECODE,
-            cwd=path,
-        )
-        if code != 0 or not out:
+        """Return the absolute git directory (``git rev-parse --git-dir``)."""
+        layout, err = self._repo_layout(path or self.path)
+        if layout is None:
             raise GitError(err or "Failed to get git directory")
-        git_dir_raw = cast(str, out).strip()
-        if Path(git_dir_raw).is_absolute():
-            return str(Path(git_dir_raw).resolve())
-        repo_root, _ = self.confirm_repo(path)
-        return str((Path(repo_root) / git_dir_raw).resolve())
+        return layout.git_dir
 
     def get_git_common_dir(self, path: str | None = None) -> str:
-        """Return the common git directory via ``git rev-parse --git-common-dir``.
+        """Return the common git directory (``git rev-parse --git-common-dir``).
 
         Equals ``get_git_dir`` for a normal repo; differs for linked worktrees.
         """
-        path = path or self.path
-        code, err, out = self.executor.exec(
-            "git rev-parse --git-common-dir",
-            flags=REPLY | DECODE,
-            cwd=path,
-        )
-        if code != 0 or not out:
+        layout, err = self._repo_layout(path or self.path)
+        if layout is None:
             raise GitError(err or "Failed to get git common directory")
-        raw = cast(str, out).strip()
-        if Path(raw).is_absolute():
-            return str(Path(raw).resolve())
-        repo_root, _ = self.confirm_repo(path)
-        return str((Path(repo_root) / raw).resolve())
+        return layout.common_dir
 
     def get_head_tracking(self, path: str | None = None) -> tuple[str, int, int]:
         """Return ``(branch_or_label, ahead, behind)`` for the current HEAD.
@@ -260,7 +305,7 @@ class _CoreOps(_OpsBase):
         path = path or self.path
         head = self.get_head(path) or ""
         code, _err, out = self.executor.exec(
-            "git rev-list --left-right --count @{upstream}...HEAD",
+            ["git", "rev-list", "--left-right", "--count", "@{upstream}...HEAD"],
             flags=REPLY | DECODE,
             cwd=path,
         )
@@ -290,9 +335,8 @@ class _CoreOps(_OpsBase):
             GitError: When git cannot resolve ``ref`` to a commit.
         """
         path = path or self.path
-        spec = shlex.quote(f"{ref}^{{commit}}")
         code, err, out = self.executor.exec(
-            f"git rev-parse --verify --end-of-options {spec}",
+            ["git", "rev-parse", "--verify", "--end-of-options", f"{ref}^{{commit}}"],
             cwd=path,
             flags=WAITING | REPLY | DECODE,
         )
@@ -7,7 +7,8 @@ Date: 2026-08-13
 
 from __future__ import annotations
 
-import shlex
+import threading
+from collections.abc import Iterator
 from typing import cast
 
 from pigit.ext.executor import REPLY, DECODE
@@ -19,8 +20,9 @@ from ._util import _SHA_RE
 class _DiffOps(_OpsBase):
     """Diff and per-file history."""
 
-    def __init__(self, api) -> None:
+    def __init__(self, api, objects) -> None:
         super().__init__(api)
+        self._objects = objects
 
     def load_file_diff(
         self,
@@ -41,25 +43,31 @@ class _DiffOps(_OpsBase):
         Returns:
                 (str): change string.
         """
-        path = path or self.path
-
-        _plain = "--color=never" if plain else "--color=always"
-        _cached = "--cached" if cached else ""
-        _tracked = "--" if tracked else "--no-index -- /dev/null"
-
-        if "->" in file:  # rename status.
-            file = file.split("->")[-1].strip()
-
         _, err, res = self.executor.exec(
-            f"git diff --submodule --no-ext-diff {_plain} {_cached} {_tracked} "
-            f"{shlex.quote(file)}",
+            _file_diff_command(file, tracked, cached, plain),
             flags=REPLY | DECODE,
-            cwd=path,
+            cwd=path or self.path,
         )
         if err or res is None:
             return "Can't get diff."
         return cast(str, res).rstrip()
 
+    def stream_file_diff(
+        self,
+        file: str,
+        tracked: bool = True,
+        cached: bool = False,
+        plain: bool = False,
+        path: str | None = None,
+    ) -> DiffStream:
+        """Like :meth:`load_file_diff`, but return a :class:`DiffStream`.
+
+        Nothing runs until the first read. Errors are logged by the executor
+        and end the stream early instead of producing a sentinel line.
+        """
+        command = _file_diff_command(file, tracked, cached, plain)
+        return DiffStream(self, command, path=path or self.path)
+
     def get_file_history(
         self, path: str, repo_path: str | None = None
     ) -> list[tuple[str, str]]:
@@ -71,7 +79,7 @@ class _DiffOps(_OpsBase):
         """
         repo_path = repo_path or self.path
         code, err, out = self.executor.exec(
-            f"git log --follow --first-parent --oneline -- {shlex.quote(path)}",
+            ["git", "log", "--follow", "--first-parent", "--oneline", "--", path],
             flags=REPLY | DECODE,
             cwd=repo_path,
         )
@@ -97,12 +105,26 @@ class _DiffOps(_OpsBase):
 
         Returns a sentinel string ``"\\x00BINARY_OR_TOO_LARGE:size\\x00"``
         for binary or oversized files so the renderer can show a message.
+
+        Reads go through the repo's persistent ``git cat-file`` pair (size
+        check, then content) so stepping through history costs no spawns.
         """
         repo_path = repo_path or self.path
 
+        objs = self._objects.read_many(
+            [f"{commit_sha}:{path}"], repo_path, max_size=max_size
+        )
+        if objs is not None:
+            if objs[0] is None:
+                return None  # File does not exist at this commit
+            _type, size, data = objs[0]
+            if data is None or b"\x00" in data[:8192]:
+                return f"\x00BINARY_OR_TOO_LARGE:{size}\x00"
+            return data.decode("utf-8", errors="replace")
+
         # 1. Check size first to avoid loading multi-MB files into memory
         size_code, _, size_out = self.executor.exec(
-            f"git cat-file -s {shlex.quote(commit_sha)}:{shlex.quote(path)}",
+            ["git", "cat-file", "-s", f"{commit_sha}:{path}"],
             flags=REPLY | DECODE,
             cwd=repo_path,
         )
@@ -117,7 +139,7 @@ class _DiffOps(_OpsBase):
 
         # 2. Fetch content
         code, err, out = self.executor.exec(
-            f"git show {shlex.quote(commit_sha)}:{shlex.quote(path)}",
+            ["git", "show", f"{commit_sha}:{path}"],
             flags=REPLY | DECODE,
             cwd=repo_path,
         )
@@ -136,3 +158,79 @@ class _DiffOps(_OpsBase):
             if isinstance(out, str)
             else out.decode("utf-8", errors="replace")
         )
+
+
+def _file_diff_command(
+    file: str, tracked: bool, cached: bool, plain: bool
+) -> list[str]:
+    command = ["git", "diff", "--submodule", "--no-ext-diff"]
+    command.append("--color=never" if plain else "--color=always")
+    if cached:
+        command.append("--cached")
+    command += ["--"] if tracked else ["--no-index", "--", "/dev/null"]
+
+    if "->" in file:  # rename status.
+        file = file.split("->")[-1].strip()
+    return [*command, file]
+
+
+class DiffStream:
+    """Read the output of a diff command a batch of lines at a time.
+
+    The command starts on the first read and stays open between reads (the
+    pipe back-pressures it while idle), so a viewer holds only the lines it
+    asked for. Reads are serialized; :meth:`close` may come from another
+    thread and takes effect once an in-flight read returns.
+    """
+
+    def __init__(self, ops: _OpsBase, command: list[str], *, path: str | None) -> None:
+        self._ops = ops
+        self._command = command
+        self._path = path
+        # ``--no-index`` exits 1 whenever the files differ.
+        self._ok_codes = (0, 1) if "--no-index" in command else (0,)
+        self._stream: Iterator[str] | None = None
+        self._exhausted = False
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @property
+    def exhausted(self) -> bool:
+        """True once the output ended or the stream was closed."""
+        return self._exhausted or self._closed
+
+    def read_lines(self, count: int) -> list[str]:
+        """Read up to ``count`` more lines (fewer only at the end of output)."""
+        with self._lock:
+            if self.exhausted:
+                return []
+            if self._stream is None:
+                self._stream = self._ops.executor.exec_stream(
+                    self._command, cwd=self._path, ok_codes=self._ok_codes
+                )
+            lines: list[str] = []
+            while len(lines) < count:
+                line = next(self._stream, None)
+                if line is None:
+                    self._exhausted = True
+                    self._close_stream()
+                    break
+                lines.append(line)
+            if self._closed:
+                self._close_stream()
+            return lines
+
+    def close(self) -> None:
+        """Stop reading (terminates the command if it is still running)."""
+        self._closed = True
+        if self._lock.acquire(blocking=False):
+            try:
+                self._close_stream()
+            finally:
+                self._lock.release()
+
+    def _close_stream(self) -> None:
+        stream, self._stream = self._stream, None
+        close = getattr(stream, "close", None)
+        if callable(close):
+            close()
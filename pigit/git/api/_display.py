@@ -30,7 +30,7 @@ class _DisplayOps(_OpsBase):
         path = path or self.path
         color = "never" if plain else "always"
         code, _err, summary = self.executor.exec(
-            f"git shortlog --summary --numbered --color={color}",
+            ["git", "shortlog", "--summary", "--numbered", f"--color={color}"],
             flags=REPLY | DECODE,
             cwd=path,
         )
@@ -98,7 +98,15 @@ class _DisplayOps(_OpsBase):
         # Get the latest log.
         if not include_part or "log" in include_part:
             _, err, res = self.executor.exec(
-                f"git log --stat --oneline --decorate -1 --color={'always' if color else 'never'}",
+                [
+                    "git",
+                    "log",
+                    "--stat",
+                    "--oneline",
+                    "--decorate",
+                    "-1",
+                    f"--color={'always' if color else 'never'}",
+                ],
                 flags=REPLY | DECODE,
                 cwd=path,
             )
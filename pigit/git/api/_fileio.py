@@ -7,7 +7,6 @@ Date: 2026-08-13
 
 from __future__ import annotations
 
-import shlex
 from pathlib import Path
 from typing import cast
 
@@ -21,15 +20,16 @@ from ._util import _file_path_for_cmd
 class _FileioOps(_OpsBase):
     """File IO and git object primitives."""
 
-    def __init__(self, api) -> None:
+    def __init__(self, api, objects) -> None:
         super().__init__(api)
+        self._objects = objects
 
     def hash_object_file(self, file, path: str | None = None) -> str | None:
         """git hash-object -w <file>. Returns SHA or None. Writes blob to object DB."""
         path = path or self.path
         file_name = _file_path_for_cmd(file)
         code, _err, out = self.executor.exec(
-            f"git hash-object -w -- {shlex.quote(file_name)}",
+            ["git", "hash-object", "-w", "--", file_name],
             cwd=path,
             flags=REPLY | DECODE,
         )
@@ -41,14 +41,20 @@ class _FileioOps(_OpsBase):
         """git cat-file -p <sha> > <dest>. Restores exact blob content."""
         path = path or self.path
         dest_name = _file_path_for_cmd(dest)
+        dest_path = Path(path or ".") / dest_name
+        objs = self._objects.read_many([sha], path)
+        if objs is not None:
+            if objs[0] is None or objs[0][2] is None:
+                raise GitError(f"cat-file failed: {sha}")
+            dest_path.write_bytes(objs[0][2])
+            return
         code, err, out = self.executor.exec(
-            f"git cat-file -p {shlex.quote(sha)}",
+            ["git", "cat-file", "-p", sha],
             cwd=path,
             flags=REPLY,
         )
         if code != 0:
             raise GitError(err or f"cat-file failed: {sha}")
-        dest_path = Path(path or ".") / dest_name
         dest_path.write_bytes(
             out if isinstance(out, bytes) else cast(str, out).encode("utf-8")
         )
@@ -92,25 +98,32 @@ class _FileioOps(_OpsBase):
     def compare_index_worktree(self, relpath: str, path: str | None = None) -> str:
         """Return ``equal``, ``differ``, or ``worktree`` (untracked)."""
         path = path or self.path
-        quoted = shlex.quote(relpath)
-        code, _err, _out = self.executor.exec(
-            f"git rev-parse --verify --end-of-options :{quoted}",
-            cwd=path,
-            flags=WAITING | REPLY | DECODE,
-        )
-        if code != 0:
+        # Index and HEAD blobs in one batch round-trip when available.
+        infos = self._objects.info_many([f":{relpath}", f"HEAD:{relpath}"], path)
+        if infos is not None:
+            in_index = infos[0] is not None
+        else:
+            code, _err, _out = self.executor.exec(
+                ["git", "rev-parse", "--verify", "--end-of-options", f":{relpath}"],
+                cwd=path,
+                flags=WAITING | REPLY | DECODE,
+            )
+            in_index = code == 0
+        if not in_index:
             # No stage-0 entry: the path is untracked, staged for deletion,
             # or in conflict. Only a genuinely untracked file is "worktree";
             # the others still have tracked/conflict state worth reporting.
             _ucode, _uerr, uout = self.executor.exec(
-                f"git ls-files -u -- {quoted}",
+                ["git", "ls-files", "-u", "--", relpath],
                 cwd=path,
                 flags=REPLY | DECODE,
             )
             if (uout or "").strip():
                 return "differ"  # unmerged
+            if infos is not None:
+                return "differ" if infos[1] is not None else "worktree"
             hcode, _herr, _hout = self.executor.exec(
-                f"git rev-parse --verify --end-of-options HEAD:{quoted}",
+                ["git", "rev-parse", "--verify", "--end-of-options", f"HEAD:{relpath}"],
                 cwd=path,
                 flags=WAITING | REPLY | DECODE,
             )
@@ -119,7 +132,7 @@ class _FileioOps(_OpsBase):
         # ident, .gitattributes) to the worktree side, so it agrees with
         # ``git status`` where hashing the raw worktree bytes would not.
         code, _err, _out = self.executor.exec(
-            f"git diff --quiet --no-ext-diff -- {quoted}",
+            ["git", "diff", "--quiet", "--no-ext-diff", "--", relpath],
             cwd=path,
             flags=WAITING | REPLY | DECODE,
         )
@@ -129,7 +142,7 @@ class _FileioOps(_OpsBase):
         """Return unique sorted index stages for an unmerged path."""
         path = path or self.path
         _code, _err, out = self.executor.exec(
-            f"git ls-files -u -- {shlex.quote(relpath)}",
+            ["git", "ls-files", "-u", "--", relpath],
             cwd=path,
             flags=REPLY | DECODE,
         )
@@ -147,7 +160,7 @@ class _FileioOps(_OpsBase):
         """Return ``(short_sha, subject, author, unix_ts)`` for the last commit on *relpath*."""
         path = path or self.path
         _code, _err, out = self.executor.exec(
-            f"git log -1 --format=%h%x00%s%x00%aN%x00%at -- {shlex.quote(relpath)}",
+            ["git", "log", "-1", "--format=%h%x00%s%x00%aN%x00%at", "--", relpath],
             cwd=path,
             flags=REPLY | DECODE,
         )
@@ -8,7 +8,6 @@ Date: 2026-08-13
 from __future__ import annotations
 
 import os
-import shlex
 from pathlib import Path
 from typing import cast
 
@@ -36,7 +35,7 @@ class _MergeOps(_OpsBase):
         """Pull from the upstream remote. Raises GitError on failure."""
         path = path or self.path
         code, err, _out = self.executor.exec(
-            "git pull",
+            ["git", "pull"],
             cwd=path,
             flags=WAITING | REPLY | DECODE,
             env=_noninteractive_env(),
@@ -51,7 +50,7 @@ class _MergeOps(_OpsBase):
         """Push the current branch to its upstream. Raises GitError on failure."""
         path = path or self.path
         code, err, _out = self.executor.exec(
-            "git push",
+            ["git", "push"],
             cwd=path,
             flags=WAITING | REPLY | DECODE,
             env=_noninteractive_env(),
@@ -67,7 +66,7 @@ class _MergeOps(_OpsBase):
         """
         path = path or self.path
         code, err, _out = self.executor.exec(
-            f"git merge {shlex.quote(source)}",
+            ["git", "merge", source],
             cwd=path,
             flags=WAITING | REPLY | DECODE,
         )
@@ -108,7 +107,7 @@ class _MergeOps(_OpsBase):
         """Return the full SHA of HEAD via ``git rev-parse HEAD``."""
         path = path or self.path
         code, err, out = self.executor.exec(
-            "git rev-parse HEAD",
+            ["git", "rev-parse", "HEAD"],
             cwd=path,
             flags=WAITING | REPLY | DECODE,
         )
@@ -122,8 +121,7 @@ class _MergeOps(_OpsBase):
         """Return True if ``commit`` is an ancestor of ``of_ref`` (inclusive)."""
         path = path or self.path
         code, err, _out = self.executor.exec(
-            "git merge-base --is-ancestor "
-            f"{shlex.quote(commit)} {shlex.quote(of_ref)}",
+            ["git", "merge-base", "--is-ancestor", commit, of_ref],
             cwd=path,
             flags=WAITING | REPLY | DECODE,
         )
@@ -137,7 +135,7 @@ class _MergeOps(_OpsBase):
         """Return True if ``git diff`` lists unmerged (conflicted) paths."""
         path = path or self.path
         code, err, out = self.executor.exec(
-            "git diff --name-only --diff-filter=U",
+            ["git", "diff", "--name-only", "--diff-filter=U"],
             cwd=path,
             flags=WAITING | REPLY | DECODE,
         )
@@ -149,7 +147,7 @@ class _MergeOps(_OpsBase):
         """Complete a merge with the default message (``git commit --no-edit``)."""
         path = path or self.path
         code, err, _ = self.executor.exec(
-            "git commit --no-edit",
+            ["git", "commit", "--no-edit"],
             cwd=path,
             flags=WAITING | REPLY | DECODE,
         )
@@ -0,0 +1,210 @@
+"""
+Module: pigit/git/api/_objects.py
+Description: Persistent ``git cat-file`` object reader shared by submodules.
+Author: Zev
+Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections.abc import Sequence
+from subprocess import Popen, TimeoutExpired
+from typing import IO
+
+from ._base import _OpsBase
+
+# ``(type, size)`` from ``--batch-check``; ``None`` when the object is missing.
+ObjectInfo = tuple[str, int]
+# ``(type, size, data)``; ``data`` is ``None`` when the object exceeded ``max_size``.
+ObjectData = tuple[str, int, bytes | None]
+
+# Request bytes written ahead of reading replies. Kept well under the pipe
+# buffer so a ``cat-file`` blocked on a full stdout never blocks our write.
+_PIPELINE_BYTES = 16 * 1024
+
+
+class _CatFileBatch:
+    """One repo's ``git cat-file --batch-check`` / ``--batch`` process pair.
+
+    Both processes are started lazily and restarted once per call when they
+    died (broken pipe or short read). Requests are written in pipelined
+    chunks and replies read back in order. Calls are serialized by a lock so
+    UI and worker threads can share the pair.
+    """
+
+    def __init__(self, executor, cwd: str) -> None:
+        self._executor = executor
+        self._cwd = cwd
+        self._procs: dict[str, Popen] = {}
+        self._lock = threading.Lock()
+
+    def _proc(self, mode: str) -> Popen:
+        proc = self._procs.get(mode)
+        if proc is not None and proc.poll() is None:
+            return proc
+        proc = self._executor.spawn_pipe(["git", "cat-file", mode], cwd=self._cwd)
+        if proc is None:
+            raise OSError(f"cannot start git cat-file {mode}")
+        self._procs[mode] = proc
+        return proc
+
+    def _stop(self, mode: str) -> None:
+        proc = self._procs.pop(mode, None)
+        if proc is None:
+            return
+        for stream in (proc.stdin, proc.stdout):
+            try:
+                if stream is not None:
+                    stream.close()
+            except OSError:
+                pass
+        try:
+            proc.wait(timeout=1)
+        except TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+    def close(self) -> None:
+        with self._lock:
+            for mode in list(self._procs):
+                self._stop(mode)
+
+    @staticmethod
+    def _read_reply(stdout: IO[bytes], with_body: bool) -> ObjectData | None:
+        header = stdout.readline()
+        if not header.endswith(b"\n"):
+            raise OSError("git cat-file exited")
+        # ``<oid> <type> <size>`` or ``<spec> missing`` / ``<spec> ambiguous``.
+        parts = header[:-1].rsplit(b" ", 2)
+        if len(parts) != 3 or not parts[2].isdigit():
+            return None
+        obj_type = parts[1].decode("ascii", errors="replace")
+        size = int(parts[2])
+        if not with_body:
+            return obj_type, size, None
+        data = stdout.read(size)
+        if len(data) != size or stdout.read(1) != b"\n":
+            raise OSError("short read from git cat-file")
+        return obj_type, size, data
+
+    def _run(
+        self, mode: str, specs: Sequence[str], with_body: bool
+    ) -> list[ObjectData | None]:
+        proc = self._proc(mode)
+        assert proc.stdin is not None and proc.stdout is not None
+        replies: list[ObjectData | None] = []
+        i = 0
+        while i < len(specs):
+            chunk: list[bytes] = []
+            size = 0
+            while i < len(specs) and size < _PIPELINE_BYTES:
+                line = os.fsencode(specs[i]) + b"\n"
+                chunk.append(line)
+                size += len(line)
+                i += 1
+            proc.stdin.write(b"".join(chunk))
+            proc.stdin.flush()
+            for _ in chunk:
+                replies.append(self._read_reply(proc.stdout, with_body))
+        return replies
+
+    def request(
+        self, specs: Sequence[str], with_body: bool
+    ) -> list[ObjectData | None]:
+        """Resolve ``specs`` in order; restart the process once if it died.
+
+        A spec containing a newline cannot be framed on the batch protocol and
+        is reported missing.
+
+        Raises:
+            OSError: The process could not be (re)started or died twice.
+        """
+        mode = "--batch" if with_body else "--batch-check"
+        framed = [s for s in specs if "\n" not in s]
+        with self._lock:
+            try:
+                got = self._run(mode, framed, with_body)
+            except (OSError, ValueError):
+                self._stop(mode)
+                got = self._run(mode, framed, with_body)
+        replies = iter(got)
+        return [None if "\n" in s else next(replies) for s in specs]
+
+
+class _ObjectOps(_OpsBase):
+    """Object reads through one long-lived ``git cat-file`` pair per repo.
+
+    Every method returns ``None`` instead of a result list when the executor
+    cannot keep a process alive (``spawn_pipe`` returned ``None``, e.g. test
+    doubles) or the process keeps crashing; callers then fall back to their
+    one-shot git command.
+    """
+
+    def __init__(self, api) -> None:
+        super().__init__(api)
+        self._batches: dict[str, _CatFileBatch] = {}
+        self._lock = threading.Lock()
+
+    def _batch(self, path: str | None) -> _CatFileBatch:
+        cwd = os.path.abspath(path or self.path or ".")
+        with self._lock:
+            batch = self._batches.get(cwd)
+            if batch is None:
+                batch = self._batches[cwd] = _CatFileBatch(self.executor, cwd)
+            return batch
+
+    def _request(
+        self, specs: Sequence[str], path: str | None, with_body: bool
+    ) -> list[ObjectData | None] | None:
+        if not specs:
+            return []
+        try:
+            return self._batch(path).request(specs, with_body)
+        except OSError as e:
+            self.log.debug("git cat-file batch unavailable: %s", e)
+            return None
+
+    def info_many(
+        self, specs: Sequence[str], path: str | None = None
+    ) -> list[ObjectInfo | None] | None:
+        """Return ``(type, size)`` per spec (``None`` for missing objects)."""
+        got = self._request(specs, path, with_body=False)
+        if got is None:
+            return None
+        return [None if r is None else (r[0], r[1]) for r in got]
+
+    def read_many(
+        self,
+        specs: Sequence[str],
+        path: str | None = None,
+        max_size: int | None = None,
+    ) -> list[ObjectData | None] | None:
+        """Return ``(type, size, data)`` per spec (``None`` for missing objects).
+
+        With ``max_size``, sizes are checked through ``--batch-check`` first and
+        only objects within the limit are read; larger ones carry ``data=None``.
+        """
+        if max_size is None:
+            return self._request(specs, path, with_body=True)
+        infos = self._request(specs, path, with_body=False)
+        if infos is None:
+            return None
+        wanted = [s for s, r in zip(specs, infos) if r is not None and r[1] <= max_size]
+        bodies = self._request(wanted, path, with_body=True)
+        if bodies is None:
+            return None
+        by_spec = dict(zip(wanted, bodies))
+        return [
+            by_spec.get(s) if r is not None and r[1] <= max_size else r
+            for s, r in zip(specs, infos)
+        ]
+
+    def close(self) -> None:
+        """Stop every ``git cat-file`` process started by this instance."""
+        with self._lock:
+            batches = list(self._batches.values())
+            self._batches.clear()
+        for batch in batches:
+            batch.close()
@@ -7,12 +7,10 @@ Date: 2026-08-13
 
 from __future__ import annotations
 
-import shlex
-
 from pigit.ext.executor import WAITING, REPLY, DECODE
 
 from ..model import Stash
-from ._util import parse_numstat
+from ._util import parse_ident, parse_numstat, split_commit_object
 from ._base import _OpsBase
 from ._errors import GitError
 
@@ -20,8 +18,9 @@ from ._errors import GitError
 class _StashOps(_OpsBase):
     """Stash listing, push, apply/pop/drop, and diff."""
 
-    def __init__(self, api) -> None:
+    def __init__(self, api, objects) -> None:
         super().__init__(api)
+        self._objects = objects
 
     def load_stashes(
         self,
@@ -37,7 +36,7 @@ class _StashOps(_OpsBase):
         """
         path = path or self.path
         _, err, resp = self.executor.exec(
-            'git stash list --format="%gd|%h|%s"',
+            ["git", "stash", "list", "--format=%gd|%h|%s"],
             flags=REPLY | DECODE,
             cwd=path,
         )
@@ -67,9 +66,9 @@ class _StashOps(_OpsBase):
             GitError: If the stash command fails.
         """
         path = path or self.path
-        cmd = "git stash push -u"
+        cmd = ["git", "stash", "push", "-u"]
         if message:
-            cmd += f" -m {shlex.quote(message)}"
+            cmd += ["-m", message]
         code, err, _ = self.executor.exec(
             cmd,
             flags=WAITING | REPLY | DECODE,
@@ -87,7 +86,7 @@ class _StashOps(_OpsBase):
         """Run ``git stash <action> <ref>`` and raise GitError on failure."""
         path = path or self.path
         code, err, _ = self.executor.exec(
-            f"git stash {action} {shlex.quote(ref)}",
+            ["git", "stash", action, ref],
             flags=WAITING | REPLY | DECODE,
             cwd=path,
         )
@@ -134,7 +133,7 @@ class _StashOps(_OpsBase):
         """
         path = path or self.path
         _, err, resp = self.executor.exec(
-            f"git stash show -p {shlex.quote(ref)}",
+            ["git", "stash", "show", "-p", ref],
             flags=REPLY | DECODE,
             cwd=path,
         )
@@ -147,7 +146,7 @@ class _StashOps(_OpsBase):
         """Store a commit as a stash entry."""
         path = path or self.path
         code, err, _ = self.executor.exec(
-            f"git stash store {shlex.quote(sha)}",
+            ["git", "stash", "store", sha],
             cwd=path,
             flags=WAITING | REPLY | DECODE,
         )
@@ -160,7 +159,7 @@ class _StashOps(_OpsBase):
         """Return numstat for a stash entry."""
         path = path or self.path
         _code, _err, resp = self.executor.exec(
-            f"git stash show --numstat {shlex.quote(ref)}",
+            ["git", "stash", "show", "--numstat", ref],
             flags=REPLY | DECODE,
             cwd=path,
         )
@@ -173,8 +172,19 @@ class _StashOps(_OpsBase):
     ) -> tuple[str, int, list[str]] | None:
         """Return ``(author, unix_ts, parent_shas)`` for a stash commit."""
         path = path or self.path
+        objs = self._objects.read_many([ref], path)
+        if objs is not None:
+            if objs[0] is None or objs[0][0] != "commit" or objs[0][2] is None:
+                return None
+            headers, _msg = split_commit_object(objs[0][2])
+            ident = next((parse_ident(v) for k, v in headers if k == "author"), None)
+            if ident is None:
+                return None
+            parents = [v for k, v in headers if k == "parent"]
+            return ident[0], ident[1], parents
+
         _code, _err, out = self.executor.exec(
-            f"git log -1 --format=%aN%x00%at%x00%P {shlex.quote(ref)}",
+            ["git", "log", "-1", "--format=%aN%x00%at%x00%P", ref],
             flags=REPLY | DECODE,
             cwd=path,
         )
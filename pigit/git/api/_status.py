@@ -7,16 +7,117 @@ Date: 2026-08-13
 
 from __future__ import annotations
 
+import os
 import time
 from pathlib import Path
 from typing import cast
 
 from pigit.ext.executor import SILENT, REPLY, DECODE
 
-from ..model import File
+from ..model import BranchStatus, File
 from ._base import _OpsBase
 from ._errors import RepoError
-from ._util import byte_str2str, _LOAD_STATUS_CACHE_TTL
+from ._util import _LOAD_STATUS_CACHE_TTL
+
+_STATUS_CMD = [
+    "git",
+    "status",
+    "--porcelain=v2",
+    "-z",
+    "--branch",
+    "--untracked-files=all",
+]
+
+_CONFLICT_XY = frozenset(["DD", "AA", "UU", "AU", "UA", "UD", "DU"])
+_INLINE_CONFLICT_XY = frozenset(["UU", "AA"])
+
+
+def _make_file(xy: str, name: str, display_str: str) -> File:
+    staged_change = xy[:1]
+    unstaged_change = xy[1:2]
+    untracked = xy == "??"
+    return File(
+        name=name,
+        display_str=display_str,
+        short_status=xy,
+        has_staged_change=staged_change not in (" ", "U", "?"),
+        has_unstaged_change=unstaged_change != " ",
+        tracked=not untracked,
+        deleted=unstaged_change == "D" or staged_change == "D",
+        added=unstaged_change == "A" or untracked,
+        has_merged_conflicts=xy in _CONFLICT_XY,
+        has_inline_merged_conflicts=xy in _INLINE_CONFLICT_XY,
+    )
+
+
+def parse_status_v2(data: bytes) -> tuple[list[File], BranchStatus]:
+    """Parse ``git status --porcelain=v2 -z --branch`` output.
+
+    Paths are NUL-terminated and never quoted, so names with spaces, ``->`` or
+    non-ASCII bytes survive as-is (decoded with :func:`os.fsdecode`). The XY
+    columns use v1 letters, with ``.`` mapped back to a space.
+
+    Returns:
+        ``(files, branch)`` in git's output order.
+    """
+    files: list[File] = []
+    head = oid = upstream = ""
+    ahead = behind = 0
+    fields = data.split(b"\0")
+    i = 0
+    while i < len(fields):
+        entry = fields[i]
+        i += 1
+        if not entry:
+            continue
+        kind = entry[:1]
+        if kind == b"#":
+            parts = entry.decode("utf-8", "replace").split(" ")
+            if len(parts) < 3:
+                continue
+            if parts[1] == "branch.oid":
+                oid = "" if parts[2] == "(initial)" else parts[2]
+            elif parts[1] == "branch.head":
+                head = "" if parts[2] == "(detached)" else parts[2]
+            elif parts[1] == "branch.upstream":
+                upstream = parts[2]
+            elif parts[1] == "branch.ab" and len(parts) >= 4:
+                try:
+                    ahead = int(parts[2].lstrip("+"))
+                    behind = int(parts[3].lstrip("-"))
+                except ValueError:
+                    ahead = behind = 0
+        elif kind == b"1":
+            # 1 XY sub mH mI mW hH hI path
+            parts = entry.split(b" ", 8)
+            if len(parts) == 9:
+                xy = parts[1].decode("ascii", "replace").replace(".", " ")
+                name = os.fsdecode(parts[8])
+                files.append(_make_file(xy, name, name))
+        elif kind == b"2":
+            # 2 XY sub mH mI mW hH hI Xscore path NUL origPath
+            parts = entry.split(b" ", 9)
+            orig = fields[i] if i < len(fields) else b""
+            i += 1
+            if len(parts) == 10:
+                xy = parts[1].decode("ascii", "replace").replace(".", " ")
+                name = os.fsdecode(parts[9])
+                shown = f"{os.fsdecode(orig)} -> {name}" if orig else name
+                files.append(_make_file(xy, name, shown))
+        elif kind == b"u":
+            # u XY sub m1 m2 m3 mW h1 h2 h3 path
+            parts = entry.split(b" ", 10)
+            if len(parts) == 11:
+                xy = parts[1].decode("ascii", "replace")
+                name = os.fsdecode(parts[10])
+                files.append(_make_file(xy, name, name))
+        elif kind == b"?":
+            name = os.fsdecode(entry[2:])
+            files.append(_make_file("??", name, name))
+        # ``!`` (ignored) entries are not requested.
+    return files, BranchStatus(
+        head=head, oid=oid, upstream=upstream, ahead=ahead, behind=behind
+    )
 
 
 class _StatusOps(_OpsBase):
@@ -56,7 +157,8 @@ class _StatusOps(_OpsBase):
         """Get the file tree status of GIT for processing and encapsulation.
 
         Returns structured ``File`` objects; formatting and truncation are the
-        caller's responsibility (e.g. the panel layer).
+        caller's responsibility (e.g. the panel layer). The branch headers read
+        by the same ``git status`` run are kept for :meth:`branch_status`.
 
         Args:
                 use_cache (bool): When True, reuse recent result if git metadata unchanged
@@ -65,15 +167,22 @@ class _StatusOps(_OpsBase):
         Returns:
                 (list[File]): Processed file status list.
         """
-        path = path or self.path
-        if path is None or path == "":
-            workdir = str(Path(".").resolve())
-        else:
-            workdir = str(Path(path).resolve())
+        return self.load_status_with_branch(path, use_cache)[0]
+
+    def load_status_with_branch(
+        self,
+        path: str | None = None,
+        use_cache: bool = True,
+    ) -> tuple[list[File], BranchStatus | None]:
+        """Like :meth:`load_status`, plus the branch headers of the same run.
 
+        Returns:
+                ``(files, branch)``; ``branch`` is None when git failed.
+        """
+        workdir = self._workdir(path)
         key = (workdir,)
         now = time.monotonic()
-        cache_sig = self._load_status_cache_signature(workdir) if use_cache else None
+        cache_sig = self._load_status_cache_signature(workdir)
 
         if use_cache and cache_sig is not None:
             c = getattr(self, "_load_status_cache", None)
@@ -83,56 +192,63 @@ class _StatusOps(_OpsBase):
                 and c["sig"] == cache_sig
                 and (now - c["time"] < _LOAD_STATUS_CACHE_TTL)
             ):
-                return c["files"]
-
-        file_items = []
+                return c["files"], c["branch"]
 
-        _, err, files = self.executor.exec(
-            "git status -s -u --porcelain", flags=REPLY | DECODE, cwd=workdir
+        code, _, out = self.executor.exec(
+            _STATUS_CMD,
+            flags=REPLY,
+            cwd=workdir,
         )
-        if err or files is None:
-            return file_items
-        for file in cast(str, files).rstrip().splitlines():
-            if not file.strip():
-                # skip blank line.
-                continue
-
-            change = file[:2]
-            staged_change = file[:1]
-            unstaged_change = file[1:2]
-            porcelain_name = file[3:]
-            if porcelain_name.endswith('"'):
-                # may is chinese char code.
-                porcelain_name = byte_str2str(porcelain_name[1:-1])
-            name = File.resolve_status_path(porcelain_name)
-            untracked = change == "??"
-            has_no_staged_change = staged_change in [" ", "U", "?"]
-            has_merged_conflicts = change in ["DD", "AA", "UU", "AU", "UA", "UD", "DU"]
-            has_inline_merged_conflicts = change in ["UU", "AA"]
-
-            file_ = File(
-                name=name,
-                display_str=porcelain_name,
-                short_status=change,
-                has_staged_change=not has_no_staged_change,
-                has_unstaged_change=unstaged_change != " ",
-                tracked=not untracked,
-                deleted=unstaged_change == "D" or staged_change == "D",
-                added=unstaged_change == "A" or untracked,
-                has_merged_conflicts=has_merged_conflicts,
-                has_inline_merged_conflicts=has_inline_merged_conflicts,
-            )
-
-            file_items.append(file_)
+        if code != 0 or out is None:
+            return [], None
+        file_items, branch = parse_status_v2(cast(bytes, out))
 
-        if use_cache and cache_sig is not None:
+        if cache_sig is not None:
+            # Stored even for ``use_cache=False`` so the header can reuse the
+            # branch headers without spawning (see :meth:`branch_status`).
             self._load_status_cache = {
                 "key": key,
                 "sig": cache_sig,
                 "time": now,
                 "files": file_items,
+                "branch": branch,
             }
-        return file_items
+        return file_items, branch
+
+    def branch_status(self, path: str | None = None) -> BranchStatus | None:
+        """Branch headers of the last status load, if still fresh; never spawns.
+
+        Fresh means same repo, unchanged index/HEAD signature and within
+        ``_LOAD_STATUS_CACHE_TTL``.
+        """
+        c = getattr(self, "_load_status_cache", None)
+        if not c:
+            return None
+        workdir = self._workdir(path)
+        if c["key"] != (workdir,):
+            return None
+        if time.monotonic() - c["time"] >= _LOAD_STATUS_CACHE_TTL:
+            return None
+        if c["sig"] != self._load_status_cache_signature(workdir):
+            return None
+        return c["branch"]
+
+    def get_head_tracking(self, path: str | None = None) -> tuple[str, int, int]:
+        """``(branch, ahead, behind)``, reusing a fresh status load when on a branch.
+
+        Falls back to the ``symbolic-ref`` + ``rev-list`` pair for a detached
+        HEAD (the label is a tag or short SHA) or when no fresh status exists.
+        """
+        branch = self.branch_status(path)
+        if branch is not None and not branch.detached:
+            return branch.head, branch.ahead, branch.behind
+        return self._core.get_head_tracking(path)
+
+    def _workdir(self, path: str | None) -> str:
+        path = path or self.path
+        if path is None or path == "":
+            return str(Path(".").resolve())
+        return str(Path(path).resolve())
 
     def status_porcelain(self, path: str | None = None) -> str:
         """Return raw ``git status --porcelain`` text for observation digests.
@@ -149,7 +265,9 @@ class _StatusOps(_OpsBase):
         else:
             workdir = str(Path(path).resolve())
         _, err, files = self.executor.exec(
-            "git status -s -u --porcelain", flags=REPLY | DECODE, cwd=workdir
+            ["git", "status", "-s", "-u", "--porcelain"],
+            flags=REPLY | DECODE,
+            cwd=workdir,
         )
         if err or files is None:
             return ""
@@ -159,7 +277,7 @@ class _StatusOps(_OpsBase):
         """Return True if index has staged changes."""
         path = path or self.path
         code, _, _ = self.executor.exec(
-            "git diff --cached --quiet", flags=REPLY | SILENT, cwd=path
+            ["git", "diff", "--cached", "--quiet"], flags=REPLY | SILENT, cwd=path
         )
         # --quiet: exit 0 = no differences, 1 = differences exist
         if code == 0:
@@ -172,7 +290,7 @@ class _StatusOps(_OpsBase):
         """Return True if the working tree has unstaged changes."""
         path = path or self.path
         code, _, _ = self.executor.exec(
-            "git diff --quiet", flags=REPLY | SILENT, cwd=path
+            ["git", "diff", "--quiet"], flags=REPLY | SILENT, cwd=path
         )
         if code == 0:
             return False
@@ -184,7 +302,7 @@ class _StatusOps(_OpsBase):
         """Return True if the working tree has untracked (non-ignored) files."""
         path = path or self.path
         code, _, out = self.executor.exec(
-            "git ls-files --others --exclude-standard",
+            ["git", "ls-files", "--others", "--exclude-standard"],
             flags=REPLY | DECODE,
             cwd=path,
         )
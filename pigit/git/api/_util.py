@@ -7,7 +7,6 @@ Date: 2026-08-13
 
 from __future__ import annotations
 
-import ast
 import re
 
 from ..model import File
@@ -24,21 +23,6 @@ _SHA_RE = re.compile(r"^[0-9a-f]{7,40}")
 _LOAD_STATUS_CACHE_TTL = 0.3
 
 
-def byte_str2str(text: str) -> str:
-    """Decode a byte literal string (e.g. b'foo') to str.
-
-    Args:
-        text: A string that looks like a Python bytes literal.
-
-    Returns:
-        The decoded string, or the original text on failure.
-    """
-    try:
-        return ast.literal_eval(text).decode("utf-8")
-    except (ValueError, SyntaxError, UnicodeDecodeError):
-        return text
-
-
 def parse_numstat(
     text: str,
 ) -> tuple[list[tuple[str, int, int]], int, int]:
@@ -61,6 +45,45 @@ def parse_numstat(
     return files, total_add, total_del
 
 
+def split_commit_object(data: bytes) -> tuple[list[tuple[str, str]], str]:
+    """Split a raw ``git cat-file commit`` payload into headers and message.
+
+    Continuation lines of multi-line headers (``gpgsig``, ``mergetag``) are
+    dropped. The message is decoded with the commit's ``encoding`` header,
+    defaulting to UTF-8, so it matches what ``git log --format=%B`` prints.
+
+    Returns:
+        ``([(key, value), ...], message)``.
+    """
+    head, _sep, message = data.partition(b"\n\n")
+    headers: list[tuple[str, str]] = []
+    for line in head.split(b"\n"):
+        if not line or line.startswith(b" "):
+            continue
+        key, _sp, value = line.partition(b" ")
+        headers.append(
+            (key.decode("ascii", errors="replace"), value.decode("utf-8", "replace"))
+        )
+    encoding = next((v for k, v in headers if k == "encoding"), "utf-8")
+    try:
+        text = message.decode(encoding, errors="replace")
+    except LookupError:
+        text = message.decode("utf-8", errors="replace")
+    return headers, text
+
+
+def parse_ident(value: str) -> tuple[str, int] | None:
+    """Parse an ``author``/``committer`` header value into ``(name, unix_ts)``."""
+    name, sep, rest = value.partition(" <")
+    _email, sep2, stamp = rest.rpartition("> ")
+    if not sep or not sep2:
+        return None
+    try:
+        return name, int(stamp.split()[0])
+    except (ValueError, IndexError):
+        return None
+
+
 def _file_path_for_cmd(file: File | str) -> str:
     if isinstance(file, File):
         return file.get_file_str()
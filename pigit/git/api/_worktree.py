@@ -7,7 +7,6 @@ Date: 2026-08-13
 
 from __future__ import annotations
 
-import shlex
 import shutil
 from pathlib import Path
 
@@ -42,20 +41,20 @@ class _WorktreeOps(_OpsBase):
             or file.has_unstaged_change
         ):
             self.executor.exec(
-                f"git add -- {shlex.quote(file_name)}",
+                ["git", "add", "--", file_name],
                 flags=WAITING | SILENT,
                 cwd=path,
             )
         elif file.has_staged_change:
             if file.tracked:
                 self.executor.exec(
-                    f"git reset HEAD -- {shlex.quote(file_name)}",
+                    ["git", "reset", "HEAD", "--", file_name],
                     flags=WAITING | SILENT,
                     cwd=path,
                 )
             else:
                 self.executor.exec(
-                    f"git rm --cached --force -- {shlex.quote(file_name)}",
+                    ["git", "rm", "--cached", "--force", "--", file_name],
                     flags=WAITING | SILENT,
                     cwd=path,
                 )
@@ -85,7 +84,7 @@ class _WorktreeOps(_OpsBase):
 
         if tracked:
             code, err, out = self.executor.exec(
-                f"git checkout -- {shlex.quote(file_name)}",
+                ["git", "checkout", "--", file_name],
                 flags=WAITING | REPLY | DECODE,
                 cwd=repo_root,
             )
@@ -144,7 +143,7 @@ class _WorktreeOps(_OpsBase):
         path = path or self.path
         file_name = _file_path_for_cmd(file)
         code, err, _ = self.executor.exec(
-            f"git add -- {shlex.quote(file_name)}",
+            ["git", "add", "--", file_name],
             cwd=path,
             flags=WAITING | REPLY | DECODE,
         )
@@ -156,7 +155,7 @@ class _WorktreeOps(_OpsBase):
         path = path or self.path
         file_name = _file_path_for_cmd(file)
         code, err, _ = self.executor.exec(
-            f"git checkout --ours -- {shlex.quote(file_name)}",
+            ["git", "checkout", "--ours", "--", file_name],
             cwd=path,
             flags=WAITING | REPLY | DECODE,
         )
@@ -168,7 +167,7 @@ class _WorktreeOps(_OpsBase):
         path = path or self.path
         file_name = _file_path_for_cmd(file)
         code, err, _ = self.executor.exec(
-            f"git checkout --theirs -- {shlex.quote(file_name)}",
+            ["git", "checkout", "--theirs", "--", file_name],
             cwd=path,
             flags=WAITING | REPLY | DECODE,
         )
@@ -180,7 +179,7 @@ class _WorktreeOps(_OpsBase):
         path = path or self.path
         file_name = _file_path_for_cmd(file)
         code, err, _ = self.executor.exec(
-            f"git checkout HEAD -- {shlex.quote(file_name)}",
+            ["git", "checkout", "HEAD", "--", file_name],
             cwd=path,
             flags=WAITING | REPLY | DECODE,
         )
@@ -192,7 +191,7 @@ class _WorktreeOps(_OpsBase):
         path = path or self.path
         file_name = _file_path_for_cmd(file)
         code, err, _ = self.executor.exec(
-            f"git reset HEAD -- {shlex.quote(file_name)}",
+            ["git", "reset", "HEAD", "--", file_name],
             cwd=path,
             flags=WAITING | REPLY | DECODE,
         )
@@ -203,7 +202,7 @@ class _WorktreeOps(_OpsBase):
         """git reset --soft HEAD~1 (uncommit, keep staged)."""
         path = path or self.path
         code, err, _ = self.executor.exec(
-            "git reset --soft HEAD~1",
+            ["git", "reset", "--soft", "HEAD~1"],
             cwd=path,
             flags=WAITING | REPLY | DECODE,
         )
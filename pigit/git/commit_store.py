@@ -0,0 +1,311 @@
+"""
+Module: pigit/git/commit_store.py
+Description: On-disk commit metadata shared across sessions (sqlite, keyed by SHA).
+Author: Zev
+Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+from .model import Commit
+
+_logger = logging.getLogger(__name__)
+
+# Bump when the schema changes; older databases are dropped and rebuilt.
+_SCHEMA_VERSION = 2
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS commits (
+    sha TEXT PRIMARY KEY,
+    author TEXT NOT NULL,
+    author_time INTEGER NOT NULL,
+    parents TEXT NOT NULL,
+    subject TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bodies (
+    sha TEXT PRIMARY KEY,
+    body TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stats (
+    sha TEXT PRIMARY KEY,
+    files TEXT NOT NULL,
+    additions INTEGER NOT NULL,
+    deletions INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS logs (
+    repo TEXT NOT NULL,
+    ref TEXT NOT NULL,
+    rows TEXT NOT NULL,
+    PRIMARY KEY (repo, ref)
+);
+CREATE TABLE IF NOT EXISTS file_histories (
+    repo TEXT NOT NULL,
+    tip TEXT NOT NULL,
+    path TEXT NOT NULL,
+    rows TEXT NOT NULL,
+    PRIMARY KEY (repo, tip, path)
+);
+"""
+_TABLES = ("commits", "bodies", "stats", "logs", "file_histories")
+# sqlite caps bound parameters per statement (999 on older builds).
+_CHUNK = 500
+
+
+class CommitStore:
+    """Commit metadata cache that outlives the TUI session.
+
+    Commit objects are immutable, so author, timestamp, parents, subject,
+    body and diff stats are stored once per SHA and shared by every repo and
+    ref. The per-view parts of a row (decoration, pushed status, list order)
+    are kept only as a snapshot of the last list shown for each ``(repo,
+    ref)``, used to paint the Commit panel while ``git log`` runs, and the
+    ``git log --follow`` walk of a path is kept per ``(repo, tip, path)``:
+    for a fixed tip it never changes.
+
+    Each table keeps at most its ``MAX_*`` newest rows; older rows are
+    pruned when the store is opened, so the file stays bounded across
+    sessions. Rows are rewritten whenever they are saved, which moves them
+    to the newest end.
+
+    Storage errors are logged and treated as cache misses; the store never
+    fails a caller. Safe to use from the loader threads.
+    """
+
+    MAX_COMMITS = 100_000
+    MAX_BODIES = 20_000
+    MAX_STATS = 20_000
+    MAX_LOGS = 200
+    MAX_FILE_HISTORIES = 500
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        self._conn: sqlite3.Connection | None = None
+        self._broken = False
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _connect(self) -> sqlite3.Connection | None:
+        if self._conn is None and not self._broken:
+            try:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(
+                    self._path, timeout=2.0, check_same_thread=False
+                )
+                if conn.execute("PRAGMA user_version").fetchone()[0] != (
+                    _SCHEMA_VERSION
+                ):
+                    conn.executescript(
+                        "".join(f"DROP TABLE IF EXISTS {t};" for t in _TABLES)
+                    )
+                conn.executescript(_SCHEMA)
+                conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+                conn.execute("PRAGMA journal_mode = WAL")
+                self._prune(conn)
+                self._conn = conn
+            except (OSError, sqlite3.Error):
+                _logger.debug("Commit store unavailable: %s", self._path, exc_info=True)
+                self._broken = True
+        return self._conn
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        """Drop all but the newest ``MAX_*`` rows of each table."""
+        caps = (
+            self.MAX_COMMITS,
+            self.MAX_BODIES,
+            self.MAX_STATS,
+            self.MAX_LOGS,
+            self.MAX_FILE_HISTORIES,
+        )
+        with conn:
+            for table, cap in zip(_TABLES, caps):
+                conn.execute(
+                    f"DELETE FROM {table} WHERE rowid <= (SELECT rowid FROM"
+                    f" {table} ORDER BY rowid DESC LIMIT 1 OFFSET ?)",
+                    (cap,),
+                )
+
+    def _query(self, sql: str, keys: Sequence[str]) -> list[tuple]:
+        """Run ``sql`` (with one ``{}`` for the placeholders) over ``keys``."""
+        rows: list[tuple] = []
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return rows
+            try:
+                for i in range(0, len(keys), _CHUNK):
+                    chunk = keys[i : i + _CHUNK]
+                    marks = ",".join("?" * len(chunk))
+                    rows += conn.execute(sql.format(marks), chunk).fetchall()
+            except sqlite3.Error:
+                _logger.debug("Commit store read failed", exc_info=True)
+        return rows
+
+    def _write(self, sql: str, rows: Iterable[tuple]) -> None:
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                with conn:
+                    conn.executemany(sql, rows)
+            except sqlite3.Error:
+                _logger.debug("Commit store write failed", exc_info=True)
+
+    # ── commit metadata ──
+
+    def put_commits(self, commits: Iterable[Commit]) -> None:
+        """Record the immutable fields of ``commits`` as the newest rows."""
+        self._write(
+            "INSERT OR REPLACE INTO commits (sha, author, author_time, parents,"
+            " subject) VALUES (?, ?, ?, ?, ?)",
+            (
+                (c.sha, c.author, c.unix_timestamp, " ".join(c.parents), c.msg)
+                for c in commits
+            ),
+        )
+
+    def get_commits(self, shas: Sequence[str]) -> dict[str, Commit]:
+        """Return stored commits for ``shas``; ``status``/``extra_info`` are empty."""
+        return {
+            sha: _commit_from_row(sha, author, when, parents, subject)
+            for sha, author, when, parents, subject in self._query(
+                "SELECT sha, author, author_time, parents, subject FROM commits"
+                " WHERE sha IN ({})",
+                shas,
+            )
+        }
+
+    def get_bodies(self, shas: Sequence[str]) -> dict[str, str]:
+        """Return the stored full messages among ``shas``."""
+        return dict(
+            self._query("SELECT sha, body FROM bodies WHERE sha IN ({})", shas)
+        )
+
+    def put_bodies(self, bodies: dict[str, str]) -> None:
+        """Record full messages (``{sha: body}``)."""
+        self._write("INSERT OR REPLACE INTO bodies VALUES (?, ?)", bodies.items())
+
+    def get_stats(self, sha: str) -> tuple[list[tuple[str, int, int]], int, int] | None:
+        """Return ``GitApi.get_commit_stats``'s result for ``sha`` if stored."""
+        rows = self._query(
+            "SELECT files, additions, deletions FROM stats WHERE sha IN ({})", [sha]
+        )
+        if not rows:
+            return None
+        files, additions, deletions = rows[0]
+        return [tuple(f) for f in json.loads(files)], additions, deletions
+
+    def put_stats(
+        self, sha: str, stats: tuple[list[tuple[str, int, int]], int, int]
+    ) -> None:
+        files, additions, deletions = stats
+        self._write(
+            "INSERT OR REPLACE INTO stats VALUES (?, ?, ?, ?)",
+            [(sha, json.dumps(files), additions, deletions)],
+        )
+
+    # ── list snapshots ──
+
+    def save_log(self, repo: str, ref: str, commits: Sequence[Commit]) -> None:
+        """Remember ``commits`` as the list last shown for ``ref`` in ``repo``."""
+        self.put_commits(commits)
+        rows = [[c.sha, c.extra_info, c.status, c.tag] for c in commits]
+        self._write(
+            "INSERT OR REPLACE INTO logs VALUES (?, ?, ?)",
+            [(repo, ref, json.dumps(rows, separators=(",", ":")))],
+        )
+
+    def load_log(self, repo: str, ref: str) -> list[Commit]:
+        """Return the list last saved for ``ref`` (empty when unknown)."""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return []
+            try:
+                row = conn.execute(
+                    "SELECT rows FROM logs WHERE repo = ? AND ref = ?", (repo, ref)
+                ).fetchone()
+            except sqlite3.Error:
+                _logger.debug("Commit store read failed", exc_info=True)
+                return []
+        if row is None:
+            return []
+        try:
+            entries = [
+                (str(sha), str(extra_info), str(status), list(tag))
+                for sha, extra_info, status, tag in json.loads(row[0])
+            ]
+        except (ValueError, TypeError):
+            return []
+        known = self.get_commits([entry[0] for entry in entries])
+        commits: list[Commit] = []
+        for sha, extra_info, status, tag in entries:
+            commit = known.get(sha)
+            if commit is None:
+                return []  # Rows lost (store rebuilt): not worth showing.
+            commit.extra_info = extra_info
+            commit.status = status
+            commit.tag = tag
+            commits.append(commit)
+        return commits
+
+    def load_file_history(
+        self, repo: str, tip: str, path: str
+    ) -> list[tuple[str, str]] | None:
+        """Return ``GitApi.get_file_history``'s result for ``path`` at ``tip``.
+
+        ``None`` when it is not stored (an empty list is a stored answer).
+        """
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    "SELECT rows FROM file_histories"
+                    " WHERE repo = ? AND tip = ? AND path = ?",
+                    (repo, tip, path),
+                ).fetchone()
+            except sqlite3.Error:
+                _logger.debug("Commit store read failed", exc_info=True)
+                return None
+        if row is None:
+            return None
+        try:
+            return [(str(sha), str(subject)) for sha, subject in json.loads(row[0])]
+        except (ValueError, TypeError):
+            return None
+
+    def save_file_history(
+        self, repo: str, tip: str, path: str, history: Sequence[tuple[str, str]]
+    ) -> None:
+        self._write(
+            "INSERT OR REPLACE INTO file_histories VALUES (?, ?, ?, ?)",
+            [(repo, tip, path, json.dumps(history, separators=(",", ":")))],
+        )
+
+
+def _commit_from_row(
+    sha: str, author: str, when: int, parents: str, subject: str
+) -> Commit:
+    return Commit(
+        sha=sha,
+        msg=subject,
+        author=author,
+        unix_timestamp=when,
+        status="",
+        extra_info="",
+        tag=[],
+        parents=parents.split() if parents else [],
+    )
@@ -53,7 +53,7 @@ class File:
 
     def get_file_str(self) -> str:
         """Return the worktree-relative path (never a rename display string)."""
-        return self.resolve_status_path(self.name)
+        return self.name
 
     def __str__(self) -> str:
         return self.get_file_str()
@@ -130,4 +130,51 @@ class Stash:
     msg: str
 
 
+@dataclass(frozen=True, slots=True)
+class RepoLayout:
+    """Resolved repository paths from one ``git rev-parse`` call."""
+
+    # Absolute work tree root; empty for bare repos or inside the git dir.
+    toplevel: str
+
+    # Absolute ``$GIT_DIR`` (per-worktree for linked worktrees).
+    git_dir: str
+
+    # Absolute common git dir shared by all worktrees.
+    common_dir: str
+
+    # True for a bare repository.
+    is_bare: bool
+
+    # True when the queried path is inside a work tree.
+    is_inside_work_tree: bool
+
+    @property
+    def is_linked_worktree(self) -> bool:
+        """True for a ``git worktree add`` checkout (git dir differs from common dir)."""
+        return self.git_dir != self.common_dir
+
+
+@dataclass(frozen=True, slots=True)
+class BranchStatus:
+    """Branch headers from ``git status --porcelain=v2 --branch``."""
+
+    # Current branch name; empty when HEAD is detached.
+    head: str
+
+    # Commit id of HEAD; empty on an unborn branch.
+    oid: str
+
+    # Upstream branch (``origin/main``); empty when none is configured.
+    upstream: str = ""
+
+    # Commits on HEAD not on upstream, and the reverse.
+    ahead: int = 0
+    behind: int = 0
+
+    @property
+    def detached(self) -> bool:
+        return not self.head
+
+
 GitFuncT = Callable[[File], None]
@@ -8,11 +8,14 @@ Date: 2026-08-20
 
 from __future__ import annotations
 
-from .backend import FakeBackend, StatMtimeBackend
+from .backend import FakeBackend, ObservationBackend, StatMtimeBackend
+from .cadence import AdaptiveCadence
 from .classify import classify_path_signal
 from .clock import FakeClock, SystemClock
 from .coordinator import RefreshCoordinator
 from .digest import hash_porcelain
+from .git_index import IndexDirtyProbe, read_index
+from .inotify import InotifyBackend, inotify_available
 from .observer import RepoObserver
 from .overlay import should_defer_repo_refresh
 from .paths import build_git_metadata_paths, build_worktree_observe_paths
@@ -26,11 +29,15 @@ from .types import (
 )
 
 __all__ = [
+    "AdaptiveCadence",
     "BackendHealth",
     "ChangeBatch",
     "ChangeKind",
     "FakeBackend",
     "FakeClock",
+    "IndexDirtyProbe",
+    "InotifyBackend",
+    "ObservationBackend",
     "ObserveContext",
     "PathSignal",
     "RefreshCoordinator",
@@ -42,5 +49,7 @@ __all__ = [
     "build_worktree_observe_paths",
     "classify_path_signal",
     "hash_porcelain",
+    "inotify_available",
+    "read_index",
     "should_defer_repo_refresh",
 ]
@@ -8,6 +8,7 @@ Date: 2026-08-20
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 from typing import Callable, Protocol, Sequence
 
@@ -24,7 +25,8 @@ from .types import BackendHealth, PathSignal, WatchRoot
 class ObservationBackend(Protocol):
     """Filesystem observation source.
 
-    Phase A backends are pull-based: call ``poll()`` from the UI/observer.
+    Phase A backends are pull-based: ``RepoObserver`` calls ``poll()``, normally
+    from its worker thread, and serializes it with ``start``/``update_roots``.
     A later push backend (e.g. optional watchdog) may enqueue onto a shared
     ``queue.Queue`` from a helper thread and return ``[]`` from ``poll()``.
     """
@@ -64,6 +66,7 @@ class StatMtimeBackend:
         self._meta_paths: list[str] = []
         self._worktree_paths: list[str] = []
         self._paths: list[str] = list(self._explicit_paths)
+        self._groups = _group_by_dir(self._paths)
         self._last_mtime: dict[str, int | None] = {}
         self._meta_dir_paths: set[str] = set()
         self._roots: list[WatchRoot] = []
@@ -119,6 +122,7 @@ class StatMtimeBackend:
         """Clear path state."""
         self._started = False
         self._paths = []
+        self._groups = []
         self._meta_paths = []
         self._worktree_paths = []
         self._last_mtime.clear()
@@ -139,8 +143,7 @@ class StatMtimeBackend:
         if not self._started:
             return []
         out: list[PathSignal] = []
-        for path in self._paths:
-            current = _read_mtime_ns(path)
+        for path, current in _read_mtimes(self._groups):
             previous = self._last_mtime.get(path)
             if previous is None:
                 self._last_mtime[path] = current
@@ -205,18 +208,15 @@ class StatMtimeBackend:
         )
         self._health = BackendHealth.DEGRADED if truncated else BackendHealth.OK
         self._meta_dir_paths = {p for p in self._meta_paths if Path(p).is_dir()}
+        self._paths = merged
+        self._groups = _group_by_dir(merged)
         if reset_baseline:
-            self._paths = merged
-            self._last_mtime = {p: _read_mtime_ns(p) for p in self._paths}
+            self._last_mtime = dict(_read_mtimes(self._groups))
             return
-        new_mtime: dict[str, int | None] = {}
-        for path in merged:
-            if path in self._last_mtime:
-                new_mtime[path] = self._last_mtime[path]
-            else:
-                new_mtime[path] = _read_mtime_ns(path)
-        self._paths = merged
-        self._last_mtime = new_mtime
+        fresh = [p for p in merged if p not in self._last_mtime]
+        new_mtime = {p: self._last_mtime[p] for p in merged if p in self._last_mtime}
+        new_mtime.update(_read_mtimes(_group_by_dir(fresh)))
+        self._last_mtime = {p: new_mtime[p] for p in merged}
 
 
 def _worktree_root_path(roots: Sequence[WatchRoot]) -> str | None:
@@ -261,9 +261,63 @@ class FakeBackend:
         return list(batch)
 
 
+# Directory groups at least this large are read with one ``os.scandir`` where
+# entries carry their stat data (Windows). On POSIX ``DirEntry.stat`` is one
+# more syscall per entry on top of the listing, so plain ``os.stat`` wins.
+_SCANDIR_MIN = 4
+_SCANDIR_STATS = os.name == "nt"
+
+_DirGroup = tuple[str, dict[str, str]]
+
+
+def _group_by_dir(paths: Sequence[str]) -> list[_DirGroup]:
+    """Group absolute paths as ``(parent dir, {name: path})`` in first-seen order."""
+    groups: dict[str, dict[str, str]] = {}
+    for path in paths:
+        parent, name = os.path.split(path)
+        groups.setdefault(parent, {})[name] = path
+    return list(groups.items())
+
+
+def _read_mtimes(groups: Sequence[_DirGroup]) -> list[tuple[str, int | None]]:
+    """Return ``(path, st_mtime_ns or None)`` for every grouped path."""
+    out: list[tuple[str, int | None]] = []
+    for parent, names in groups:
+        if _SCANDIR_STATS and len(names) >= _SCANDIR_MIN:
+            found = _scandir_mtimes(parent, names)
+            out.extend((path, found.get(name)) for name, path in names.items())
+            continue
+        paths = iter(names.values())
+        first = next(paths)
+        mtime = _read_mtime_ns(first)
+        out.append((first, mtime))
+        if mtime is None and not os.path.isdir(parent):
+            # The whole directory went away: skip stats for its other entries.
+            out.extend((path, None) for path in paths)
+            continue
+        out.extend((path, _read_mtime_ns(path)) for path in paths)
+    return out
+
+
+def _scandir_mtimes(parent: str, names: dict[str, str]) -> dict[str, int]:
+    """List ``parent`` once and read mtimes for the watched ``names``."""
+    found: dict[str, int] = {}
+    try:
+        with os.scandir(parent) as it:
+            for entry in it:
+                if entry.name in names:
+                    try:
+                        found[entry.name] = entry.stat().st_mtime_ns
+                    except OSError:
+                        pass
+    except OSError:
+        pass
+    return found
+
+
 def _read_mtime_ns(path: str) -> int | None:
     """Return ``st_mtime_ns`` or ``None`` if the path is missing."""
     try:
-        return Path(path).stat().st_mtime_ns
+        return os.stat(path).st_mtime_ns
     except OSError:
         return None
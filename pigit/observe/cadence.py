@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Module: pigit/observe/cadence.py
+Description: Adaptive poll interval: fast after activity, backing off when idle.
+Author: Zev
+Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+from .clock import MonotonicClock, SystemClock
+
+DEFAULT_FAST_S = 0.25
+DEFAULT_IDLE_S = 4.0
+# How long activity keeps the poll at the fast interval before backing off.
+DEFAULT_HOT_S = 5.0
+
+
+class AdaptiveCadence:
+    """Poll interval that stays at ``fast_s`` while the user or repo is active.
+
+    ``note_activity`` (a keypress, or a poll that found changes) snaps the
+    interval back to ``fast_s``. Once nothing has happened for ``hot_s``, each
+    ``next_interval`` doubles the previous one up to ``idle_s``.
+    """
+
+    def __init__(
+        self,
+        fast_s: float = DEFAULT_FAST_S,
+        idle_s: float = DEFAULT_IDLE_S,
+        *,
+        hot_s: float = DEFAULT_HOT_S,
+        clock: MonotonicClock | None = None,
+    ) -> None:
+        if not 0 < fast_s <= idle_s:
+            raise ValueError("expected 0 < fast_s <= idle_s")
+        self._fast_s = fast_s
+        self._idle_s = idle_s
+        self._hot_s = hot_s
+        self._clock = clock if clock is not None else SystemClock()
+        self._last_activity = self._clock.monotonic()
+        self._interval = fast_s
+
+    @property
+    def fast_s(self) -> float:
+        return self._fast_s
+
+    @property
+    def backed_off(self) -> bool:
+        """True when the last interval handed out is longer than ``fast_s``."""
+        return self._interval > self._fast_s
+
+    def note_activity(self) -> None:
+        """Record activity now; the next interval is ``fast_s``."""
+        self._last_activity = self._clock.monotonic()
+        self._interval = self._fast_s
+
+    def next_interval(self) -> float:
+        """Return how long to wait before the next poll."""
+        quiet = self._clock.monotonic() - self._last_activity
+        if quiet < self._hot_s:
+            self._interval = self._fast_s
+        else:
+            self._interval = min(self._idle_s, self._interval * 2)
+        return self._interval
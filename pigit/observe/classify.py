@@ -8,6 +8,8 @@ Date: 2026-08-20
 
 from __future__ import annotations
 
+import os
+from functools import lru_cache
 from pathlib import Path, PurePosixPath
 
 from .types import ChangeKind, ObserveContext, PathSignal
@@ -19,6 +21,9 @@ def classify_path_signal(
 ) -> tuple[frozenset[ChangeKind], frozenset[str]]:
     """Map a filesystem signal to change kinds and repo-relative paths.
 
+    Roots are resolved once per context; the signal path is only normalized,
+    and resolved (symlinks followed) just when it falls under none of them.
+
     Args:
         signal: Absolute path observation from a backend.
         ctx: Repo layout and optional Status preview target.
@@ -26,55 +31,60 @@ def classify_path_signal(
     Returns:
         Tuple of (kinds, repo-relative paths). Paths may be empty.
     """
-    abs_path = Path(signal.path).resolve()
-    git_dir = Path(ctx.git_dir).resolve()
-    common_dir = Path(ctx.common_dir).resolve()
-    repo_root = Path(ctx.repo_root).resolve()
-
+    roots = _resolved_roots(ctx.repo_root, ctx.git_dir, ctx.common_dir)
+    abs_path = os.path.normpath(os.path.abspath(signal.path))
+    result = _classify(abs_path, roots, ctx.preview_target)
+    if result is None:
+        resolved = str(Path(signal.path).resolve())
+        if resolved != abs_path:
+            result = _classify(resolved, roots, ctx.preview_target)
+    return result or (frozenset(), frozenset())
+
+
+@lru_cache(maxsize=16)
+def _resolved_roots(
+    repo_root: str, git_dir: str, common_dir: str
+) -> tuple[str, tuple[str, ...]]:
+    """Return (repo root, distinct git/common dirs), resolved."""
+    metas = dict.fromkeys(str(Path(p).resolve()) for p in (git_dir, common_dir))
+    return str(Path(repo_root).resolve()), tuple(metas)
+
+
+def _classify(
+    abs_path: str,
+    roots: tuple[str, tuple[str, ...]],
+    preview_target: str | None,
+) -> tuple[frozenset[ChangeKind], frozenset[str]] | None:
+    """Classify a normalized path; None when it is outside every root."""
+    repo_root, meta_dirs = roots
     kinds: set[ChangeKind] = set()
     rel_paths: set[str] = set()
 
-    if _is_under(abs_path, git_dir) or _is_under(abs_path, common_dir):
-        kinds |= _classify_git_meta(abs_path, git_dir, common_dir)
-    elif _is_under(abs_path, repo_root):
-        rel = _repo_relative(abs_path, repo_root)
-        if rel is not None:
-            rel_paths.add(rel)
-            kinds.add(ChangeKind.WORKTREE_META)
-            if ctx.preview_target is not None and rel == ctx.preview_target:
-                kinds.add(ChangeKind.PREVIEW_FILE)
+    meta_rels = [r for r in (_rel_under(abs_path, d) for d in meta_dirs) if r]
+    if meta_rels:
+        for rel in meta_rels:
+            kinds |= _kinds_for_git_rel(rel)
+    else:
+        rel = _rel_under(abs_path, repo_root)
+        if rel is None:
+            return None
+        rel_paths.add(rel)
+        kinds.add(ChangeKind.WORKTREE_META)
+        if preview_target is not None and rel == preview_target:
+            kinds.add(ChangeKind.PREVIEW_FILE)
 
     return frozenset(kinds), frozenset(rel_paths)
 
 
-def _is_under(path: Path, root: Path) -> bool:
-    try:
-        path.relative_to(root)
-        return True
-    except ValueError:
-        return False
-
-
-def _repo_relative(path: Path, repo_root: Path) -> str | None:
-    try:
-        return path.relative_to(repo_root).as_posix()
-    except ValueError:
+def _rel_under(path: str, root: str) -> str | None:
+    """Return ``path`` relative to ``root`` in posix form, or None if outside."""
+    if path == root:
+        return "."
+    prefix = root if root.endswith(os.sep) else root + os.sep
+    if not path.startswith(prefix):
         return None
-
-
-def _classify_git_meta(
-    abs_path: Path,
-    git_dir: Path,
-    common_dir: Path,
-) -> set[ChangeKind]:
-    """Classify a path under git_dir or common_dir."""
-    kinds: set[ChangeKind] = set()
-    for root in {git_dir, common_dir}:
-        if not _is_under(abs_path, root):
-            continue
-        rel = abs_path.relative_to(root).as_posix()
-        kinds |= _kinds_for_git_rel(rel)
-    return kinds
+    rel = path[len(prefix) :]
+    return rel if os.sep == "/" else rel.replace(os.sep, "/")
 
 
 def _kinds_for_git_rel(rel: str) -> set[ChangeKind]:
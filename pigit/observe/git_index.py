@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+"""
+Module: pigit/observe/git_index.py
+Description: mmap reader for .git/index (DIRC v2-v4) and a stat-sweep dirty probe.
+Author: Zev
+Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import re
+import stat
+import struct
+from dataclasses import dataclass
+from typing import Callable, NamedTuple
+
+from .denylist import is_denied_name
+
+_HEADER = struct.Struct(">4sII")
+# ctime s/ns, mtime s/ns, dev, ino, mode, uid, gid, size
+_STAT = struct.Struct(">10I")
+_FLAGS = struct.Struct(">H")
+_EXT = struct.Struct(">4sI")
+
+_FLAG_EXTENDED = 0x4000
+_FLAG_NAME_MASK = 0x0FFF
+_FLAG_STAGE_SHIFT = 12
+# Extended flags (v3+): skip-worktree and intent-to-add entries are not on disk
+# the way the index claims, so they are left out of stat comparisons.
+_XFLAG_SKIP_WORKTREE = 0x4000
+_XFLAG_INTENT_TO_ADD = 0x2000
+
+_GITLINK = 0o160000
+_SPARSE_DIR = 0o040000
+
+_RE_SHA256_FORMAT = re.compile(r"^\s*objectformat\s*=\s*sha256\s*$", re.I | re.M)
+
+# Extensions that make the entry list incomplete: split index, sparse dirs.
+_UNSUPPORTED_EXTENSIONS = frozenset({b"link", b"sdir"})
+
+
+class IndexFormatError(ValueError):
+    """The index file is missing, truncated, or uses an unsupported layout."""
+
+
+class IndexStat(NamedTuple):
+    """Cached stat data for one stage-0 index entry (git truncates to 32 bits)."""
+
+    mtime_s: int
+    mtime_ns: int
+    size: int
+    ino: int
+    mode: int
+
+
+@dataclass(frozen=True, slots=True)
+class GitIndex:
+    """Parsed ``.git/index``: stage-0 entries keyed by repo-relative path."""
+
+    version: int
+    entries: dict[str, IndexStat]
+    # Paths with stage 1-3 entries (unmerged).
+    unmerged: frozenset[str]
+    # Index file mtime; entries modified at/after it are "racily clean".
+    mtime_ns: int
+    # Repo-relative directories containing at least one entry ("" is the root).
+    dirs: frozenset[str]
+
+
+def object_hash_size(git_dir: str) -> int:
+    """Return 32 for ``extensions.objectFormat = sha256`` repos, else 20."""
+    base = git_dir
+    try:
+        # Linked worktrees keep config in the common dir.
+        with open(os.path.join(git_dir, "commondir"), encoding="utf-8") as fp:
+            base = os.path.join(git_dir, fp.read().strip())
+    except OSError:
+        pass
+    try:
+        with open(os.path.join(base, "config"), encoding="utf-8") as fp:
+            text = fp.read()
+    except OSError:
+        return 20
+    return 32 if _RE_SHA256_FORMAT.search(text) else 20
+
+
+def _read_varint(buf, pos: int) -> tuple[int, int]:
+    """Git's offset varint (used by v4 path prefix compression)."""
+    c = buf[pos]
+    pos += 1
+    value = c & 0x7F
+    while c & 0x80:
+        c = buf[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (c & 0x7F)
+    return value, pos
+
+
+def parse_index(buf, *, hash_size: int = 20, mtime_ns: int = 0) -> GitIndex:
+    """Parse an index image (``bytes`` or ``mmap``).
+
+    Raises:
+        IndexFormatError: Bad signature, unknown version, truncated data, or
+            a split/sparse index whose entries live elsewhere.
+    """
+    if len(buf) < _HEADER.size + hash_size:
+        raise IndexFormatError("index too short")
+    signature, version, count = _HEADER.unpack_from(buf, 0)
+    if signature != b"DIRC" or version not in (2, 3, 4):
+        raise IndexFormatError(f"unsupported index {signature!r} v{version}")
+    end = len(buf) - hash_size
+    pos = _HEADER.size
+    fixed = _STAT.size + hash_size
+    entries: dict[str, IndexStat] = {}
+    unmerged: set[str] = set()
+    dirs: set[str] = {""}
+    prev = b""
+    try:
+        for _ in range(count):
+            start = pos
+            (_cs, _cn, ms, mn, _dev, ino, mode, _uid, _gid, size) = _STAT.unpack_from(
+                buf, pos
+            )
+            pos += fixed
+            (flags,) = _FLAGS.unpack_from(buf, pos)
+            pos += 2
+            xflags = 0
+            if version >= 3 and flags & _FLAG_EXTENDED:
+                (xflags,) = _FLAGS.unpack_from(buf, pos)
+                pos += 2
+            if version == 4:
+                strip, pos = _read_varint(buf, pos)
+                nul = buf.find(b"\0", pos, end)
+                if nul < 0 or strip > len(prev):
+                    raise IndexFormatError("bad v4 path")
+                raw = prev[: len(prev) - strip] + buf[pos:nul]
+                pos = nul + 1
+            else:
+                name_len = flags & _FLAG_NAME_MASK
+                if name_len == _FLAG_NAME_MASK:
+                    name_len = buf.find(b"\0", pos, end) - pos
+                    if name_len < 0:
+                        raise IndexFormatError("unterminated path")
+                raw = bytes(buf[pos : pos + name_len])
+                # 1-8 NULs pad each entry to a multiple of 8 bytes.
+                pos = start + ((pos - start + name_len + 8) & ~7)
+            prev = raw
+            if pos > end:
+                raise IndexFormatError("entry runs past checksum")
+            if mode == _SPARSE_DIR:
+                raise IndexFormatError("sparse index")
+            path = os.fsdecode(raw)
+            if (flags >> _FLAG_STAGE_SHIFT) & 3:
+                unmerged.add(path)
+                continue
+            if xflags & (_XFLAG_SKIP_WORKTREE | _XFLAG_INTENT_TO_ADD):
+                continue
+            entries[path] = IndexStat(ms, mn, size, ino, mode)
+            slash = path.rfind("/")
+            while slash > 0:
+                parent = path[:slash]
+                if parent in dirs:
+                    break
+                dirs.add(parent)
+                slash = parent.rfind("/")
+    except struct.error as exc:
+        raise IndexFormatError("truncated index") from exc
+
+    while pos + _EXT.size <= end:
+        ext, ext_size = _EXT.unpack_from(buf, pos)
+        if ext in _UNSUPPORTED_EXTENSIONS:
+            raise IndexFormatError(f"unsupported extension {ext!r}")
+        pos += _EXT.size + ext_size
+
+    return GitIndex(
+        version=version,
+        entries=entries,
+        unmerged=frozenset(unmerged),
+        mtime_ns=mtime_ns,
+        dirs=frozenset(dirs),
+    )
+
+
+def read_index(index_path: str, *, hash_size: int = 20) -> GitIndex:
+    """Memory-map and parse ``index_path``.
+
+    Raises:
+        IndexFormatError: Missing file or unsupported layout.
+    """
+    try:
+        with open(index_path, "rb") as fp:
+            st = os.fstat(fp.fileno())
+            if st.st_size == 0:
+                raise IndexFormatError("empty index")
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                return parse_index(buf, hash_size=hash_size, mtime_ns=st.st_mtime_ns)
+    except OSError as exc:
+        raise IndexFormatError(str(exc)) from exc
+
+
+def stat_matches(entry: IndexStat, st: os.stat_result) -> bool:
+    """Git's cheap "unchanged" test: mtime, size, inode, file type, exec bit."""
+    if entry.mtime_s != (st.st_mtime_ns // 1_000_000_000) & 0xFFFFFFFF:
+        return False
+    # Some filesystems / git builds store 0 ns; compare ns only when recorded.
+    if entry.mtime_ns and entry.mtime_ns != st.st_mtime_ns % 1_000_000_000:
+        return False
+    if entry.size != st.st_size & 0xFFFFFFFF:
+        return False
+    if entry.ino and entry.ino != st.st_ino & 0xFFFFFFFF:
+        return False
+    if stat.S_IFMT(entry.mode) != stat.S_IFMT(st.st_mode):
+        return False
+    if stat.S_ISREG(st.st_mode) and (entry.mode & 0o100) != (st.st_mode & 0o100):
+        return False
+    return True
+
+
+# (mtime_ns, size, ino, type|exec bits) as ``os.lstat`` reports them for an
+# unchanged regular file; anything else takes the exact :func:`stat_matches`.
+_FastKey = tuple[int, int, int, int]
+_DirEntries = dict[str, tuple[_FastKey, IndexStat]]
+_NO_ENTRIES: _DirEntries = {}
+
+
+def _group_by_dir(index: GitIndex | None) -> dict[str, _DirEntries]:
+    """Regroup entries per directory; every ``index.dirs`` member gets a key."""
+    if index is None:
+        return {}
+    grouped: dict[str, _DirEntries] = {d: {} for d in index.dirs}
+    for path, entry in index.entries.items():
+        parent, _, name = path.rpartition("/")
+        fast = (
+            entry.mtime_s * 1_000_000_000 + entry.mtime_ns,
+            entry.size,
+            entry.ino,
+            entry.mode & 0o170100,
+        )
+        grouped[parent][name] = (fast, entry)
+    return grouped
+
+
+class IndexDirtyProbe:
+    """Worktree change digest that only runs git when a stat sweep says so.
+
+    Each call sweeps the worktree with ``os.scandir``: tracked files are
+    compared against the index's cached stat data, untracked names are
+    listed, and missing tracked files are noted. The sweep yields a
+    fingerprint of everything that differs from the index; while it stays the
+    same the previous digest is returned without spawning. When it moves (or
+    the index cannot be read) ``confirm`` — normally a ``git status`` hash —
+    decides the returned digest.
+
+    Directories named in the worktree denylist are skipped unless they hold
+    tracked files. Ignored files are never matched against ``.gitignore``, so
+    creating one costs a single confirmation, not a false refresh.
+    """
+
+    def __init__(
+        self,
+        repo_root: str,
+        git_dir: str,
+        confirm: Callable[[], str | None],
+    ) -> None:
+        self._root = os.path.realpath(repo_root)
+        self._index_path = os.path.join(git_dir, "index")
+        self._hash_size = object_hash_size(git_dir)
+        self._confirm = confirm
+        self._index: GitIndex | None = None
+        self._index_key: tuple[int, int, int] | None = None
+        # rel dir -> {name: IndexStat}, so the sweep never builds full paths
+        # for tracked files.
+        self._by_dir: dict[str, _DirEntries] = {}
+        self._last_sweep: bytes | None = None
+        self._last_digest: str | None = None
+        self.confirmations = 0
+
+    def __call__(self) -> str | None:
+        sweep = self.sweep()
+        if (
+            sweep is not None
+            and sweep == self._last_sweep
+            and self._last_digest is not None
+        ):
+            return self._last_digest
+        self.confirmations += 1
+        digest = self._confirm()
+        self._last_sweep = sweep
+        self._last_digest = digest
+        return digest
+
+    def sweep(self) -> bytes | None:
+        """Fingerprint of worktree-vs-index differences; None if unreadable."""
+        index = self._load_index()
+        if index is None:
+            return None
+        by_dir = self._by_dir
+        racy_ns = index.mtime_ns
+        h = hashlib.blake2b(digest_size=16)
+        h.update(b"%d:%d\0" % (self._index_key[0], self._index_key[1]))
+        seen = 0
+        stack = [""]
+        while stack:
+            rel_dir = stack.pop()
+            prefix = f"{rel_dir}/" if rel_dir else ""
+            names = by_dir.get(rel_dir, _NO_ENTRIES)
+            try:
+                with os.scandir(os.path.join(self._root, rel_dir)) as it:
+                    listing = list(it)
+            except OSError:
+                continue
+            for entry in listing:
+                name = entry.name
+                cached = names.get(name)
+                try:
+                    if cached is not None:
+                        seen += 1
+                        fast, full = cached
+                        if full.mode == _GITLINK:
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                        m = st.st_mtime_ns
+                        if m < racy_ns and (
+                            (m, st.st_size, st.st_ino, st.st_mode & 0o170100) == fast
+                            or stat_matches(full, st)
+                        ):
+                            continue
+                        # Modified, or racily clean: git would re-hash it.
+                        path = os.fsencode(prefix + name)
+                        h.update(b"M%s\0%d:%d\0" % (path, m, st.st_size))
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        rel = prefix + name
+                        if rel in by_dir or not is_denied_name(name):
+                            stack.append(rel)
+                        continue
+                except OSError:
+                    continue
+                h.update(b"?%s\0" % os.fsencode(prefix + name))
+        missing = len(index.entries) - seen
+        if missing:
+            # Deleted (or replaced by a directory) tracked files.
+            h.update(b"D%d\0" % missing)
+        return h.digest()
+
+    def _load_index(self) -> GitIndex | None:
+        try:
+            st = os.stat(self._index_path)
+        except OSError:
+            return None
+        key = (st.st_mtime_ns, st.st_size, st.st_ino)
+        if key != self._index_key or self._index is None:
+            try:
+                self._index = read_index(self._index_path, hash_size=self._hash_size)
+            except IndexFormatError:
+                self._index = None
+            self._index_key = key
+            self._by_dir = _group_by_dir(self._index)
+        return self._index
@@ -0,0 +1,511 @@
+# -*- coding: utf-8 -*-
+"""
+Module: pigit/observe/inotify.py
+Description: Linux inotify push backend (ctypes) with StatMtime fallback.
+Author: Zev
+Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import functools
+import logging
+import os
+import struct
+from pathlib import Path
+from typing import Callable, Sequence
+
+from .backend import StatMtimeBackend
+from .denylist import is_denied_name
+from .paths import metadata_roots_signature
+from .types import BackendHealth, PathSignal, WatchRoot
+
+_logger = logging.getLogger(__name__)
+
+# <sys/inotify.h>
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_EXCL_UNLINK = 0x04000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_DIR_FLAGS = IN_ONLYDIR | IN_DONT_FOLLOW | IN_EXCL_UNLINK
+_CHANGE_MASK = (
+    IN_CLOSE_WRITE
+    | IN_CREATE
+    | IN_DELETE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+# Git writes metadata via lock + rename; reflogs and FETCH_HEAD are appended.
+_META_MASK = _CHANGE_MASK | _DIR_FLAGS
+# Worktree also tracks chmod (git records the executable bit).
+_WORKTREE_MASK = _CHANGE_MASK | IN_ATTRIB | _DIR_FLAGS
+
+# struct inotify_event { int wd; uint32 mask, cookie, len; char name[]; }
+_EVENT = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+# Metadata subtrees watched recursively under git_dir / common_dir (the dir
+# itself is watched flat, so ``objects/`` churn never reaches us).
+_META_TREES = ("refs", "logs")
+
+# Above this many distinct worktree paths in one poll, report the worktree
+# root instead (keeps a bulk checkout from flooding the signal queue).
+MAX_WORKTREE_SIGNALS_PER_POLL = 64
+
+# Paths reported after a queue overflow: one per change kind.
+_RESCAN_META_FILES = ("HEAD", "index", "packed-refs", "refs/stash")
+
+
+@functools.lru_cache(maxsize=1)
+def _libc() -> ctypes.CDLL | None:
+    name = ctypes.util.find_library("c")
+    try:
+        libc = ctypes.CDLL(name, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+def inotify_available() -> bool:
+    """Return True when libc exposes the inotify syscalls (Linux)."""
+    return _libc() is not None
+
+
+class _Inotify:
+    """Thin ctypes wrapper around one non-blocking, close-on-exec inotify fd."""
+
+    def __init__(self) -> None:
+        libc = _libc()
+        if libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self._libc = libc
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self.fd = fd
+
+    def add_watch(self, path: str, mask: int) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        # EINVAL: the kernel already dropped it (IN_IGNORED in flight).
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read(self) -> bytes:
+        """Return every queued event record (empty when none are pending)."""
+        chunks: list[bytes] = []
+        while True:
+            try:
+                data = os.read(self.fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            chunks.append(data)
+        return b"".join(chunks)
+
+    def close(self) -> None:
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+def _iter_events(buf: bytes):
+    """Yield ``(wd, mask, name)`` from a raw inotify read buffer."""
+    offset = 0
+    size = _EVENT.size
+    while offset + size <= len(buf):
+        wd, mask, _cookie, length = _EVENT.unpack_from(buf, offset)
+        offset += size
+        raw = buf[offset : offset + length]
+        offset += length
+        yield wd, mask, os.fsdecode(raw.rstrip(b"\0"))
+
+
+def _walk_dirs(root: str, *, deny: bool) -> list[str]:
+    """Return ``root`` plus every subdirectory (no symlinks), DFS order.
+
+    With ``deny``, directories named in the worktree denylist are skipped.
+    """
+    out: list[str] = []
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        out.append(current)
+        try:
+            with os.scandir(current) as it:
+                entries = [e for e in it if e.is_dir(follow_symlinks=False)]
+        except OSError:
+            continue
+        for entry in sorted(entries, key=lambda e: e.name, reverse=True):
+            if deny and is_denied_name(entry.name):
+                continue
+            stack.append(entry.path)
+    return out
+
+
+def _worktree_key(
+    roots: Sequence[WatchRoot],
+) -> tuple[str | None, frozenset[str]]:
+    """``(worktree root, file roots outside it)`` — what the worktree half watches."""
+    root_path: str | None = None
+    files: list[str] = []
+    for root in roots:
+        if root.kind == "worktree":
+            root_path = str(Path(root.path).resolve())
+        elif root.kind == "file":
+            files.append(str(Path(root.path).resolve()))
+    prefix = None if root_path is None else root_path.rstrip(os.sep) + os.sep
+    outside = frozenset(p for p in files if prefix is None or not p.startswith(prefix))
+    return root_path, outside
+
+
+class _WatchLimit(Exception):
+    """The per-user inotify watch (or memory) limit was hit."""
+
+
+class InotifyBackend:
+    """Push-style backend: inotify watches, drained by :meth:`poll`.
+
+    Watches the git dir and common dir flat (``HEAD``, ``index``,
+    ``packed-refs``...) plus their ``refs/`` and ``logs/`` trees, and every
+    non-denied worktree directory when a worktree root is attached. Content
+    edits arrive as ``IN_CLOSE_WRITE``. Hits on Status file roots (which
+    include the preview target) are always signalled; other paths under the
+    worktree root only when ``worktree_digest`` moves too, so writes to
+    ignored files (build logs, editor swap files) do not wake Status.
+
+    ``fileno()`` lets the observer sleep in ``select`` until events arrive.
+    When inotify is unavailable or the watch limit is reached the backend
+    switches to :class:`StatMtimeBackend` (given ``worktree_digest``) for the
+    rest of its life and reports that backend's health.
+    """
+
+    def __init__(
+        self,
+        *,
+        worktree_digest: Callable[[], str | None] | None = None,
+    ) -> None:
+        self._worktree_digest = worktree_digest
+        self._inotify: _Inotify | None = None
+        self._fallback: StatMtimeBackend | None = None
+        # wd -> (directory, is_worktree); reverse map for updates.
+        self._watches: dict[int, tuple[str, bool]] = {}
+        self._wd_by_dir: dict[str, int] = {}
+        # Parent dir -> file names for "file" roots outside the worktree tree.
+        self._file_filters: dict[str, set[str]] = {}
+        self._roots: list[WatchRoot] = []
+        self._meta_sig: frozenset[tuple[str, str]] = frozenset()
+        self._worktree_key: tuple[str | None, frozenset[str]] | None = None
+        self._meta_dirs: list[str] = []
+        # git_dir / common_dir themselves (watched flat, not recursively).
+        self._meta_bases: set[str] = set()
+        self._worktree_root: str | None = None
+        # Resolved "file" roots: Status entries, signalled without the digest.
+        self._file_roots: frozenset[str] = frozenset()
+        self._last_digest: str | None = None
+        self._started = False
+
+    @property
+    def using_fallback(self) -> bool:
+        return self._fallback is not None
+
+    def fileno(self) -> int | None:
+        """Readable when events are pending; None when polling is required."""
+        if self._inotify is None or self._fallback is not None:
+            return None
+        return self._inotify.fd
+
+    def start(self, roots: Sequence[WatchRoot]) -> None:
+        """Drop every watch and watch ``roots`` from scratch."""
+        if self._fallback is not None:
+            self._fallback.start(roots)
+            return
+        self._close()
+        try:
+            self._inotify = _Inotify()
+        except OSError as exc:
+            self._switch_to_fallback(roots, f"inotify unavailable: {exc}")
+            return
+        self._started = True
+        self._meta_sig = frozenset()
+        self._worktree_key = None
+        self.update_roots(roots)
+
+    def update_roots(self, roots: Sequence[WatchRoot]) -> None:
+        """Add/remove watches for changed roots; unchanged halves are kept."""
+        if self._fallback is not None:
+            self._fallback.update_roots(roots)
+            return
+        if not self._started:
+            self.start(roots)
+            return
+        self._roots = list(roots)
+        self._file_roots = frozenset(
+            str(Path(root.path).resolve()) for root in roots if root.kind == "file"
+        )
+        meta_sig = metadata_roots_signature(roots)
+        wt_key = _worktree_key(roots)
+        try:
+            if meta_sig != self._meta_sig:
+                self._meta_sig = meta_sig
+                self._meta_dirs = self._expand_meta_dirs(roots)
+                self._sync_watches(is_worktree=False, wanted=self._meta_dirs)
+            if wt_key != self._worktree_key:
+                # Status file roots inside the worktree are already covered by
+                # its directory watches, so Status list churn is a no-op here.
+                self._worktree_key = wt_key
+                self._sync_worktree(*wt_key)
+        except _WatchLimit as exc:
+            self._switch_to_fallback(roots, str(exc))
+
+    def stop(self) -> None:
+        """Close the inotify fd (or stop the fallback)."""
+        if self._fallback is not None:
+            self._fallback.stop()
+        self._close()
+        self._started = False
+
+    def health(self) -> BackendHealth:
+        if self._fallback is not None:
+            return self._fallback.health()
+        return BackendHealth.OK
+
+    def poll(self) -> list[PathSignal]:
+        """Drain pending events into deduplicated PathSignals."""
+        if self._fallback is not None:
+            return self._fallback.poll()
+        if self._inotify is None:
+            return []
+        try:
+            return self._handle_events(self._inotify.read())
+        except _WatchLimit as exc:
+            self._switch_to_fallback(self._roots, str(exc))
+            return []
+
+    # ── internals ──
+
+    def _handle_events(self, buf: bytes) -> list[PathSignal]:
+        meta: dict[str, None] = {}
+        worktree: dict[str, None] = {}
+        overflow = False
+        for wd, mask, name in _iter_events(buf):
+            if mask & IN_Q_OVERFLOW:
+                overflow = True
+                continue
+            watch = self._watches.get(wd)
+            if watch is None:
+                continue
+            directory, is_worktree = watch
+            if mask & IN_IGNORED:
+                self._forget(wd)
+                continue
+            if not name:
+                # The watched dir itself moved or vanished; its parent's
+                # watch reports the path.
+                continue
+            if not is_worktree and name.endswith(".lock"):
+                continue
+            allowed = self._file_filters.get(directory)
+            if is_worktree and allowed is not None and name not in allowed:
+                continue
+            path = os.path.join(directory, name)
+            if is_worktree and is_denied_name(name):
+                continue
+            (worktree if is_worktree else meta)[path] = None
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                self._watch_new_dir(directory, path, is_worktree)
+        if overflow:
+            return self._rescan()
+        if worktree:
+            worktree = self._confirm_worktree(worktree)
+        if len(worktree) > MAX_WORKTREE_SIGNALS_PER_POLL and self._worktree_root:
+            worktree = {self._worktree_root: None}
+        # Metadata last: the observer queue drops its oldest entries first.
+        return [PathSignal(path=p) for p in (*worktree, *meta)]
+
+    def _confirm_worktree(self, hits: dict[str, None]) -> dict[str, None]:
+        """Drop worktree ``hits`` the digest shows cannot change status.
+
+        Status file roots and hits outside the worktree root always count:
+        rewriting an already modified file leaves the digest as it was but
+        still changes its diff. The digest only filters the other (untracked
+        or unknown) paths, and an unreadable digest keeps them.
+        """
+        root = self._worktree_root
+        if self._worktree_digest is None or root is None:
+            return hits
+        prefix = root.rstrip(os.sep) + os.sep
+        unknown = [
+            p
+            for p in hits
+            if p not in self._file_roots and (p == root or p.startswith(prefix))
+        ]
+        if not unknown:
+            return hits
+        current = self._read_digest()
+        if current is None:
+            return hits
+        previous, self._last_digest = self._last_digest, current
+        if current != previous:
+            return hits
+        for path in unknown:
+            del hits[path]
+        return hits
+
+    def _read_digest(self) -> str | None:
+        """Invoke the digest provider; treat failures as no reading."""
+        if self._worktree_digest is None:
+            return None
+        try:
+            return self._worktree_digest()
+        except Exception:
+            _logger.debug("worktree digest failed", exc_info=True)
+            return None
+
+    def _rescan(self) -> list[PathSignal]:
+        """Recover from ``IN_Q_OVERFLOW``: re-walk watches, report every kind."""
+        _logger.debug("inotify queue overflow; rescanning")
+        self._meta_dirs = self._expand_meta_dirs(self._roots)
+        self._sync_watches(is_worktree=False, wanted=self._meta_dirs)
+        self._sync_worktree(*_worktree_key(self._roots))
+        out: list[PathSignal] = []
+        if self._worktree_root is not None:
+            out.append(PathSignal(path=self._worktree_root))
+        for root in self._roots:
+            if root.kind in ("git_dir", "common_dir"):
+                base = str(Path(root.path).resolve())
+                out.extend(
+                    PathSignal(path=os.path.join(base, rel))
+                    for rel in _RESCAN_META_FILES
+                )
+        return out
+
+    def _expand_meta_dirs(self, roots: Sequence[WatchRoot]) -> list[str]:
+        dirs: list[str] = []
+        self._meta_bases = set()
+        for root in roots:
+            if root.kind not in ("git_dir", "common_dir"):
+                continue
+            base = str(Path(root.path).resolve())
+            if not os.path.isdir(base):
+                continue
+            self._meta_bases.add(base)
+            dirs.append(base)
+            for rel in _META_TREES:
+                sub = os.path.join(base, rel)
+                if os.path.isdir(sub):
+                    dirs.extend(_walk_dirs(sub, deny=False))
+        return list(dict.fromkeys(dirs))
+
+    def _sync_worktree(self, root_path: str | None, files: frozenset[str]) -> None:
+        if root_path != self._worktree_root or self._last_digest is None:
+            # Baseline, so the first event after attaching compares against
+            # the state Status was loaded from.
+            self._last_digest = (
+                None if root_path is None else self._read_digest()
+            )
+        self._worktree_root = root_path
+        wanted: list[str] = []
+        self._file_filters = {}
+        if root_path is not None and os.path.isdir(root_path):
+            wanted = _walk_dirs(root_path, deny=True)
+        for path in sorted(files):
+            parent, name = os.path.split(path)
+            self._file_filters.setdefault(parent, set()).add(name)
+        wanted.extend(p for p in self._file_filters if p not in wanted)
+        self._sync_watches(is_worktree=True, wanted=wanted)
+
+    def _sync_watches(self, *, is_worktree: bool, wanted: list[str]) -> None:
+        """Make this half's watch set equal ``wanted``."""
+        assert self._inotify is not None
+        keep = set(wanted)
+        for wd, (directory, wt) in list(self._watches.items()):
+            if wt == is_worktree and directory not in keep:
+                self._inotify.rm_watch(wd)
+                self._forget(wd)
+        for directory in wanted:
+            current = self._wd_by_dir.get(directory)
+            if current is not None and self._watches[current][1] == is_worktree:
+                continue
+            self._add(directory, is_worktree)
+
+    def _watch_new_dir(self, parent: str, path: str, is_worktree: bool) -> None:
+        """Watch a directory created after the walk (and anything inside it)."""
+        if is_worktree and self._worktree_root is None:
+            return
+        if (
+            not is_worktree
+            and parent in self._meta_bases
+            and os.path.basename(path) not in _META_TREES
+        ):
+            # e.g. ``objects/`` or ``rebase-merge/`` under the git dir itself.
+            return
+        for directory in _walk_dirs(path, deny=is_worktree):
+            if directory not in self._wd_by_dir:
+                self._add(directory, is_worktree)
+
+    def _add(self, directory: str, is_worktree: bool) -> None:
+        assert self._inotify is not None
+        try:
+            wd = self._inotify.add_watch(
+                directory, _WORKTREE_MASK if is_worktree else _META_MASK
+            )
+        except OSError as exc:
+            if exc.errno in (errno.ENOSPC, errno.ENOMEM):
+                raise _WatchLimit(f"inotify watch limit reached at {directory}")
+            # Vanished, unreadable or not a directory: nothing to watch.
+            return
+        # inotify returns the existing wd for a directory watched twice.
+        self._watches[wd] = (directory, is_worktree)
+        self._wd_by_dir[directory] = wd
+
+    def _forget(self, wd: int) -> None:
+        watch = self._watches.pop(wd, None)
+        if watch is not None and self._wd_by_dir.get(watch[0]) == wd:
+            del self._wd_by_dir[watch[0]]
+
+    def _switch_to_fallback(self, roots: Sequence[WatchRoot], reason: str) -> None:
+        _logger.info("Repo observe falling back to stat polling: %s", reason)
+        self._close()
+        self._fallback = StatMtimeBackend(worktree_digest=self._worktree_digest)
+        self._fallback.start(roots)
+
+    def _close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        self._watches.clear()
+        self._wd_by_dir.clear()
+        self._file_filters = {}
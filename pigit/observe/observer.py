@@ -8,21 +8,37 @@ Date: 2026-08-20
 
 from __future__ import annotations
 
+import logging
+import os
 import queue
+import select
+import threading
 from typing import Callable
 
 from .backend import ObservationBackend
+from .cadence import AdaptiveCadence
 from .types import ObserveContext, PathSignal, WatchRoot
 
 DEFAULT_QUEUE_MAXSIZE = 256
 
+# After a push backend wakes the worker, wait this long so one poll reads the
+# whole burst of events (git writes several files per operation).
+PUSH_SETTLE_S = 0.02
+
+_logger = logging.getLogger(__name__)
+
 
 class RepoObserver:
     """Pulls signals from an ObservationBackend onto a queue.Queue.
 
-    The UI (or a helper) must call ``poll_into_queue``; this class does not
-    spawn threads. Push backends may still enqueue elsewhere and return []
-    from ``poll``.
+    Either call ``poll_into_queue`` yourself, or ``start_worker`` to poll on a
+    daemon thread. While the worker runs it owns the backend: ``start`` /
+    ``update_roots`` / ``stop`` only hand roots over and never block on a poll
+    (which may spawn ``git status`` for the worktree digest). A backend with a
+    ``fileno()`` (push, e.g. inotify) wakes the worker as soon as it has events
+    instead of waiting out the interval. With an ``AdaptiveCadence`` the wait
+    shortens after ``note_activity`` or a poll that found changes, and grows
+    while the repo stays idle.
     """
 
     def __init__(
@@ -38,28 +54,187 @@ class RepoObserver:
             out_queue if out_queue is not None else queue.Queue(maxsize=maxsize)
         )
         self._ctx_provider = ctx_provider
+        self._worker: threading.Thread | None = None
+        self._stop_event = threading.Event()
+        self._wake = threading.Event()
+        self._pending_lock = threading.Lock()
+        # (roots, reset) waiting for the worker; reset wins over update.
+        self._pending_roots: tuple[list[WatchRoot], bool] | None = None
+        # Write end of the worker's self-pipe (wakes a ``select`` wait).
+        self._wake_w: int | None = None
+        self._cadence: AdaptiveCadence | None = None
 
     @property
     def queue(self) -> queue.Queue[PathSignal]:
         """Queue that receives PathSignals."""
         return self._queue
 
+    @property
+    def worker_running(self) -> bool:
+        return self._worker is not None and self._worker.is_alive()
+
     def start(self, roots: list[WatchRoot]) -> None:
         """Start the underlying backend with ``roots``."""
+        if self._worker is not None:
+            self._hand_over(list(roots), reset=True)
+            return
         self._backend.start(roots)
 
     def update_roots(self, roots: list[WatchRoot]) -> None:
         """Update backend roots without a full stop (keeps mtime baselines)."""
-        update = getattr(self._backend, "update_roots", None)
-        if callable(update):
-            update(roots)
-        else:
-            self._backend.start(roots)
+        if self._worker is not None:
+            self._hand_over(list(roots), reset=False)
+            return
+        self._apply_roots(roots, reset=False)
 
     def stop(self) -> None:
-        """Stop the underlying backend."""
+        """Stop the underlying backend (the worker stops it on its way out)."""
+        if self._worker is not None:
+            self.stop_worker()
+            return
         self._backend.stop()
 
+    def start_worker(self, interval_s: float | AdaptiveCadence) -> None:
+        """Poll the backend into the queue on a daemon thread.
+
+        ``interval_s`` is either a fixed wait in seconds or an
+        ``AdaptiveCadence`` consulted before every wait.
+        """
+        if self._worker is not None:
+            return
+        if isinstance(interval_s, AdaptiveCadence):
+            self._cadence = interval_s
+            interval_s.note_activity()
+        else:
+            self._cadence = None
+        self._stop_event = threading.Event()
+        wake_r, self._wake_w = os.pipe()
+        os.set_blocking(wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._worker = threading.Thread(
+            target=self._run_worker,
+            args=(interval_s, self._stop_event, wake_r, self._wake_w),
+            name="pigit-observe",
+            daemon=True,
+        )
+        self._worker.start()
+
+    def stop_worker(self, timeout: float | None = None) -> None:
+        """Ask the worker to exit; wait up to ``timeout`` seconds (None: no wait).
+
+        Not waiting is the UI default: an in-flight digest finishes on its own
+        and the worker then stops the backend.
+        """
+        worker = self._worker
+        if worker is None:
+            return
+        self._worker = None
+        self._stop_event.set()
+        self._nudge()
+        self._wake_w = None
+        if timeout is not None:
+            worker.join(timeout)
+
+    def note_activity(self) -> None:
+        """Mark user activity: poll at the fast cadence again.
+
+        Wakes a worker that has backed off so a change made just before the
+        keypress shows up without waiting out the idle interval.
+        """
+        cadence = self._cadence
+        if cadence is None:
+            return
+        backed_off = cadence.backed_off
+        cadence.note_activity()
+        if backed_off and self._worker is not None:
+            self._nudge()
+
+    def _hand_over(self, roots: list[WatchRoot], *, reset: bool) -> None:
+        with self._pending_lock:
+            prev = self._pending_roots
+            self._pending_roots = (roots, reset or (prev is not None and prev[1]))
+        self._nudge()
+
+    def _nudge(self) -> None:
+        self._wake.set()
+        if self._wake_w is not None:
+            try:
+                os.write(self._wake_w, b"\0")
+            except OSError:
+                # Pipe full (already woken) or closed by an exiting worker.
+                pass
+
+    def _take_pending(self) -> tuple[list[WatchRoot], bool] | None:
+        with self._pending_lock:
+            pending, self._pending_roots = self._pending_roots, None
+        return pending
+
+    def _apply_roots(self, roots: list[WatchRoot], *, reset: bool) -> None:
+        update = getattr(self._backend, "update_roots", None)
+        if reset or not callable(update):
+            self._backend.start(roots)
+        else:
+            update(roots)
+
+    def _run_worker(
+        self,
+        interval_s: float | AdaptiveCadence,
+        stop: threading.Event,
+        wake_r: int,
+        wake_w: int,
+    ) -> None:
+        try:
+            self._worker_loop(interval_s, stop, wake_r)
+        finally:
+            os.close(wake_r)
+            os.close(wake_w)
+
+    def _worker_loop(
+        self,
+        interval_s: float | AdaptiveCadence,
+        stop: threading.Event,
+        wake_r: int,
+    ) -> None:
+        cadence = interval_s if isinstance(interval_s, AdaptiveCadence) else None
+        while not stop.is_set():
+            self._wake.clear()
+            pending = self._take_pending()
+            try:
+                if pending is not None:
+                    self._apply_roots(pending[0], reset=pending[1])
+                if not stop.is_set() and self.poll_into_queue() and cadence:
+                    cadence.note_activity()
+            except Exception:
+                _logger.debug("Observe poll failed", exc_info=True)
+            wait = cadence.next_interval() if cadence else interval_s
+            self._sleep(wait, wake_r)
+        try:
+            self._backend.stop()
+        except Exception:
+            _logger.debug("Observe backend stop failed", exc_info=True)
+
+    def _sleep(self, interval_s: float, wake_r: int) -> None:
+        """Wait for the interval, a nudge, or (push backends) pending events."""
+        fileno = getattr(self._backend, "fileno", None)
+        fd = fileno() if callable(fileno) else None
+        if fd is None:
+            self._wake.wait(interval_s)
+            return
+        try:
+            ready, _, _ = select.select([fd, wake_r], [], [], interval_s)
+        except (OSError, ValueError):
+            # Backend fd closed under us (e.g. fell back to polling).
+            self._wake.wait(interval_s)
+            return
+        if wake_r in ready:
+            try:
+                while os.read(wake_r, 64):
+                    pass
+            except BlockingIOError:
+                pass
+        elif ready:
+            self._wake.wait(PUSH_SETTLE_S)
+
     def poll_into_queue(self) -> int:
         """Poll the backend and enqueue signals.
 
@@ -87,6 +87,9 @@ class Application:
     def after_start(self) -> None:
         """Lifecycle hook invoked after the loop is ready."""
 
+    def before_key(self, key: str) -> None:
+        """Lifecycle hook invoked before each key is dispatched to the root."""
+
     def on_exit(self) -> None:
         """Lifecycle hook invoked before ``root.destroy()`` on teardown.
 
@@ -161,6 +164,7 @@ class Application:
                 root,
                 on_after_start=self._on_loop_after_start,
                 on_before_resize=self.resize,
+                on_before_key=self.before_key,
                 **self._loop_kwargs,
             )
             root._event_loop = self._loop
@@ -14,7 +14,7 @@ import logging
 import queue
 import threading
 from typing import Any, Generic, TypeVar
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 
 T = TypeVar("T")
 
@@ -74,6 +74,71 @@ class AsyncTask(Generic[T]):
 
         _executor.submit(_run)
 
+    def start_stream(
+        self,
+        work: Callable[[], Iterable[T]],
+        callback: Callable[[T], None],
+    ) -> None:
+        """Like :meth:`start`, but deliver each item *work* yields as it arrives.
+
+        The worker stops pulling items once the task is cancelled or
+        restarted; items it already queued are still delivered, as with
+        :meth:`start`. Work blocked inside the iterable keeps its worker
+        until it yields or returns, so the caller should also stop the
+        underlying source (e.g. terminate its subprocess).
+        """
+        with self._lock:
+            self._gen += 1
+            current_gen = self._gen
+
+        def _run() -> None:
+            items = None
+            try:
+                items = iter(work())
+                for item in items:
+                    with self._lock:
+                        if current_gen != self._gen:
+                            return
+                        _GLOBAL_QUEUE.put((callback, item))
+            except Exception:
+                _logger.debug("AsyncTask stream failed", exc_info=True)
+            finally:
+                close = getattr(items, "close", None)
+                if callable(close):
+                    close()
+
+        _executor.submit(_run)
+
+    def watch(
+        self,
+        future: concurrent.futures.Future[T],
+        callback: Callable[[T], None],
+    ) -> None:
+        """Deliver the result of *future* to *callback* on the main thread.
+
+        For work already running elsewhere (e.g. a process pool): no worker
+        thread waits on it, the future's done callback queues the result.
+        Unlike :meth:`start`, earlier watches are not cancelled; :meth:`cancel`
+        drops them all. Failed or cancelled futures deliver nothing.
+        """
+        with self._lock:
+            current_gen = self._gen
+
+        def _done(done: concurrent.futures.Future[T]) -> None:
+            if done.cancelled():
+                return
+            if done.exception() is not None:
+                _logger.debug(
+                    "AsyncTask watched future failed", exc_info=done.exception()
+                )
+                return
+            with self._lock:
+                if current_gen != self._gen:
+                    return
+                _GLOBAL_QUEUE.put((callback, done.result()))
+
+        future.add_done_callback(_done)
+
     def cancel(self) -> None:
         """Mark the current task as cancelled.
 
@@ -85,6 +85,7 @@ class AppEventLoop:
         *,
         on_after_start: Callable[[], None] | None = None,
         on_before_resize: Callable[[tuple[int, int]], None] | None = None,
+        on_before_key: Callable[[str], None] | None = None,
     ) -> None:
         self._child = child
         self._real_time = real_time
@@ -100,6 +101,7 @@ class AppEventLoop:
         self._alt = alt
         self._on_after_start = on_after_start
         self._on_before_resize = on_before_resize
+        self._on_before_key = on_before_key
 
         self._key_handlers = resolve_key_handlers(self, self.BINDINGS)
 
@@ -124,6 +126,8 @@ class AppEventLoop:
 
     def before_dispatch_key(self, key: str) -> None:
         """Hook before dispatching a string semantic key (subclasses may override)."""
+        if self._on_before_key is not None:
+            self._on_before_key(key)
 
     def after_dispatch_key(self, key: str, outcome: KeyDispatchOutcome) -> None:
         """Hook after dispatching a string key; ``outcome`` matches the branch taken."""
@@ -17,7 +17,8 @@ from .calendar_layout import (
 from .frame import BoxFrame
 from .gutter import format_line_number
 from .text import plain
-from .word_diff import merge_ranges, tokenize_with_positions
+from .text_index import TextIndex
+from .word_diff import match_tokens, merge_ranges, tokenize_with_positions
 
 __all__ = [
     "plain",
@@ -25,8 +26,10 @@ __all__ = [
     "parse_ansi_line",
     "tokenize_with_positions",
     "merge_ranges",
+    "match_tokens",
     "format_line_number",
     "ContributionCalendar",
     "build_contribution_calendar",
     "calendar_day_values",
+    "TextIndex",
 ]
@@ -0,0 +1,63 @@
+"""
+Module: pigit/termui/primitives/text_index.py
+Description: Case-insensitive substring index for incremental list filtering.
+Author: Zev
+Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Sequence
+
+
+class TextIndex:
+    """Answer ``query in row.lower()`` over a fixed list of rows, per keystroke.
+
+    Rows are lowercased once, on the first :meth:`search`. Every answer is
+    remembered; a new query only scans the hits of the longest remembered
+    query it contains (every row holding ``"fix bug"`` also holds ``"fix"``),
+    so typing narrows the previous result and backspacing is a lookup. Build
+    a new index whenever the rows change.
+    """
+
+    # Remembered answers; each holds at most ``len(rows)`` ints.
+    MAX_CACHED_QUERIES = 32
+
+    def __init__(self, texts: Sequence[str]) -> None:
+        self._texts = texts
+        self._lowered: list[str] | None = None
+        self._hits: OrderedDict[str, list[int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def search(self, query: str) -> list[int]:
+        """Return the indices of rows containing ``query`` (case-insensitive)."""
+        needle = query.lower()
+        if not needle:
+            return list(range(len(self._texts)))
+        hits = self._hits.get(needle)
+        if hits is not None:
+            self._hits.move_to_end(needle)
+            return list(hits)
+        if self._lowered is None:
+            self._lowered = [text.lower() for text in self._texts]
+        rows = self._lowered
+        candidates = self._candidates(needle)
+        if candidates is None:
+            hits = [i for i, row in enumerate(rows) if needle in row]
+        else:
+            hits = [i for i in candidates if needle in rows[i]]
+        self._hits[needle] = hits
+        if len(self._hits) > self.MAX_CACHED_QUERIES:
+            self._hits.popitem(last=False)
+        return list(hits)
+
+    def _candidates(self, needle: str) -> list[int] | None:
+        """Smallest remembered hit list whose query is contained in ``needle``."""
+        best: list[int] | None = None
+        for query, hits in self._hits.items():
+            if query in needle and (best is None or len(hits) < len(best)):
+                best = hits
+        return best
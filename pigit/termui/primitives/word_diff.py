@@ -1,12 +1,22 @@
 """
 Module: pigit/termui/primitives/word_diff.py
-Description: Word-level diff tokenization and range merging for highlight segments.
+Description: Word-level diff tokenization, token matching and range merging for
+    highlight segments.
 Author: Zev
 Date: 2026-08-20
 """
 
 from __future__ import annotations
 
+import re
+from collections.abc import Sequence
+
+# Whitespace runs, word runs (``str.isalnum()`` or ``_``), other runs.
+_TOKEN_RE = re.compile(r"\s+|\w+|[^\w\s]+")
+
+# Most edit steps the Myers pass explores before giving up on a region.
+MAX_EDIT_COST = 128
+
 
 def tokenize_with_positions(
     text: str,
@@ -26,36 +36,169 @@ def tokenize_with_positions(
         Tuple of token strings and ``(start, end)`` spans in ``text``.
     """
 
-    def _is_word(character: str) -> bool:
-        return character.isalnum() or character == "_"
-
     tokens: list[str] = []
     positions: list[tuple[int, int]] = []
-    index = 0
-    length = len(text)
-    while index < length:
-        if text[index].isspace():
-            start = index
-            while index < length and text[index].isspace():
-                index += 1
-            tokens.append(text[start:index])
-            positions.append((start, index))
+    for match in _TOKEN_RE.finditer(text):
+        tokens.append(match.group())
+        positions.append(match.span())
+    return tokens, positions
+
+
+def match_tokens(a: Sequence[str], b: Sequence[str]) -> list[tuple[int, int, int]]:
+    """Return the blocks of tokens ``a`` and ``b`` have in common.
+
+    Same shape as ``difflib.SequenceMatcher.get_matching_blocks()``: ascending
+    ``(i, j, size)`` triples with ``a[i:i+size] == b[j:j+size]``, ending with
+    the sentinel ``(len(a), len(b), 0)``.
+
+    Regions of at most :data:`MAX_EDIT_COST` tokens get a shortest edit
+    script from Myers' O(ND) algorithm. Longer ones are first split
+    patience-style: tokens that occur exactly once on each side anchor the
+    match, and only the gaps between anchors are diffed. A gap needing more
+    than :data:`MAX_EDIT_COST` edits is reported as changed as a whole, so
+    long, heavily edited lines (minified code) stay cheap.
+    """
+    pairs: list[tuple[int, int]] = []
+    todo = [(0, len(a), 0, len(b))]
+    while todo:
+        alo, ahi, blo, bhi = todo.pop()
+        # Common prefix and suffix.
+        while alo < ahi and blo < bhi and a[alo] == b[blo]:
+            pairs.append((alo, blo))
+            alo += 1
+            blo += 1
+        while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+            ahi -= 1
+            bhi -= 1
+            pairs.append((ahi, bhi))
+        if alo == ahi or blo == bhi:
             continue
+        if ahi - alo + bhi - blo <= MAX_EDIT_COST:
+            anchors = []
+        else:
+            anchors = _unique_anchors(a, alo, ahi, b, blo, bhi)
+        if anchors:
+            prev_a, prev_b = alo, blo
+            for i, j in anchors:
+                pairs.append((i, j))
+                todo.append((prev_a, i, prev_b, j))
+                prev_a, prev_b = i + 1, j + 1
+            todo.append((prev_a, ahi, prev_b, bhi))
+        else:
+            pairs += _myers(a, alo, ahi, b, blo, bhi)
+
+    pairs.sort()
+    blocks: list[tuple[int, int, int]] = []
+    for i, j in pairs:
+        if blocks:
+            bi, bj, size = blocks[-1]
+            if bi + size == i and bj + size == j:
+                blocks[-1] = (bi, bj, size + 1)
+                continue
+        blocks.append((i, j, 1))
+    blocks.append((len(a), len(b), 0))
+    return blocks
+
 
-        start = index
-        if _is_word(text[index]):
-            while index < length and _is_word(text[index]):
-                index += 1
+def _unique_anchors(
+    a: Sequence[str], alo: int, ahi: int, b: Sequence[str], blo: int, bhi: int
+) -> list[tuple[int, int]]:
+    """Longest increasing run of tokens unique to both ``a`` and ``b`` ranges."""
+    counts: dict[str, list[int]] = {}
+    for i in range(alo, ahi):
+        entry = counts.get(a[i])
+        if entry is None:
+            counts[a[i]] = [1, i, 0, -1]
         else:
-            while (
-                index < length
-                and not text[index].isspace()
-                and not _is_word(text[index])
-            ):
-                index += 1
-        tokens.append(text[start:index])
-        positions.append((start, index))
-    return tokens, positions
+            entry[0] += 1
+    for j in range(blo, bhi):
+        entry = counts.get(b[j])
+        if entry is not None:
+            entry[2] += 1
+            entry[3] = j
+    candidates = sorted(
+        (i, j) for count_a, i, count_b, j in counts.values() if count_a == count_b == 1
+    )
+    if not candidates:
+        return []
+    # Longest increasing subsequence on ``j`` (patience sorting).
+    tails: list[int] = []
+    tail_idx: list[int] = []
+    prev = [-1] * len(candidates)
+    for n, (_i, j) in enumerate(candidates):
+        lo, hi = 0, len(tails)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if tails[mid] < j:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == len(tails):
+            tails.append(j)
+            tail_idx.append(n)
+        else:
+            tails[lo] = j
+            tail_idx[lo] = n
+        prev[n] = tail_idx[lo - 1] if lo else -1
+    run: list[tuple[int, int]] = []
+    n = tail_idx[-1]
+    while n >= 0:
+        run.append(candidates[n])
+        n = prev[n]
+    run.reverse()
+    return run
+
+
+def _myers(
+    a: Sequence[str], alo: int, ahi: int, b: Sequence[str], blo: int, bhi: int
+) -> list[tuple[int, int]]:
+    """Matched ``(i, j)`` token pairs of a shortest edit script (Myers, 1986).
+
+    Returns no pairs when the script needs more than :data:`MAX_EDIT_COST`
+    edits.
+    """
+    n = ahi - alo
+    m = bhi - blo
+    max_d = min(n + m, MAX_EDIT_COST)
+    offset = max_d + 1
+    v = [0] * (2 * max_d + 3)
+    trace: list[list[int]] = []
+    for d in range(max_d + 1):
+        trace.append(v[:])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _myers_backtrack(trace, offset, n, m, alo, blo)
+    return []
+
+
+def _myers_backtrack(
+    trace: list[list[int]], offset: int, x: int, y: int, alo: int, blo: int
+) -> list[tuple[int, int]]:
+    pairs: list[tuple[int, int]] = []
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        k = x - y
+        if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = v[offset + prev_k]
+        prev_y = prev_x - prev_k
+        while x > prev_x and y > prev_y:
+            x -= 1
+            y -= 1
+            pairs.append((alo + x, blo + y))
+        x, y = prev_x, prev_y
+    return pairs
 
 
 def merge_ranges(
@@ -7,16 +7,78 @@ Date: 2026-08-20
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import logging
+import os
+from array import array
+from typing import TYPE_CHECKING, TextIO
 from collections.abc import Sequence
 
 from . import palette
 from ._color import ColorAdapter
-from .surface import FlatCell, Surface
+from .surface import NO_COLOR, FlatCell, Surface, pack_rgb, unpack_rgb
 
 if TYPE_CHECKING:
     from ._session import Session
 
+# One packed Surface row: (chars, fg, bg, style), see Surface.packed_rows.
+_PackedRow = tuple[list[str], array, array, array]
+
+# Terminal SGR state as packed (fg, bg, style_flags); the state after a reset.
+_SgrState = tuple[int, int, int]
+_SGR_RESET: _SgrState = (NO_COLOR, NO_COLOR, 0)
+
+_DEFAULT_FG = pack_rgb(palette.DEFAULT_FG)
+_DEFAULT_BG = pack_rgb(palette.DEFAULT_BG)
+
+# DEC private mode 2026: the terminal holds output between BSU and ESU and
+# paints the frame at once, so a half-written frame is never shown.
+_SYNC_BEGIN = "\033[?2026h"
+_SYNC_END = "\033[?2026l"
+
+_logger = logging.getLogger(__name__)
+
+
+def _detect_sync_output() -> bool:
+    """Detect synchronized-output (mode 2026) support from the environment.
+
+    ``PIGIT_SYNC_OUTPUT=1``/``0`` forces it on or off (``TERM_PROGRAM`` is
+    often not forwarded over SSH). Otherwise it is enabled only for
+    terminals known to implement the mode.
+    """
+    force = os.environ.get("PIGIT_SYNC_OUTPUT", "").lower()
+    if force:
+        if force in ("1", "on", "true", "yes"):
+            return True
+        if force in ("0", "off", "false", "no"):
+            return False
+        _logger.warning("Invalid PIGIT_SYNC_OUTPUT=%r, using auto-detect", force)
+
+    term = os.environ.get("TERM", "")
+    term_program = os.environ.get("TERM_PROGRAM", "")
+    if term_program in ("WezTerm", "ghostty", "iTerm.app", "vscode", "contour"):
+        return True
+    if term in ("xterm-kitty", "xterm-ghostty", "alacritty", "contour") or (
+        term.startswith("foot")
+    ):
+        return True
+    return False
+
+
+def _output_fd(stream: TextIO) -> int | None:
+    """Return the tty file descriptor behind ``stream``, or ``None``."""
+    try:
+        fd = stream.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
+    if not isinstance(fd, int) or not stream.isatty() or not os.isatty(fd):
+        return None
+    return fd
+
+
+def _copy_row(row: _PackedRow) -> _PackedRow:
+    chars, fg, bg, style = row
+    return list(chars), array("i", fg), array("i", bg), array("i", style)
+
 
 class Renderer:
     """
@@ -26,14 +88,25 @@ class Renderer:
     (``Session.renderer``).
     """
 
+    # Changed cells at most this many columns apart are rewritten as one
+    # span: a cursor move (``ESC[r;cf``) costs about as many bytes.
+    SPAN_GAP = 8
+
     def __init__(self, session: Session) -> None:
         self._out = session.stdout
-        self._prev_frame: list[str] | None = None
+        # Packed rows of the last frame drawn, for cell-level damage tracking.
+        self._prev_rows: list[_PackedRow] | None = None
+        # The surface _prev_rows was taken from; its dirty rows are relative
+        # to that frame.
+        self._prev_surface: Surface | None = None
         self._prev_size: tuple[int, int] | None = None
         self._cursor_pos: tuple[int, int] | None = None
         self._last_cursor: tuple[int, int] | None = None
         self._cursor_visible: bool = False
         self._color = ColorAdapter()
+        # Frames go straight to the tty in one os.write when there is one.
+        self._fd = _output_fd(self._out)
+        self._sync_output = _detect_sync_output()
 
     def write(self, text: str) -> None:
         """Write raw text to the terminal output stream."""
@@ -142,99 +215,196 @@ class Renderer:
         self.flush()
 
     # ------------------------------------------------------------------ #
-    # Row rendering (FlatCell-aware)
+    # Row rendering (packed Surface rows)
     # ------------------------------------------------------------------ #
 
-    def _row_to_str(self, row: list[FlatCell]) -> str:
+    def _row_to_str(self, row: Sequence[FlatCell]) -> str:
         """Convert a row of FlatCells to an ANSI string."""
-        parts = []
-        last_fg = None
-        last_bg = None
-        last_style = 0
+        packed: _PackedRow = (
+            [cell.char for cell in row],
+            array("i", [pack_rgb(cell.fg) for cell in row]),
+            array("i", [pack_rgb(cell.bg) for cell in row]),
+            array("i", [cell.style_flags for cell in row]),
+        )
+        return self._packed_to_str(packed)
+
+    def _packed_to_str(self, row: _PackedRow) -> str:
+        """Convert a packed Surface row to an ANSI string."""
+        parts: list[str] = []
+        if self._cells_to_sgr(row, 0, len(row[0]), _SGR_RESET, parts) != _SGR_RESET:
+            parts.append(self._color.reset_sequence())
+        return "".join(parts)
 
-        for cell in row:
-            if cell.char == "":
+    def _cells_to_sgr(
+        self,
+        row: _PackedRow,
+        start: int,
+        end: int,
+        state: _SgrState,
+        parts: list[str],
+    ) -> _SgrState:
+        """Append cells ``[start, end)`` of a packed row to ``parts``.
+
+        ``state`` is the terminal's SGR state before the first cell; only
+        attributes that differ from it are emitted. Returns the state after
+        the last cell.
+        """
+        chars, fgs, bgs, styles = row
+        color = self._color
+        last_fg, last_bg, last_style = state
+        for col in range(start, end):
+            char = chars[col]
+            if char == "":
                 continue
-            sgr_parts = []
-            if cell.fg != last_fg:
-                if cell.fg is None or cell.fg == palette.DEFAULT_FG:
-                    sgr_parts.append("\033[39m")
+            fg = fgs[col]
+            if fg != last_fg:
+                if fg == NO_COLOR or fg == _DEFAULT_FG:
+                    parts.append("\033[39m")
                 else:
-                    sgr_parts.append(self._color.fg_sequence(cell.fg))
-                last_fg = cell.fg
-            if cell.bg != last_bg:
-                if cell.bg is None or cell.bg == palette.DEFAULT_BG:
-                    sgr_parts.append("\033[49m")
+                    parts.append(color.fg_sequence(unpack_rgb(fg)))
+                last_fg = fg
+            bg = bgs[col]
+            if bg != last_bg:
+                if bg == NO_COLOR or bg == _DEFAULT_BG:
+                    parts.append("\033[49m")
                 else:
-                    sgr_parts.append(self._color.bg_sequence(cell.bg))
-                last_bg = cell.bg
-            if cell.style_flags != last_style:
+                    parts.append(color.bg_sequence(unpack_rgb(bg)))
+                last_bg = bg
+            style = styles[col]
+            if style != last_style:
                 if last_style:
-                    sgr_parts.append(self._color.reset_style_sequence())
-                if cell.style_flags:
-                    sgr_parts.append(self._color.style_sequence(cell.style_flags))
-                last_style = cell.style_flags
-
-            if sgr_parts:
-                parts.extend(sgr_parts)
-            parts.append(cell.char)
-
-        if last_fg is not None or last_bg is not None or last_style:
-            parts.append(self._color.reset_sequence())
-        return "".join(parts)
+                    parts.append(color.reset_style_sequence())
+                if style:
+                    parts.append(color.style_sequence(style))
+                last_style = style
+            parts.append(char)
+        return last_fg, last_bg, last_style
+
+    def _changed_spans(self, old: _PackedRow, new: _PackedRow) -> list[tuple[int, int]]:
+        """Return ``[start, end)`` column spans where ``new`` differs from ``old``.
+
+        Spans closer than :attr:`SPAN_GAP` are merged. A span never starts on
+        the spacer half of a wide character: it starts at the character.
+        """
+        spans: list[tuple[int, int]] = []
+        gap = self.SPAN_GAP
+        chars = new[0]
+        for col, (a, b) in enumerate(zip(zip(*old), zip(*new))):
+            if a == b:
+                continue
+            if spans and col - spans[-1][1] <= gap:
+                spans[-1] = (spans[-1][0], col + 1)
+            else:
+                start = col
+                while start > 0 and chars[start] == "":
+                    start -= 1
+                if spans and start <= spans[-1][1]:
+                    spans[-1] = (spans[-1][0], col + 1)
+                else:
+                    spans.append((start, col + 1))
+        return spans
 
     def render_surface(self, surface: Surface) -> None:
-        """Draw a full Surface to the terminal using row-level diff."""
-        lines = [self._row_to_str(row) for row in surface.rows()]
+        """Draw a Surface to the terminal, rewriting only changed cell spans.
+
+        The first frame (and any frame after :meth:`clear_cache` or a size
+        change) clears the screen and draws every row. Later frames look
+        only at the rows the surface reports dirty (every row when a
+        different surface is drawn), compare each with the previous frame's
+        cells and emit, per changed span, a cursor move and the span's
+        cells. SGR state carries over from one span to the next, so
+        unchanged attributes are not repeated.
+
+        The whole frame, cursor included, is built in one buffer and sent
+        with a single write, wrapped in a synchronized update when the
+        terminal supports it.
+        """
+        rows = surface.packed_rows()
+        dirty: Sequence[int] = surface.pop_dirty_rows()
+        if self._prev_surface is not surface:
+            dirty = range(surface.height)
+            self._prev_surface = surface
         curr_size = (surface.width, surface.height)
-
-        if (
-            self._prev_frame is None
-            or len(self._prev_frame) != len(lines)
-            or self._prev_size != curr_size
-        ):
-            self.clear_screen()
-            for idx, line in enumerate(lines, start=1):
-                self.move_cursor(idx, 1)
-                # Do NOT call erase_line_to_end() here. In terminals like
+        parts: list[str] = []
+
+        if self._prev_rows is None or self._prev_size != curr_size:
+            # Full clear then CUP (1,1), as in clear_screen().
+            parts.append("\033[2J\033[0;0f\033[1;1f")
+            for idx, row in enumerate(rows, start=1):
+                parts.append(f"\033[{idx};1f")
+                # Do NOT erase to end of line (EL0) here. In terminals like
                 # Ghostty, writing a character to the last column leaves the
                 # cursor in a "pending wrap" state; the subsequent EL0
                 # (\033[K) can clear that last character, causing full-width
                 # rows (e.g. header separator) to appear one column short.
-                # Since clear_screen() already blanked the screen, EL0 is
-                # redundant on this path anyway.
-                self._out.write(line)
+                # Since the screen was just cleared, EL0 is redundant on this
+                # path anyway.
+                parts.append(self._packed_to_str(row))
+            self._last_cursor = None
+            # The surface is reused and redrawn in place: keep a copy.
+            self._prev_rows = [_copy_row(row) for row in rows]
         else:
-            for idx, (old, new) in enumerate(
-                zip(self._prev_frame, lines, strict=True), start=1
-            ):
-                if old != new:
-                    self.move_cursor(idx, 1)
-                    self._out.write(self._color.reset_sequence())
-                    self.erase_line_to_end()
-                    self._out.write(new)
-
-        self._prev_frame = lines
+            prev_rows = self._prev_rows
+            state = _SGR_RESET
+            for r in dirty:
+                old, new = prev_rows[r], rows[r]
+                if old == new:
+                    continue
+                for start, end in self._changed_spans(old, new):
+                    parts.append(f"\033[{r + 1};{start + 1}f")
+                    state = self._cells_to_sgr(new, start, end, state, parts)
+                prev_rows[r] = _copy_row(new)
+            if state != _SGR_RESET:
+                parts.append(self._color.reset_sequence())
+            if parts:
+                self._last_cursor = None  # Writing spans moved the cursor.
         self._prev_size = curr_size
 
         if self._cursor_pos is not None:
             target = (self._cursor_pos[0] + 1, self._cursor_pos[1] + 1)
             if self._last_cursor != target:
-                self.move_cursor(*target)
+                parts.append(f"\033[{target[0]};{target[1]}f")
                 self._last_cursor = target
             if not self._cursor_visible:
-                self.show_cursor()
+                parts.append("\033[?25h")
                 self._cursor_visible = True
         else:
             if self._cursor_visible:
-                self.hide_cursor()
+                parts.append("\033[?25l")
                 self._cursor_visible = False
             self._last_cursor = None
 
         self._cursor_pos = None
-        self.flush()
+        if parts:
+            if self._sync_output:
+                parts.insert(0, _SYNC_BEGIN)
+                parts.append(_SYNC_END)
+            self._write_frame("".join(parts))
+
+    def _write_frame(self, frame: str) -> None:
+        """Send one frame to the terminal with as few syscalls as possible.
+
+        On a tty the frame is encoded once and written with ``os.write``
+        (looping only on a short write), bypassing the text stream's
+        buffering. Other streams get a single ``write`` and ``flush``.
+        """
+        if self._fd is None:
+            self._out.write(frame)
+            self._out.flush()
+            return
+        # Text written outside render_surface must reach the tty first.
+        self._out.flush()
+        data = memoryview(
+            frame.encode(
+                getattr(self._out, "encoding", None) or "utf-8",
+                getattr(self._out, "errors", None) or "strict",
+            )
+        )
+        while data:
+            data = data[os.write(self._fd, data) :]
 
     def clear_cache(self) -> None:
         """Invalidate the incremental-render frame cache."""
-        self._prev_frame = None
+        self._prev_rows = None
         self._prev_size = None
+        self._prev_surface = None
@@ -7,8 +7,9 @@ Date: 2026-08-20
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
-from collections.abc import Sequence
+from array import array
+from typing import TYPE_CHECKING, overload
+from collections.abc import Iterator, Sequence
 
 from . import palette
 from .wcwidth_table import (
@@ -28,6 +29,23 @@ _BOX_TR = "\u2510"
 _BOX_BL = "\u2514"
 _BOX_BR = "\u2518"
 
+# Packed color meaning "no color" (RGB tuple ``None``).
+NO_COLOR = -1
+
+
+def pack_rgb(rgb: tuple[int, int, int] | None) -> int:
+    """Pack an RGB tuple into a 24-bit int; ``None`` packs to NO_COLOR."""
+    if rgb is None:
+        return NO_COLOR
+    return (rgb[0] << 16) | (rgb[1] << 8) | rgb[2]
+
+
+def unpack_rgb(value: int) -> tuple[int, int, int] | None:
+    """Inverse of :func:`pack_rgb`."""
+    if value < 0:
+        return None
+    return (value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF
+
 
 class FlatCell:
     """TrueColor-aware terminal cell with structured style attributes.
@@ -73,8 +91,48 @@ class FlatCell:
         )
 
 
-_BLANK_CELL = FlatCell()
-_SPACER_CELL = FlatCell("")
+class _RowView(Sequence[FlatCell]):
+    """Read-only :class:`FlatCell` view of one packed Surface row."""
+
+    __slots__ = ("_surface", "_row")
+
+    def __init__(self, surface: Surface, row: int) -> None:
+        self._surface = surface
+        self._row = row
+
+    def __len__(self) -> int:
+        return self._surface.width
+
+    def _cell(self, col: int) -> FlatCell:
+        s, r = self._surface, self._row
+        return FlatCell(
+            s._chars[r][col],
+            fg=unpack_rgb(s._fg[r][col]),
+            bg=unpack_rgb(s._bg[r][col]),
+            style_flags=s._style[r][col],
+        )
+
+    @overload
+    def __getitem__(self, index: int) -> FlatCell: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[FlatCell]: ...
+
+    def __getitem__(self, index: int | slice) -> FlatCell | list[FlatCell]:
+        if isinstance(index, slice):
+            return [self._cell(c) for c in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("row index out of range")
+        return self._cell(index)
+
+    def __iter__(self) -> Iterator[FlatCell]:
+        for c in range(len(self)):
+            yield self._cell(c)
+
+    def __repr__(self) -> str:
+        return f"_RowView(row={self._row}, {''.join(self._surface._chars[self._row])!r})"
 
 
 class _Subsurface:
@@ -253,22 +311,89 @@ class Surface:
     (0-based, top to bottom) and ``col`` is the horizontal axis
     (0-based, left to right). For APIs that accept a single ``x`` argument,
     ``x`` means ``row`` to stay consistent with ``Component.x``.
+
+    Cells are stored packed, one set of parallel arrays per row: the
+    characters (``""`` for the spacer half of a wide character), fg and bg
+    as 24-bit ints (``-1`` for no color, see :func:`pack_rgb`) and style
+    flags. Drawing writes slices of these arrays; no per-cell objects are
+    allocated. :meth:`rows` returns :class:`FlatCell` views for callers that
+    read cells.
+
+    Every drawing method marks the rows it writes as dirty, and
+    :meth:`pop_dirty_rows` hands them to the renderer, which skips the
+    rest. :meth:`clear` leaves rows that are already blank untouched, so
+    a frame redrawn in place only dirties the rows that hold content.
     """
 
     def __init__(self, width: int, height: int) -> None:
         self.width = width
         self.height = height
-        blank_row = [_BLANK_CELL] * width
-        self._rows: list[list[FlatCell]] = [list(blank_row) for _ in range(height)]
+        self._blank_chars = [" "] * max(width, 0)
+        self._blank_colors = array("i", [NO_COLOR]) * max(width, 0)
+        self._blank_styles = array("i", [0]) * max(width, 0)
+        self._chars: list[list[str]] = [
+            list(self._blank_chars) for _ in range(height)
+        ]
+        self._fg: list[array[int]] = [
+            array("i", self._blank_colors) for _ in range(height)
+        ]
+        self._bg: list[array[int]] = [
+            array("i", self._blank_colors) for _ in range(height)
+        ]
+        self._style: list[array[int]] = [
+            array("i", self._blank_styles) for _ in range(height)
+        ]
+        # Per-row flags: written since the last pop_dirty_rows(), and
+        # known to hold only blank cells.
+        self._dirty = bytearray(b"\x01") * height
+        self._blank = bytearray(b"\x01") * height
 
     def __repr__(self) -> str:
         return f"Surface({self.width}x{self.height})"
 
     def clear(self) -> None:
         """Reset every cell to a blank space."""
-        for row in self._rows:
-            for i in range(self.width):
-                row[i] = _BLANK_CELL
+        blank_chars = self._blank_chars
+        blank_colors = self._blank_colors
+        blank_styles = self._blank_styles
+        for r in range(self.height):
+            if self._blank[r]:
+                continue
+            self._blank[r] = 1
+            self._dirty[r] = 1
+            self._chars[r][:] = blank_chars
+            self._fg[r][:] = blank_colors
+            self._bg[r][:] = blank_colors
+            self._style[r][:] = blank_styles
+
+    def _fill(
+        self,
+        row: int,
+        start: int,
+        end: int,
+        char: str,
+        fg: int,
+        bg: int,
+        style_flags: int,
+    ) -> None:
+        """Set cells ``[start, end)`` of ``row`` to one packed cell."""
+        n = end - start
+        self._dirty[row] = 1
+        self._blank[row] = 0
+        self._chars[row][start:end] = [char] * n
+        self._fg[row][start:end] = array("i", [fg]) * n
+        self._bg[row][start:end] = array("i", [bg]) * n
+        self._style[row][start:end] = array("i", [style_flags]) * n
+
+    def _set_cell(
+        self, row: int, col: int, char: str, fg: int, bg: int, style_flags: int
+    ) -> None:
+        self._dirty[row] = 1
+        self._blank[row] = 0
+        self._chars[row][col] = char
+        self._fg[row][col] = fg
+        self._bg[row][col] = bg
+        self._style[row][col] = style_flags
 
     def blit(
         self,
@@ -281,17 +406,24 @@ class Surface:
         dst_col: int,
     ) -> None:
         """Copy a region from *src* into this surface, clipped to both bounds."""
+        # Clip columns once: the same window applies to every row.
+        left = max(0, -src_col, -dst_col)
+        right = min(width, src.width - src_col, self.width - dst_col)
+        if right <= left:
+            return
+        s0, s1 = src_col + left, src_col + right
+        d0, d1 = dst_col + left, dst_col + right
         for r in range(height):
             srow = src_row + r
             drow = dst_row + r
             if not (0 <= srow < src.height and 0 <= drow < self.height):
                 continue
-            for c in range(width):
-                scol = src_col + c
-                dcol = dst_col + c
-                if not (0 <= scol < src.width and 0 <= dcol < self.width):
-                    continue
-                self._rows[drow][dcol] = src._rows[srow][scol]
+            self._dirty[drow] = 1
+            self._blank[drow] = 0
+            self._chars[drow][d0:d1] = src._chars[srow][s0:s1]
+            self._fg[drow][d0:d1] = src._fg[srow][s0:s1]
+            self._bg[drow][d0:d1] = src._bg[srow][s0:s1]
+            self._style[drow][d0:d1] = src._style[srow][s0:s1]
 
     def subsurface(self, row: int, col: int, width: int, height: int) -> _Subsurface:
         """Return a proxy that translates local coordinates to this surface."""
@@ -347,6 +479,8 @@ class Surface:
         """
         if row < 0 or row >= self.height or col >= self.width:
             return
+        pfg = pack_rgb(fg)
+        pbg = pack_rgb(bg)
 
         if col < 0:
             # Rare: negative start column; scan char-by-char and clip.
@@ -355,39 +489,52 @@ class Surface:
                 if cur_col >= self.width:
                     return
                 w = _char_width(ord(ch))
-                if cur_col >= 0 and cur_col + w <= self.width:
-                    self._rows[row][cur_col] = FlatCell(
-                        ch, fg=fg, bg=bg, style_flags=style_flags
-                    )
+                if w and cur_col >= 0 and cur_col + w <= self.width:
+                    self._set_cell(row, cur_col, ch, pfg, pbg, style_flags)
                     if w == 2:
-                        self._rows[row][cur_col + 1] = _SPACER_CELL
+                        self._set_cell(row, cur_col + 1, "", pfg, pbg, style_flags)
                 cur_col += w
             return
 
         # Pre-compute width and truncate early to avoid per-char overflow checks.
         if text.isascii():
-            total_w = len(text)
-            if col + total_w > self.width:
-                text = text[: self.width - col]
-            for ch in text:
-                self._rows[row][col] = FlatCell(
-                    ch, fg=fg, bg=bg, style_flags=style_flags
-                )
-                col += 1
+            text = text[: self.width - col]
+            end = col + len(text)
+            n = end - col
+            self._dirty[row] = 1
+            self._blank[row] = 0
+            self._chars[row][col:end] = text
+            self._fg[row][col:end] = array("i", [pfg]) * n
+            self._bg[row][col:end] = array("i", [pbg]) * n
+            self._style[row][col:end] = array("i", [style_flags]) * n
             return
 
         total_w = wcswidth(text)
         if col + total_w > self.width:
             text = truncate_by_width(text, self.width - col)
 
+        start = col
+        self._dirty[row] = 1
+        self._blank[row] = 0
+        chars = self._chars[row]
         for ch in text:
             if col >= self.width:
                 break
             w = _char_width(ord(ch))
-            self._rows[row][col] = FlatCell(ch, fg=fg, bg=bg, style_flags=style_flags)
+            if w == 0:
+                # Combining marks join the cell before them (past a spacer).
+                prev = col - 1 if col > start and chars[col - 1] else col - 2
+                if prev >= start:
+                    chars[prev] += ch
+                continue
+            chars[col] = ch
             if w == 2:
-                self._rows[row][col + 1] = _SPACER_CELL
+                chars[col + 1] = ""
             col += w
+        n = col - start
+        self._fg[row][start:col] = array("i", [pfg]) * n
+        self._bg[row][start:col] = array("i", [pbg]) * n
+        self._style[row][start:col] = array("i", [style_flags]) * n
 
     def draw_segments(
         self,
@@ -421,11 +568,13 @@ class Surface:
         Existing character content is replaced. ``bg`` is stored on each cell
         and may be ``None`` (no background color).
         """
-        cell = FlatCell(" ", bg=bg)
-        for r in range(row, min(row + height, self.height)):
-            for c in range(col, min(col + width, self.width)):
-                if 0 <= r < self.height and 0 <= c < self.width:
-                    self._rows[r][c] = cell
+        pbg = pack_rgb(bg)
+        start = max(col, 0)
+        end = min(col + width, self.width)
+        if end <= start:
+            return
+        for r in range(max(row, 0), min(row + height, self.height)):
+            self._fill(r, start, end, " ", NO_COLOR, pbg, 0)
 
     def draw_box_rgb(
         self,
@@ -442,19 +591,17 @@ class Surface:
         if width < 2 or height < 2:
             return
 
+        pfg = pack_rgb(fg)
+        pbg = pack_rgb(bg)
         top = _BOX_TL + _BOX_H * (width - 2) + _BOX_TR
         self.draw_text_rgb(row, col, top, fg=fg, bg=bg, style_flags=style_flags)
         for r in range(row + 1, row + height - 1):
             if 0 <= r < self.height:
                 if 0 <= col < self.width:
-                    self._rows[r][col] = FlatCell(
-                        _BOX_V, fg=fg, bg=bg, style_flags=style_flags
-                    )
+                    self._set_cell(r, col, _BOX_V, pfg, pbg, style_flags)
                 end_col = col + width - 1
                 if 0 <= end_col < self.width:
-                    self._rows[r][end_col] = FlatCell(
-                        _BOX_V, fg=fg, bg=bg, style_flags=style_flags
-                    )
+                    self._set_cell(r, end_col, _BOX_V, pfg, pbg, style_flags)
         bottom = _BOX_BL + _BOX_H * (width - 2) + _BOX_BR
         self.draw_text_rgb(
             row + height - 1, col, bottom, fg=fg, bg=bg, style_flags=style_flags
@@ -478,10 +625,12 @@ class Surface:
         style_flags: int = 0,
     ) -> None:
         """Draw a vertical line with RGB colors."""
-        cell = FlatCell(_BOX_V, fg=fg, bg=bg, style_flags=style_flags)
-        for r in range(row, min(row + height, self.height)):
-            if 0 <= r < self.height and 0 <= col < self.width:
-                self._rows[r][col] = cell
+        if not 0 <= col < self.width:
+            return
+        pfg = pack_rgb(fg)
+        pbg = pack_rgb(bg)
+        for r in range(max(row, 0), min(row + height, self.height)):
+            self._set_cell(r, col, _BOX_V, pfg, pbg, style_flags)
 
     def draw_hline_rgb(
         self,
@@ -493,19 +642,43 @@ class Surface:
         style_flags: int = 0,
     ) -> None:
         """Draw a horizontal line with RGB colors."""
-        cell = FlatCell(_BOX_H, fg=fg, bg=bg, style_flags=style_flags)
-        for c in range(col, min(col + width, self.width)):
-            if 0 <= row < self.height and 0 <= c < self.width:
-                self._rows[row][c] = cell
+        start = max(col, 0)
+        end = min(col + width, self.width)
+        if not 0 <= row < self.height or end <= start:
+            return
+        self._fill(
+            row, start, end, _BOX_H, pack_rgb(fg), pack_rgb(bg), style_flags
+        )
+
+    @property
+    def _rows(self) -> list[_RowView]:
+        return self.rows()
 
-    def rows(self) -> list[list[FlatCell]]:
-        """Return the internal row buffers for Renderer output.
+    def rows(self) -> list[_RowView]:
+        """Return read-only :class:`FlatCell` views of each row.
 
-        This exposes the 2-D cell grid directly; callers should treat
-        each row as read-only and not mutate cells in place.
+        Cells are built on access; the renderer reads
+        :meth:`packed_rows` instead.
         """
-        return self._rows
+        return [_RowView(self, r) for r in range(self.height)]
+
+    def packed_rows(
+        self,
+    ) -> list[tuple[list[str], array[int], array[int], array[int]]]:
+        """Return ``(chars, fg, bg, style)`` storage for each row.
+
+        These are the live buffers, not copies; callers must not mutate
+        them.
+        """
+        return list(zip(self._chars, self._fg, self._bg, self._style))
+
+    def pop_dirty_rows(self) -> list[int]:
+        """Return the rows written since the last call, and reset them."""
+        dirty = self._dirty
+        rows = [r for r in range(self.height) if dirty[r]]
+        self._dirty = bytearray(self.height)
+        return rows
 
     def lines(self) -> list[str]:
         """Flatten buffer to strings for Renderer output."""
-        return ["".join(cell.char for cell in row) for row in self._rows]
+        return ["".join(chars) for chars in self._chars]
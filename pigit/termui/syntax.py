@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import functools
 import re
+from typing import NamedTuple
 
 from . import palette
 from .theme import get_theme
@@ -90,10 +91,8 @@ _STATIC_RULES: list[tuple[str, str]] = [
 ]
 
 
-# Pre-compile static regexes for performance
-_STATIC_RES: list[tuple[re.Pattern[str], str]] = [
-    (re.compile(pattern), token_type) for pattern, token_type in _STATIC_RULES
-]
+# Keyword categories in match priority order.
+_KEYWORD_CATEGORIES = ("control", "decl", "storage", "type", "operator")
 
 # Pre-compile hunk-header regexes
 _HUNK_RE: re.Pattern[str] = re.compile(
@@ -102,13 +101,32 @@ _HUNK_RE: re.Pattern[str] = re.compile(
 _HUNK_RANGE_RE: re.Pattern[str] = re.compile(r"(-|\+)(\d+)(,\d+)?")
 
 
+class CacheInfo(NamedTuple):
+    """Token cache statistics, like ``functools.lru_cache``'s ``cache_info()``."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache (``0.0`` before any)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
 class SyntaxTokenizer:
     """Per-line syntax tokenizer with language-aware rules and LRU cache."""
 
-    def __init__(self) -> None:
+    CACHE_SIZE = 512
+
+    def __init__(self, cache_size: int = CACHE_SIZE) -> None:
         self._lang_re: dict[str, dict] = {}
         self._token_cache: dict[tuple[str, str], list[tuple[str, str]]] = {}
-        self._CACHE_MAX = 512
+        self._cache_max = max(0, cache_size)
+        self._hits = 0
+        self._misses = 0
 
     # ── language detection ──
 
@@ -136,7 +154,15 @@ class SyntaxTokenizer:
     # ── regex compilation ──
 
     def _get_lang_re(self, lang: str) -> dict:
-        """Return (cached) compiled regex dict for a language."""
+        """Return (cached) compiled regex dict for a language.
+
+        All rules of the language are joined into one master regex, one named
+        group per rule, in priority order: whitespace, special patterns, keyword
+        categories, builtins, then :data:`_STATIC_RULES`. A final group takes
+        any other single character as ``punct``. The regex alternation picks
+        the first rule that matches at a position, so one ``finditer`` pass
+        gives the same tokens as trying each rule in turn.
+        """
         if lang in self._lang_re:
             return self._lang_re[lang]
 
@@ -145,28 +171,36 @@ class SyntaxTokenizer:
         while "_alias" in raw:
             raw = _LANGUAGE_CONFIGS[raw["_alias"]]
 
-        compiled: dict = {
-            "_special_rules": [
-                (re.compile(p), t) for p, t in raw.get("special_patterns", [])
-            ],
-        }
-
+        # No rule starts with whitespace, so whitespace runs would fall
+        # through every alternative to ``punct``: take them first.
+        rules: list[tuple[str, str]] = [(r"\s+", "punct")]
+        rules.extend(raw.get("special_patterns", []))
         cats = raw.get("keyword_categories", {})
-        for category in ("control", "decl", "storage", "type", "operator"):
+        for category in _KEYWORD_CATEGORIES:
             words = cats.get(category, set())
             if words:
                 pattern = (
                     r"\b(?:" + "|".join(re.escape(w) for w in sorted(words)) + r")\b"
                 )
-                compiled[f"_{category}_re"] = re.compile(pattern)
+                rules.append((pattern, f"keyword_{category}"))
 
         builtins = raw.get("builtins", set())
         if builtins:
             pattern = (
                 r"\b(?:" + "|".join(re.escape(w) for w in sorted(builtins)) + r")\b"
             )
-            compiled["_builtin_re"] = re.compile(pattern)
+            rules.append((pattern, "builtin"))
+
+        rules.extend(_STATIC_RULES)
+        rules.append((r"(?s:.)", "punct"))
 
+        # Rule patterns must not use numbered backreferences: their group
+        # numbers shift inside the master regex.
+        master = "|".join(f"(?P<r{i}>{p})" for i, (p, _) in enumerate(rules))
+        compiled: dict = {
+            "_master_re": re.compile(master),
+            "_group_types": {f"r{i}": ttype for i, (_, ttype) in enumerate(rules)},
+        }
         compiled["_color_overrides"] = raw.get("color_overrides", {})
         compiled["_markdown"] = raw.get("markdown_rules", False)
         self._lang_re[lang] = compiled
@@ -175,21 +209,29 @@ class SyntaxTokenizer:
     # ── public tokenize ──
 
     def tokenize(self, line: str, lang: str) -> list[tuple[str, str]]:
-        """Tokenize a line of code; results are cached."""
+        """Tokenize a line of code; results are kept in an LRU cache."""
         key = (line, lang)
-        if key in self._token_cache:
-            return self._token_cache[key]
-
-        config = self._get_lang_re(lang)
-        tokens = self._tokenize_impl(line, config)
-        tokens = self._merge_adjacent(tokens)
-
-        # Simple LRU eviction
-        while len(self._token_cache) >= self._CACHE_MAX:
-            self._token_cache.pop(next(iter(self._token_cache)))
-        self._token_cache[key] = tokens
+        cache = self._token_cache
+        tokens = cache.pop(key, None)
+        if tokens is not None:
+            self._hits += 1
+            cache[key] = tokens  # Most recently used goes last.
+            return tokens
+
+        self._misses += 1
+        tokens = self._tokenize_impl(line, self._get_lang_re(lang))
+        if self._cache_max:
+            while len(cache) >= self._cache_max:
+                del cache[next(iter(cache))]
+            cache[key] = tokens
         return tokens
 
+    def cache_info(self) -> CacheInfo:
+        """Return hit/miss counts and the size of the token cache."""
+        return CacheInfo(
+            self._hits, self._misses, self._cache_max, len(self._token_cache)
+        )
+
     # ── hunk header tokenize ──
 
     @staticmethod
@@ -292,6 +334,15 @@ class SyntaxTokenizer:
 
     # ── multi-line string / comment mask ──
 
+    @staticmethod
+    def has_multiline_context(lang: str) -> bool:
+        """Return True if ``lang`` has constructs tracked by the multi-line mask."""
+        raw = _LANGUAGE_CONFIGS.get(lang, {})
+        while "_alias" in raw:
+            lang = raw["_alias"]
+            raw = _LANGUAGE_CONFIGS.get(lang, {})
+        return lang == "py" or raw.get("block_comment") == ("/*", "*/")
+
     @staticmethod
     def compute_multiline_mask(
         lines: list[str],
@@ -320,6 +371,10 @@ class SyntaxTokenizer:
             return lang
 
         mask: list[str | None] = [None] * len(lines)
+        if not any(
+            SyntaxTokenizer.has_multiline_context(lang) for lang in set(line_langs)
+        ):
+            return mask
 
         in_docstring = False
         in_block = False
@@ -384,73 +439,17 @@ class SyntaxTokenizer:
 
     # ── internal tokenize implementation ──
 
-    def _tokenize_impl(self, line: str, config: dict) -> list[tuple[str, str]]:
-        tokens: list[tuple[str, str]] = []
-        pos = 0
-        special_rules = config.get("_special_rules", [])
-
-        while pos < len(line):
-            matched = False
-
-            # 1. Special patterns (language-specific, e.g. Rust lifetime)
-            for pattern_re, token_type in special_rules:
-                m = pattern_re.match(line, pos)
-                if m:
-                    tokens.append((m.group(0), token_type))
-                    pos += len(m.group(0))
-                    matched = True
-                    break
-            if matched:
-                continue
-
-            # 2. Keyword categories (control > decl > storage > type > operator)
-            for category in ("control", "decl", "storage", "type", "operator"):
-                regex = config.get(f"_{category}_re")
-                if regex:
-                    m = regex.match(line, pos)
-                    if m:
-                        tokens.append((m.group(0), f"keyword_{category}"))
-                        pos += len(m.group(0))
-                        matched = True
-                        break
-            if matched:
-                continue
-
-            # 3. Builtins
-            builtin_re = config.get("_builtin_re")
-            if builtin_re:
-                m = builtin_re.match(line, pos)
-                if m:
-                    tokens.append((m.group(0), "builtin"))
-                    pos += len(m.group(0))
-                    continue
-
-            # 4. Static rules (strings, comments, numbers, calls, types, vars, ops, punct)
-            for pattern_re, token_type in _STATIC_RES:
-                m = pattern_re.match(line, pos)
-                if m:
-                    tokens.append((m.group(0), token_type))
-                    pos += len(m.group(0))
-                    matched = True
-                    break
-
-            if not matched:
-                tokens.append((line[pos], "punct"))
-                pos += 1
-
-        return tokens
-
-    # ── merge adjacent tokens of same type ──
-
     @staticmethod
-    def _merge_adjacent(tokens: list[tuple[str, str]]) -> list[tuple[str, str]]:
-        if not tokens:
-            return []
-        merged: list[tuple[str, str]] = [tokens[0]]
-        for text, ttype in tokens[1:]:
-            last_text, last_type = merged[-1]
-            if ttype == last_type:
-                merged[-1] = (last_text + text, last_type)
+    def _tokenize_impl(line: str, config: dict) -> list[tuple[str, str]]:
+        """Scan ``line`` once with the master regex, merging same-type runs."""
+        group_types = config["_group_types"]
+        tokens: list[tuple[str, str]] = []
+        last_type = ""
+        for m in config["_master_re"].finditer(line):
+            token_type = group_types[m.lastgroup]
+            if token_type == last_type:
+                tokens[-1] = (tokens[-1][0] + m.group(), token_type)
             else:
-                merged.append((text, ttype))
-        return merged
+                tokens.append((m.group(), token_type))
+                last_type = token_type
+        return tokens
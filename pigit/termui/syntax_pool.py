@@ -0,0 +1,104 @@
+"""
+Module: pigit/termui/syntax_pool.py
+Description: Small process pool for CPU-bound syntax highlighting off the UI
+    thread's GIL. Each worker holds its own SyntaxTokenizer.
+Author: Zev
+Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import multiprocessing
+import os
+import threading
+from typing import Any, TypeVar
+from collections.abc import Callable
+
+from .syntax import SyntaxTokenizer
+from .theme import Theme, get_theme, set_theme
+
+T = TypeVar("T")
+
+_logger = logging.getLogger(__name__)
+
+# A few workers: highlighting one large diff, not a batch job.
+MAX_WORKERS = 3
+
+_pool: concurrent.futures.ProcessPoolExecutor | None = None
+_pool_failed = False
+_pool_lock = threading.Lock()
+
+# The tokenizer of the current worker process (see _init_worker).
+_worker_tokenizer: SyntaxTokenizer | None = None
+
+
+def _init_worker(theme: Theme) -> None:
+    """Bind the parent's theme and build this worker's tokenizer."""
+    global _worker_tokenizer
+    set_theme(theme)
+    _worker_tokenizer = SyntaxTokenizer()
+
+
+def worker_tokenizer() -> SyntaxTokenizer:
+    """Return the tokenizer of the current pool worker.
+
+    Compiled language regexes and the token cache live for the whole worker,
+    so later chunks in the same language skip compilation.
+    """
+    global _worker_tokenizer
+    if _worker_tokenizer is None:
+        _worker_tokenizer = SyntaxTokenizer()
+    return _worker_tokenizer
+
+
+def _get_pool() -> concurrent.futures.ProcessPoolExecutor | None:
+    global _pool, _pool_failed
+    with _pool_lock:
+        if _pool is None and not _pool_failed:
+            workers = max(1, min(MAX_WORKERS, (os.cpu_count() or 2) - 1))
+            try:
+                # Spawned workers: forking a process that runs threads can
+                # copy locks held by those threads.
+                _pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(get_theme(),),
+                )
+            except (OSError, NotImplementedError, ValueError):
+                _logger.debug("syntax pool unavailable", exc_info=True)
+                _pool_failed = True
+        return _pool
+
+
+def submit(fn: Callable[..., T], *args: Any) -> concurrent.futures.Future[T] | None:
+    """Run ``fn(*args)`` in a pool worker.
+
+    ``fn`` and its arguments must be picklable (``fn`` a module-level
+    function). Returns ``None`` when no process pool can be started here or
+    it has broken; callers then keep the work in-thread.
+    """
+    global _pool, _pool_failed
+    pool = _get_pool()
+    if pool is None:
+        return None
+    try:
+        return pool.submit(fn, *args)
+    except RuntimeError:  # Shut down, or broken (BrokenProcessPool).
+        _logger.debug("syntax pool submit failed", exc_info=True)
+        with _pool_lock:
+            _pool = None
+            _pool_failed = True
+        return None
+
+
+def shutdown() -> None:
+    """Stop the workers; the next :func:`submit` starts a new pool."""
+    global _pool, _pool_failed
+    with _pool_lock:
+        pool, _pool = _pool, None
+        _pool_failed = False
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
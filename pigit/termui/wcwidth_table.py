@@ -76,6 +76,8 @@ def wcswidth(text: str) -> int:
     a known limitation: this function only guarantees correctness for common
     CJK and basic ASCII ranges.
     """
+    if text.isascii():
+        return len(text)  # Every ASCII code point is one column here.
     return sum(_char_width(ord(cp)) for cp in text)
 
 
@@ -83,6 +85,8 @@ def truncate_by_width(text: str, max_width: int) -> str:
     """Truncate text so that its display width <= max_width."""
     if max_width <= 0:
         return ""
+    if text.isascii():
+        return text[:max_width]
     width = 0
     parts = []
     for cp in text:
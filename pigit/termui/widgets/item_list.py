@@ -18,6 +18,7 @@ from ..component import Component, ComponentError
 from ..mouse import MouseButton, MouseKind, MouseEvent
 from .._runtime_context import request_render
 from ..segment import Segment
+from ..primitives.text_index import TextIndex
 from ..surface import Surface, _Subsurface
 from ..reactive import Signal
 from ..types import EVT_SELECTION_CHANGED
@@ -70,6 +71,8 @@ class ItemList(Component):
         self._filter_fn: Callable[[str, str], bool] | None = None
         self._filter_needle: str = ""
         self._visible_to_source: list[int] = []
+        # Built on the first default-filter keystroke for each source content.
+        self._text_index: TextIndex | None = None
         self._search_active: bool = False
         self._search_query: str = ""
         self._on_search_changed = on_search_changed
@@ -113,6 +116,7 @@ class ItemList(Component):
         """
         self.content = content
         self._source_content = list(content)
+        self._text_index = None
         self._item_starts = None
         self._visible_to_source = list(range(len(content)))
         if not content:
@@ -240,8 +244,13 @@ class ItemList(Component):
         if not needle.strip():
             filtered = rows
             self._visible_to_source = list(range(len(rows)))
+        elif self._filter_fn is None:
+            if self._text_index is None:
+                self._text_index = TextIndex(rows)
+            self._visible_to_source = self._text_index.search(needle)
+            filtered = [rows[i] for i in self._visible_to_source]
         else:
-            fn = self._filter_fn or (lambda row, n: n.lower() in row.lower())
+            fn = self._filter_fn
             filtered = []
             visible_to_source = []
             for i, r in enumerate(rows):
@@ -7,19 +7,39 @@ Date: 2026-05-25
 
 from __future__ import annotations
 
+import queue
+import threading
+import time
+from collections.abc import Iterator
 from dataclasses import dataclass
+from functools import partial
 from typing import TYPE_CHECKING
 
+from pigit.termui.async_task import AsyncTask
 from pigit.termui.reactive import Signal
 from pigit.git.api import GitError
 
 from .base import IListViewModel, ViewModelBase
 
 if TYPE_CHECKING:
+    from pigit.app_commit_graph import GraphLayout
     from pigit.app_types import CommitSnapshot, GraphRow
-    from pigit.git.api import GitApi
+    from pigit.git.activity import CommitActivity
+    from pigit.git.api import CommitLog, CommitSearch, DiffStream, GitApi
+    from pigit.git.commit_store import CommitStore
     from pigit.git.model import Commit
 
+# Commits per ``git log`` page (the first page is the classic 300 cap).
+PAGE_SIZE = 300
+# Start loading the next page when the cursor is this close to a window edge.
+PREFETCH_MARGIN = 100
+# Most commits kept in memory; pages beyond it are dropped from the far end.
+MAX_WINDOW = 3000
+# Search hits are published in batches of at most this many commits, and no
+# hit waits longer than ``SEARCH_FLUSH_S``; a search stops at MAX_WINDOW.
+SEARCH_BATCH = 200
+SEARCH_FLUSH_S = 0.1
+
 
 @dataclass
 class _CommitLoad:
@@ -30,6 +50,23 @@ class _CommitLoad:
     resolved: str
     graph_rows: list[GraphRow]
     remotes: tuple[str, ...]
+    limit: int = PAGE_SIZE
+    layout: GraphLayout | None = None
+    # Read from the commit store: only painted while the list is empty.
+    stored: bool = False
+
+
+@dataclass
+class _CommitPage:
+    """A page read next to the current window, plus the window it yields."""
+
+    log: CommitLog
+    base: list[Commit]
+    commits: list[Commit]
+    window_start: int
+    shift: int
+    graph_rows: list[GraphRow]
+    layout: GraphLayout
 
 
 class ICommitViewModel(IListViewModel["Commit"]):
@@ -44,6 +81,9 @@ class ICommitViewModel(IListViewModel["Commit"]):
     @property
     def remotes(self) -> tuple[str, ...]: ...
 
+    @property
+    def activity(self) -> Signal[CommitActivity | None]: ...
+
     @property
     def log_ref(self) -> str: ...
 
@@ -59,13 +99,55 @@ class ICommitViewModel(IListViewModel["Commit"]):
 
     def load_diff(self, idx: int) -> list[str]: ...
 
+    def open_diff(self, idx: int) -> DiffStream | None: ...
+
     def get_bodies(self) -> dict[str, str] | None: ...
 
+    @property
+    def window_shift(self) -> int: ...
 
-class CommitViewModel(ViewModelBase["Commit"], ICommitViewModel):
-    """Concrete ViewModel for commit log."""
+    def ensure_window(self, idx: int) -> None: ...
 
-    def __init__(self, git: GitApi) -> None:
+    @property
+    def search_query(self) -> str: ...
+
+    @property
+    def searching(self) -> bool: ...
+
+    @property
+    def search_running(self) -> Signal[bool]: ...
+
+    def search(self, query: str) -> None: ...
+
+    def clear_search(self) -> None: ...
+
+
+class CommitViewModel(ViewModelBase["Commit"], ICommitViewModel):
+    """Concrete ViewModel for commit log.
+
+    ``items`` is a window onto the log: the first page loads on refresh, and
+    :meth:`ensure_window` pages further (or back) through a :class:`CommitLog`
+    as the cursor nears either edge, keeping at most ``MAX_WINDOW`` commits.
+
+    ``activity`` holds the year of commit counts behind the contribution
+    graph; it is aggregated separately (cached under ``activity_cache_dir``)
+    whenever the listed ref's tip moves.
+
+    With a :class:`CommitStore`, the list last shown for the ref paints the
+    first refresh before ``git log`` returns, and commit bodies and diff
+    stats are read from the store before asking git.
+
+    :meth:`search` swaps the window for the matches of a history-wide
+    ``git log`` search, published as they stream in, until
+    :meth:`clear_search`.
+    """
+
+    def __init__(
+        self,
+        git: GitApi,
+        activity_cache_dir: str | None = None,
+        store: CommitStore | None = None,
+    ) -> None:
         super().__init__()
         self._git = git
         head = git.get_head() or "HEAD"
@@ -74,6 +156,26 @@ class CommitViewModel(ViewModelBase["Commit"], ICommitViewModel):
         self._graph_rows: Signal[list[GraphRow]] = Signal([])
         self._remotes: Signal[tuple[str, ...]] = Signal(())
         self._bodies: dict[str, str] | None = None
+        self._log: CommitLog | None = None
+        # Graph layout positioned after the last row of the window.
+        self._layout: GraphLayout | None = None
+        self._window_ref: str | None = None
+        self._window_start = 0
+        self._window_shift = 0
+        self._pager = AsyncTask()
+        self._paging = False
+        self._activity: Signal[CommitActivity | None] = Signal(None)
+        self._activity_cache_dir = activity_cache_dir
+        self._activity_tip = ""
+        self._activity_task = AsyncTask()
+        self._store = store
+        # Rows of the list last written to the store (skips unchanged saves).
+        self._stored_rows: list[tuple[str, str, str]] | None = None
+        self._search_query = ""
+        self._search: CommitSearch | None = None
+        self._search_hits: list[Commit] = []
+        self._search_running: Signal[bool] = Signal(False)
+        self._search_task = AsyncTask()
 
     @property
     def repo_path(self) -> str:
@@ -87,10 +189,43 @@ class CommitViewModel(ViewModelBase["Commit"], ICommitViewModel):
     def remotes(self) -> tuple[str, ...]:
         return self._remotes.value
 
+    @property
+    def activity(self) -> Signal[CommitActivity | None]:
+        """Year of per-day / per-author counts for ``log_ref`` (None until loaded)."""
+        return self._activity
+
     @property
     def log_ref(self) -> str:
         return self._log_ref
 
+    @property
+    def window_start(self) -> int:
+        """Log offset of ``items[0]`` (0 until early pages are dropped)."""
+        return self._window_start
+
+    @property
+    def window_shift(self) -> int:
+        """Items the last publish removed from the front (negative: prepended).
+
+        Zero after a refresh; lets the panel keep the selected commit in place.
+        """
+        return self._window_shift
+
+    @property
+    def search_query(self) -> str:
+        """Query whose matches ``items`` holds ("" when listing the log)."""
+        return self._search_query
+
+    @property
+    def searching(self) -> bool:
+        """True while a search is still reading history."""
+        return self._search_running.value
+
+    @property
+    def search_running(self) -> Signal[bool]:
+        """:attr:`searching` as a signal, so a search with no hits is seen to end."""
+        return self._search_running
+
     def set_log_ref(self, ref: str) -> None:
         """Pin the commit list to ``ref`` (validated asynchronously on load)."""
         ref = ref.strip()
@@ -98,7 +233,10 @@ class CommitViewModel(ViewModelBase["Commit"], ICommitViewModel):
             return
         self._log_ref = ref
         self._bodies = None
-        self.refresh()
+        if self._search_query:
+            self.clear_search()  # Lists the new ref's log.
+        else:
+            self.refresh()
 
     def follow_head(self, ref: str) -> bool:
         """Point the list at the current checkout; True when it overrode a pin.
@@ -124,13 +262,52 @@ class CommitViewModel(ViewModelBase["Commit"], ICommitViewModel):
         return names
 
     def refresh(self) -> None:
-        """Start a background load; the result is applied on the UI thread."""
+        """Start a background load; the result is applied on the UI thread.
+
+        Search results stay listed until :meth:`clear_search`.
+        """
+        if self._search_query:
+            return
+        if self._store is not None and not self._items.value:
+            self._loader.start_stream(self._load_with_stored, self._apply_load)
+            return
         self._loader.start(self._load_commits, self._apply_load)
 
+    def _load_with_stored(self) -> Iterator[_CommitLoad]:
+        """Yield the list saved for ``log_ref`` (if any), then the real load."""
+        stored = self._load_stored()
+        if stored is not None:
+            yield stored
+        yield self._load_commits()
+
+    def _load_stored(self) -> _CommitLoad | None:
+        requested = self._log_ref
+        commits = self._store.load_log(self.repo_path, requested)
+        if not commits:
+            return None
+        from pigit.app_commit_graph import GraphLayout
+
+        layout = GraphLayout()
+        graph_rows = layout.extend(commits)
+        return _CommitLoad(
+            commits=commits,
+            requested=requested,
+            resolved=requested,
+            graph_rows=graph_rows,
+            remotes=(),
+            layout=layout,
+            stored=True,
+        )
+
     def _load_commits(self) -> _CommitLoad:
         requested = self._log_ref
         ref = requested
-        commits = self._git.load_commits(ref)
+        # Reload as much as was paged in from the top, so an auto-refresh
+        # does not pull the cursor back to the first page.
+        limit = PAGE_SIZE
+        if self._window_start == 0 and self._window_ref == requested:
+            limit = max(limit, len(self._items.value))
+        commits = self._load_top(ref, limit)
         if not commits and not self.viewing_checkout_log():
             # An empty pinned log is either an unborn/empty branch or a
             # dangling ref (deleted/renamed). Verify only then, so the
@@ -140,19 +317,35 @@ class CommitViewModel(ViewModelBase["Commit"], ICommitViewModel):
                 self._git.verify_commitish(ref)
             except GitError:
                 ref = self._head
-                commits = self._git.load_commits(ref)
+                commits = self._load_top(ref, limit)
         remotes = tuple(self._git.get_remotes())
-        from pigit.app_commit_graph import compute_graph_rows
+        if self._store is not None:
+            self._save_log(ref, commits)
+        from pigit.app_commit_graph import GraphLayout
 
-        graph_rows = compute_graph_rows(commits) if commits else []
+        layout = GraphLayout()
+        graph_rows = layout.extend(commits)
         return _CommitLoad(
             commits=commits,
             requested=requested,
             resolved=ref,
             graph_rows=graph_rows,
             remotes=remotes,
+            limit=limit,
+            layout=layout,
         )
 
+    def _save_log(self, ref: str, commits: list[Commit]) -> None:
+        rows = [(c.sha, c.extra_info, c.status) for c in commits[:PAGE_SIZE]]
+        if rows != self._stored_rows:
+            self._stored_rows = rows
+            self._store.save_log(self.repo_path, ref, commits[:PAGE_SIZE])
+
+    def _load_top(self, ref: str, limit: int) -> list[Commit]:
+        if limit > PAGE_SIZE:
+            return self._git.load_commits(ref, max_commits=limit)
+        return self._git.load_commits(ref)
+
     def _apply_load(self, result: _CommitLoad) -> None:
         """Apply a load result on the UI thread, unless superseded.
 
@@ -160,13 +353,288 @@ class CommitViewModel(ViewModelBase["Commit"], ICommitViewModel):
         state. Derived ``graph_rows`` / ``remotes`` must be published before
         ``items`` so list subscribers rebuild row caches with rails ready.
         """
-        if result.requested != self._log_ref:
+        if result.requested != self._log_ref or self._search_query:
+            return
+        if result.stored:
+            # Placeholder until git answers; the window stays unset.
+            if not self._items.value:
+                self._layout = result.layout
+                self._graph_rows.set(result.graph_rows)
+                super()._on_loaded(result.commits)
             return
         self._log_ref = result.resolved
+        self._reset_window(result.resolved, result.commits, result.limit)
+        self._layout = result.layout
         self._graph_rows.set(result.graph_rows)
         self._remotes.set(result.remotes)
         self._bodies = None
         super()._on_loaded(result.commits)
+        self._refresh_activity(result.commits[0].sha if result.commits else "")
+
+    def _refresh_activity(self, tip: str) -> None:
+        """Aggregate activity for ``tip`` in the background when it moved.
+
+        The previous counts stay published until the new ones arrive.
+        """
+        if tip == self._activity_tip:
+            return
+        self._activity_tip = tip
+        if not tip:
+            self._activity_task.cancel()
+            self._activity.set(None)
+            return
+        self._activity_task.start(
+            partial(self._load_activity, tip), self._apply_activity
+        )
+
+    def _load_activity(self, tip: str) -> CommitActivity:
+        from pigit.git.activity import activity_cache_path, load_activity
+
+        cache_path = None
+        if self._activity_cache_dir and self.repo_path:
+            cache_path = activity_cache_path(self._activity_cache_dir, self.repo_path)
+        return load_activity(self._git, tip, cache_path)
+
+    def _apply_activity(self, activity: CommitActivity) -> None:
+        if activity.tip == self._activity_tip:
+            self._activity.set(activity)
+
+    def _close_window(self) -> None:
+        """Stop paging the current window's log."""
+        self._pager.cancel()
+        self._paging = False
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def _reset_window(self, ref: str, commits: list[Commit], limit: int) -> None:
+        """Start a new window at the top of ``ref``'s log."""
+        self._close_window()
+        self._window_ref = ref
+        self._window_start = 0
+        self._window_shift = 0
+        if len(commits) < limit:
+            return  # The first load already holds the whole history.
+        pushed_from = next(
+            (i for i, c in enumerate(commits) if c.status == "pushed"), None
+        )
+        self._log = self._git.open_commit_log(
+            ref, start=len(commits), pushed_from=pushed_from
+        )
+
+    def ensure_window(self, idx: int) -> None:
+        """Load the adjacent page when ``idx`` (window index) nears an edge."""
+        log = self._log
+        if log is None or self._paging:
+            return
+        base = self._items.value
+        end = self._window_start + len(base)
+        if idx >= len(base) - PREFETCH_MARGIN and (
+            end < log.offset or not log.exhausted
+        ):
+            forward = True
+        elif idx < PREFETCH_MARGIN and self._window_start > 0:
+            forward = False
+        else:
+            return
+        self._paging = True
+        self._pager.start(
+            partial(
+                self._load_page,
+                log,
+                base,
+                self._window_start,
+                forward,
+                self._graph_rows.value,
+                self._layout,
+            ),
+            self._apply_page,
+        )
+
+    def _load_page(
+        self,
+        log: CommitLog,
+        base: list[Commit],
+        start: int,
+        forward: bool,
+        base_rows: list[GraphRow],
+        layout: GraphLayout | None,
+    ) -> _CommitPage:
+        """Read the page after (or before) ``base`` and build the new window.
+
+        Forward pages extend a copy of the window's graph layout; a page read
+        before the window lays the whole window out again.
+        """
+        from pigit.app_commit_graph import GraphLayout
+
+        if forward:
+            end = start + len(base)
+            if end < log.offset:
+                page = log.read_range(end, min(PAGE_SIZE, log.offset - end))
+            else:
+                page = log.read_page(PAGE_SIZE)
+            window = base + page
+            if layout is not None and len(base_rows) == len(base):
+                layout = layout.copy()
+                rows = base_rows + layout.extend(page)
+            else:
+                layout = GraphLayout()
+                rows = layout.extend(window)
+            shift = max(0, len(window) - MAX_WINDOW)
+            window = window[shift:]
+            rows = rows[shift:]
+        else:
+            first = max(0, start - PAGE_SIZE)
+            page = log.read_range(first, start - first)
+            window = (page + base)[:MAX_WINDOW]
+            shift = -len(page)
+            layout = GraphLayout()
+            rows = layout.extend(window)
+
+        return _CommitPage(
+            log=log,
+            base=base,
+            commits=window,
+            window_start=start + shift,
+            shift=shift,
+            graph_rows=rows,
+            layout=layout,
+        )
+
+    def _apply_page(self, result: _CommitPage) -> None:
+        """Publish a page unless a refresh or another page replaced the window."""
+        self._paging = False
+        if result.log is not self._log or result.base is not self._items.value:
+            return
+        if not result.shift and len(result.commits) == len(result.base):
+            return
+        self._window_start = result.window_start
+        self._window_shift = result.shift
+        self._layout = result.layout
+        self._graph_rows.set(result.graph_rows)
+        self._bodies = None
+        super()._on_loaded(result.commits)
+
+    def search(self, query: str) -> None:
+        """List the commits of ``log_ref``'s history matching ``query``.
+
+        Stops any running search. Matches replace ``items`` as they arrive;
+        see :meth:`GitApi.search_commits` for the query syntax.
+        """
+        query = query.strip()
+        if not query:
+            self.clear_search()
+            return
+        if query == self._search_query:
+            return
+        self._stop_search()
+        self._close_window()
+        self._window_ref = None
+        self._window_start = 0
+        self._search_query = query
+        self._search = search = self._git.search_commits(self._log_ref, query)
+        self._search_hits = []
+        self._search_running.set(True)
+        self._publish_hits()
+        self._search_task.start_stream(
+            partial(self._read_search, search), self._apply_search
+        )
+
+    def clear_search(self) -> None:
+        """Drop search results and list the log again."""
+        if not self._search_query:
+            return
+        self._stop_search()
+        self._search_query = ""
+        self._search_hits = []
+        self.refresh()
+
+    def _stop_search(self) -> None:
+        self._search_task.cancel()
+        search, self._search = self._search, None
+        if search is not None:
+            search.close()
+        self._search_running.set(False)
+
+    def _read_search(
+        self, search: CommitSearch
+    ) -> Iterator[tuple[CommitSearch, list[Commit], bool]]:
+        """Yield ``(search, batch, done)``; the last batch has ``done`` set.
+
+        ``git log`` can walk history for a long time between matches, so a
+        pump thread reads it and a batch is flushed once its first hit is
+        ``SEARCH_FLUSH_S`` old, whether or not another match arrives.
+        """
+        hits: queue.SimpleQueue[Commit | Exception | None] = queue.SimpleQueue()
+
+        def pump() -> None:
+            try:
+                for commit in search:
+                    hits.put(commit)
+            except Exception as exc:  # Re-raised on the stream's thread.
+                hits.put(exc)
+            finally:
+                hits.put(None)
+
+        threading.Thread(target=pump, name="commit-search", daemon=True).start()
+        batch: list[Commit] = []
+        deadline: float | None = None
+        found = 0
+        try:
+            while True:
+                timeout = None
+                if deadline is not None:
+                    timeout = max(deadline - time.monotonic(), 0.0)
+                try:
+                    item = hits.get(timeout=timeout)
+                except queue.Empty:
+                    yield search, batch, False
+                    batch, deadline = [], None
+                    continue
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                batch.append(item)
+                found += 1
+                if found >= MAX_WINDOW:
+                    break
+                if deadline is None:
+                    deadline = time.monotonic() + SEARCH_FLUSH_S
+                if len(batch) >= SEARCH_BATCH:
+                    yield search, batch, False
+                    batch, deadline = [], None
+        finally:
+            # Also stops the pump when the stream is cancelled.
+            search.close()
+        yield search, batch, True
+
+    def _apply_search(self, result: tuple[CommitSearch, list[Commit], bool]) -> None:
+        search, batch, done = result
+        if search is not self._search:
+            return
+        if done:
+            self._search = None
+        if batch or done:
+            self._search_hits = self._search_hits + batch
+            self._publish_hits()
+        if done:
+            self._search_running.set(False)
+
+    def _publish_hits(self) -> None:
+        self._window_shift = 0
+        self._layout = None
+        self._graph_rows.set([])
+        self._bodies = None
+        super()._on_loaded(self._search_hits)
+
+    def dispose(self) -> None:
+        self._stop_search()
+        self._search_query = ""
+        self._close_window()
+        self._activity_task.cancel()
+        self._activity_tip = ""
+        super().dispose()
 
     def get_inspector_snapshot(self, idx: int):
         c = self.item_at(idx)
@@ -180,7 +648,12 @@ class CommitViewModel(ViewModelBase["Commit"], ICommitViewModel):
         from pigit.app_types import CommitSnapshot
         from pigit.ext.utils import relative_time
 
-        files, total_add, total_del = self._git.get_commit_stats(c.sha)
+        stats = self._store.get_stats(c.sha) if self._store is not None else None
+        if stats is None:
+            stats = self._git.get_commit_stats(c.sha)
+            if self._store is not None and stats[0]:
+                self._store.put_stats(c.sha, stats)
+        files, total_add, total_del = stats
         return CommitSnapshot(
             identity=c.sha[:7],
             sha=c.sha,
@@ -202,10 +675,25 @@ class CommitViewModel(ViewModelBase["Commit"], ICommitViewModel):
         text = self._git.load_commit_info(c.sha, plain=True)
         return text.splitlines()
 
+    def open_diff(self, idx: int) -> DiffStream | None:
+        """Like :meth:`load_diff`, but stream the diff (``None``: no such commit)."""
+        c = self.item_at(idx)
+        if c is None:
+            return None
+        return self._git.stream_commit_info(c.sha, plain=True)
+
     def get_bodies(self) -> dict[str, str] | None:
         if self._bodies is not None:
             return self._bodies
         if not self._items.value:
             return None
-        self._bodies = self._git.get_commit_bodies(self._log_ref)
+        shas = [c.sha for c in self._items.value]
+        bodies = self._store.get_bodies(shas) if self._store is not None else {}
+        missing = [sha for sha in shas if sha not in bodies]
+        if missing:
+            fetched = self._git.get_commit_bodies(self._log_ref, shas=missing)
+            if self._store is not None:
+                self._store.put_bodies(fetched)
+            bodies.update(fetched)
+        self._bodies = bodies
         return self._bodies
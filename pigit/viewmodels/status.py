@@ -16,11 +16,12 @@ from collections.abc import Callable
 from .base import ActionResult, IListViewModel, ViewModelBase
 
 from pigit.session_history import SessionHistory, HistoryRecord, ReverseCommand
-from pigit.git.model import File
+from pigit.git.model import BranchStatus, File
+from pigit.termui.reactive import Signal
 
 if TYPE_CHECKING:
     from pigit.app_types import FileSnapshot, StashSnapshot
-    from pigit.git.api import GitApi
+    from pigit.git.api import DiffStream, GitApi
     from pigit.git.model import Stash
 
 _logger = logging.getLogger(__name__)
@@ -55,6 +56,8 @@ class IStatusViewModel(IListViewModel["File"]):
 
     def load_diff_by_path(self, rel: str, plain: bool = True) -> list[str]: ...
 
+    def open_diff(self, idx: int, plain: bool = True) -> DiffStream | None: ...
+
     def get_inspector_snapshot(self, idx: int) -> FileSnapshot | None: ...
 
     def get_stash_snapshot(self, ref: str) -> StashSnapshot | None: ...
@@ -92,15 +95,29 @@ class StatusViewModel(ViewModelBase["File"], IStatusViewModel):
         super().__init__()
         self._git = git
         self._history = history
+        self._branch: Signal[BranchStatus | None] = Signal(None)
 
     @property
     def repo_path(self) -> str:
         return self._git.path or ""
 
-    def _do_load(self) -> list[File]:
+    @property
+    def branch(self) -> Signal[BranchStatus | None]:
+        """Branch headers read by the same ``git status`` run as ``items``."""
+        return self._branch
+
+    def refresh(self) -> None:
+        self._loader.start(self._load_status, self._apply_load)
+
+    def _load_status(self) -> tuple[list[File], BranchStatus | None]:
         # Observe already decided the worktree changed; index/HEAD cache would
         # hide clean→Modified and new untracked rows.
-        return self._git.load_status(use_cache=False)
+        return self._git.load_status_with_branch(use_cache=False)
+
+    def _apply_load(self, result: tuple[list[File], BranchStatus | None]) -> None:
+        files, branch = result
+        self._branch.set(branch)
+        super()._on_loaded(files)
 
     def _run_single(
         self,
@@ -256,6 +273,14 @@ class StatusViewModel(ViewModelBase["File"], IStatusViewModel):
         text = self._git.load_file_diff(f.name, f.tracked, cached, plain=plain)
         return text.splitlines()
 
+    def open_diff(self, idx: int, plain: bool = True) -> DiffStream | None:
+        """Like :meth:`load_diff`, but stream the diff (``None``: no such file)."""
+        f = self.item_at(idx)
+        if f is None:
+            return None
+        cached = f.has_staged_change and not f.has_unstaged_change
+        return self._git.stream_file_diff(f.name, f.tracked, cached, plain=plain)
+
     def load_diff_by_path(self, rel: str, plain: bool = True) -> list[str]:
         """Load a file diff by worktree-relative path (stable across refresh)."""
         for idx, item in enumerate(self.items.value):
@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 """Tests for the inline merge-graph layout algorithm."""
 
-from pigit.app_commit_graph import compute_graph_rows, _alloc_lane
+import random
+
+from pigit.app_commit_graph import GraphLayout, compute_graph_rows
 from pigit.git.model import Commit
 
 
@@ -156,31 +158,91 @@ def test_orphan_branch_allocates_new_lane():
     assert rows[1].commit_lane == 0
 
 
-class TestAllocLane:
-    def test_reuses_none_slot(self):
-        lanes = ["a", None, "b"]
-        idx = _alloc_lane(lanes, prefer_after=0)
-        assert idx == 1
-        assert lanes == ["a", None, "b"]
-
-    def test_appends_when_no_none_slot(self):
-        lanes = ["a", "b"]
-        idx = _alloc_lane(lanes, prefer_after=0)
-        assert idx == 2
-        assert lanes == ["a", "b", None]
-
-    def test_respects_prefer_after(self):
-        lanes = [None, "a", None]
-        idx = _alloc_lane(lanes, prefer_after=1)
-        assert idx == 2
-
-    def test_respects_exclude(self):
-        lanes = [None, None, "a"]
-        idx = _alloc_lane(lanes, prefer_after=0, exclude={0})
-        assert idx == 1
-
-    def test_exclude_forces_append(self):
-        lanes = [None]
-        idx = _alloc_lane(lanes, prefer_after=0, exclude={0})
-        assert idx == 1
-        assert lanes == [None, None]
+def _reference_rows(commits):
+    """The original full-copy layout, kept as an oracle for GraphLayout."""
+    lanes, rows = [], []
+
+    def alloc(prefer_after, exclude=()):
+        for i in range(prefer_after, len(lanes)):
+            if lanes[i] is None and i not in exclude:
+                return i
+        lanes.append(None)
+        return len(lanes) - 1
+
+    for commit in commits:
+        before = list(lanes)
+        incoming = [i for i, s in enumerate(lanes) if s == commit.sha]
+        if incoming:
+            lane, closed = incoming[0], incoming[1:]
+        else:
+            lane, closed = alloc(0), []
+        lanes[lane] = commit.parents[0] if commit.parents else None
+        excluded = set(closed)
+        for i in closed:
+            lanes[i] = None
+        opened = []
+        for parent in commit.parents[1:]:
+            slot = alloc(lane + 1, excluded)
+            lanes[slot] = parent
+            opened.append(slot)
+            excluded.add(slot)
+        while lanes and lanes[-1] is None:
+            lanes.pop()
+        rows.append((before, lane, closed, opened, list(lanes)))
+    return rows
+
+
+def _random_history(rng: random.Random, n: int) -> list[Commit]:
+    """Newest-first commits with merges, octopus merges, and many roots."""
+    commits = []
+    for i in range(n):
+        older = range(i + 1, n)
+        k = rng.choice([0, 1, 1, 1, 2, 2, 3]) if older else 0
+        parents = [f"c{p}" for p in rng.sample(older, min(k, len(older)))]
+        commits.append(_mk(f"c{i}", parents))
+    return commits
+
+
+def test_matches_reference_layout_on_random_dags():
+    rng = random.Random(7)
+    for _ in range(30):
+        commits = _random_history(rng, rng.randint(1, 150))
+        got = [
+            (r.lanes_before, r.commit_lane, r.closed_lanes, r.opened_lanes, r.lanes_after)
+            for r in compute_graph_rows(commits)
+        ]
+        assert got == _reference_rows(commits)
+
+
+def test_extend_by_pages_matches_one_shot():
+    commits = _random_history(random.Random(3), 400)
+    layout = GraphLayout()
+    rows = []
+    for start in range(0, len(commits), 37):
+        rows += layout.extend(commits[start : start + 37])
+    fork = layout.copy()
+    assert fork.lanes == layout.lanes
+    expected = compute_graph_rows(commits)
+    assert [(r.commit_lane, r.lanes_after) for r in rows] == [
+        (r.commit_lane, r.lanes_after) for r in expected
+    ]
+
+
+class TestLaneAllocation:
+    def test_reuses_lowest_free_slot(self):
+        # a and b hold lanes 0 and 1; root x frees lane 0 and e takes it.
+        rows = compute_graph_rows(
+            [_mk("a", ["x"]), _mk("b", ["y"]), _mk("x", []), _mk("e", ["z"])]
+        )
+        assert [r.commit_lane for r in rows] == [0, 1, 0, 0]
+        assert rows[-1].lanes_after == ["z", "y"]
+
+    def test_opened_lane_prefers_right_of_commit(self):
+        rows = compute_graph_rows([_mk("a", ["x"]), _mk("b", ["y", "z"])])
+        assert rows[1].commit_lane == 1
+        assert rows[1].opened_lanes == [2]
+
+    def test_root_commit_frees_its_lane(self):
+        rows = compute_graph_rows([_mk("a", ["x"]), _mk("b", []), _mk("c", [])])
+        assert rows[1].lanes_after == ["x"]
+        assert rows[2].commit_lane == 1
@@ -21,6 +21,8 @@ class TestDiffViewer:
     def test_set_content_computes_heatmap(self):
         d = DiffViewer()
         d.set_content(["+added line", "-removed line", "@@ context", " context"])
+        assert d._heatmap == [None] * 4  # Computed when the lines are drawn.
+        d._prepare_lines(0, 4)
         assert len(d._heatmap) == 4
         assert len(d._heatmap_colors) == 4
         # Added line gets green symbol
@@ -449,6 +451,53 @@ class TestCommitPanelLifecycle:
         assert "HEAD" in _main_text(0)
         assert "HEAD" not in _main_text(1)
 
+    def test_window_shift_keeps_selected_commit(self):
+        from unittest.mock import Mock
+        from pigit.git.model import Commit
+        from pigit.viewmodels.commit import ICommitViewModel
+        from pigit.termui.reactive import Signal
+        from pigit.app_commit import CommitPanel
+
+        commits = [Commit(f"s{i}", "m", "Zev", 0, "pushed", "", []) for i in range(12)]
+        vm = Mock(spec=ICommitViewModel)
+        vm.items = Signal([])
+        vm.graph_rows = []
+        vm.remotes = ()
+        vm.window_shift = 0
+        panel = CommitPanel(vm=vm, report_default=False)
+        panel.resize((60, 5))
+        panel.activate()
+        vm.items.set(commits[:8])
+        panel.next(6)
+        vm.ensure_window.assert_called_with(6)
+        assert panel.viewport_start == 2
+
+        vm.window_shift = 4
+        vm.items.set(commits[4:12])
+        assert panel.commits[panel.curr_no].sha == "s6"
+        assert panel.viewport_start == 0
+
+
+    def test_search_without_hits_swaps_the_placeholder(self):
+        from unittest.mock import Mock
+        from pigit.viewmodels.commit import ICommitViewModel
+        from pigit.termui.reactive import Signal
+        from pigit.app_commit import CommitPanel
+
+        vm = Mock(spec=ICommitViewModel)
+        vm.items = Signal([])
+        vm.search_running = Signal(False)
+        vm.graph_rows = []
+        vm.search_query = "nothing"
+        vm.searching = True
+        panel = CommitPanel(vm=vm)
+        panel.activate()
+        vm.search_running.set(True)
+        assert panel.content == ["Searching history…"]
+
+        vm.searching = False
+        vm.search_running.set(False)
+        assert panel.content == ["No matching commits."]
 
 class TestCommitReport:
     """Bottom contribution-graph report strip on the Commit panel."""
@@ -461,11 +510,32 @@ class TestCommitReport:
 
         vm = Mock(spec=ICommitViewModel)
         vm.items = Signal([])
+        vm.activity = Signal(None)
         vm.graph_rows = []
         panel = CommitPanel(vm=vm, report_default=report_default)
         panel.activate()
         return panel
 
+    def test_report_prefers_year_activity_over_loaded_window(self):
+        import datetime
+
+        from pigit.git.activity import CommitActivity
+        from pigit.git.model import Commit
+
+        panel = self._panel()
+        panel._vm.items.set([Commit("a1", "m", "Zev", 1700000000, "pushed", "", [])])
+        graph = panel._contrib_graph
+        assert sum(graph._day_counts.values()) == 1
+
+        day = datetime.date.today()
+        year = CommitActivity("a1", {"Ann": {day: 4}, "Zev": {day: 1}})
+        panel._vm.activity.set(year)
+        assert graph._day_counts == {day: 5}
+        assert graph._author_day_counts["Ann"] == {day: 4}
+
+        panel._vm.items.set([Commit("a1", "m", "Zev", 1700000000, "pushed", "", [])])
+        assert graph._day_counts == {day: 5}  # a window reload keeps the year
+
     def test_hidden_at_or_below_19_rows(self):
         panel = self._panel()
         panel.resize((80, 10))
@@ -184,6 +184,39 @@ class TestObserveBatchSinks:
         app._refresh_list_panel.assert_called_once_with(panel)
         app._schedule_reload_header.assert_not_called()
 
+    def test_status_reload_carries_header_on_head_change(self, app):
+        """HEAD+INDEX on Status: header comes from the status run, not get_head_tracking."""
+        from pigit.app_status import StatusPanel
+
+        app._tab_view = MagicMock()
+        app._schedule_reload_header = MagicMock()
+        app._refresh_list_panel = MagicMock()
+        panel = object.__new__(StatusPanel)
+
+        with patch("pigit.app.resolve_presentation_leaf", return_value=panel):
+            app._on_observe_batch(
+                ChangeBatch(
+                    kinds=frozenset({ChangeKind.HEAD, ChangeKind.INDEX}),
+                    paths=frozenset(),
+                )
+            )
+
+        app._refresh_list_panel.assert_called_once_with(panel)
+        app._schedule_reload_header.assert_not_called()
+
+    def test_status_branch_updates_header(self, app):
+        from pigit.git.model import BranchStatus
+
+        app._schedule_reload_header = MagicMock()
+        app._on_status_branch(BranchStatus(head="dev", oid="abc", ahead=3, behind=1))
+
+        assert app._header_state.branch == "dev"
+        assert (app._header_state.ahead, app._header_state.behind) == (3, 1)
+        app._schedule_reload_header.assert_not_called()
+
+        app._on_status_branch(BranchStatus(head="", oid="abc"))
+        app._schedule_reload_header.assert_called_once()
+
     def test_build_observe_roots_attaches_worktree_only_for_status(self, app):
         """Worktree root is present only while Status is the active panel."""
         from pigit.app_status import StatusPanel
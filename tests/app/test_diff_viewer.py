@@ -4,7 +4,8 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from pigit.app_diff import DiffViewer, DiffType
+from pigit.app_diff import DiffViewer, DiffType, _render_hunks_in_worker
+from pigit.termui import EVT_GOTO
 
 _LOCALGIT_PATH = "pigit.git.api.GitApi"
 
@@ -119,6 +120,20 @@ class TestFileHistoryState:
         assert viewer._diff_type == DiffType.COMMIT
         assert viewer._i == 2
 
+    @patch(_LOCALGIT_PATH)
+    def test_deactivate_closes_the_history_git(self, mock_git_cls, viewer):
+        mock_git = MagicMock()
+        mock_git.get_file_history.return_value = [("abc1234", "x")]
+        mock_git.get_file_at_commit.return_value = "a"
+        mock_git_cls.return_value = mock_git
+
+        viewer._enter_file_history("src/main.py")
+        viewer.deactivate()
+
+        mock_git.close.assert_called_once()
+        assert viewer._file_history_git is None
+        assert viewer._file_history_mode is True
+
     @patch(_LOCALGIT_PATH)
     def test_multiple_enter_exit_cycles(self, mock_git_cls, viewer):
         mock_git = MagicMock()
@@ -134,6 +149,30 @@ class TestFileHistoryState:
             assert viewer._diff_type == DiffType.COMMIT
             assert viewer._i == 2
 
+    @patch(_LOCALGIT_PATH)
+    def test_history_is_read_from_the_store_for_the_same_tip(
+        self, mock_git_cls, viewer, tmp_path
+    ):
+        from pigit.git.commit_store import CommitStore
+
+        mock_git = MagicMock()
+        mock_git.resolve_head_sha.return_value = "tip1"
+        mock_git.get_file_history.return_value = [("abc1234", "x")]
+        mock_git.get_file_at_commit.return_value = "a"
+        mock_git_cls.return_value = mock_git
+        viewer._store = CommitStore(tmp_path / "commits.sqlite")
+
+        for _ in range(2):
+            viewer._enter_file_history("src/main.py")
+            assert viewer._file_history_commits == [("abc1234", "x")]
+            viewer._exit_file_history()
+        assert mock_git.get_file_history.call_count == 1
+
+        mock_git.resolve_head_sha.return_value = "tip2"
+        viewer._enter_file_history("src/main.py")
+        assert mock_git.get_file_history.call_count == 2
+        viewer._store.close()
+
 
 class TestFileHistoryNavigation:
     """p/n navigation between file history commits."""
@@ -363,3 +402,355 @@ class TestEmptyContentChrome:
         assert rows[0][-1].char == "\u2510"  # ┐
         assert rows[-1][0].char == "\u2514"  # └
         assert rows[-1][-1].char == "\u2518"  # ┘
+
+
+class TestLazyLinePreparation:
+    """Per-line metadata and tokens are computed for the drawn window only."""
+
+    @staticmethod
+    def _big_diff(n: int) -> list[str]:
+        lines = [
+            "diff --git a/a.py b/a.py",
+            "--- a/a.py",
+            "+++ b/a.py",
+            f"@@ -1,{n} +1,{n} @@",
+        ]
+        lines += [f"+x = {i}" for i in range(n)]
+        lines += [
+            "diff --git a/b.py b/b.py",
+            "--- a/b.py",
+            "+++ b/b.py",
+            "@@ -10,3 +20,3 @@",
+            ' """doc',
+            "-old",
+            '+"""',
+        ]
+        return lines
+
+    def _render(self, dv: DiffViewer, top: int) -> None:
+        from pigit.termui.surface import Surface
+
+        dv._i = top
+        dv._render_surface(Surface(60, 12))
+
+    def test_only_window_and_lookahead_are_tokenized(self):
+        dv = DiffViewer(size=(60, 12))
+        dv.set_content(self._big_diff(1000))
+        assert all(t is None for t in dv._render_tokens)
+
+        self._render(dv, 0)
+
+        ready = [i for i, t in enumerate(dv._render_tokens) if t is not None]
+        assert ready == list(range(10 + DiffViewer.TOKENIZE_LOOKAHEAD))
+
+    def test_line_numbers_match_hunk_headers_after_a_jump(self):
+        dv = DiffViewer(size=(60, 12))
+        lines = self._big_diff(1000)
+        dv.set_content(lines)
+
+        self._render(dv, len(lines) - 10)
+
+        assert dv._line_numbers[1003].strip() == "1000"  # Last "+x" line.
+        assert dv._line_numbers[1008:1011] == ["  20", "  11", "  21"]
+        assert dv._line_numbers[1007] == ""  # @@ header
+
+    def test_multiline_mask_is_computed_per_hunk(self):
+        dv = DiffViewer(size=(60, 12))
+        lines = self._big_diff(1000)
+        dv.set_content(lines)
+
+        self._render(dv, 1004)  # Second file only.
+
+        assert dv._mask_ready == {1}
+        assert dv._multiline_mask[1009] == "docstring"  # Inside ' """doc'.
+
+
+class _FakeStream:
+    """In-memory DiffStream."""
+
+    def __init__(self, lines: list[str]) -> None:
+        self._lines = list(lines)
+        self.closed = False
+
+    @property
+    def exhausted(self) -> bool:
+        return self.closed or not self._lines
+
+    def read_lines(self, count: int) -> list[str]:
+        if self.closed:
+            return []
+        batch, self._lines = self._lines[:count], self._lines[count:]
+        return batch
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class TestStreamedDiff:
+    """Streamed diffs grow in batches, pause at the line limit and resume on L."""
+
+    @staticmethod
+    def _viewer(**kwargs) -> DiffViewer:
+        dv = DiffViewer(size=(60, 12), **kwargs)
+        dv.STREAM_BATCH = 3
+        # Run stream reads inline instead of on the worker pool.
+        dv._stream_task.start_stream = lambda work, cb: [cb(b) for b in work()]
+        return dv
+
+    @staticmethod
+    def _diff() -> list[str]:
+        return [
+            "diff --git a/a.py b/a.py",
+            "--- a/a.py",
+            "+++ b/a.py",
+            "@@ -1,4 +1,4 @@",
+            ' """doc',
+            "-old one",
+            "-old two",
+            "+new one",
+            "+new two",
+            "diff --git a/b.json b/b.json",
+            "--- a/b.json",
+            "+++ b/b.json",
+            "@@ -10,2 +10,2 @@",
+            '-{"a": 1}',
+            '+{"a": 2}',
+        ]
+
+    def _render(self, dv: DiffViewer) -> None:
+        from pigit.termui.surface import Surface
+
+        dv._render_surface(Surface(60, 12))
+
+    @pytest.mark.parametrize("split", [2, 5, 7, 9, 13])
+    def test_appending_matches_setting_everything_at_once(self, split):
+        lines = self._diff()
+        whole = DiffViewer(size=(60, 20), word_diff=True)
+        whole.set_content(lines)
+        parts = DiffViewer(size=(60, 20), word_diff=True)
+        parts.set_content(lines[:split])
+        self._render(parts)  # Cache the first part before it grows.
+        parts.append_content(lines[split:])
+
+        assert parts._hunks == whole._hunks
+        assert parts._lang_starts == whole._lang_starts
+        assert parts._langs == whole._langs
+        assert parts._max_text_w == whole._max_text_w
+        self._render(whole)
+        self._render(parts)
+        assert parts._word_diff_segments == whole._word_diff_segments
+        assert parts._line_numbers == whole._line_numbers
+        assert parts._multiline_mask == whole._multiline_mask
+        assert parts._render_tokens == whole._render_tokens
+
+    def test_pauses_at_the_limit_until_load_more(self):
+        from pigit.termui.surface import Surface
+
+        dv = self._viewer(max_lines=7)
+        stream = _FakeStream(self._diff())
+        dv.load_stream(stream)
+        assert len(dv._content) == 7 and dv._stream_paused
+
+        surface = Surface(60, 12)
+        dv._render_surface(surface)
+        footer = "".join(cell.char for cell in surface.rows()[-1])
+        assert "7 lines · L: load more" in footer
+
+        dv._load_more()
+        assert len(dv._content) == 14 and dv._stream_paused
+        dv._load_more()
+        assert dv._content == self._diff()
+        assert dv._stream is None and not dv._stream_paused
+
+    def test_hunk_actions_wait_for_the_last_hunk(self):
+        dv = self._viewer(max_lines=7)
+        dv._diff_type = DiffType.UNSTAGED
+        dv._apply_patch = MagicMock()
+        dv.load_stream(_FakeStream(self._diff()))
+
+        dv._hunk_index = 0
+        with patch("pigit.app_diff.show_toast") as toast:
+            dv._run_hunk_action("stage")
+        toast.assert_called_once()
+        dv._apply_patch.assert_not_called()
+
+        dv._load_more()
+        dv._run_hunk_action("stage")  # Hunk 0 is complete now.
+        dv._apply_patch.assert_called_once()
+
+        dv._load_more()
+        dv._hunk_index = 1
+        dv._run_hunk_action("stage")
+        assert dv._apply_patch.call_count == 2
+
+    def test_goto_with_stream_replaces_content(self):
+        dv = self._viewer()
+        dv.set_content(["old"])
+        dv.update(EVT_GOTO, key="k", stream=_FakeStream(self._diff()))
+        assert dv._content == self._diff()
+        assert [h.start for h in dv._hunks] == [3, 12]
+
+    def test_new_content_closes_the_stream(self):
+        dv = self._viewer(max_lines=3)
+        stream = _FakeStream(self._diff())
+        dv.load_stream(stream)
+        dv.set_content(["other"])
+        assert stream.closed
+        dv._apply_stream_batch((stream, ["late"], True))  # Queued before close.
+        assert dv._content == ["other"]
+
+
+class TestSyntaxPool:
+    """Large diffs are highlighted ahead, whole hunks per syntax pool job."""
+
+    @staticmethod
+    def _diff(hunks: int = 6) -> list[str]:
+        lines = ["diff --git a/a.py b/a.py", "--- a/a.py", "+++ b/a.py"]
+        for h in range(hunks):
+            lines += [
+                f"@@ -{h * 10 + 1},4 +{h * 10 + 1},4 @@",
+                ' """doc',
+                ' end"""',
+                f"-x = foo({h})",
+                f"+x = bar({h})",
+            ]
+        return lines
+
+    @staticmethod
+    def _inline_pool(monkeypatch) -> list[list]:
+        """Run pool jobs synchronously; return the payloads submitted."""
+        from concurrent.futures import Future
+
+        from pigit.termui import syntax_pool
+
+        calls: list[list] = []
+
+        def submit(fn, payload):
+            calls.append(payload)
+            future: Future = Future()
+            future.set_result(fn(payload))
+            return future
+
+        monkeypatch.setattr(syntax_pool, "submit", submit)
+        return calls
+
+    @staticmethod
+    def _viewer(**kwargs) -> DiffViewer:
+        dv = DiffViewer(size=(60, 12), **kwargs)
+        dv.POOL_MIN_LINES = 10
+        dv.POOL_CHUNK_LINES = 10
+        # Deliver results inline instead of through the main-thread queue.
+        def watch(future, cb):
+            def done(f):
+                if not f.cancelled() and f.exception() is None:
+                    cb(f.result())
+
+            future.add_done_callback(done)
+
+        dv._pool_task.watch = watch
+        return dv
+
+    @pytest.mark.parametrize("word_diff", [False, True])
+    def test_pool_tokens_match_in_thread_tokens(self, monkeypatch, word_diff):
+        calls = self._inline_pool(monkeypatch)
+        lines = self._diff()
+        dv = self._viewer(word_diff=word_diff)
+        dv.set_content(lines)
+        assert [len(c) for c in calls] == [2, 2, 2]  # Hunks of 5 lines.
+        assert not dv._pool_jobs
+
+        in_thread = DiffViewer(size=(60, 12), word_diff=word_diff)
+        in_thread.set_content(lines)
+        in_thread._prepare_lines(0, len(lines))
+        hunk_lines = range(3, len(lines))
+        assert all(dv._render_tokens[i] is not None for i in hunk_lines)
+        assert [dv._render_tokens[i] for i in hunk_lines] == [
+            in_thread._render_tokens[i] for i in hunk_lines
+        ]
+        # Metadata is still prepared when the lines are drawn.
+        dv._prepare_lines(0, len(lines))
+        assert dv._heatmap == in_thread._heatmap
+        assert dv._line_numbers == in_thread._line_numbers
+
+    def test_combined_diff_is_plain_in_the_pool(self, monkeypatch):
+        calls = self._inline_pool(monkeypatch)
+        lines = ["diff --cc a.py", "index 1,2..3"]
+        for h in range(4):
+            lines += [
+                f"@@@ -{h * 10 + 1},2 -{h * 10 + 1},2 +{h * 10 + 1},2 @@@",
+                f"- x = foo({h})",
+                f" +x = bar({h})",
+                f"++y = {h}",
+            ]
+        dv = self._viewer()
+        dv.set_content(lines)
+        assert calls
+        assert all(runs == [(0, "plain")] for call in calls for _, runs, _ in call)
+
+        in_thread = DiffViewer(size=(60, 12))
+        in_thread.set_content(lines)
+        in_thread._prepare_lines(0, len(lines))
+        assert dv._render_tokens[2:] == in_thread._render_tokens[2:]
+
+    def test_small_diff_stays_in_thread(self, monkeypatch):
+        calls = self._inline_pool(monkeypatch)
+        dv = self._viewer()
+        dv.POOL_MIN_LINES = 1000
+        dv.set_content(self._diff())
+        assert calls == []
+
+    def test_grown_hunk_is_sent_again(self, monkeypatch):
+        calls = self._inline_pool(monkeypatch)
+        lines = self._diff(hunks=3)
+        dv = self._viewer(word_diff=True)
+        dv.set_content(lines)
+        sent = len(calls)
+        dv.append_content(["-y = 1", "+y = 2"])
+        assert calls[sent][0][0][-2:] == ["-y = 1", "+y = 2"]
+        assert dv._render_tokens[-1] is not None
+
+    def test_stale_results_are_dropped(self, monkeypatch):
+        from concurrent.futures import Future
+
+        from pigit.termui import syntax_pool
+
+        pending: list[Future] = []
+
+        def submit(fn, payload):
+            pending.append(Future())
+            return pending[-1]
+
+        monkeypatch.setattr(syntax_pool, "submit", submit)
+        dv = self._viewer()
+        dv.set_content(self._diff())
+        jobs = list(dv._pool_jobs)
+        dv.set_content(self._diff())
+        assert all(f.cancelled() for f in pending[: len(jobs)])
+        dv._on_pool_job_done(jobs[0], [[[("x", (0, 0, 0), 1, None)]] * 5] * 2)
+        assert dv._render_tokens[4] is None
+
+    def test_results_merge_in_job_order(self, monkeypatch):
+        from concurrent.futures import Future
+
+        from pigit.termui import syntax_pool
+
+        pending: list[tuple[Future, list]] = []
+
+        def submit(fn, payload):
+            pending.append((Future(), payload))
+            return pending[-1][0]
+
+        monkeypatch.setattr(syntax_pool, "submit", submit)
+        dv = self._viewer()
+        dv.set_content(self._diff())
+        (first, first_payload), (second, payload), (third, third_payload) = pending
+
+        second.set_result(_render_hunks_in_worker(payload))
+        assert dv._render_tokens[13] is None  # Waits for the first job.
+        first.set_exception(RuntimeError("worker died"))
+        third.set_result(_render_hunks_in_worker(third_payload))
+        # The failed job is skipped; its lines are prepared when drawn.
+        assert dv._render_tokens[4] is None
+        assert dv._render_tokens[13] is not None
+        assert dv._render_tokens[-1] is not None
+        assert not dv._pool_jobs
@@ -0,0 +1,44 @@
+"""
+Module: tests/app/test_git_trace_sheet.py
+Description: Tests for GitTraceSheet formatting.
+Author: Zev
+Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+from pigit.app_git_trace import GitTraceSheet
+from pigit.ext.exec_trace import ExecTrace
+from pigit.termui.segment import Segment
+
+
+def _plain(rows: list[list[Segment]]) -> list[str]:
+    return ["".join(seg.text for seg in row) for row in rows]
+
+
+def test_format_lists_totals_then_newest_run_first():
+    trace = ExecTrace()
+    trace.record(["git", "status"], cwd="/r", start=0.0, wall=0.002, code=0)
+    trace.record(
+        ["git", "add", "a b"], cwd="/r", start=1.0, wall=0.010, out_bytes=2048
+    )
+    text = _plain(GitTraceSheet.format(trace.totals(), trace.records()))
+    assert text[0] == "Git trace · 2 processes · 0.012s"
+    assert "git add" in text[1] and "git status" in text[2]
+    assert text[3] == ""
+    assert text[4].endswith("git add 'a b'")
+    assert "2.0K" in text[4]
+    assert text[5].endswith("git status")
+
+
+def test_format_marks_detached_runs_live():
+    trace = ExecTrace()
+    trace.record(["git", "cat-file", "--batch"], cwd=None, start=0.0, wall=None)
+    text = _plain(GitTraceSheet.format(trace.totals(), trace.records()))
+    assert text[-1].lstrip().startswith("live")
+
+
+def test_empty_trace_has_title_only():
+    assert _plain(GitTraceSheet.format([], [])) == [
+        "Git trace · 0 processes · 0.000s"
+    ]
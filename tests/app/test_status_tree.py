@@ -5,11 +5,13 @@ from pigit.app_status import build_status_tree, StatusTreeRow, _summarize
 from pigit.git.model import File
 
 
-def _file(name, short_status=" M", has_staged=False, has_unstaged=True):
+def _file(
+    name, short_status=" M", has_staged=False, has_unstaged=True, display_str=None
+):
     """Construct a File with the fields relevant to tree building."""
     return File(
         name=name,
-        display_str=name,
+        display_str=name if display_str is None else display_str,
         short_status=short_status,
         has_staged_change=has_staged,
         has_unstaged_change=has_unstaged,
@@ -86,7 +88,7 @@ def test_source_index_preserved():
 
 
 def test_rename_uses_target_path():
-    items = [(_file("old.txt -> src/new.txt"), 0)]
+    items = [(_file("src/new.txt", display_str="old.txt -> src/new.txt"), 0)]
     rows = build_status_tree(items, set())
     assert _paths(rows) == [
         ("dir", "src", 0),
@@ -94,6 +96,15 @@ def test_rename_uses_target_path():
     ]
 
 
+def test_arrow_in_path_is_not_a_rename():
+    items = [(_file("docs/a -> b.md"), 0)]
+    rows = build_status_tree(items, set())
+    assert _paths(rows) == [
+        ("dir", "docs", 0),
+        ("file", "docs/a -> b.md", 1),
+    ]
+
+
 def test_backslash_normalized():
     items = [(_file("src\\app\\main.py"), 0)]
     rows = build_status_tree(items, set())
@@ -23,6 +23,31 @@ def test_commit_report_default_read_from_toml(tmp_path):
     assert c.get().app.commit_report_default is False
 
 
+
+@pytest.mark.parametrize(
+    "raw, expected, warns",
+    [("5000", 5000, False), ("0", 20000, True), ('"many"', 20000, True)],
+)
+def test_diff_max_lines_read_from_toml(tmp_path, raw, expected, warns):
+    config_path = tmp_path / "pigit-diff.toml"
+    config_path.write_text(f"[app]\ndiff_max_lines = {raw}\n")
+    c = Config(str(config_path), version="test", auto_load=True)
+    assert c.get().app.diff_max_lines == expected
+    assert any("diff_max_lines" in w for w in c._warnings) is warns
+
+
+@pytest.mark.parametrize(
+    "raw, expected, warns",
+    [("64", 64, False), ("0", 0, False), ("-1", 512, True), ("true", 512, True)],
+)
+def test_syntax_cache_size_read_from_toml(tmp_path, raw, expected, warns):
+    config_path = tmp_path / "pigit-syntax.toml"
+    config_path.write_text(f"[app]\nsyntax_cache_size = {raw}\n")
+    c = Config(str(config_path), version="test", auto_load=True)
+    assert c.get().app.syntax_cache_size == expected
+    assert any("syntax_cache_size" in w for w in c._warnings) is warns
+
+
 @patch("builtins.input", lambda _: "yes")
 def test_create(tmp_path):
     config_path = tmp_path / "pigit-create.toml"
@@ -41,6 +66,8 @@ def test_create(tmp_path):
     assert "diff_preview_default" in content
     assert "log_graph_default" in content
     assert "commit_report_default" in content
+    assert "diff_max_lines = 20000" in content
+    assert "syntax_cache_size = 512" in content
 
 
 def test_load():
@@ -3,12 +3,14 @@
 
 import json
 import os
+import shlex
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from pigit.ext.executor_factory import MockExecutor
 from pigit.git.api import GitApi
+from pigit.git.api._core import _LAYOUT_CMD
 from pigit.git.managed_repos import ManagedRepos, _fuzzy_match, _logger
 
 
@@ -20,8 +22,7 @@ def tmp_repos_json(tmp_path):
 def _rev_parse_responses(repo_root: str) -> dict:
     top = str(repo_root)
     return {
-        "git rev-parse --show-toplevel": (0, "", top + "\n"),
-        "git rev-parse --git-dir": (0, "", ".git\n"),
+        shlex.join(_LAYOUT_CMD): (0, "", f".git\n.git\nfalse\ntrue\n{top}\n"),
     }
 
 
@@ -0,0 +1,53 @@
+import subprocess
+import sys
+
+from pigit.ext.exec_trace import ExecTrace, format_argv
+from pigit.ext.executor import DECODE, REPLY
+from pigit.ext.executor_factory import LocalExecutor
+from pigit.git import GitApi
+
+
+def test_ring_buffer_is_bounded_but_totals_keep_counting():
+    trace = ExecTrace(capacity=2)
+    for i in range(3):
+        trace.record(["git", "status", str(i)], cwd="/r", start=0.0, wall=0.5)
+    assert [r.argv[-1] for r in trace.records()] == ["1", "2"]
+    (total,) = trace.totals()
+    assert (total.command, total.count, total.wall) == ("git status", 3, 1.5)
+
+
+def test_totals_sorted_by_wall_and_summary():
+    trace = ExecTrace()
+    trace.record(["git", "log"], cwd=None, start=0.0, wall=0.1)
+    trace.record("git status -s", cwd=None, start=0.0, wall=0.3, code=1)
+    assert [t.command for t in trace.totals()] == ["git status", "git log"]
+    summary = trace.format_summary()
+    assert summary.splitlines()[0] == "git trace: 2 processes, 0.400s wall"
+    assert "git status" in summary.splitlines()[2]
+
+
+def test_executor_records_run():
+    trace = ExecTrace()
+    ex = LocalExecutor(trace=trace)
+    code, _, out = ex.exec(
+        [sys.executable, "-c", "print('abc')"], flags=REPLY | DECODE
+    )
+    assert (code, out) == (0, "abc\n")
+    (rec,) = trace.records()
+    assert rec.code == 0
+    assert rec.out_bytes == 4
+    assert rec.wall is not None and rec.wall > 0
+    assert rec.caller == "test_executor_records_run"
+
+
+def test_git_api_caller_is_facade_method(tmp_path):
+    subprocess.run(["git", "init", "-q", "-b", "main"], cwd=tmp_path, check=True)
+    trace = ExecTrace()
+    git = GitApi(executor=LocalExecutor(trace=trace), path=str(tmp_path))
+    assert git.get_head() == "main"
+    assert {r.caller for r in trace.records()} == {"GitApi.get_head"}
+
+
+def test_format_argv_quotes_lists_only():
+    assert format_argv(("git", "add", "a b")) == "git add 'a b'"
+    assert format_argv(("git log | head",)) == "git log | head"
@@ -1,5 +1,7 @@
 # -*- coding:utf-8 -*-
 
+import shlex
+
 import pytest
 
 from pigit.ext.executor import REPLY, WAITING
@@ -9,6 +11,7 @@ from pigit.ext.executor_factory import (
     MockExecutor,
 )
 from pigit.git.api import GitApi
+from pigit.git.api._core import _LAYOUT_CMD
 
 
 @pytest.fixture(autouse=True)
@@ -87,8 +90,7 @@ def test_repo_uses_factory_executor(tmp_path):
     root_s = str(root.resolve())
     mock = MockExecutor(
         responses={
-            "git rev-parse --show-toplevel": (0, "", root_s + "\n"),
-            "git rev-parse --git-dir": (0, "", ".git\n"),
+            shlex.join(_LAYOUT_CMD): (0, "", f".git\n.git\nfalse\ntrue\n{root_s}\n"),
         }
     )
     ExecutorFactory.set_strategy(mock)
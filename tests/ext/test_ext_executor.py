@@ -1,4 +1,5 @@
 import logging
+import os
 import sys
 import time
 import textwrap
@@ -45,6 +46,42 @@ class TestExecutor:
 
         assert lines == ["one", "two"]
 
+    def test_exec_argv_skips_shell_and_resolves_executable(self):
+        with patch("pigit.ext.executor.Popen") as mock_popen:
+            mock_proc = MagicMock()
+            mock_popen.return_value.__enter__.return_value = mock_proc
+            mock_proc.communicate.return_value = (b"ok", b"")
+            mock_proc.returncode = 0
+
+            Executor().exec(["python3", "-V"], flags=REPLY | DECODE)
+            kws = mock_popen.call_args.kwargs
+            assert kws["shell"] is False
+            assert os.path.isabs(kws["executable"])
+            # No cwd: fds are inherited so CPython can take posix_spawn.
+            assert kws["close_fds"] is False
+
+            Executor().exec(["python3", "-V"], flags=REPLY | DECODE, cwd="/tmp")
+            assert "close_fds" not in mock_popen.call_args.kwargs
+
+    def test_exec_string_keeps_shell(self):
+        with patch("pigit.ext.executor.Popen") as mock_popen:
+            mock_proc = MagicMock()
+            mock_popen.return_value.__enter__.return_value = mock_proc
+            mock_proc.communicate.return_value = (b"", b"")
+            mock_proc.returncode = 0
+
+            Executor().exec("echo hi | cat", flags=REPLY | DECODE)
+            kws = mock_popen.call_args.kwargs
+            assert kws["shell"] is True
+            assert "executable" not in kws
+
+    @win_skip_mark
+    def test_exec_argv_runs_real_process(self):
+        code, err, out = self.executor.exec(
+            [sys.executable, "-c", "print('a b')"], flags=REPLY | DECODE
+        )
+        assert (code, err, out) == (0, "", "a b\n")
+
     @win_skip_mark
     def test_exec_with_more(self):
         print()
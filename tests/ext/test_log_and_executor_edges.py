@@ -99,6 +99,28 @@ def test_exec_stream_nonzero_and_stderr():
     assert log.warning.called
 
 
+def test_exec_stream_ok_codes_are_not_logged():
+    log = MagicMock()
+    ex = Executor(log=log)
+
+    class _Proc:
+        returncode = 1
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *a):
+            return False
+
+        stdout = iter([b"+added\n"])
+        stderr = None
+
+    with patch("pigit.ext.executor.Popen", return_value=_Proc()):
+        lines = list(ex.exec_stream("git diff --no-index", ok_codes=(0, 1)))
+    assert lines == ["+added"]
+    assert not log.warning.called
+
+
 def test_exec_stream_stdout_none_early_exit():
     log = MagicMock()
     ex = Executor(log=log)
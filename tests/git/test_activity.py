@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Module: tests/git/test_activity.py
+Description: Tests for the year-long commit activity aggregation and its cache.
+Author: Zev
+Date: 2026-10-16
+"""
+
+import datetime
+import os
+import subprocess
+import time
+
+import pytest
+
+from pigit.git import GitApi
+from pigit.git.activity import (
+    CommitActivity,
+    activity_cache_path,
+    load_activity,
+    load_cached_activity,
+)
+
+_DAY = 86400
+
+
+def _git_run(cwd, *args: str, when: int | None = None) -> str:
+    env = dict(os.environ)
+    if when is not None:
+        env["GIT_AUTHOR_DATE"] = env["GIT_COMMITTER_DATE"] = f"@{when} +0000"
+    return subprocess.run(
+        ["git", *args], cwd=cwd, env=env, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def _commit(repo: str, author: str, when: int) -> str:
+    _git_run(
+        repo,
+        "-c",
+        f"user.name={author}",
+        "-c",
+        "user.email=a@example.com",
+        "commit",
+        "-q",
+        "--allow-empty",
+        "-m",
+        f"{author} {when}",
+        when=when,
+    )
+    return _git_run(repo, "rev-parse", "HEAD")
+
+
+class _CountingGit(GitApi):
+    """GitApi that records the ``exclude`` of every activity walk."""
+
+    def __init__(self, path: str) -> None:
+        super().__init__(path=path)
+        self.walks: list[str] = []
+
+    def iter_activity(self, branch_name, since="1.year", exclude="", path=None):
+        self.walks.append(exclude)
+        return super().iter_activity(branch_name, since, exclude, path)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = str(tmp_path / "repo")
+    os.mkdir(repo)
+    _git_run(repo, "init", "-q")
+    now = int(time.time())
+    _commit(repo, "Old", now - 400 * _DAY)
+    _commit(repo, "Zev", now - 3 * _DAY)
+    _commit(repo, "Ann", now - 3 * _DAY)
+    _commit(repo, "Zev", now - _DAY)
+    return repo
+
+
+def _day(ago: int) -> datetime.date:
+    return datetime.datetime.fromtimestamp(time.time() - ago * _DAY).date()
+
+
+def test_full_pass_counts_last_year_and_caches(repo, tmp_path):
+    git = _CountingGit(repo)
+    cache = activity_cache_path(tmp_path / "cache", repo)
+    tip = _git_run(repo, "rev-parse", "HEAD")
+
+    activity = load_activity(git, tip, cache)
+
+    assert git.walks == [""]
+    assert activity.tip == tip
+    assert activity.author_day_counts == {
+        "Zev": {_day(3): 1, _day(1): 1},
+        "Ann": {_day(3): 1},
+    }
+    assert activity.day_counts == {_day(3): 2, _day(1): 1}
+    assert [e.tip for e in load_cached_activity(cache)] == [tip]
+
+    again = load_activity(git, tip, cache)
+    assert git.walks == [""]  # Same tip: served from the cache.
+    assert again.author_day_counts == activity.author_day_counts
+
+
+def test_new_commits_read_only_past_cached_tip(repo, tmp_path):
+    git = _CountingGit(repo)
+    cache = activity_cache_path(tmp_path / "cache", repo)
+    old_tip = _git_run(repo, "rev-parse", "HEAD")
+    load_activity(git, old_tip, cache)
+
+    new_tip = _commit(repo, "Ann", int(time.time()))
+    activity = load_activity(git, new_tip, cache)
+
+    assert git.walks == ["", old_tip]
+    assert activity.author_day_counts["Ann"] == {_day(3): 1, _day(0): 1}
+    assert [e.tip for e in load_cached_activity(cache)] == [new_tip, old_tip]
+
+
+def test_rewritten_history_reads_full_year(repo, tmp_path):
+    git = _CountingGit(repo)
+    cache = activity_cache_path(tmp_path / "cache", repo)
+    load_activity(git, _git_run(repo, "rev-parse", "HEAD"), cache)
+
+    _git_run(repo, "reset", "-q", "--hard", "HEAD~1")
+    tip = _commit(repo, "Bob", int(time.time()))
+    activity = load_activity(git, tip, cache)
+
+    assert git.walks == ["", ""]
+    assert set(activity.author_day_counts) == {"Zev", "Ann", "Bob"}
+    assert activity.author_day_counts["Zev"] == {_day(3): 1}
+
+
+def test_prune_drops_days_outside_the_window():
+    activity = CommitActivity("tip")
+    activity.add(int(time.time()), "Zev")
+    activity.add(int(time.time()) - 30 * _DAY, "Ann")
+
+    activity.prune(_day(10))
+
+    assert activity.author_day_counts == {"Zev": {_day(0): 1}}
+
+
+def test_corrupt_cache_is_ignored(tmp_path):
+    cache = tmp_path / "bad.json"
+    cache.write_text("{not json")
+    assert load_cached_activity(cache) == []
+    cache.write_text('{"version": 1, "tips": [{"authors": {}}]}')
+    assert load_cached_activity(cache) == []
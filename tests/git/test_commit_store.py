@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Module: tests/git/test_commit_store.py
+Description: Tests for the sqlite commit metadata store.
+Author: Zev
+Date: 2026-10-16
+"""
+
+import sqlite3
+
+import pytest
+
+from pigit.git.commit_store import CommitStore
+from pigit.git.model import Commit
+
+
+def _commit(
+    sha: str, extra_info: str = "", status: str = "pushed", tag: list | None = None
+) -> Commit:
+    return Commit(
+        sha, f"msg {sha}", "Zev", 1700000000, status, extra_info, tag or [], ["p1"]
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = CommitStore(tmp_path / "sub" / "commits.sqlite")
+    yield store
+    store.close()
+
+
+def test_log_snapshot_round_trip(store):
+    commits = [
+        _commit("b", "(HEAD -> main, tag: v1.0)", "unpushed", ["v1.0"]),
+        _commit("a"),
+    ]
+    store.save_log("/repo", "main", commits)
+
+    loaded = store.load_log("/repo", "main")
+
+    assert [c.sha for c in loaded] == ["b", "a"]
+    assert loaded[0].extra_info == "(HEAD -> main, tag: v1.0)"
+    assert loaded[0].tag == ["v1.0"]
+    assert loaded[0].status == "unpushed"
+    assert loaded[1].parents == ["p1"] and loaded[1].msg == "msg a"
+    assert store.load_log("/repo", "dev") == []
+    assert store.load_log("/other", "main") == []
+
+
+def test_metadata_is_shared_between_snapshots(store):
+    store.save_log("/repo", "main", [_commit("b"), _commit("a")])
+    store.save_log("/repo", "main", [_commit("a", "(HEAD -> main)")])
+
+    assert [c.extra_info for c in store.load_log("/repo", "main")] == [
+        "(HEAD -> main)"
+    ]
+    assert set(store.get_commits(["a", "b", "z"])) == {"a", "b"}
+
+
+def test_bodies_and_stats(store):
+    store.put_bodies({"a": "subject\n\nbody"})
+    assert store.get_bodies(["a", "b"]) == {"a": "subject\n\nbody"}
+
+    assert store.get_stats("a") is None
+    store.put_stats("a", ([("x.py", 3, 1)], 3, 1))
+    assert store.get_stats("a") == ([("x.py", 3, 1)], 3, 1)
+
+
+def test_reads_many_shas_in_chunks(store):
+    commits = [_commit(f"{i:040x}") for i in range(1200)]
+    store.put_commits(commits)
+    assert len(store.get_commits([c.sha for c in commits])) == 1200
+
+
+def test_file_history_is_kept_per_tip(store):
+    assert store.load_file_history("/repo", "t1", "a.py") is None
+    store.save_file_history("/repo", "t1", "a.py", [("b", "second"), ("a", "first")])
+    store.save_file_history("/repo", "t2", "a.py", [])
+
+    assert store.load_file_history("/repo", "t1", "a.py") == [
+        ("b", "second"),
+        ("a", "first"),
+    ]
+    assert store.load_file_history("/repo", "t2", "a.py") == []
+    assert store.load_file_history("/repo", "t1", "b.py") is None
+
+
+def test_opening_prunes_the_oldest_rows(tmp_path, monkeypatch):
+    path = tmp_path / "commits.sqlite"
+    store = CommitStore(path)
+    store.put_commits([_commit(sha) for sha in "abcd"])
+    store.save_log("/repo", "old", [_commit("a")])
+    store.save_log("/repo", "new", [_commit("b")])
+    store.close()
+
+    monkeypatch.setattr(CommitStore, "MAX_COMMITS", 3)
+    monkeypatch.setattr(CommitStore, "MAX_LOGS", 1)
+    store = CommitStore(path)
+    # Saving a log rewrites its commits, so a and b outlive c.
+    assert sorted(store.get_commits(list("abcd"))) == ["a", "b", "d"]
+    assert store.load_log("/repo", "old") == []
+    assert [c.sha for c in store.load_log("/repo", "new")] == ["b"]
+    store.close()
+
+
+def test_schema_change_rebuilds_the_store(tmp_path):
+    path = tmp_path / "commits.sqlite"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE commits (sha TEXT)")
+    conn.execute("PRAGMA user_version = 0")
+    conn.close()
+
+    store = CommitStore(path)
+    store.save_log("/repo", "main", [_commit("a")])
+    assert [c.sha for c in store.load_log("/repo", "main")] == ["a"]
+    store.close()
+
+
+def test_unusable_path_degrades_to_misses(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    store = CommitStore(blocker / "commits.sqlite")
+
+    store.save_log("/repo", "main", [_commit("a")])
+    store.put_bodies({"a": "body"})
+    assert store.load_log("/repo", "main") == []
+    assert store.get_bodies(["a"]) == {}
+    assert store.get_stats("a") is None
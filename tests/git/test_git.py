@@ -101,8 +101,11 @@ class TestRepo:
             ),
             (
                 [
-                    (0, "", "/fake/work\n"),
-                    (0, "", "/fake/work/.git\n"),
+                    (
+                        0,
+                        "",
+                        "/fake/work/.git\n/fake/work/.git\nfalse\ntrue\n/fake/work\n",
+                    ),
                 ],
                 ("/fake/work", "/fake/work/.git"),
             ),
@@ -111,7 +114,8 @@ class TestRepo:
     @patch(exec_patch)
     def test_get_repo_info(self, mock_exec_cmd, side_effect, expected):
         mock_exec_cmd.side_effect = side_effect
-        assert self.git.confirm_repo() == expected
+        # Fresh instance: the shared one has the real layout cached.
+        assert GitApi(path=self.test_repo).confirm_repo() == expected
 
     def test_get_repo_info_2(self):
         git = self.git
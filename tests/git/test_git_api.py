@@ -6,12 +6,25 @@ Author: Zev
 Date: 2026-08-13
 """
 
+import os
 import shlex
+import subprocess
 
 import pytest
 
 from pigit.ext.executor_factory import MockExecutor
 from pigit.git import GitApi, GitError, RepoError
+from pigit.git.api._core import _LAYOUT_CMD
+
+_LAYOUT_KEY = shlex.join(_LAYOUT_CMD)
+
+
+def _layout_reply(git_dir: str, common_dir: str = "", top: str = "") -> tuple:
+    """``rev-parse`` reply for :data:`_LAYOUT_CMD` (``top`` empty: bare-like)."""
+    lines = [git_dir, common_dir or git_dir, "false", "true" if top else "false"]
+    if top:
+        lines.append(top)
+    return (0, "", "\n".join(lines) + "\n")
 
 
 class TestBindPath:
@@ -29,7 +42,7 @@ class TestBindPath:
     def test_path_assignment_propagates_to_submodules(self):
         ex = MockExecutor(
             responses={
-                "git symbolic-ref -q --short HEAD || git describe --tags --exact-match": (
+                "git symbolic-ref -q --short HEAD": (
                     0,
                     "",
                     "main\n",
@@ -51,29 +64,87 @@ class TestCoreEdgeCases:
         with pytest.raises(GitError):
             git.get_git_dir()
 
-    def test_get_git_common_dir_absolute(self):
+    def test_get_git_common_dir_absolute(self, tmp_path):
+        common = str(tmp_path / "main" / ".git")
         ex = MockExecutor(
             responses={
-                "git rev-parse --git-common-dir": (0, "", "/repo/.git\n"),
+                _LAYOUT_KEY: _layout_reply(
+                    str(tmp_path / "main/.git/worktrees/wt"), common, str(tmp_path)
+                ),
             }
         )
-        git = GitApi(executor=ex, path="/repo")
-        assert git.get_git_common_dir() == "/repo/.git"
+        git = GitApi(executor=ex, path=str(tmp_path))
+        assert git.get_git_common_dir() == common
+        assert git.repo_layout().is_linked_worktree is True
+
+    def test_repo_layout_single_spawn_and_cached(self, tmp_path):
+        (tmp_path / ".git").mkdir()
+        ex = MockExecutor(
+            responses={_LAYOUT_KEY: _layout_reply(".git", top=str(tmp_path))}
+        )
+        git = GitApi(executor=ex, path=str(tmp_path))
+        git_dir = str(tmp_path / ".git")
+        assert git.confirm_repo() == (str(tmp_path), git_dir)
+        assert git.get_git_dir() == git_dir
+        assert git.get_git_common_dir() == git_dir
+        assert len(ex.exec_calls) == 1
+
+    def test_repo_layout_refreshes_when_head_changes(self, tmp_path):
+        git_dir = tmp_path / ".git"
+        git_dir.mkdir()
+        ex = MockExecutor(
+            responses={_LAYOUT_KEY: _layout_reply(".git", top=str(tmp_path))}
+        )
+        git = GitApi(executor=ex, path=str(tmp_path))
+        git.repo_layout()
+        (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+        git.repo_layout()
+        git.repo_layout()
+        assert len(ex.exec_calls) == 2
+
+    def test_repo_layout_bare(self, tmp_path):
+        ex = MockExecutor(
+            responses={
+                _LAYOUT_KEY: (
+                    128,
+                    "fatal: this operation must be run in a work tree",
+                    ".\n.\ntrue\nfalse\n",
+                ),
+            }
+        )
+        git = GitApi(executor=ex, path=str(tmp_path))
+        layout = git.repo_layout()
+        assert layout is not None
+        assert layout.is_bare is True
+        assert layout.toplevel == ""
+        assert git.get_git_dir() == str(tmp_path)
+        assert git.confirm_repo() == ("", "")
 
     def test_get_git_common_dir_failure_raises(self):
         git = GitApi(executor=MockExecutor(default=(1, "fatal", "")), path="/repo")
         with pytest.raises(GitError):
             git.get_git_common_dir()
 
+    def test_get_head_falls_back_to_exact_tag(self):
+        ex = MockExecutor(
+            responses={
+                "git symbolic-ref -q --short HEAD": (1, "", ""),
+                "git describe --tags --exact-match": (0, "", "v1.2\n"),
+            }
+        )
+        git = GitApi(executor=ex, path="/repo")
+        assert git.get_head() == "v1.2"
+        assert [c[0][1] for c in ex.exec_calls] == ["symbolic-ref", "describe"]
+
     def test_get_head_tracking_with_upstream(self):
         ex = MockExecutor(
             responses={
-                "git symbolic-ref -q --short HEAD || git describe --tags --exact-match": (
+                "git symbolic-ref -q --short HEAD": (
                     0,
                     "",
                     "main\n",
                 ),
-                "git rev-list --left-right --count @{upstream}...HEAD": (
+                "git rev-list --left-right --count '@{upstream}...HEAD'": (
                     0,
                     "",
                     "2\t3\n",
@@ -86,12 +157,12 @@ class TestCoreEdgeCases:
     def test_get_head_tracking_without_upstream(self):
         ex = MockExecutor(
             responses={
-                "git symbolic-ref -q --short HEAD || git describe --tags --exact-match": (
+                "git symbolic-ref -q --short HEAD": (
                     0,
                     "",
                     "main\n",
                 ),
-                "git rev-list --left-right --count @{upstream}...HEAD": (
+                "git rev-list --left-right --count '@{upstream}...HEAD'": (
                     128,
                     "no upstream",
                     "",
@@ -129,19 +200,19 @@ class TestStashEdgeCases:
         git = GitApi(executor=ex, path="/repo")
         git.stash_push()
         assert ex.exec_calls
-        assert ex.exec_calls[0][0] == "git stash push -u"
+        assert ex.exec_calls[0][0] == ["git", "stash", "push", "-u"]
 
     def test_stash_push_with_message_keeps_untracked_flag(self):
         ex = MockExecutor(default=(0, "", ""))
         git = GitApi(executor=ex, path="/repo")
         git.stash_push(message="wip")
-        assert ex.exec_calls[0][0] == "git stash push -u -m wip"
+        assert ex.exec_calls[0][0] == ["git", "stash", "push", "-u", "-m", "wip"]
 
-    def test_stash_apply_quotes_ref(self):
+    def test_stash_apply_passes_ref_verbatim(self):
         ex = MockExecutor(default=(0, "", ""))
         git = GitApi(executor=ex, path="/repo")
         git.stash_apply("stash@{0}")
-        assert ex.exec_calls[0][0] == "git stash apply 'stash@{0}'"
+        assert ex.exec_calls[0][0] == ["git", "stash", "apply", "stash@{0}"]
 
     def test_stash_apply_failure_raises(self):
         git = GitApi(executor=MockExecutor(default=(1, "conflict", "")), path="/repo")
@@ -155,7 +226,7 @@ class TestLogGraph:
         git = GitApi(executor=ex, path="/repo")
         out = git.load_log_graph("feature/x", limit=80)
         assert "* abc (feat) subject" in out
-        cmd = ex.exec_calls[0][0]
+        cmd = shlex.join(ex.exec_calls[0][0])
         assert cmd.startswith("git log --decorate --graph")
         assert "--oneline" not in cmd
         assert "--color=always" in cmd
@@ -221,7 +292,7 @@ class TestListCommitsInRange:
     def test_parses_commits_oldest_first(self):
         ex = MockExecutor(
             responses={
-                'git log --reverse --topo-order --pretty=format:"%H|%P|%s" main..HEAD': (
+                "git log --reverse --topo-order '--pretty=format:%H|%P|%s' main..HEAD": (
                     0,
                     "",
                     "aaa1||root commit\nbbb1|aaa1|second commit\nccc1|aaa1 bbb1|merge commit\n",
@@ -248,6 +319,147 @@ class TestListCommitsInRange:
             git.list_commits_in_range("nonexistent")
 
 
+def _log_key(*extra: str, branch: str = "main") -> str:
+    return shlex.join(
+        [
+            "git",
+            "log",
+            branch,
+            "--oneline",
+            "--pretty=format:%H|%at|%aN|%d|%P|%s",
+            *extra,
+            "--abbrev=20",
+            "--date=unix",
+        ]
+    )
+
+
+def _log_lines(*shas: str) -> str:
+    return "".join(f"{sha}|1700000000|Zev||p|msg {sha}\n" for sha in shas)
+
+
+class TestCommitLog:
+    def test_pages_resume_and_find_the_first_pushed_commit(self):
+        ex = MockExecutor(
+            responses={
+                _log_key("--skip=2"): (0, "", _log_lines("c2", "c3", "c4", "c5")),
+                shlex.join(["git", "merge-base", "main", "main@{u}"]): (0, "", "c4\n"),
+            }
+        )
+        log = GitApi(executor=ex, path="/repo").open_commit_log("main", start=2)
+        first = log.read_page(2)
+        assert [(c.sha, c.status) for c in first] == [
+            ("c2", "unpushed"),
+            ("c3", "unpushed"),
+        ]
+        assert log.offset == 4 and not log.exhausted
+        rest = log.read_page(10)
+        assert [(c.sha, c.status) for c in rest] == [
+            ("c4", "pushed"),
+            ("c5", "pushed"),
+        ]
+        assert log.exhausted and log.read_page(10) == []
+        # One ``git log`` served both pages.
+        logs = [c for c, _f, _k in ex.exec_calls if c[:2] == ["git", "log"]]
+        assert len(logs) == 1
+
+    def test_read_range_reuses_known_pushed_offset(self):
+        ex = MockExecutor(
+            responses={_log_key("--skip=1", "-n", "2"): (0, "", _log_lines("c1", "c2"))}
+        )
+        log = GitApi(executor=ex, path="/repo").open_commit_log(
+            "main", start=3, pushed_from=2
+        )
+        page = log.read_range(1, 2)
+        assert [(c.sha, c.status) for c in page] == [
+            ("c1", "unpushed"),
+            ("c2", "pushed"),
+        ]
+
+    def test_streams_a_real_log(self, object_repo):
+        git, repo = object_repo
+        for i in range(5):
+            _git_run(repo, "commit", "-q", "--allow-empty", "-m", f"c{i}")
+        shas = _git_run(repo, "rev-list", "HEAD").splitlines()
+        log = git.open_commit_log("HEAD", start=2, pushed_from=0)
+        assert [c.sha for c in log.read_page(3)] == shas[2:5]
+        assert [c.sha for c in log.read_range(0, 2)] == shas[:2]
+        log.close()
+        assert log.exhausted and log.read_page(3) == []
+
+
+class TestDiffStream:
+    def test_reads_a_file_diff_in_batches(self):
+        key = shlex.join(
+            ["git", "diff", "--submodule", "--no-ext-diff", "--color=never"]
+            + ["--cached", "--", "new.py"]
+        )
+        ex = MockExecutor(responses={key: (0, "", "l1\nl2\nl3\n")})
+        git = GitApi(executor=ex, path="/repo")
+        stream = git.stream_file_diff("old.py -> new.py", cached=True, plain=True)
+        assert ex.exec_calls == []  # Nothing runs before the first read.
+
+        assert stream.read_lines(2) == ["l1", "l2"]
+        assert not stream.exhausted
+        assert stream.read_lines(10) == ["l3"]
+        assert stream.exhausted and stream.read_lines(10) == []
+        assert len(ex.exec_calls) == 1
+
+    def test_close_stops_a_real_show(self, object_repo):
+        git, _repo = object_repo
+        stream = git.stream_commit_info("HEAD", plain=True)
+        head = stream.read_lines(1)
+        assert head[0].startswith("commit ")
+        stream.close()
+        assert stream.exhausted and stream.read_lines(5) == []
+
+
+class TestCommitSearch:
+    @pytest.mark.parametrize(
+        "query, args",
+        [
+            ("fix bug", ["-i", "-F", "--grep=fix bug"]),
+            ("author: Zev", ["-i", "-F", "--author=Zev"]),
+            ("-S parse_log", ["-Sparse_log"]),
+            ("-Gdef\\s+run", ["-Gdef\\s+run"]),
+        ],
+    )
+    def test_query_maps_to_log_options(self, query, args):
+        key = shlex.join(
+            [
+                "git",
+                "log",
+                "main",
+                "--oneline",
+                "--pretty=format:%H|%at|%aN|%d|%P|%s",
+                *args,
+                "--abbrev=20",
+                "--date=unix",
+            ]
+        )
+        ex = MockExecutor(responses={key: (0, "", _log_lines("c7", "c9"))})
+        search = GitApi(executor=ex, path="/repo").search_commits("main", query)
+        assert [c.sha for c in search] == ["c7", "c9"]
+
+    @pytest.mark.parametrize("query", ["", "  ", "author:", "-S"])
+    def test_empty_query_runs_nothing(self, query):
+        ex = MockExecutor()
+        search = GitApi(executor=ex, path="/repo").search_commits("main", query)
+        assert list(search) == []
+        assert ex.exec_calls == []
+
+    def test_streams_and_stops_a_real_search(self, object_repo):
+        git, repo = object_repo
+        for i in range(3):
+            _git_run(repo, "commit", "-q", "--allow-empty", "-m", f"Needle {i}")
+        search = git.search_commits("HEAD", "needle")
+        matches = iter(search)
+        assert next(matches).msg == "Needle 2"
+        search.close()
+        assert list(matches) == []
+        assert search._proc is not None and search._proc.returncode is not None
+
+
 class TestUnstagedChanges:
     def test_has_unstaged_changes_true(self):
         ex = MockExecutor(responses={"git diff --quiet": (1, "", "")})
@@ -287,7 +499,7 @@ class TestSequencerDetect:
             else:
                 p.write_text("x\n")
         ex = MockExecutor(
-            responses={"git rev-parse --git-dir": (0, "", str(git_dir) + "\n")}
+            responses={_LAYOUT_KEY: _layout_reply(str(git_dir), top=str(tmp_path))}
         )
         return GitApi(executor=ex, path=str(tmp_path))
 
@@ -659,3 +871,171 @@ class TestInspectorGitReads:
             path="/repo",
         )
         assert git.stash_meta(ref) == ("Jane | Doe", 1700000000, ["abc", "def"])
+
+
+def _git_run(cwd, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def object_repo(tmp_path):
+    repo = str(tmp_path)
+    _git_run(repo, "init", "-q")
+    _git_run(repo, "config", "user.name", "Zev")
+    _git_run(repo, "config", "user.email", "zev@example.com")
+    (tmp_path / "a.txt").write_text("one\n")
+    (tmp_path / "big.bin").write_bytes(b"\x00" * 64)
+    _git_run(repo, "add", ".")
+    _git_run(repo, "commit", "-q", "-m", "first\n\nbody line")
+    (tmp_path / "a.txt").write_text("two\n")
+    _git_run(repo, "commit", "-q", "-am", "second")
+    git = GitApi(path=repo)
+    yield git, repo
+    git.close()
+
+
+class TestObjectBatch:
+    def test_file_at_commit_reads_through_batch(self, object_repo):
+        git, repo = object_repo
+        first = _git_run(repo, "rev-parse", "HEAD~1")
+        assert git.get_file_at_commit(first, "a.txt") == "one\n"
+        assert git.get_file_at_commit("HEAD", "a.txt") == "two\n"
+        assert git.get_file_at_commit("HEAD", "missing.txt") is None
+
+    def test_file_at_commit_size_and_binary_sentinel(self, object_repo):
+        git, _repo = object_repo
+        assert git.get_file_at_commit("HEAD", "a.txt", max_size=2) == (
+            "\x00BINARY_OR_TOO_LARGE:4\x00"
+        )
+        assert git.get_file_at_commit("HEAD", "big.bin") == (
+            "\x00BINARY_OR_TOO_LARGE:64\x00"
+        )
+
+    def test_restarts_after_process_dies(self, object_repo):
+        git, repo = object_repo
+        assert git.get_file_at_commit("HEAD", "a.txt") == "two\n"
+        batch = git._objects._batch(repo)
+        for proc in batch._procs.values():
+            proc.kill()
+            proc.wait()
+        assert git.get_file_at_commit("HEAD", "a.txt") == "two\n"
+
+    def test_commit_bodies_from_shas(self, object_repo):
+        git, repo = object_repo
+        shas = _git_run(repo, "rev-list", "HEAD").splitlines()
+        assert git.get_commit_bodies("HEAD", shas=shas) == git.get_commit_bodies(
+            "HEAD"
+        )
+
+    def test_read_many_pipelines_in_order(self, object_repo):
+        git, _repo = object_repo
+        specs = ["HEAD:a.txt", "HEAD:nope", "HEAD~1:a.txt"] * 500
+        got = git._objects.read_many(specs)
+        assert got is not None
+        assert got[:3] == [("blob", 4, b"two\n"), None, ("blob", 4, b"one\n")]
+        assert got[-3:] == got[:3]
+
+    def test_compare_index_worktree(self, object_repo):
+        git, repo = object_repo
+        assert git.compare_index_worktree("a.txt") == "equal"
+        with open(os.path.join(repo, "a.txt"), "w") as f:
+            f.write("three\n")
+        assert git.compare_index_worktree("a.txt") == "differ"
+        with open(os.path.join(repo, "new.txt"), "w") as f:
+            f.write("x\n")
+        assert git.compare_index_worktree("new.txt") == "worktree"
+
+    def test_mock_executor_has_no_batch(self):
+        git = GitApi(executor=MockExecutor(), path="/repo")
+        assert git._objects.read_many(["HEAD:a.txt"]) is None
+
+
+_STATUS_KEY = "git status --porcelain=v2 -z --branch --untracked-files=all"
+
+
+def _status_v2(*entries: str) -> bytes:
+    return b"".join(e.encode() + b"\0" for e in entries)
+
+
+class TestStatusV2:
+    _OUT = _status_v2(
+        "# branch.oid 1234567890abcdef1234567890abcdef12345678",
+        "# branch.head main",
+        "# branch.upstream origin/main",
+        "# branch.ab +2 -1",
+        "1 .M N... 100644 100644 100644 aaaa aaaa src/a b.py",
+        "1 A. N... 000000 100644 100644 0000 bbbb new.txt",
+        "2 R. N... 100644 100644 100644 cccc cccc R100 docs/x -> y.md",
+        "docs/old.md",
+        "u UU N... 100644 100644 100644 100644 d1 d2 d3 conflict.py",
+        "? 中文.txt",
+    )
+
+    def test_parses_entries_and_branch(self):
+        from pigit.git.api._status import parse_status_v2
+
+        files, branch = parse_status_v2(self._OUT)
+
+        assert [f.name for f in files] == [
+            "src/a b.py",
+            "new.txt",
+            "docs/x -> y.md",
+            "conflict.py",
+            "中文.txt",
+        ]
+        assert [f.short_status for f in files] == [" M", "A ", "R ", "UU", "??"]
+        assert files[0].has_unstaged_change and not files[0].has_staged_change
+        assert files[1].has_staged_change and not files[1].has_unstaged_change
+        assert files[2].display_str == "docs/old.md -> docs/x -> y.md"
+        assert files[2].get_file_str() == "docs/x -> y.md"
+        assert files[3].has_merged_conflicts and files[3].has_inline_merged_conflicts
+        assert files[4].added and not files[4].tracked
+        assert branch.head == "main"
+        assert branch.upstream == "origin/main"
+        assert (branch.ahead, branch.behind) == (2, 1)
+
+    def test_detached_and_unborn_headers(self):
+        from pigit.git.api._status import parse_status_v2
+
+        _, branch = parse_status_v2(
+            _status_v2("# branch.oid (initial)", "# branch.head (detached)")
+        )
+        assert branch.detached
+        assert branch.oid == ""
+        assert (branch.upstream, branch.ahead, branch.behind) == ("", 0, 0)
+
+    def test_failed_status_returns_empty(self):
+        git = GitApi(executor=MockExecutor(default=(128, b"fatal", None)), path="/r")
+        assert git.load_status_with_branch(use_cache=False) == ([], None)
+
+    def test_head_tracking_reuses_fresh_status(self, tmp_path):
+        (tmp_path / ".git").mkdir()
+        ex = MockExecutor(
+            responses={
+                _LAYOUT_KEY: _layout_reply(str(tmp_path / ".git"), top=str(tmp_path)),
+                _STATUS_KEY: (0, b"", self._OUT),
+            }
+        )
+        git = GitApi(executor=ex, path=str(tmp_path))
+        git.load_status(use_cache=False)
+        spawned = len(ex.exec_calls)
+
+        assert git.get_head_tracking() == ("main", 2, 1)
+        assert len(ex.exec_calls) == spawned
+
+    def test_head_tracking_falls_back_when_detached(self, tmp_path):
+        (tmp_path / ".git").mkdir()
+        ex = MockExecutor(
+            responses={
+                _LAYOUT_KEY: _layout_reply(str(tmp_path / ".git"), top=str(tmp_path)),
+                _STATUS_KEY: (0, b"", _status_v2("# branch.head (detached)")),
+                "git symbolic-ref -q --short HEAD": (1, "", ""),
+                "git describe --tags --exact-match": (0, "", "v1.0\n"),
+            }
+        )
+        git = GitApi(executor=ex, path=str(tmp_path))
+        git.load_status(use_cache=False)
+
+        assert git.get_head_tracking()[0] == "v1.0"
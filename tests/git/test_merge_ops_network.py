@@ -20,7 +20,7 @@ def test_push_runs_git_push_with_terminal_prompt_disabled() -> None:
     git.push()
     assert ex.exec_calls
     cmd, _flags, kws = ex.exec_calls[-1]
-    assert cmd == "git push"
+    assert cmd == ["git", "push"]
     assert kws.get("env", {}).get("GIT_TERMINAL_PROMPT") == "0"
 
 
@@ -29,7 +29,7 @@ def test_pull_sets_terminal_prompt_disabled() -> None:
     git = GitApi(executor=ex, path="/repo")
     git.pull()
     cmd, _flags, kws = ex.exec_calls[-1]
-    assert cmd == "git pull"
+    assert cmd == ["git", "pull"]
     assert kws.get("env", {}).get("GIT_TERMINAL_PROMPT") == "0"
 
 
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Module: tests/observe/test_cadence.py
+Description: Tests for AdaptiveCadence and the observer's activity wake-up.
+Author: Zev
+Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from pigit.observe.backend import FakeBackend
+from pigit.observe.cadence import AdaptiveCadence
+from pigit.observe.clock import FakeClock
+from pigit.observe.observer import RepoObserver
+from pigit.observe.types import PathSignal
+
+
+def test_cadence_backs_off_when_idle_and_snaps_back_on_activity():
+    clock = FakeClock()
+    cadence = AdaptiveCadence(0.25, 4.0, hot_s=1.0, clock=clock)
+    assert cadence.next_interval() == 0.25
+    clock.advance(1.0)
+    assert [cadence.next_interval() for _ in range(6)] == [
+        0.5,
+        1.0,
+        2.0,
+        4.0,
+        4.0,
+        4.0,
+    ]
+    assert cadence.backed_off
+    cadence.note_activity()
+    assert not cadence.backed_off
+    assert cadence.next_interval() == 0.25
+
+
+def test_cadence_rejects_inverted_bounds():
+    with pytest.raises(ValueError):
+        AdaptiveCadence(5.0, 1.0)
+
+
+class _IdleBackend(FakeBackend):
+    """Each poll finds nothing and lets ``step_s`` of fake time pass."""
+
+    def __init__(self, clock: FakeClock, step_s: float) -> None:
+        super().__init__()
+        self._clock = clock
+        self._step_s = step_s
+        self.polls = threading.Semaphore(0)
+
+    def poll(self) -> list[PathSignal]:
+        self._clock.advance(self._step_s)
+        self.polls.release()
+        return []
+
+
+def test_observer_activity_wakes_backed_off_worker():
+    clock = FakeClock()
+    cadence = AdaptiveCadence(10.0, 60.0, hot_s=1.0, clock=clock)
+    backend = _IdleBackend(clock, step_s=5.0)
+    observer = RepoObserver(backend=backend)
+    observer.start([])
+    observer.start_worker(cadence)
+    try:
+        # The first poll goes quiet, so the worker backs off to 20 s.
+        assert backend.polls.acquire(timeout=5)
+        for _ in range(100):
+            if cadence.backed_off:
+                break
+            time.sleep(0.01)
+        assert cadence.backed_off
+        observer.note_activity()
+        assert backend.polls.acquire(timeout=5)
+    finally:
+        observer.stop_worker(timeout=5)
@@ -123,3 +123,26 @@ def test_common_dir_refs_when_separate_from_git_dir():
         _ctx(git_dir="/repo/.git", common_dir="/common"),
     )
     assert ChangeKind.REFS in kinds
+
+
+def test_symlinked_signal_path_falls_back_to_resolve(tmp_path):
+    repo = tmp_path / "repo"
+    (repo / ".git").mkdir(parents=True)
+    link = tmp_path / "link"
+    link.symlink_to(repo)
+    ctx = _ctx(
+        repo_root=str(repo), git_dir=str(repo / ".git"), common_dir=str(repo / ".git")
+    )
+    index = PathSignal(path=str(link / ".git" / "index"))
+    kinds, paths = classify_path_signal(index, ctx)
+    assert kinds == frozenset({ChangeKind.INDEX})
+    source = PathSignal(path=str(link / "a" / "b.py"))
+    kinds, paths = classify_path_signal(source, ctx)
+    assert kinds == frozenset({ChangeKind.WORKTREE_META})
+    assert paths == frozenset({"a/b.py"})
+
+
+def test_sibling_prefix_is_not_under_repo():
+    kinds, paths = classify_path_signal(PathSignal(path="/repo2/a.py"), _ctx())
+    assert kinds == frozenset()
+    assert paths == frozenset()
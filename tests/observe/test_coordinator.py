@@ -9,6 +9,7 @@ Date: 2026-08-20
 from __future__ import annotations
 
 import queue
+import threading
 from typing import Any
 
 from pigit.observe.backend import FakeBackend
@@ -16,7 +17,7 @@ from pigit.observe.clock import FakeClock
 from pigit.observe.coordinator import RefreshCoordinator
 from pigit.observe.observer import RepoObserver
 from pigit.observe.overlay import should_defer_repo_refresh
-from pigit.observe.types import ChangeKind, ObserveContext, PathSignal
+from pigit.observe.types import ChangeKind, ObserveContext, PathSignal, WatchRoot
 from pigit.termui.types import LayerKind
 
 
@@ -148,3 +149,45 @@ def test_observer_poll_into_queue():
     assert q.get_nowait().path.endswith("index")
     observer.poll_into_queue()
     assert q.empty()
+
+
+class _BlockingBackend(FakeBackend):
+    """FakeBackend whose ``start`` and ``poll`` record the calling thread."""
+
+    def __init__(self, scripted) -> None:
+        super().__init__(scripted)
+        self.threads: set[str] = set()
+        self.roots: list[list[WatchRoot]] = []
+        self.release = threading.Event()
+
+    def start(self, roots) -> None:
+        self.threads.add(threading.current_thread().name)
+        self.roots.append(list(roots))
+        super().start(roots)
+
+    def poll(self) -> list[PathSignal]:
+        self.threads.add(threading.current_thread().name)
+        # Stand-in for a slow git status digest.
+        self.release.wait(5)
+        return super().poll()
+
+
+def test_observer_worker_polls_off_caller_thread():
+    backend = _BlockingBackend([[PathSignal(path="/repo/.git/HEAD", mtime_ns=1)]])
+    observer = RepoObserver(backend=backend)
+    observer.start_worker(0.01)
+    root = WatchRoot(kind="git_dir", path="/repo/.git")
+
+    # Handing roots over must not wait for the (blocked) poll.
+    observer.start([root])
+    observer.update_roots([root])
+    backend.release.set()
+
+    signal = observer.queue.get(timeout=5)
+    observer.stop_worker(timeout=5)
+
+    assert signal.path == "/repo/.git/HEAD"
+    assert not observer.worker_running
+    assert backend.threads == {"pigit-observe"}
+    assert backend.roots[-1] == [root]
+    assert backend._started is False
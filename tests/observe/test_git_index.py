@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Module: tests/observe/test_git_index.py
+Description: Tests for the .git/index reader and the stat-sweep dirty probe.
+Author: Zev
+Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from pigit.observe.git_index import (
+    IndexDirtyProbe,
+    IndexFormatError,
+    parse_index,
+    read_index,
+    stat_matches,
+)
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    repo = tmp_path / "repo"
+    (repo / "src" / "deep").mkdir(parents=True)
+    (repo / "a.txt").write_text("a\n")
+    (repo / "src" / "b.py").write_text("b\n")
+    (repo / "src" / "deep" / "c.py").write_text("c\n")
+    (repo / "src" / "deep" / ("long" * 40 + ".txt")).write_text("long\n")
+    (repo / "run.sh").write_text("#!/bin/sh\n")
+    (repo / "run.sh").chmod(0o755)
+    _git(repo, "init", "-q")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "init")
+    return repo
+
+
+@pytest.mark.parametrize("version", [2, 3, 4])
+def test_read_index_matches_ls_files(repo: Path, version: int):
+    _git(repo, "update-index", f"--index-version={version}")
+    if version == 3:
+        # Extended flags only appear with skip-worktree / intent-to-add.
+        (repo / "new.txt").write_text("n\n")
+        _git(repo, "add", "-N", "new.txt")
+    index = read_index(str(repo / ".git" / "index"))
+
+    tracked = set(_git(repo, "ls-files", "-z").split("\0")) - {""}
+    assert index.version == version
+    assert set(index.entries) == tracked - {"new.txt"}
+    assert {"src", "src/deep", ""} <= index.dirs
+    for path, entry in index.entries.items():
+        assert stat_matches(entry, os.lstat(repo / path)), path
+
+
+def test_parse_index_rejects_garbage():
+    with pytest.raises(IndexFormatError):
+        parse_index(b"DIRC" + b"\0" * 40)
+    with pytest.raises(IndexFormatError):
+        read_index("/nonexistent/index")
+
+
+def test_probe_confirms_only_on_suspected_change(repo: Path):
+    calls = []
+
+    def confirm() -> str:
+        calls.append(1)
+        return _git(repo, "status", "--porcelain")
+
+    # Age the index so files written in the same second are not "racily clean".
+    old = os.stat(repo / ".git" / "index").st_mtime_ns + 5_000_000_000
+    os.utime(repo / ".git" / "index", ns=(old, old))
+    probe = IndexDirtyProbe(str(repo), str(repo / ".git"), confirm)
+    clean = probe()
+    assert probe() == clean
+    assert probe() == clean
+    assert probe.confirmations == 1
+
+    (repo / "src" / "b.py").write_text("changed\n")
+    dirty = probe()
+    assert probe.confirmations == 2
+    assert "src/b.py" in dirty
+    assert probe() == dirty
+    assert probe.confirmations == 2
+
+    (repo / "src" / "deep" / "untracked.txt").write_text("u\n")
+    assert "untracked.txt" in probe()
+    os.remove(repo / "a.txt")
+    assert " D a.txt" in probe()
+    assert probe.confirmations == 4
+    assert len(calls) == 4
+
+
+def test_probe_skips_denied_untracked_dirs(repo: Path):
+    probe = IndexDirtyProbe(str(repo), str(repo / ".git"), lambda: "digest")
+    before = probe.sweep()
+    (repo / "node_modules").mkdir()
+    (repo / "node_modules" / "x.js").write_text("")
+    assert probe.sweep() == before
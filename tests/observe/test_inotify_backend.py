@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+Module: tests/observe/test_inotify_backend.py
+Description: Tests for the ctypes inotify backend and its StatMtime fallback.
+Author: Zev
+Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import errno
+import os
+import queue
+import select
+import struct
+from pathlib import Path
+
+import pytest
+
+from pigit.observe import inotify as inotify_mod
+from pigit.observe.inotify import InotifyBackend, inotify_available
+from pigit.observe.types import PathSignal, WatchRoot
+
+needs_inotify = pytest.mark.skipif(not inotify_available(), reason="Linux only")
+
+
+def _repo(tmp_path: Path) -> tuple[Path, Path]:
+    work = tmp_path / "repo"
+    git_dir = work / ".git"
+    (git_dir / "refs" / "heads").mkdir(parents=True)
+    (git_dir / "objects").mkdir()
+    (git_dir / "HEAD").write_text("ref: refs/heads/main\n")
+    (work / "src").mkdir()
+    (work / "node_modules").mkdir()
+    return work.resolve(), git_dir.resolve()
+
+
+def _roots(work: Path, git_dir: Path, *, worktree: bool = True) -> list[WatchRoot]:
+    roots = [
+        WatchRoot(kind="git_dir", path=str(git_dir)),
+        WatchRoot(kind="common_dir", path=str(git_dir)),
+    ]
+    if worktree:
+        roots.append(WatchRoot(kind="worktree", path=str(work)))
+    return roots
+
+
+def _paths(backend: InotifyBackend) -> set[str]:
+    return {s.path for s in backend.poll()}
+
+
+@needs_inotify
+def test_reports_metadata_and_worktree_writes(tmp_path: Path):
+    work, git_dir = _repo(tmp_path)
+    backend = InotifyBackend()
+    backend.start(_roots(work, git_dir))
+    try:
+        assert backend.poll() == []
+        (git_dir / "HEAD.lock").write_text("ref: refs/heads/dev\n")
+        os.replace(git_dir / "HEAD.lock", git_dir / "HEAD")
+        (git_dir / "objects" / "ab").mkdir()
+        (work / "src" / "a.py").write_text("x = 1\n")
+        (work / "node_modules" / "dep.js").write_text("")
+
+        fd = backend.fileno()
+        assert fd is not None
+        assert select.select([fd], [], [], 1.0)[0]
+        paths = _paths(backend)
+    finally:
+        backend.stop()
+
+    assert str(git_dir / "HEAD") in paths
+    assert str(work / "src" / "a.py") in paths
+    assert not any(p.endswith(".lock") for p in paths)
+    assert not any("node_modules" in p or "objects" in p for p in paths)
+
+
+@needs_inotify
+def test_worktree_writes_need_a_digest_change(tmp_path: Path):
+    work, git_dir = _repo(tmp_path)
+    digest = {"value": "d0"}
+    calls = []
+
+    def read_digest():
+        calls.append(1)
+        return digest["value"]
+
+    backend = InotifyBackend(worktree_digest=read_digest)
+    backend.start(_roots(work, git_dir))
+    try:
+        assert len(calls) == 1  # Baseline when the worktree is attached.
+        # e.g. ``*.log`` in .gitignore: the digest does not move.
+        (work / "src" / "app.log").write_text("build output\n")
+        (git_dir / "index").write_text("")
+        assert _paths(backend) == {str(git_dir / "index")}
+        assert len(calls) == 2
+
+        (work / "src" / "a.py").write_text("x = 1\n")
+        digest["value"] = "d1"
+        assert _paths(backend) == {str(work / "src" / "a.py")}
+        assert backend.poll() == []
+        assert len(calls) == 3  # No events, no digest.
+    finally:
+        backend.stop()
+
+
+@needs_inotify
+def test_status_file_writes_skip_the_digest(tmp_path: Path):
+    work, git_dir = _repo(tmp_path)
+    dirty = work / "src" / "a.py"
+    dirty.write_text("x = 1\n")
+    calls = []
+
+    def read_digest():
+        calls.append(1)
+        return "d0"  # Already modified: rewriting it keeps the digest.
+
+    backend = InotifyBackend(worktree_digest=read_digest)
+    backend.start([*_roots(work, git_dir), WatchRoot(kind="file", path=str(dirty))])
+    try:
+        dirty.write_text("x = 2\n")
+        assert _paths(backend) == {str(dirty)}
+        assert len(calls) == 1  # Only the baseline.
+
+        dirty.write_text("x = 3\n")
+        (work / "src" / "app.log").write_text("build output\n")
+        assert _paths(backend) == {str(dirty)}
+    finally:
+        backend.stop()
+
+
+@needs_inotify
+def test_new_directory_is_watched(tmp_path: Path):
+    work, git_dir = _repo(tmp_path)
+    backend = InotifyBackend()
+    backend.start(_roots(work, git_dir))
+    try:
+        (work / "pkg").mkdir()
+        assert str(work / "pkg") in _paths(backend)
+        (work / "pkg" / "mod.py").write_text("")
+        assert str(work / "pkg" / "mod.py") in _paths(backend)
+        (git_dir / "refs" / "heads" / "feature").mkdir()
+        backend.poll()
+        (git_dir / "refs" / "heads" / "feature" / "x").write_text("abc\n")
+        assert str(git_dir / "refs" / "heads" / "feature" / "x") in _paths(backend)
+    finally:
+        backend.stop()
+
+
+@needs_inotify
+def test_detaching_worktree_drops_its_watches(tmp_path: Path):
+    work, git_dir = _repo(tmp_path)
+    backend = InotifyBackend()
+    backend.start(_roots(work, git_dir))
+    try:
+        backend.update_roots(_roots(work, git_dir, worktree=False))
+        (work / "src" / "a.py").write_text("")
+        (git_dir / "index").write_text("")
+        assert _paths(backend) == {str(git_dir / "index")}
+    finally:
+        backend.stop()
+
+
+@needs_inotify
+def test_queue_overflow_rescans_every_kind(tmp_path: Path):
+    work, git_dir = _repo(tmp_path)
+    backend = InotifyBackend()
+    backend.start(_roots(work, git_dir))
+    try:
+        overflow = struct.pack("iIII", -1, inotify_mod.IN_Q_OVERFLOW, 0, 0)
+        paths = {s.path for s in backend._handle_events(overflow)}
+    finally:
+        backend.stop()
+    assert str(work) in paths
+    assert {str(git_dir / "HEAD"), str(git_dir / "index")} <= paths
+
+
+@needs_inotify
+def test_bulk_worktree_events_collapse_to_root(tmp_path: Path):
+    work, git_dir = _repo(tmp_path)
+    backend = InotifyBackend()
+    backend.start(_roots(work, git_dir))
+    try:
+        for i in range(inotify_mod.MAX_WORKTREE_SIGNALS_PER_POLL + 1):
+            (work / "src" / f"f{i}.txt").write_text("")
+        (git_dir / "index").write_text("")
+        signals = backend.poll()
+    finally:
+        backend.stop()
+    assert signals == [
+        PathSignal(path=str(work)),
+        PathSignal(path=str(git_dir / "index")),
+    ]
+
+
+@needs_inotify
+def test_watch_limit_falls_back_to_stat_polling(tmp_path: Path, monkeypatch):
+    work, git_dir = _repo(tmp_path)
+
+    def no_space(self, path, mask):
+        raise OSError(errno.ENOSPC, "No space left on device", path)
+
+    monkeypatch.setattr(inotify_mod._Inotify, "add_watch", no_space)
+    backend = InotifyBackend(worktree_digest=lambda: "d0")
+    backend.start(_roots(work, git_dir))
+    try:
+        assert backend.using_fallback
+        assert backend.fileno() is None
+        assert backend.poll() == []
+        (git_dir / "HEAD").write_text("ref: refs/heads/dev\n")
+        assert str(git_dir / "HEAD") in _paths(backend)
+    finally:
+        backend.stop()
+
+
+def test_unavailable_inotify_falls_back(tmp_path: Path, monkeypatch):
+    work, git_dir = _repo(tmp_path)
+    monkeypatch.setattr(inotify_mod, "_libc", lambda: None)
+    backend = InotifyBackend()
+    backend.start(_roots(work, git_dir, worktree=False))
+    assert backend.using_fallback
+    backend.stop()
+
+
+@needs_inotify
+def test_observer_worker_wakes_on_events(tmp_path: Path):
+    from pigit.observe.observer import RepoObserver
+
+    work, git_dir = _repo(tmp_path)
+    observer = RepoObserver(backend=InotifyBackend())
+    # An interval far beyond the timeout below: only the fd can wake it.
+    observer.start_worker(60.0)
+    try:
+        observer.start(_roots(work, git_dir))
+        # Roots are applied on the worker; retry until the watch is live.
+        deadline = 50
+        signal = None
+        while signal is None and deadline:
+            (git_dir / "index").write_text(str(deadline))
+            try:
+                signal = observer.queue.get(timeout=0.1)
+            except queue.Empty:
+                deadline -= 1
+    finally:
+        observer.stop_worker(timeout=5)
+    assert signal is not None and signal.path == str(git_dir / "index")
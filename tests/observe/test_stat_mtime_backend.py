@@ -200,3 +200,23 @@ def test_new_branch_ref_emits_via_heads_dir_then_tracks_file(tmp_path: Path):
     (heads / "feature").write_text("ccc\n")
     second = backend.poll()
     assert any(Path(s.path).name == "feature" for s in second)
+
+
+def test_stat_mtime_groups_by_dir_and_handles_removed_dir(tmp_path: Path):
+    keep = tmp_path / "keep.txt"
+    keep.write_text("k")
+    gone_dir = tmp_path / "gone"
+    gone_dir.mkdir()
+    gone = [gone_dir / f"f{i}.txt" for i in range(6)]
+    for path in gone:
+        path.write_text("x")
+    backend = StatMtimeBackend(paths=[str(keep), *map(str, gone)])
+    backend.start([])
+    assert backend.poll() == []
+    for path in gone:
+        path.unlink()
+    gone_dir.rmdir()
+    signals = backend.poll()
+    assert {s.path for s in signals} == {str(p.resolve()) for p in gone}
+    assert all(s.mtime_ns is None for s in signals)
+    assert backend.poll() == []
@@ -106,6 +106,27 @@ def test_async_task_multiple_polls_are_safe():
     assert received == ["x"]
 
 
+def test_async_task_watch_delivers_future_result():
+    from concurrent.futures import Future
+
+    task = AsyncTask()
+    received = []
+    done, dropped, failed = Future(), Future(), Future()
+
+    task.watch(done, received.append)
+    task.watch(failed, received.append)
+    done.set_result("x")
+    failed.set_exception(ValueError("boom"))
+    AsyncTask.poll_all()
+    assert received == ["x"]
+
+    task.watch(dropped, received.append)
+    task.cancel()
+    dropped.set_result("late")
+    AsyncTask.poll_all()
+    assert received == ["x"]
+
+
 # --- Integration with AppEventLoop ---
 
 
@@ -283,3 +304,30 @@ def test_run_async_dedup(mocker):
 
     assert "new" in received
     assert "old" not in received
+
+
+def test_async_task_stream_delivers_items_until_cancelled():
+    task = AsyncTask()
+    received = []
+    release = threading.Event()
+    closed = threading.Event()
+
+    def items():
+        try:
+            yield 1
+            yield 2
+            release.wait(1.0)
+            yield 3
+        finally:
+            closed.set()
+
+    task.start_stream(items, received.append)
+    deadline = time.monotonic() + 2.0
+    while len(received) < 2 and time.monotonic() < deadline:
+        AsyncTask.poll_all()
+        time.sleep(0.01)
+    task.cancel()
+    release.set()
+    assert closed.wait(1.0)
+    AsyncTask.poll_all()
+    assert received == [1, 2]
@@ -14,10 +14,12 @@ PRIMITIVES_EXPORTS = (
     "parse_ansi_line",
     "tokenize_with_positions",
     "merge_ranges",
+    "match_tokens",
     "format_line_number",
     "ContributionCalendar",
     "build_contribution_calendar",
     "calendar_day_values",
+    "TextIndex",
 )
 
 
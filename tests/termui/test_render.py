@@ -250,3 +250,221 @@ class TestRenderSurfaceIncrementalWithRGB:
         written = _capture_output(sess)
         assert "abc" not in written
         assert "xyz" in written
+
+
+def _replay(output: str, screen: list[list[str]]) -> None:
+    """Apply cursor moves and text from ``output`` to a character grid."""
+    import re
+
+    from pigit.termui.wcwidth_table import _char_width
+
+    row = col = 0
+    for token in re.findall(r"\033\[(\d+);(\d+)f|\033\[[0-9;?]*[A-Za-z]|(.)", output):
+        r, c, ch = token
+        if r:
+            row, col = int(r) - 1, int(c) - 1
+        elif ch:
+            screen[row][col] = ch
+            if _char_width(ord(ch)) == 2:
+                screen[row][col + 1] = ""
+            col += _char_width(ord(ch))
+
+
+def _packed_row(chars: list[str]):
+    """Packed storage of a one-row Surface holding ``chars``."""
+    s = Surface(len(chars), 1)
+    s._chars[0][:] = chars
+    return s.packed_rows()[0]
+
+
+class TestRenderSurfaceCellSpans:
+    def _frame(self, selected: int) -> Surface:
+        s = Surface(80, 4)
+        for i in range(4):
+            if i == selected:
+                s.draw_text_rgb(i, 0, ">", fg=(250, 200, 0))
+            s.draw_text_rgb(i, 2, f"item {i}", fg=(200, 200, 200))
+            s.draw_text_rgb(i, 60, "modified", fg=(90, 90, 90))
+        return s
+
+    def test_only_changed_spans_are_written(self):
+        sess = FakeSession()
+        r = Renderer(sess)
+        s = Surface(40, 2)
+        s.draw_text_rgb(0, 0, "a" * 40)
+        s.draw_text_rgb(1, 0, "b" * 40)
+        r.render_surface(s)
+        sess.stdout.reset_mock()
+        s.draw_text_rgb(0, 3, "X")
+        s.draw_text_rgb(0, 30, "Y")
+        r.render_surface(s)
+        written = _capture_output(sess)
+        assert written.count("\033[1;4f") == 1
+        assert written.count("\033[1;31f") == 1
+        assert "a" not in written
+        assert "\033[K" not in written
+
+    def test_close_changes_merge_into_one_span(self):
+        r = Renderer(FakeSession())
+        old = _packed_row(["a"] * 20)
+        chars = ["a"] * 20
+        chars[2] = "x"
+        chars[6] = "y"
+        assert r._changed_spans(old, _packed_row(chars)) == [(2, 7)]
+        chars[19] = "z"
+        assert r._changed_spans(old, _packed_row(chars)) == [(2, 7), (19, 20)]
+
+    def test_color_only_change_is_a_span(self):
+        r = Renderer(FakeSession())
+        s = Surface(10, 1)
+        s.draw_text_rgb(0, 0, "abcdefghij")
+        old = _packed_row(list("abcdefghij"))
+        assert r._changed_spans(old, s.packed_rows()[0]) == []
+        s.draw_text_rgb(0, 4, "e", fg=(1, 2, 3))
+        assert r._changed_spans(old, s.packed_rows()[0]) == [(4, 5)]
+
+    def test_span_starts_at_wide_character(self):
+        r = Renderer(FakeSession())
+        old = _packed_row(["中", "", "a"])
+        new = _packed_row(["中", "", "b"])
+        assert r._changed_spans(old, new) == [(2, 3)]
+        old = _packed_row(["中", "a", "a"])
+        new = _packed_row(["中", "", "a"])
+        assert r._changed_spans(old, new) == [(0, 2)]
+
+    def test_sgr_state_carries_across_spans(self):
+        sess = FakeSession()
+        r = Renderer(sess)
+        r._color = ColorAdapter(ColorMode.TRUECOLOR)
+        s = Surface(40, 2)
+        r.render_surface(s)
+        sess.stdout.reset_mock()
+        s.draw_text_rgb(0, 0, "A", fg=(1, 2, 3))
+        s.draw_text_rgb(1, 20, "B", fg=(1, 2, 3))
+        r.render_surface(s)
+        written = _capture_output(sess)
+        assert written.count("\033[38;2;1;2;3m") == 1
+        assert written.count("\033[0m") == 1
+
+    def test_moving_selection_writes_a_fraction_of_the_rows(self):
+        sess = FakeSession()
+        r = Renderer(sess)
+        r.render_surface(self._frame(0))
+        sess.stdout.reset_mock()
+        r.render_surface(self._frame(1))
+        written = _capture_output(sess)
+        rows = self._frame(1).rows()
+        full_rows = r._row_to_str(rows[0]) + r._row_to_str(rows[1])
+        assert written.count(">") == 1
+        assert len(written) * 4 < len(full_rows)
+
+    def test_idle_frame_writes_nothing(self):
+        sess = FakeSession()
+        r = Renderer(sess)
+        r.render_surface(self._frame(0))
+        s = self._frame(0)
+        r.render_surface(s)
+        sess.stdout.reset_mock()
+        s.clear()
+        for i in range(4):
+            s.draw_text_rgb(i, 2, f"item {i}", fg=(200, 200, 200))
+            s.draw_text_rgb(i, 60, "modified", fg=(90, 90, 90))
+        s.draw_text_rgb(0, 0, ">", fg=(250, 200, 0))
+        r.render_surface(s)
+        assert _capture_output(sess) == ""
+
+    def test_clean_rows_keep_their_snapshot(self):
+        r = Renderer(FakeSession())
+        s = Surface(10, 3)
+        r.render_surface(s)
+        before = list(r._prev_rows)
+        s.draw_text_rgb(1, 0, "x")
+        r.render_surface(s)
+        assert r._prev_rows[0] is before[0]
+        assert r._prev_rows[2] is before[2]
+        assert r._prev_rows[1][0][0] == "x"
+
+    def test_replayed_output_matches_surface(self):
+        import random
+
+        rng = random.Random(7)
+        sess = FakeSession()
+        r = Renderer(sess)
+        s = Surface(30, 6)
+        screen = [[" "] * 30 for _ in range(6)]
+        for _ in range(40):
+            s.clear()
+            for row in range(6):
+                text = "".join(rng.choice("ab中 ") for _ in range(rng.randint(0, 14)))
+                s.draw_text_rgb(row, rng.randint(0, 10), text, fg=(row, 0, 0))
+            sess.stdout.reset_mock()
+            r.render_surface(s)
+            _replay(_capture_output(sess), screen)
+            assert ["".join(line) for line in screen] == s.lines()
+
+
+class TestFrameWrite:
+    def test_frame_is_one_write(self):
+        sess = FakeSession()
+        r = Renderer(sess)
+        s = Surface(10, 3)
+        s.draw_text_rgb(0, 0, "abc", fg=(1, 2, 3))
+        r.set_cursor(1, 1)
+        r.render_surface(s)
+        assert sess.stdout.write.call_count == 1
+        assert sess.stdout.flush.call_count == 1
+        sess.stdout.reset_mock()
+        s.draw_text_rgb(2, 0, "xyz")
+        r.render_surface(s)
+        assert sess.stdout.write.call_count == 1
+
+    def test_synchronized_update_wraps_frame(self):
+        sess = FakeSession()
+        r = Renderer(sess)
+        r._sync_output = True
+        s = Surface(10, 2)
+        r.render_surface(s)
+        written = _capture_output(sess)
+        assert written.startswith("\033[?2026h")
+        assert written.endswith("\033[?2026l")
+        sess.stdout.reset_mock()
+        r.render_surface(s)
+        assert sess.stdout.write.call_count == 0
+
+    def test_tty_frame_goes_through_os_write(self):
+        sess = FakeSession()
+        sess.stdout.encoding = "utf-8"
+        sess.stdout.errors = "strict"
+        r = Renderer(sess)
+        r._fd = 99
+        sizes = [3, 100]
+        with mock.patch("pigit.termui.renderer.os.write") as write:
+            write.side_effect = lambda fd, data: sizes.pop(0)
+            r._write_frame("中abc")
+        chunks = [bytes(c[0][1]) for c in write.call_args_list]
+        assert chunks == ["中abc".encode(), b"abc"]
+        sess.stdout.write.assert_not_called()
+
+
+class TestDetectSyncOutput:
+    @staticmethod
+    def _detect(env):
+        from pigit.termui.renderer import _detect_sync_output
+
+        base = {"TERM": "", "TERM_PROGRAM": "", "PIGIT_SYNC_OUTPUT": ""}
+        with mock.patch.dict("os.environ", {**base, **env}):
+            return _detect_sync_output()
+
+    def test_known_terminals(self):
+        assert self._detect({"TERM": "xterm-kitty"})
+        assert self._detect({"TERM_PROGRAM": "WezTerm"})
+        assert self._detect({"TERM": "foot-extra"})
+
+    def test_unknown_terminal_is_off(self):
+        assert not self._detect({"TERM": "xterm-256color"})
+        assert not self._detect({"TERM": "tmux-256color", "TERM_PROGRAM": "tmux"})
+
+    def test_env_override(self):
+        assert self._detect({"TERM": "xterm", "PIGIT_SYNC_OUTPUT": "1"})
+        assert not self._detect({"TERM": "xterm-kitty", "PIGIT_SYNC_OUTPUT": "off"})
+        assert self._detect({"TERM": "xterm-kitty", "PIGIT_SYNC_OUTPUT": "bogus"})
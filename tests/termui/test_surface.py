@@ -294,3 +294,52 @@ class TestSurfaceRGBWideChars:
         assert row[1].char == "中"
         assert row[2].char == ""  # spacer
         assert row[3].char == "B"  # C is clipped
+
+    def test_draw_text_rgb_combining_mark_joins_previous_cell(self):
+        s = Surface(5, 1)
+        s.draw_text_rgb(0, 0, "e\u0301x|", fg=(255, 0, 0))
+        assert [cell.char for cell in s.rows()[0]] == ["e\u0301", "x", "|", " ", " "]
+
+    def test_draw_text_rgb_combining_mark_after_wide_char(self):
+        s = Surface(4, 1)
+        s.draw_text_rgb(0, 0, "中\u0301A", fg=(255, 0, 0))
+        assert [cell.char for cell in s.rows()[0]] == ["中\u0301", "", "A", " "]
+        assert s.lines() == ["中\u0301A "]
+
+
+class TestSurfaceDirtyRows:
+    def test_new_surface_is_all_dirty(self):
+        s = Surface(4, 3)
+        assert s.pop_dirty_rows() == [0, 1, 2]
+        assert s.pop_dirty_rows() == []
+
+    def test_drawing_marks_written_rows(self):
+        s = Surface(6, 6)
+        s.pop_dirty_rows()
+        s.draw_text_rgb(1, 0, "ab")
+        s.draw_text_rgb(2, 0, "中")
+        s.fill_rect_rgb(3, 2, 2, 1, bg=(1, 2, 3))
+        s.draw_hline_rgb(4, 0, 3, fg=DEFAULT_FG)
+        s.draw_text_rgb(9, 0, "out of bounds")
+        assert s.pop_dirty_rows() == [1, 2, 3, 4]
+        s.draw_box_rgb(0, 0, 3, 3, fg=DEFAULT_FG)
+        assert s.pop_dirty_rows() == [0, 1, 2]
+
+    def test_subsurface_and_blit_mark_parent_rows(self):
+        s = Surface(6, 6)
+        s.pop_dirty_rows()
+        s.subsurface(2, 1, 3, 3).draw_vline_rgb(0, 0, 2, fg=DEFAULT_FG)
+        assert s.pop_dirty_rows() == [2, 3]
+        src = Surface(2, 2)
+        s.blit(src, 0, 0, 2, 2, 4, 0)
+        assert s.pop_dirty_rows() == [4, 5]
+
+    def test_clear_skips_blank_rows(self):
+        s = Surface(4, 3)
+        s.draw_text_rgb(1, 0, "ab")
+        s.pop_dirty_rows()
+        s.clear()
+        assert s.pop_dirty_rows() == [1]
+        s.clear()
+        assert s.pop_dirty_rows() == []
+        assert s.lines() == ["    "] * 3
@@ -218,6 +218,51 @@ class TestCache:
         r2 = tok.tokenize("x = 1", "py")
         assert r1 is r2  # same cached object
 
+    def test_evicts_least_recently_used(self):
+        tok = SyntaxTokenizer(cache_size=2)
+        first = tok.tokenize("a", "py")
+        tok.tokenize("b", "py")
+        tok.tokenize("a", "py")  # "b" is now the oldest
+        tok.tokenize("c", "py")
+        assert tok.tokenize("a", "py") is first
+        assert tok.cache_info() == (2, 3, 2, 2)
+
+    def test_cache_info_hit_rate(self):
+        tok = SyntaxTokenizer()
+        assert tok.cache_info().hit_rate == 0.0
+        for _ in range(4):
+            tok.tokenize("x = 1", "py")
+        assert tok.cache_info().hit_rate == 0.75
+
+    def test_zero_size_disables_cache(self):
+        tok = SyntaxTokenizer(cache_size=0)
+        tok.tokenize("x = 1", "py")
+        tok.tokenize("x = 1", "py")
+        assert tok.cache_info() == (0, 2, 0, 0)
+
+
+class TestSinglePass:
+    @pytest.fixture
+    def tok(self):
+        return SyntaxTokenizer(cache_size=0)
+
+    def test_rule_priority_kept(self, tok):
+        # Keyword before call, call before type, string before comment.
+        assert tok.tokenize("if(x)", "py")[0] == ("if", "keyword_control")
+        assert tok.tokenize("Foo(1)", "py")[0] == ("Foo", "call")
+        assert tok.tokenize('"# no"', "py") == [('"# no"', "string")]
+
+    def test_whitespace_and_unknown_chars_merge_into_punct(self, tok):
+        assert tok.tokenize("x  $ y", "py") == [
+            ("x", "variable"),
+            ("  $ ", "punct"),
+            ("y", "variable"),
+        ]
+
+    def test_tokens_cover_line(self, tok):
+        line = "let r: &'a str = `${x}` // done\t\u00e9"
+        assert "".join(text for text, _ in tok.tokenize(line, "rs")) == line
+
 
 class TestMultilineMask:
     @pytest.fixture
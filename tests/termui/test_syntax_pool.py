@@ -0,0 +1,26 @@
+"""Tests for the syntax highlighting process pool."""
+
+from __future__ import annotations
+
+from pigit.termui import syntax_pool
+from pigit.termui.syntax import SyntaxTokenizer
+
+
+def test_worker_tokenizer_is_kept():
+    tokenizer = syntax_pool.worker_tokenizer()
+    assert isinstance(tokenizer, SyntaxTokenizer)
+    assert syntax_pool.worker_tokenizer() is tokenizer
+
+
+def test_submit_runs_in_worker_process():
+    future = syntax_pool.submit(pow, 2, 10)
+    try:
+        if future is not None:  # None: no process pool in this environment.
+            assert future.result(timeout=60) == 1024
+    finally:
+        syntax_pool.shutdown()
+
+
+def test_unavailable_pool_returns_none(monkeypatch):
+    monkeypatch.setattr(syntax_pool, "_get_pool", lambda: None)
+    assert syntax_pool.submit(pow, 2, 10) is None
@@ -0,0 +1,57 @@
+"""
+Module: tests/termui/test_text_index.py
+Description: Tests for the incremental substring filter index.
+Author: Zev
+Date: 2026-10-16
+"""
+
+from __future__ import annotations
+
+from pigit.termui.primitives import TextIndex
+
+
+class _CountingRows(list):
+    """Row list that counts full scans."""
+
+    def __init__(self, rows):
+        super().__init__(rows)
+        self.scans = 0
+
+    def __iter__(self):
+        self.scans += 1
+        return super().__iter__()
+
+
+def test_search_is_case_insensitive_substring():
+    index = TextIndex(["Fix Bug", "add feature", "fixture", "docs"])
+    assert index.search("FIX") == [0, 2]
+    assert index.search("e") == [1, 2]
+    assert index.search("zzz") == []
+    assert index.search("") == [0, 1, 2, 3]
+    assert len(index) == 4
+
+
+def test_longer_query_scans_only_previous_hits():
+    index = TextIndex([f"commit {i}" for i in range(100)])
+    assert len(index.search("commit 1")) == 11
+    index._lowered = rows = _CountingRows(index._lowered)
+
+    assert index.search("commit 12") == [12]
+    assert index.search("commit 1") == [1, *range(10, 20)]
+    assert rows.scans == 0  # Narrowed or remembered: no full scan.
+
+    assert index.search("99") == [99]
+    assert rows.scans == 1  # Unrelated query: one scan.
+
+
+def test_results_are_copies():
+    index = TextIndex(["a", "b"])
+    index.search("a").append(99)
+    assert index.search("a") == [0]
+
+
+def test_cache_is_bounded():
+    index = TextIndex(["row"])
+    for i in range(TextIndex.MAX_CACHED_QUERIES + 5):
+        index.search(f"q{i}")
+    assert len(index._hits) == TextIndex.MAX_CACHED_QUERIES
@@ -117,6 +117,15 @@ class TestItemListSearch:
         assert sel.content == ["alpha"]
         assert sel.visible_to_source(0) == 0
 
+    def test_filter_follows_replaced_source_content(self):
+        sel = ItemList(size=(20, 5))
+        sel.set_source_content(["alpha", "beta"])
+        sel.set_filter("a")
+        sel.set_source_content(["gamma", "delta", "zeta"])
+        sel.set_filter("ta")
+        assert sel.content == ["delta", "zeta"]
+        assert sel.visible_to_source(1) == 2
+
     def test_search_bar_drawn_when_active(self):
         sel = ItemList(content=["item"], size=(20, 5))
         sel.enter_search()
@@ -2,11 +2,64 @@
 
 from __future__ import annotations
 
+import difflib
+
+import pytest
+
 from pigit.app_diff import DiffViewer
+from pigit.termui.primitives import match_tokens, tokenize_with_positions
+
+
+class TestMatchTokens:
+    """Patience/Myers token matcher."""
+
+    @pytest.mark.parametrize(
+        "a, b",
+        [
+            ("", ""),
+            ("a b c", ""),
+            ("", "a b c"),
+            ("a b c", "a b c"),
+            ("a b c d", "a x c y"),
+            ("x = a + b", "x = a - b"),
+            ("a a a b", "a b a a"),
+            ("f(a, b, c)", "g(c, b, a)"),
+        ],
+    )
+    def test_matches_cover_same_tokens_as_difflib(self, a, b):
+        ta, _ = tokenize_with_positions(a)
+        tb, _ = tokenize_with_positions(b)
+        blocks = match_tokens(ta, tb)
+        assert blocks[-1] == (len(ta), len(tb), 0)
+        last_i = last_j = 0
+        for i, j, size in blocks:
+            assert i >= last_i and j >= last_j
+            assert ta[i : i + size] == tb[j : j + size]
+            last_i, last_j = i + size, j + size
+        # Short lines get a shortest edit script: never fewer matches.
+        matched = sum(size for _, _, size in blocks)
+        expected = difflib.SequenceMatcher(None, ta, tb, autojunk=False)
+        assert matched >= sum(m.size for m in expected.get_matching_blocks())
+
+    def test_heavy_edit_gives_up_on_region(self, monkeypatch):
+        from pigit.termui.primitives import word_diff
+
+        monkeypatch.setattr(word_diff, "MAX_EDIT_COST", 4)
+        a = list("aabbccdd")
+        b = list("ddccbbaa")
+        # Reported as changed as a whole instead of searching further.
+        assert match_tokens(a, b) == [(8, 8, 0)]
+
+    def test_long_minified_line(self):
+        old = ",".join(f"v{i}" for i in range(20000))
+        new = old.replace("v10000,", "w10000,")
+        del_r, add_r = DiffViewer._word_diff_ranges(old, new)
+        assert [old[s:e] for s, e in del_r] == ["v10000"]
+        assert [new[s:e] for s, e in add_r] == ["w10000"]
 
 
 class TestWordDiffRanges:
-    """Word-level diff ranges via difflib.SequenceMatcher."""
+    """Word-level diff ranges via match_tokens."""
 
     def test_range_no_change(self):
         del_r, add_r = DiffViewer._word_diff_ranges("hello world", "hello world")
@@ -98,6 +151,7 @@ class TestSetContentLocalWordDiff:
     def test_content_unchanged_by_word_diff(self):
         dv = DiffViewer(word_diff=True)
         dv.set_content(self._simple_diff())
+        dv._prepare_lines(0, len(dv._content))
         # Content stays exactly the same as input (normal unified diff).
         assert dv._content[5] == "-old hello world"
         assert dv._content[6] == "+old new world"
@@ -105,6 +159,7 @@ class TestSetContentLocalWordDiff:
     def test_segments_highlight_changed_words(self):
         dv = DiffViewer(word_diff=True)
         dv.set_content(self._simple_diff())
+        dv._prepare_lines(0, len(dv._content))
 
         del_segs = dv._word_diff_segments[5]
         add_segs = dv._word_diff_segments[6]
@@ -118,6 +173,7 @@ class TestSetContentLocalWordDiff:
     def test_hunks_still_parse_correctly(self):
         dv = DiffViewer(word_diff=True)
         dv.set_content(self._simple_diff())
+        dv._prepare_lines(0, len(dv._content))
         assert len(dv._hunks) == 1
         hunk = dv._hunks[0]
         assert hunk.old_count == 2
@@ -127,6 +183,7 @@ class TestSetContentLocalWordDiff:
     def test_patch_extraction_works(self):
         dv = DiffViewer(word_diff=True)
         dv.set_content(self._simple_diff())
+        dv._prepare_lines(0, len(dv._content))
         patch = dv._extract_hunk_patch(0)
         assert "-old hello world" in patch
         assert "+old new world" in patch
@@ -144,9 +201,31 @@ class TestSetContentLocalWordDiff:
                 "+new1",
             ]
         )
+        dv._prepare_lines(0, len(dv._content))
         # old1 paired (with new1), old2 unpaired -> no word-diff segments.
         assert dv._word_diff_segments[4] == []  # unpaired "-old2"
 
+    def test_segments_wait_until_hunk_is_drawn(self):
+        dv = DiffViewer(word_diff=True)
+        dv.set_content(self._simple_diff())
+        assert dv._word_diff_segments[5] == []
+        dv._prepare_lines(5, 6)
+        assert dv._word_diff_segments[5]
+
+    def test_hunk_result_is_reused(self, monkeypatch):
+        first = DiffViewer(word_diff=True)
+        first.set_content(self._simple_diff())
+        first._prepare_lines(0, len(first._content))
+
+        def fail(*_args):
+            raise AssertionError("hunk diffed twice")
+
+        monkeypatch.setattr(DiffViewer, "_hunk_word_diff", fail)
+        again = DiffViewer(word_diff=True)
+        again.set_content(self._simple_diff())
+        again._prepare_lines(0, len(again._content))
+        assert again._word_diff_segments == first._word_diff_segments
+
     def test_help_entries_no_w_key(self):
         dv = DiffViewer()
         entries = dv.get_help_entries()
@@ -154,7 +233,7 @@ class TestSetContentLocalWordDiff:
         assert "w" not in keys
 
 
-class TestPreTokenizeWithWordDiff:
+class TestRenderDiffLineWithWordDiff:
     """Word-diff segments receive per-token background colors."""
 
     def test_word_diff_segments_get_background(self):
@@ -170,9 +249,11 @@ class TestPreTokenizeWithWordDiff:
                 (" baz", None, 4),
             ]
         ]
-        tokens = DiffViewer._pre_tokenize_with(
-            content, ["plain"], [None], tokenizer, segments
-        )
+        tokens = [
+            DiffViewer._render_diff_line(
+                content[0], "plain", None, tokenizer, segments[0]
+            )
+        ]
 
         bar_tokens = [t for t in tokens[0] if t[0] == "bar"]
         assert bar_tokens
@@ -189,9 +270,11 @@ class TestPreTokenizeWithWordDiff:
         segments: list[list[tuple[str, str | None, int]]] = [
             [("foo ", None, 4), ("bar", "del", 3)]
         ]
-        tokens = DiffViewer._pre_tokenize_with(
-            content, ["plain"], [None], tokenizer, segments
-        )
+        tokens = [
+            DiffViewer._render_diff_line(
+                content[0], "plain", None, tokenizer, segments[0]
+            )
+        ]
 
         bar_tokens = [t for t in tokens[0] if t[0] == "bar"]
         assert bar_tokens
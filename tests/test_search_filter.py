@@ -65,4 +65,27 @@ def test_commit_help_includes_search():
     vm.items = Signal([])
     panel = CommitPanel(vm=vm)
     entries = panel.get_help_entries()
-    assert ("/", "Filter commit list by message or SHA") in entries
+    assert ("/", "Filter commits (Enter: search history)") in entries
+
+
+def test_commit_search_submits_to_history_on_enter():
+    from pigit.app_commit import CommitPanel
+    from pigit.viewmodels.commit import ICommitViewModel
+    from pigit.termui.reactive import Signal
+
+    vm = Mock(spec=ICommitViewModel)
+    vm.items = Signal([])
+    vm.search_query = ""
+    vm.searching = False
+    panel = CommitPanel(vm=vm)
+    panel.enter_search()
+    panel.search_handle_key("f")
+    panel.search_handle_key("x")
+    vm.search.assert_not_called()  # typing only filters what is loaded
+
+    panel.search_handle_key(keys.KEY_ENTER)
+    vm.search.assert_called_once_with("fx")
+
+    vm.clear_search.reset_mock()
+    panel.enter_search()
+    vm.clear_search.assert_called_once()
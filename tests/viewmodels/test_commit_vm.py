@@ -88,6 +88,13 @@ def test_load_diff_invalid_index(commit_vm):
     assert commit_vm.load_diff(99) == []
 
 
+def test_open_diff(commit_vm):
+    stream = commit_vm.open_diff(1)
+    assert stream is commit_vm._git.stream_commit_info.return_value
+    commit_vm._git.stream_commit_info.assert_called_once_with("def5678", plain=True)
+    assert commit_vm.open_diff(99) is None
+
+
 def test_get_bodies_caches_result(commit_vm):
     commit_vm._git.get_commit_bodies.return_value = {"abc1234": "subject\n\nbody"}
     bodies1 = commit_vm.get_bodies()
@@ -120,7 +127,9 @@ def test_get_bodies_uses_log_ref(commit_vm):
     commit_vm._log_ref = "feat"
     commit_vm._git.get_commit_bodies.return_value = {}
     commit_vm.get_bodies()
-    commit_vm._git.get_commit_bodies.assert_called_with("feat")
+    commit_vm._git.get_commit_bodies.assert_called_with(
+        "feat", shas=[c.sha for c in commit_vm.items.value]
+    )
 
 
 def test_set_log_ref_assigns_and_refresh_without_verify(commit_vm):
@@ -245,3 +254,321 @@ def test_list_log_ref_names_head_first(commit_vm):
         Branch("origin/foo", "?", "?", False, is_remote=True),
     ]
     assert commit_vm.list_log_ref_names() == ["HEAD", "main", "origin/foo"]
+
+
+class _FakeLog:
+    """In-memory CommitLog over ``history`` starting at ``start``."""
+
+    def __init__(self, history: list[Commit], start: int) -> None:
+        self.history = history
+        self.offset = start
+        self.closed = False
+
+    @property
+    def exhausted(self) -> bool:
+        return self.offset >= len(self.history)
+
+    def read_page(self, count: int) -> list[Commit]:
+        page = self.history[self.offset : self.offset + count]
+        self.offset += len(page)
+        return page
+
+    def read_range(self, start: int, count: int) -> list[Commit]:
+        return self.history[start : start + count]
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _history(n: int) -> list[Commit]:
+    return [
+        Commit(f"s{i}", f"m{i}", "Zev", 1700000000 - i, "pushed", "", [], [f"s{i + 1}"])
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def paged_vm(monkeypatch):
+    import pigit.viewmodels.commit as commit_mod
+
+    monkeypatch.setattr(commit_mod, "PAGE_SIZE", 4)
+    monkeypatch.setattr(commit_mod, "PREFETCH_MARGIN", 1)
+    monkeypatch.setattr(commit_mod, "MAX_WINDOW", 8)
+    history = _history(20)
+    git = Mock()
+    git.get_head.return_value = "main"
+    git.load_commits.side_effect = lambda ref, max_commits=4: history[:max_commits]
+    git.get_remotes.return_value = []
+    git.open_commit_log.side_effect = lambda ref, start, pushed_from: _FakeLog(
+        history, start
+    )
+    vm = CommitViewModel(git)
+    vm._apply_load(vm._load_commits())
+    return vm
+
+
+def _page(vm: CommitViewModel, idx: int) -> None:
+    """Run ``ensure_window`` synchronously (worker + UI callback)."""
+    calls = []
+    vm._pager.start = lambda work, cb: calls.append((work, cb))
+    vm.ensure_window(idx)
+    for work, cb in calls:
+        cb(work())
+
+
+def test_first_page_opens_log_after_it(paged_vm):
+    assert [c.sha for c in paged_vm.items.value] == ["s0", "s1", "s2", "s3"]
+    paged_vm._git.open_commit_log.assert_called_once_with(
+        "main", start=4, pushed_from=0
+    )
+    _page(paged_vm, 1)  # far from the end: nothing to load
+    assert len(paged_vm.items.value) == 4
+
+
+def test_paging_slides_a_bounded_window(paged_vm):
+    _page(paged_vm, 3)
+    assert len(paged_vm.items.value) == 8
+    assert len(paged_vm.graph_rows) == 8
+    assert paged_vm.window_shift == 0
+    _page(paged_vm, 7)
+    assert [c.sha for c in paged_vm.items.value][0] == "s4"
+    assert paged_vm.window_start == 4
+    assert paged_vm.window_shift == 4
+    # Back toward the top: the dropped page is re-read and the tail trimmed.
+    _page(paged_vm, 0)
+    assert [c.sha for c in paged_vm.items.value] == [f"s{i}" for i in range(8)]
+    assert paged_vm.window_start == 0
+    assert paged_vm.window_shift == -4
+    # Forward again: s8..s11 come from a range read, then the stream resumes.
+    _page(paged_vm, 7)
+    _page(paged_vm, 7)
+    assert [c.sha for c in paged_vm.items.value][-1] == "s15"
+
+
+def test_refresh_keeps_paged_window_and_closes_old_log(paged_vm):
+    _page(paged_vm, 3)
+    old_log = paged_vm._log
+    paged_vm._apply_load(paged_vm._load_commits())
+    assert len(paged_vm.items.value) == 8
+    assert old_log.closed
+    assert paged_vm._log is not old_log and paged_vm._log.offset == 8
+
+
+def test_stale_page_is_dropped(paged_vm):
+    calls = []
+    paged_vm._pager.start = lambda work, cb: calls.append((work, cb))
+    paged_vm.ensure_window(3)
+    work, cb = calls[0]
+    result = work()
+    paged_vm._apply_load(paged_vm._load_commits())  # refresh lands first
+    cb(result)
+    assert len(paged_vm.items.value) == 4
+
+
+def test_activity_reloads_only_when_tip_moves(commit_vm, tmp_path):
+    from pigit.git.activity import CommitActivity
+
+    calls = []
+    commit_vm._activity_task.start = lambda work, cb: calls.append((work, cb))
+    commit_vm._activity_cache_dir = str(tmp_path)
+    commit_vm._git.path = str(tmp_path)
+    commit_vm._git.iter_activity.return_value = [(1700000000, "Zev")]
+
+    commit_vm._apply_load(commit_vm._load_commits())
+    commit_vm._apply_load(commit_vm._load_commits())  # auto-refresh, same tip
+    assert len(calls) == 1
+    work, cb = calls[0]
+    cb(work())
+    activity = commit_vm.activity.value
+    assert isinstance(activity, CommitActivity) and activity.tip == "abc1234"
+
+    commit_vm._git.load_commits.return_value = [
+        Commit("fff0000", "third", "Zev", 1700000200, "unpushed", "", [], ["abc1234"])
+    ]
+    commit_vm._apply_load(commit_vm._load_commits())
+    assert len(calls) == 2
+    cb(work())  # the superseded tip's result is dropped
+    assert commit_vm.activity.value is activity
+
+
+@pytest.fixture
+def stored_vm(commit_vm, tmp_path):
+    from pigit.git.commit_store import CommitStore
+
+    store = CommitStore(tmp_path / "commits.sqlite")
+    commit_vm._store = store
+    commit_vm._git.path = "/repo"
+    commit_vm._items.set([])
+    yield commit_vm
+    store.close()
+
+
+def test_first_refresh_paints_stored_log_from_the_loader(stored_vm):
+    stored = stored_vm._git.load_commits.return_value
+    stored_vm._store.save_log("/repo", "main", stored)
+    streams = []
+    stored_vm._loader.start_stream = lambda work, cb: streams.append((work, cb))
+
+    stored_vm.refresh()
+
+    # Nothing is read on the calling (UI) thread.
+    assert stored_vm.items.value == []
+    (work, cb), = streams
+    loads = work()
+    cb(next(loads))
+    assert [c.sha for c in stored_vm.items.value] == ["abc1234", "def5678"]
+    assert len(stored_vm.graph_rows) == 2
+    assert stored_vm._log is None
+    assert stored_vm._window_ref is None
+
+    cb(next(loads))
+    assert stored_vm._window_ref == "main"
+    assert next(loads, None) is None
+
+
+def test_stored_log_is_not_painted_over_a_listed_log(stored_vm):
+    stored_vm._store.save_log(
+        "/repo", "main", stored_vm._git.load_commits.return_value[:1]
+    )
+    stored = stored_vm._load_stored()
+    stored_vm._items.set(stored_vm._git.load_commits.return_value)
+
+    stored_vm._apply_load(stored)
+
+    assert len(stored_vm.items.value) == 2
+
+
+def test_load_saves_log_only_when_it_changed(stored_vm):
+    stored_vm._store.save_log = Mock(wraps=stored_vm._store.save_log)
+    stored_vm._load_commits()
+    stored_vm._load_commits()
+    assert stored_vm._store.save_log.call_count == 1
+    assert len(stored_vm._store.load_log("/repo", "main")) == 2
+
+
+def test_bodies_and_stats_read_through_the_store(stored_vm):
+    git = stored_vm._git
+    stored_vm._items.set(git.load_commits.return_value)
+    stored_vm._store.put_bodies({"abc1234": "first\n\nstored"})
+    git.get_commit_bodies.return_value = {"def5678": "second"}
+
+    bodies = stored_vm.get_bodies()
+
+    assert bodies == {"abc1234": "first\n\nstored", "def5678": "second"}
+    git.get_commit_bodies.assert_called_once_with("main", shas=["def5678"])
+    assert stored_vm._store.get_bodies(["def5678"]) == {"def5678": "second"}
+
+    git.get_commit_stats.return_value = ([("a.py", 1, 0)], 1, 0)
+    stored_vm._build_commit_snapshot(git.load_commits.return_value[0])
+    stored_vm._build_commit_snapshot(git.load_commits.return_value[0])
+    assert git.get_commit_stats.call_count == 1
+
+
+class _FakeSearch:
+    def __init__(self, commits: list[Commit]) -> None:
+        self.commits = commits
+        self.closed = False
+
+    def __iter__(self):
+        return iter(self.commits)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_search_streams_hits_in_batches(commit_vm, monkeypatch):
+    import pigit.viewmodels.commit as commit_mod
+
+    monkeypatch.setattr(commit_mod, "SEARCH_BATCH", 2)
+    streams = []
+    commit_vm._search_task.start_stream = lambda work, cb: streams.append((work, cb))
+    hits = _history(5)
+    commit_vm._git.search_commits.return_value = _FakeSearch(hits)
+
+    commit_vm.search(" fix ")
+
+    commit_vm._git.search_commits.assert_called_once_with("main", "fix")
+    assert commit_vm.search_query == "fix" and commit_vm.searching
+    assert commit_vm.items.value == [] and commit_vm.graph_rows == []
+    work, cb = streams[0]
+    sizes = []
+    for batch in work():
+        cb(batch)
+        sizes.append(len(commit_vm.items.value))
+    assert sizes == [2, 4, 5]
+    assert not commit_vm.searching
+    assert commit_vm.items.value == hits
+
+
+def test_search_without_hits_reports_that_it_finished(commit_vm):
+    streams = []
+    commit_vm._search_task.start_stream = lambda work, cb: streams.append((work, cb))
+    commit_vm._git.search_commits.return_value = _FakeSearch([])
+    seen = []
+
+    class Watcher:
+        def on_running(self, running: bool) -> None:
+            seen.append(running)
+
+    watcher = Watcher()
+    commit_vm.search_running.subscribe(watcher.on_running)
+    commit_vm.search("nothing")
+    work, cb = streams[0]
+    for batch in work():
+        cb(batch)
+    assert seen == [True, False]
+    assert not commit_vm.searching and commit_vm.items.value == []
+
+
+def test_lone_hit_is_flushed_while_git_is_silent(commit_vm, monkeypatch):
+    import threading
+
+    import pigit.viewmodels.commit as commit_mod
+
+    monkeypatch.setattr(commit_mod, "SEARCH_FLUSH_S", 0.01)
+    release = threading.Event()
+    hit = _history(1)[0]
+
+    class SlowSearch(_FakeSearch):
+        def __iter__(self):
+            yield hit
+            release.wait(5)  # git walking history with no further match
+
+    search = SlowSearch([])
+    stream = commit_vm._read_search(search)
+    assert next(stream) == (search, [hit], False)
+    release.set()
+    assert next(stream) == (search, [], True)
+    assert search.closed
+
+
+def test_new_query_stops_the_running_search(commit_vm):
+    streams = []
+    commit_vm._search_task.start_stream = lambda work, cb: streams.append((work, cb))
+    first = _FakeSearch(_history(3))
+    commit_vm._git.search_commits.return_value = first
+    commit_vm.search("one")
+    stale = list(streams[0][0]())
+
+    commit_vm._git.search_commits.return_value = _FakeSearch([])
+    commit_vm.search("two")
+    assert first.closed
+    for batch in stale:
+        streams[0][1](batch)  # late batches of the old search are dropped
+    assert commit_vm.items.value == [] and commit_vm.searching
+
+
+def test_clear_search_lists_the_log_again(commit_vm):
+    loads = []
+    commit_vm._search_task.start_stream = lambda work, cb: None
+    commit_vm._loader.start = lambda work, cb: loads.append((work, cb))
+    commit_vm._git.search_commits.return_value = _FakeSearch([])
+    commit_vm.search("x")
+    commit_vm.refresh()  # auto-refresh keeps the results
+    assert loads == []
+
+    commit_vm.clear_search()
+    assert commit_vm.search_query == "" and not commit_vm.searching
+    work, cb = loads[0]
+    cb(work())
+    assert [c.sha for c in commit_vm.items.value] == ["abc1234", "def5678"]
@@ -216,10 +216,29 @@ def test_load_diff(status_vm):
     assert diff == ["+line1", "-line2"]
 
 
-def test_do_load_bypasses_status_cache(status_vm):
+def test_open_diff_streams_the_selected_file(status_vm):
+    stream = status_vm.open_diff(1)
+    assert stream is status_vm._git.stream_file_diff.return_value
+    status_vm._git.stream_file_diff.assert_called_once_with(
+        "b.py", True, True, plain=True
+    )
+    assert status_vm.open_diff(99) is None
+
+
+def test_load_status_bypasses_status_cache(status_vm):
     """Observe-driven refresh must not reuse index/HEAD-keyed status cache."""
-    status_vm._do_load()
-    status_vm._git.load_status.assert_called_with(use_cache=False)
+    status_vm._git.load_status_with_branch.return_value = ([], None)
+    status_vm._load_status()
+    status_vm._git.load_status_with_branch.assert_called_with(use_cache=False)
+
+
+def test_apply_load_publishes_branch_with_items(status_vm):
+    from pigit.git.model import BranchStatus
+
+    branch = BranchStatus(head="main", oid="abc", upstream="origin/main", ahead=2)
+    status_vm._apply_load(([], branch))
+    assert status_vm.items.value == []
+    assert status_vm.branch.value == branch
 
 
 def test_load_diff_by_path_finds_file_after_reorder(status_vm):
@@ -0,0 +1,10 @@
+"""Synthetic-repo benchmarks for the pigit git API layer.
+
+Build a reproducible repo and time the hot GitApi reads against it::
+
+    python -m tools.bench --files 100000 --commits 500000 --out after.json
+    python -m tools.bench --diff before.json after.json
+
+Repos are cached under ``--workdir`` keyed by their spec, so only the first
+run pays for the build.
+"""
@@ -0,0 +1,153 @@
+"""CLI: ``python -m tools.bench [options]`` from the repository root."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parents[2]
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from pigit.ext.exec_trace import ExecTrace  # noqa: E402
+
+from .cases import CASES, make_context, run_case  # noqa: E402
+from .synth import RepoSpec, build_repo  # noqa: E402
+
+SCHEMA = 1
+
+
+def _git_version() -> str:
+    out = subprocess.run(
+        ["git", "--version"], capture_output=True, text=True, check=False
+    ).stdout
+    return out.strip()
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        prog="python -m tools.bench",
+        description="Benchmark the pigit git API against a synthetic repo.",
+    )
+    defaults = RepoSpec()
+    p.add_argument("--files", type=int, default=defaults.files)
+    p.add_argument("--commits", type=int, default=defaults.commits)
+    p.add_argument("--branches", type=int, default=defaults.branches)
+    p.add_argument("--stashes", type=int, default=defaults.stashes)
+    p.add_argument("--untracked", type=int, default=defaults.untracked)
+    p.add_argument("--dirty", type=int, default=defaults.dirty)
+    p.add_argument(
+        "--merge-every",
+        type=int,
+        default=defaults.merge_every,
+        help="add a merge every N mainline commits (0: linear history)",
+    )
+    p.add_argument("--repeat", type=int, default=5, help="timed runs per case")
+    p.add_argument(
+        "--max-commits", type=int, default=300, help="iter_commits page size"
+    )
+    p.add_argument(
+        "--case",
+        action="append",
+        choices=sorted(CASES),
+        help="run only this case (repeatable)",
+    )
+    p.add_argument(
+        "--workdir",
+        type=Path,
+        default=Path(tempfile.gettempdir()) / "pigit-bench",
+        help="where synthetic repos are built and cached",
+    )
+    p.add_argument("--out", type=Path, help="write results JSON here")
+    p.add_argument(
+        "--diff",
+        nargs=2,
+        type=Path,
+        metavar=("OLD", "NEW"),
+        help="compare two result files instead of running",
+    )
+    return p.parse_args(argv)
+
+
+def _diff(old_path: Path, new_path: Path) -> str:
+    old = json.loads(old_path.read_text())
+    new = json.loads(new_path.read_text())
+    lines = []
+    if old.get("spec") != new.get("spec"):
+        lines.append("warning: results come from different repo specs")
+    lines.append(f"{'case':<16} {'old ms':>10} {'new ms':>10} {'delta':>8}  spawns")
+    for name in sorted(set(old["cases"]) | set(new["cases"])):
+        a, b = old["cases"].get(name), new["cases"].get(name)
+        if a is None or b is None:
+            lines.append(f"{name:<16} {'only in ' + ('new' if a is None else 'old')}")
+            continue
+        base = a["median_ms"] or 1e-9
+        delta = (b["median_ms"] - a["median_ms"]) / base * 100
+        lines.append(
+            f"{name:<16} {a['median_ms']:>10.2f} {b['median_ms']:>10.2f} "
+            f"{delta:>+7.1f}%  {a['subprocesses']} -> {b['subprocesses']}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    if args.diff:
+        print(_diff(*args.diff))
+        return 0
+
+    spec = RepoSpec(
+        files=args.files,
+        commits=args.commits,
+        branches=args.branches,
+        stashes=args.stashes,
+        untracked=args.untracked,
+        dirty=args.dirty,
+        merge_every=args.merge_every,
+    )
+    args.workdir.mkdir(parents=True, exist_ok=True)
+    print(f"building {spec.key} under {args.workdir} ...", file=sys.stderr)
+    repo = build_repo(spec, args.workdir)
+
+    trace = ExecTrace()
+    ctx = make_context(repo, spec, args.workdir, trace, args.max_commits)
+    results: dict[str, dict] = {}
+    try:
+        for name in args.case or list(CASES):
+            results[name] = run_case(CASES[name], ctx, trace, args.repeat)
+            r = results[name]
+            print(
+                f"{name:<16} median {r['median_ms']:>9.2f}ms  "
+                f"subprocesses {r['subprocesses']}",
+                file=sys.stderr,
+            )
+    finally:
+        ctx.git.close()
+
+    report = {
+        "schema": SCHEMA,
+        "spec": spec.as_dict(),
+        "environment": {
+            "python": platform.python_version(),
+            "git": _git_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "cases": results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.out:
+        args.out.write_text(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,121 @@
+"""Benchmark cases and the timing loop.
+
+Each case is timed against one shared :class:`~pigit.git.GitApi`, the way the
+TUI uses it. Subprocess counts come from a private
+:class:`~pigit.ext.exec_trace.ExecTrace`, so long-lived helpers such as the
+``cat-file`` batch show up only on the run that started them.
+"""
+
+from __future__ import annotations
+
+import json
+import statistics
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from pigit.ext.exec_trace import ExecTrace
+from pigit.ext.executor_factory import LocalExecutor
+from pigit.git import GitApi
+from pigit.git.managed_repos import ManagedRepos
+
+from .synth import RepoSpec, tracked_path
+
+
+@dataclass(slots=True)
+class BenchContext:
+    """Everything a case needs; built once per repo."""
+
+    repo: Path
+    spec: RepoSpec
+    git: GitApi
+    managed: ManagedRepos
+    max_commits: int
+
+
+def _load_status(ctx: BenchContext) -> None:
+    ctx.git.load_status(str(ctx.repo), use_cache=False)
+
+
+def _iter_commits(ctx: BenchContext) -> None:
+    for _ in ctx.git.iter_commits("main", max_commits=ctx.max_commits):
+        pass
+
+
+def _load_branches(ctx: BenchContext) -> None:
+    ctx.git.load_branches(scope="all")
+
+
+def _load_stashes(ctx: BenchContext) -> None:
+    ctx.git.load_stashes()
+
+
+def _load_file_diff(ctx: BenchContext) -> None:
+    ctx.git.load_file_diff(tracked_path(0), plain=True)
+
+
+def _refresh_meta(ctx: BenchContext) -> None:
+    for _ in ctx.managed.refresh_meta(force=True):
+        pass
+
+
+CASES: dict[str, Callable[[BenchContext], None]] = {
+    "load_status": _load_status,
+    "iter_commits": _iter_commits,
+    "load_branches": _load_branches,
+    "load_stashes": _load_stashes,
+    "load_file_diff": _load_file_diff,
+    "refresh_meta": _refresh_meta,
+}
+
+
+def make_context(
+    repo: Path, spec: RepoSpec, workdir: Path, trace: ExecTrace, max_commits: int
+) -> BenchContext:
+    executor = LocalExecutor(trace=trace)
+    repos_json = workdir / f"{spec.key}.repos.json"
+    repos_json.write_text(json.dumps({"bench": {"path": str(repo)}}))
+    return BenchContext(
+        repo=repo,
+        spec=spec,
+        git=GitApi(executor=executor, path=str(repo)),
+        managed=ManagedRepos(executor, repo_json_path=str(repos_json)),
+        max_commits=max_commits,
+    )
+
+
+def _spawned(trace: ExecTrace) -> int:
+    return sum(t.count for t in trace.totals())
+
+
+def run_case(
+    fn: Callable[[BenchContext], None],
+    ctx: BenchContext,
+    trace: ExecTrace,
+    repeat: int,
+    warmup: int = 1,
+) -> dict:
+    """Time ``fn`` ``repeat`` times after ``warmup`` untimed runs.
+
+    Returns:
+        ``median_ms`` / ``min_ms`` / ``max_ms`` over the timed runs, plus the
+        median subprocess count per run.
+    """
+    for _ in range(warmup):
+        fn(ctx)
+    walls: list[float] = []
+    spawns: list[int] = []
+    for _ in range(repeat):
+        before = _spawned(trace)
+        t0 = time.perf_counter()
+        fn(ctx)
+        walls.append((time.perf_counter() - t0) * 1000)
+        spawns.append(_spawned(trace) - before)
+    return {
+        "median_ms": round(statistics.median(walls), 3),
+        "min_ms": round(min(walls), 3),
+        "max_ms": round(max(walls), 3),
+        "runs": repeat,
+        "subprocesses": statistics.median_low(spawns),
+    }
@@ -0,0 +1,206 @@
+"""Build reproducible synthetic git repos for benchmarking.
+
+History is written in one ``git fast-import`` stream with fixed identities and
+timestamps, so the same :class:`RepoSpec` always yields the same object ids.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import os
+import shutil
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO
+
+_IDENT = "Bench <bench@example.invalid>"
+_EPOCH = 1_600_000_000
+_MARKER = ".bench-spec.json"
+
+
+@dataclass(frozen=True, slots=True)
+class RepoSpec:
+    """Size knobs of one synthetic repo."""
+
+    # Tracked files in the first commit (spread over 100-file directories).
+    files: int = 1000
+    # Commits in total, merges and their side commits included.
+    commits: int = 1000
+    # Extra local branches pointing at evenly spaced commits.
+    branches: int = 20
+    # Stash entries, each stashing one modified file.
+    stashes: int = 5
+    # Untracked files under ``untracked/`` (100 per directory).
+    untracked: int = 100
+    # Tracked files left modified in the worktree.
+    dirty: int = 10
+    # A side commit plus a merge commit every N mainline commits (0: linear).
+    merge_every: int = 0
+
+    @property
+    def key(self) -> str:
+        """Directory-safe name identifying this spec."""
+        return (
+            f"f{self.files}-c{self.commits}-b{self.branches}-s{self.stashes}"
+            f"-u{self.untracked}-d{self.dirty}-m{self.merge_every}"
+        )
+
+    def as_dict(self) -> dict[str, int]:
+        return dataclasses.asdict(self)
+
+
+def tracked_path(i: int) -> str:
+    return f"src/d{i // 100:04d}/f{i:06d}.txt"
+
+
+def _env(ts: int) -> dict[str, str]:
+    env = dict(os.environ)
+    name, _, email = _IDENT.partition(" <")
+    date = f"{ts} +0000"
+    env.update(
+        GIT_AUTHOR_NAME=name,
+        GIT_AUTHOR_EMAIL=email.rstrip(">"),
+        GIT_COMMITTER_NAME=name,
+        GIT_COMMITTER_EMAIL=email.rstrip(">"),
+        GIT_AUTHOR_DATE=date,
+        GIT_COMMITTER_DATE=date,
+        GIT_CONFIG_NOSYSTEM="1",
+    )
+    return env
+
+
+def _git(repo: Path, *args: str, ts: int = _EPOCH) -> None:
+    subprocess.run(
+        ["git", *args],
+        cwd=repo,
+        env=_env(ts),
+        check=True,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def _data(out: IO[bytes], text: str) -> None:
+    raw = text.encode()
+    out.write(b"data %d\n%s\n" % (len(raw), raw))
+
+
+def _commit(
+    out: IO[bytes],
+    ref: str,
+    mark: int,
+    ts: int,
+    message: str,
+    parents: list[int],
+    changes: list[tuple[str, str]],
+) -> None:
+    out.write(f"commit {ref}\nmark :{mark}\n".encode())
+    out.write(f"committer {_IDENT} {ts} +0000\n".encode())
+    _data(out, message)
+    if parents:
+        out.write(f"from :{parents[0]}\n".encode())
+    for parent in parents[1:]:
+        out.write(f"merge :{parent}\n".encode())
+    for path, content in changes:
+        out.write(f"M 100644 inline {path}\n".encode())
+        _data(out, content)
+
+
+def _write_history(out: IO[bytes], spec: RepoSpec) -> list[int]:
+    """Stream every commit; return the mainline marks oldest first."""
+    files = max(spec.files, 1)
+    _commit(
+        out,
+        "refs/heads/main",
+        1,
+        _EPOCH,
+        "initial import",
+        [],
+        [(tracked_path(i), f"file {i}\n") for i in range(files)],
+    )
+    mainline = [1]
+    mark = 1
+    since_merge = 0
+    while mark < spec.commits:
+        mark += 1
+        ts = _EPOCH + mark * 60
+        target = (mark * 7919) % files
+        change = [(tracked_path(target), f"file {target} rev {mark}\n")]
+        merging = spec.merge_every and since_merge >= spec.merge_every
+        if merging and mark < spec.commits:
+            # Side commit forked a few commits back, then a merge on main.
+            base = mainline[max(0, len(mainline) - spec.merge_every)]
+            _commit(out, "refs/bench/side", mark, ts, f"side {mark}", [base], change)
+            mark += 1
+            _commit(
+                out,
+                "refs/heads/main",
+                mark,
+                ts + 30,
+                f"Merge side {mark - 1}",
+                [mainline[-1], mark - 1],
+                change,
+            )
+            since_merge = 0
+        else:
+            parents = [mainline[-1]]
+            _commit(out, "refs/heads/main", mark, ts, f"change {target}", parents, change)
+            since_merge += 1
+        mainline.append(mark)
+    for j in range(spec.branches):
+        at = mainline[(j * len(mainline)) // max(spec.branches, 1)]
+        out.write(f"reset refs/heads/branch-{j:04d}\nfrom :{at}\n\n".encode())
+    out.write(b"done\n")
+    return mainline
+
+
+def build_repo(spec: RepoSpec, dest: Path) -> Path:
+    """Create (or reuse) the repo for ``spec`` under ``dest / spec.key``.
+
+    A repo is reused when its marker file records the same spec; anything else
+    at that path is removed and rebuilt.
+    """
+    repo = dest / spec.key
+    marker = repo / _MARKER
+    if marker.is_file() and json.loads(marker.read_text()) == spec.as_dict():
+        return repo
+    if repo.exists():
+        shutil.rmtree(repo)
+    repo.mkdir(parents=True)
+
+    _git(repo, "init", "-q", "-b", "main")
+    _git(repo, "config", "user.name", "Bench")
+    _git(repo, "config", "user.email", "bench@example.invalid")
+    _git(repo, "config", "gc.auto", "0")
+    proc = subprocess.Popen(
+        ["git", "fast-import", "--quiet", "--done"],
+        cwd=repo,
+        env=_env(_EPOCH),
+        stdin=subprocess.PIPE,
+    )
+    assert proc.stdin is not None
+    with proc.stdin as out:
+        _write_history(out, spec)
+    if proc.wait() != 0:
+        raise RuntimeError(f"git fast-import failed for {spec.key}")
+    _git(repo, "checkout", "-q", "-f", "main")
+
+    files = max(spec.files, 1)
+    stash_ts = _EPOCH + (spec.commits + 1) * 60
+    for s in range(spec.stashes):
+        i = (s * 31) % files
+        (repo / tracked_path(i)).write_text(f"file {i} stash {s}\n")
+        _git(repo, "stash", "push", "-q", "-m", f"bench stash {s}", ts=stash_ts + s)
+    for i in range(min(spec.dirty, files)):
+        (repo / tracked_path(i)).write_text(f"file {i} dirty\n")
+    for j in range(spec.untracked):
+        path = repo / "untracked" / f"u{j // 100:03d}" / f"n{j:05d}.txt"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"untracked {j}\n")
+    # Keep the marker itself out of status output.
+    with open(repo / ".git" / "info" / "exclude", "a") as fp:
+        fp.write(f"/{_MARKER}\n")
+    marker.write_text(json.dumps(spec.as_dict(), sort_keys=True))
+    return repo